@@ -21,7 +21,7 @@ import jwt
 from marshmallow import fields
 
 from ..config.injection_context import InjectionContext
-from ..core.event_bus import Event, EventBus
+from ..core.event_bus import OVERFLOW_BLOCK, Event, EventBus
 from ..core.plugin_registry import PluginRegistry
 from ..core.profile import Profile
 from ..ledger.error import LedgerConfigError, LedgerTransactionError
@@ -42,6 +42,9 @@ from .request_context import AdminRequestContext
 
 LOGGER = logging.getLogger(__name__)
 
+# number of events queued for webhook delivery
+WEBHOOK_EVENT_QUEUE_SIZE = 1000
+
 EVENT_PATTERN_WEBHOOK = re.compile("^acapy::webhook::(.*)$")
 EVENT_PATTERN_RECORD = re.compile("^acapy::record::([^:]*)(?:::.*)?$")
 
@@ -508,8 +511,25 @@ class AdminServer(BaseAdminServer):
 
         event_bus = self.context.inject_or(EventBus)
         if event_bus:
-            event_bus.subscribe(EVENT_PATTERN_WEBHOOK, self._on_webhook_event)
-            event_bus.subscribe(EVENT_PATTERN_RECORD, self._on_record_event)
+            # deliver webhooks from queues, so that emitting events does not wait
+            queue_size = self.context.settings.get(
+                "admin.webhook_event_queue_size", WEBHOOK_EVENT_QUEUE_SIZE
+            )
+            overflow = self.context.settings.get(
+                "admin.webhook_event_overflow", OVERFLOW_BLOCK
+            )
+            event_bus.subscribe(
+                EVENT_PATTERN_WEBHOOK,
+                self._on_webhook_event,
+                queue_size=queue_size,
+                overflow=overflow,
+            )
+            event_bus.subscribe(
+                EVENT_PATTERN_RECORD,
+                self._on_record_event,
+                queue_size=queue_size,
+                overflow=overflow,
+            )
 
             # Only include forward webhook events if the option is enabled
             if self.context.settings.get_bool("monitor_forward", False):
@@ -521,6 +541,8 @@ class AdminServer(BaseAdminServer):
                     lambda profile, event, webhook_topic=webhook_topic: self.send_webhook(
                         profile, webhook_topic, event.payload
                     ),
+                    queue_size=queue_size,
+                    overflow=overflow,
                 )
 
         # order tags alphabetically, parameters deterministically and pythonically
@@ -41,14 +41,25 @@ class AskarProfile(Profile):
         opened: AskarOpenStore,
         context: InjectionContext = None,
         *,
-        profile_id: str = None
+        profile_id: str = None,
+        ledger_pool: IndyVdrLedgerPool = None
     ):
-        """Create a new AskarProfile instance."""
+        """
+        Create a new AskarProfile instance.
+
+        A ledger pool may be given to share it with other profiles, otherwise a
+        new pool is created according to the profile settings.
+        """
         super().__init__(context=context, name=opened.name, created=opened.created)
         self.opened = opened
-        self.ledger_pool: IndyVdrLedgerPool = None
+        self.ledger_pool: IndyVdrLedgerPool = ledger_pool
         self.profile_id = profile_id
-        self.init_ledger_pool()
+        # revocation index blocks reserved by the credential issuer
+        self.rev_reg_allocator = None
+        # credential definitions loaded by the credential issuer
+        self.cred_def_cache = None
+        if not ledger_pool:
+            self.init_ledger_pool()
         self.bind_providers()
 
     @property
@@ -150,6 +161,9 @@ class AskarProfile(Profile):
     async def close(self):
         """Close the profile instance."""
         if self.opened:
+            if self.rev_reg_allocator:
+                await self.rev_reg_allocator.release(self)
+            self.cred_def_cache = None
             await self.opened.close()
             self.opened = None
 
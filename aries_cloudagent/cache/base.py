@@ -6,6 +6,10 @@ from typing import Any, Sequence, Text, Union
 
 from ..core.error import BaseError
 
+# Prefix for keys of values which must stay in the agent process, such as
+# secrets: caches shared between processes keep these in process only
+LOCAL_ONLY_PREFIX = "local::"
+
 
 class CacheError(BaseError):
     """Base class for cache-related errors."""
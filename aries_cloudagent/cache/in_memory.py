@@ -1,29 +1,113 @@
 """Basic in-memory cache implementation."""
 
+import heapq
+import itertools
+import sys
 import time
-from typing import Any, Sequence, Text, Union
+
+from collections import OrderedDict
+from typing import Any, Mapping, Sequence, Text, Union
 
 from .base import BaseCache
 
 
+def estimate_size(value: Any, _depth: int = 0) -> int:
+    """
+    Estimate the memory used by a cached value, in bytes.
+
+    Containers and plain objects are measured recursively to a limited depth,
+    so the result is only an approximation for deeply nested values.
+    """
+    size = sys.getsizeof(value)
+    if _depth >= 6 or isinstance(value, (str, bytes, bytearray, int, float)):
+        return size
+    if isinstance(value, Mapping):
+        for key, item in value.items():
+            size += estimate_size(key, _depth + 1) + estimate_size(item, _depth + 1)
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        for item in value:
+            size += estimate_size(item, _depth + 1)
+    elif hasattr(value, "__dict__"):
+        size += estimate_size(vars(value), _depth + 1)
+    return size
+
+
 class InMemoryCache(BaseCache):
     """Basic in-memory cache class."""
 
-    def __init__(self):
-        """Initialize a `InMemoryCache` instance."""
+    def __init__(self, max_entries: int = None, max_bytes: int = None):
+        """
+        Initialize a `InMemoryCache` instance.
+
+        Entries are evicted in least recently used order once the cache holds
+        more than `max_entries` entries, or once the estimated size of the cached
+        values exceeds `max_bytes`. Expired entries are found through a heap
+        ordered by expiry time.
+
+        Args:
+            max_entries: The maximum number of cache entries
+            max_bytes: The approximate maximum size of the cached values
+        """
         super().__init__()
         # looks like { "key": { "expires": <epoch timestamp>, "value": <val> } }
-        self._cache = {}
+        # in least recently used order
+        self._cache = OrderedDict()
+        self._expiry = []
+        self._seq = itertools.count()
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @property
+    def stats(self) -> dict:
+        """Accessor for the cache counters."""
+        return {
+            "entries": len(self._cache),
+            "bytes": self.total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
 
     def _remove_expired_cache_items(self):
         """Remove all expired items from cache."""
-        for key, val in self._cache.copy().items():  # iterate copy, del from original
-            cache_item_expiry = val["expires"]
-            if cache_item_expiry is None:
-                continue
-            now = time.perf_counter()
-            if now >= cache_item_expiry:
-                del self._cache[key]
+        expiry = self._expiry
+        now = time.perf_counter()
+        while expiry and expiry[0][0] <= now:
+            _, seq, key = heapq.heappop(expiry)
+            entry = self._cache.get(key)
+            if entry and entry["seq"] == seq:
+                self._remove(key)
+                self.expirations += 1
+
+    def _remove(self, key: Text):
+        """Remove an entry from the cache."""
+        entry = self._cache.pop(key)
+        self.total_bytes -= entry["size"]
+
+    def _evict(self):
+        """Evict least recently used entries until the cache is within bounds."""
+        while self._cache and (
+            self.max_entries
+            and len(self._cache) > self.max_entries
+            or self.max_bytes
+            and self.total_bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._cache)))
+            self.evictions += 1
+        # drop heap entries for replaced or evicted items once they dominate
+        if len(self._expiry) > 2 * len(self._cache) + 1000:
+            self._expiry = [
+                item
+                for item in self._expiry
+                if item[2] in self._cache and self._cache[item[2]]["seq"] == item[1]
+            ]
+            heapq.heapify(self._expiry)
 
     async def get(self, key: Text):
         """
@@ -36,8 +120,17 @@ class InMemoryCache(BaseCache):
             The record found or `None`
 
         """
-        self._remove_expired_cache_items()
-        return self._cache.get(key)["value"] if self._cache.get(key) else None
+        entry = self._cache.get(key)
+        if entry and entry["expires"] is not None:
+            if time.perf_counter() >= entry["expires"]:
+                self._remove_expired_cache_items()
+                entry = None
+        if entry:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return entry["value"]
+        self.misses += 1
+        return None
 
     async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
         """
@@ -53,8 +146,21 @@ class InMemoryCache(BaseCache):
         """
         self._remove_expired_cache_items()
         expires_ts = time.perf_counter() + ttl if ttl else None
+        size = estimate_size(value)
         for key in [keys] if isinstance(keys, Text) else keys:
-            self._cache[key] = {"expires": expires_ts, "value": value}
+            if key in self._cache:
+                self._remove(key)
+            seq = next(self._seq)
+            self._cache[key] = {
+                "expires": expires_ts,
+                "value": value,
+                "seq": seq,
+                "size": size,
+            }
+            self.total_bytes += size
+            if expires_ts is not None:
+                heapq.heappush(self._expiry, (expires_ts, seq, key))
+        self._evict()
 
     async def clear(self, key: Text):
         """
@@ -65,9 +171,11 @@ class InMemoryCache(BaseCache):
 
         """
         if key in self._cache:
-            del self._cache[key]
+            self._remove(key)
 
     async def flush(self):
         """Remove all items from the cache."""
 
-        self._cache = {}
+        self._cache = OrderedDict()
+        self._expiry = []
+        self.total_bytes = 0
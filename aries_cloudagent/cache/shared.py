@@ -0,0 +1,467 @@
+"""Shared cache backends, accessible from multiple agent processes."""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import struct
+import time
+import zlib
+
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Sequence, Tuple
+from urllib.parse import unquote, urlparse
+from uuid import uuid4
+
+from .base import CacheError
+
+LOGGER = logging.getLogger(__name__)
+
+# value header: format marker and absolute expiry time (0 for none)
+HEADER = struct.Struct(">cd")
+FORMAT_JSON = b"j"
+FORMAT_ZLIB = b"z"
+COMPRESS_MIN = 1024
+
+# file cache header: absolute expiry time (0 for none)
+EXPIRY = struct.Struct(">d")
+
+# delete a Redis lock only if it is still held with the given token
+REDIS_UNLOCK_SCRIPT = (
+    'if redis.call("GET", KEYS[1]) == ARGV[1] then '
+    'return redis.call("DEL", KEYS[1]) else return 0 end'
+)
+
+
+class SharedCacheError(CacheError):
+    """Error raised when a shared cache backend cannot be reached."""
+
+
+def encode_value(value: Any, ttl: float = None) -> Optional[bytes]:
+    """
+    Serialize a cache value for a shared backend.
+
+    Values are stored as compact JSON, compressed when large. Returns `None` if
+    the value cannot be represented as JSON.
+    """
+    try:
+        data = json.dumps(value, separators=(",", ":")).encode("utf-8")
+    except (TypeError, ValueError):
+        return None
+    fmt = FORMAT_JSON
+    if len(data) >= COMPRESS_MIN:
+        data = zlib.compress(data)
+        fmt = FORMAT_ZLIB
+    expires = time.time() + ttl if ttl else 0.0
+    return HEADER.pack(fmt, expires) + data
+
+
+def decode_value(data: bytes) -> Tuple[Any, Optional[float]]:
+    """
+    Deserialize a cache value read from a shared backend.
+
+    Returns: a tuple of the value and its remaining time to live, if any
+
+    """
+    try:
+        fmt, expires = HEADER.unpack_from(data)
+        offset = HEADER.size
+        body = data[offset:]
+        if fmt == FORMAT_ZLIB:
+            body = zlib.decompress(body)
+        elif fmt != FORMAT_JSON:
+            raise SharedCacheError(f"Unknown shared cache value format: {fmt}")
+        ttl = None
+        if expires:
+            ttl = expires - time.time()
+            if ttl <= 0:
+                return None, 0
+        return json.loads(body), ttl
+    except (struct.error, zlib.error, ValueError) as err:
+        raise SharedCacheError(f"Invalid shared cache value: {err}") from err
+
+
+class SharedCacheBackend(ABC):
+    """Interface for a byte-oriented cache store shared between processes."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a stored value."""
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: float = None):
+        """Store a value with an optional time to live in seconds."""
+
+    @abstractmethod
+    async def delete(self, key: str):
+        """Remove a stored value."""
+
+    @abstractmethod
+    async def flush(self):
+        """Remove all stored values."""
+
+    @abstractmethod
+    async def lock(self, key: str, ttl: float) -> Optional[str]:
+        """
+        Try to take an expiring lock on a key.
+
+        Returns: a token identifying the lock, or `None` if it is already held
+
+        """
+
+    @abstractmethod
+    async def unlock(self, key: str, token: str):
+        """Release a lock taken with `lock`."""
+
+    async def close(self):
+        """Release any resources held by the backend."""
+
+
+class FileCacheBackend(SharedCacheBackend):
+    """
+    Shared cache backend storing values as files in a directory.
+
+    Suitable for agent processes on the same host, for instance with the
+    directory on a memory-backed file system such as /dev/shm. Each file starts
+    with the expiry time of its value: expired files are removed when read, and
+    by a sweep of the directory run at most every `sweep_interval` seconds when
+    values are stored. File operations are run in the default executor, and
+    file system errors are raised as `SharedCacheError`.
+    """
+
+    def __init__(self, path: str, *, sweep_interval: float = 60):
+        """Initialize the file cache backend."""
+        self.path = path
+        self.sweep_interval = sweep_interval
+        self._last_sweep = time.time()
+        self._sweep_task: asyncio.Future = None
+        os.makedirs(path, exist_ok=True)
+
+    def _file_path(self, key: str, suffix: str = ".val") -> str:
+        """Get the file path for a key."""
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, name + suffix)
+
+    @staticmethod
+    async def _run(func, *args):
+        """Run a blocking file operation in the default executor."""
+        try:
+            return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+        except OSError as err:
+            raise SharedCacheError(f"Error accessing file cache: {err}") from err
+
+    @staticmethod
+    def _unlink(path: str):
+        """Remove a file, if present."""
+        try:
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    def _read_value(self, path: str) -> Optional[bytes]:
+        """Read a value file, removing it if the value has expired."""
+        try:
+            with open(path, "rb") as value_file:
+                data = value_file.read()
+        except FileNotFoundError:
+            return None
+        try:
+            (expires,) = EXPIRY.unpack_from(data)
+        except struct.error:
+            expires = 0.0
+        if expires and expires <= time.time():
+            self._unlink(path)
+            return None
+        offset = EXPIRY.size
+        return data[offset:]
+
+    def _write_value(self, path: str, value: bytes, expires: float):
+        """Write a value file, replacing it atomically."""
+        temp_path = f"{path}.{uuid4().hex}.tmp"
+        with open(temp_path, "wb") as value_file:
+            value_file.write(EXPIRY.pack(expires) + value)
+        os.replace(temp_path, path)
+
+    def _sweep(self, expired_only: bool = True):
+        """Remove expired value files and abandoned temporary files."""
+        now = time.time()
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if entry.name.endswith(".tmp"):
+                    try:
+                        if entry.stat().st_mtime + self.sweep_interval > now:
+                            continue
+                    except FileNotFoundError:
+                        continue
+                elif not entry.name.endswith(".val"):
+                    continue
+                elif expired_only:
+                    try:
+                        with open(entry.path, "rb") as value_file:
+                            (expires,) = EXPIRY.unpack(value_file.read(EXPIRY.size))
+                    except FileNotFoundError:
+                        continue
+                    except struct.error:
+                        expires = 0.0
+                    if not expires or expires > now:
+                        continue
+                self._unlink(entry.path)
+
+    async def sweep(self):
+        """Remove expired values from the directory."""
+        self._last_sweep = time.time()
+        await self._run(self._sweep)
+
+    def _schedule_sweep(self):
+        """Start a sweep in the background if one is due."""
+        if self.sweep_interval and (
+            time.time() - self._last_sweep >= self.sweep_interval
+            and not (self._sweep_task and not self._sweep_task.done())
+        ):
+            self._sweep_task = asyncio.ensure_future(self.sweep())
+            self._sweep_task.add_done_callback(self._sweep_done)
+
+    @staticmethod
+    def _sweep_done(task: asyncio.Future):
+        """Log any error from a background sweep."""
+        if not task.cancelled() and task.exception():
+            LOGGER.warning("Error sweeping file cache: %s", task.exception())
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a stored value."""
+        return await self._run(self._read_value, self._file_path(key))
+
+    async def set(self, key: str, value: bytes, ttl: float = None):
+        """Store a value with an optional time to live in seconds."""
+        expires = time.time() + ttl if ttl else 0.0
+        await self._run(self._write_value, self._file_path(key), value, expires)
+        self._schedule_sweep()
+
+    async def delete(self, key: str):
+        """Remove a stored value."""
+        await self._run(self._unlink, self._file_path(key))
+
+    async def flush(self):
+        """Remove all stored values."""
+        await self._run(self._sweep, False)
+
+    def _lock(self, key: str, ttl: float) -> Optional[str]:
+        """Take a lock file, if it is not held by another process."""
+        path = self._file_path(key, ".lock")
+        token = uuid4().hex
+        for _ in range(2):
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    with open(path, "r") as lock_file:
+                        expires = float(lock_file.read().split(" ")[0] or 0)
+                except (FileNotFoundError, ValueError):
+                    expires = 0
+                if expires > time.time():
+                    return None
+                # the holder has given up, take over the lock
+                self._unlink(path)
+                continue
+            with os.fdopen(fd, "w") as lock_file:
+                lock_file.write(f"{time.time() + ttl} {token}")
+            return token
+        return None
+
+    async def lock(self, key: str, ttl: float) -> Optional[str]:
+        """Try to take an expiring lock on a key using an exclusive lock file."""
+        return await self._run(self._lock, key, ttl)
+
+    def _unlock(self, key: str, token: str):
+        """Remove a lock file, if it is still held with the given token."""
+        path = self._file_path(key, ".lock")
+        try:
+            with open(path, "r") as lock_file:
+                if lock_file.read().split(" ")[-1] != token:
+                    return
+            os.unlink(path)
+        except FileNotFoundError:
+            pass
+
+    async def unlock(self, key: str, token: str):
+        """Release a lock file, if it is still held with the given token."""
+        await self._run(self._unlock, key, token)
+
+    async def close(self):
+        """Wait for any running sweep to finish."""
+        if self._sweep_task and not self._sweep_task.done():
+            await asyncio.wait([self._sweep_task])
+
+
+class RedisCacheBackend(SharedCacheBackend):
+    """
+    Shared cache backend using a Redis-compatible server.
+
+    Speaks the Redis serialization protocol over a single connection, so no
+    client library is required. All keys are stored under a common prefix.
+    """
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        *,
+        db: int = 0,
+        password: str = None,
+        prefix: str = "acapy:",
+        timeout: float = 5.0,
+    ):
+        """Initialize the Redis cache backend."""
+        self.host = host
+        self.port = port
+        self.db = db
+        self.password = password
+        self.prefix = prefix
+        self.timeout = timeout
+        self._reader: asyncio.StreamReader = None
+        self._writer: asyncio.StreamWriter = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode_command(args: Sequence) -> bytes:
+        """Encode a command in the Redis serialization protocol."""
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    async def _read_reply(self):
+        """Read a single reply from the server."""
+        line = await self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise SharedCacheError("Connection to shared cache closed")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise SharedCacheError(f"Shared cache error: {body.decode('utf-8')}")
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(body)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise SharedCacheError("Unexpected reply from shared cache")
+
+    async def _connect(self):
+        """Open the connection to the server."""
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        if self.password:
+            await self._send(("AUTH", self.password))
+        if self.db:
+            await self._send(("SELECT", self.db))
+
+    async def _send(self, args: Sequence):
+        """Send a command and wait for the reply."""
+        self._writer.write(self._encode_command(args))
+        return await self._read_reply()
+
+    async def execute(self, *args):
+        """Execute a command on the server, reconnecting if required."""
+        async with self._lock:
+            try:
+                if not self._writer:
+                    await asyncio.wait_for(self._connect(), self.timeout)
+                return await asyncio.wait_for(self._send(args), self.timeout)
+            except SharedCacheError as err:
+                if not err.message.startswith("Shared cache error"):
+                    self._disconnect()
+                raise
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError) as err:
+                self._disconnect()
+                raise SharedCacheError(
+                    f"Error communicating with shared cache: {err}"
+                ) from err
+            except BaseException:
+                # interrupted mid-command: the reply may still be pending
+                self._disconnect()
+                raise
+
+    def _disconnect(self):
+        """Drop the current connection."""
+        if self._writer:
+            self._writer.close()
+        self._reader = None
+        self._writer = None
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a stored value."""
+        return await self.execute("GET", self.prefix + key)
+
+    async def set(self, key: str, value: bytes, ttl: float = None):
+        """Store a value with an optional time to live in seconds."""
+        if ttl:
+            await self.execute("SET", self.prefix + key, value, "PX", int(ttl * 1000))
+        else:
+            await self.execute("SET", self.prefix + key, value)
+
+    async def delete(self, key: str):
+        """Remove a stored value."""
+        await self.execute("DEL", self.prefix + key)
+
+    async def flush(self):
+        """Remove all values stored under the key prefix."""
+        cursor = b"0"
+        while True:
+            cursor, keys = await self.execute(
+                "SCAN", cursor, "MATCH", self.prefix + "*", "COUNT", 500
+            )
+            if keys:
+                await self.execute("DEL", *keys)
+            if cursor in (b"0", 0):
+                break
+
+    async def lock(self, key: str, ttl: float) -> Optional[str]:
+        """Try to take an expiring lock on a key."""
+        token = uuid4().hex
+        result = await self.execute(
+            "SET", f"{self.prefix}lock:{key}", token, "NX", "PX", int(ttl * 1000)
+        )
+        return token if result == "OK" else None
+
+    async def unlock(self, key: str, token: str):
+        """Release a lock, if it is still held with the given token."""
+        await self.execute(
+            "EVAL", REDIS_UNLOCK_SCRIPT, 1, f"{self.prefix}lock:{key}", token
+        )
+
+    async def close(self):
+        """Close the connection to the server."""
+        async with self._lock:
+            self._disconnect()
+
+
+def shared_backend_from_url(url: str) -> SharedCacheBackend:
+    """
+    Create a shared cache backend from a URL.
+
+    Supported URLs are `redis://[:password@]host[:port][/db]` and
+    `file:///path/to/directory`.
+    """
+    parsed = urlparse(url)
+    if parsed.scheme == "redis":
+        db = parsed.path.strip("/")
+        return RedisCacheBackend(
+            parsed.hostname or "localhost",
+            parsed.port or 6379,
+            db=int(db) if db else 0,
+            password=unquote(parsed.password) if parsed.password else None,
+        )
+    if parsed.scheme == "file":
+        return FileCacheBackend(unquote(parsed.path))
+    raise SharedCacheError(f"Unsupported shared cache URL: {url}")
@@ -3,7 +3,7 @@ import pytest
 from asyncio import ensure_future, sleep, wait_for
 
 from ..base import CacheError
-from ..in_memory import InMemoryCache
+from ..in_memory import InMemoryCache, estimate_size
 
 
 @pytest.fixture()
@@ -166,3 +166,74 @@ class TestBasicCache:
     @pytest.mark.asyncio
     async def test_repr(self, cache):
         assert isinstance(repr(cache), str)
+
+
+class TestBoundedCache:
+    @pytest.mark.asyncio
+    async def test_lru_max_entries(self):
+        cache = InMemoryCache(max_entries=3)
+        for idx in range(3):
+            await cache.set(f"key{idx}", idx)
+        assert await cache.get("key0") == 0  # key1 is now least recently used
+        await cache.set("key3", 3)
+        assert await cache.get("key1") is None
+        assert await cache.get("key0") == 0
+        assert await cache.get("key3") == 3
+        assert cache.stats["entries"] == 3
+        assert cache.evictions == 1
+        assert cache.hits == 3
+        assert cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_max_bytes(self):
+        value_size = estimate_size("x" * 1000)
+        cache = InMemoryCache(max_bytes=value_size * 3)
+        await cache.set(["a", "b"], "x" * 1000)
+        assert cache.total_bytes == value_size * 2
+        await cache.set("c", "y" * 1000)
+        await cache.set("b", "z" * 1000)  # replacing does not double count
+        assert cache.total_bytes == value_size * 3
+        await cache.set("d", "w" * 1000)
+        assert await cache.get("a") is None
+        assert await cache.get("d") == "w" * 1000
+        assert cache.total_bytes == value_size * 3
+        await cache.clear("d")
+        assert cache.total_bytes == value_size * 2
+        await cache.flush()
+        assert cache.stats["bytes"] == 0
+
+    @pytest.mark.asyncio
+    async def test_expiry_heap(self):
+        cache = InMemoryCache()
+        await cache.set("short", "value", 0.05)
+        await cache.set("long", "value", 60)
+        await cache.set("replaced", "value", 0.05)
+        await cache.set("replaced", "new value")
+        await sleep(0.05)
+        await cache.set("other", "value")
+        assert "short" not in cache._cache
+        assert await cache.get("replaced") == "new value"
+        assert await cache.get("long") == "value"
+        assert cache.expirations == 1
+        assert len(cache._expiry) == 1
+
+    @pytest.mark.asyncio
+    async def test_expiry_heap_compaction(self):
+        cache = InMemoryCache()
+        for _ in range(3):
+            for idx in range(1000):
+                await cache.set(f"key{idx}", idx, 60)
+        assert len(cache._expiry) <= 3000
+        assert len(cache._cache) == 1000
+
+    def test_estimate_size(self):
+        class Record:
+            def __init__(self):
+                self.name = "x" * 100
+
+        assert estimate_size({"key": ["a" * 100, b"b" * 100]}) > 200
+        assert estimate_size(Record()) > 100
+        nested = []
+        for _ in range(20):
+            nested = [nested]
+        assert estimate_size(nested) > 0
@@ -0,0 +1,378 @@
+import asyncio
+import os
+import time
+
+from tempfile import TemporaryDirectory
+
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ..in_memory import InMemoryCache
+from ..shared import (
+    FileCacheBackend,
+    RedisCacheBackend,
+    SharedCacheError,
+    decode_value,
+    encode_value,
+    shared_backend_from_url,
+)
+from ..tiered import LOCK_UNAVAILABLE, TieredCache
+
+
+class StubRedisServer:
+    """Minimal Redis-compatible server supporting the commands used by the cache."""
+
+    def __init__(self):
+        self.data = {}
+        self.expires = {}
+        self.commands = []
+        self.server = None
+        self.writers = set()
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        for writer in self.writers:
+            writer.close()
+        await self.server.wait_closed()
+        await asyncio.sleep(0)
+
+    @staticmethod
+    def encode(value) -> bytes:
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, Exception):
+            return f"-ERR {value}\r\n".encode()
+        if isinstance(value, int):
+            return b":%d\r\n" % value
+        if isinstance(value, list):
+            return b"*%d\r\n" % len(value) + b"".join(
+                StubRedisServer.encode(item) for item in value
+            )
+        if isinstance(value, str):
+            return f"+{value}\r\n".encode()
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def handle(self, reader, writer):
+        self.writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                args = []
+                for _ in range(int(line[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    args.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self.encode(self.command(*args)))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.writers.discard(writer)
+            writer.close()
+
+    def command(self, name: bytes, *args):
+        name = name.decode().upper()
+        self.commands.append(name)
+        now = time.time()
+        for key, expires in list(self.expires.items()):
+            if expires <= now:
+                self.data.pop(key, None)
+                del self.expires[key]
+        if name == "GET":
+            return self.data.get(args[0])
+        if name == "SET":
+            key, value, opts = args[0], args[1], [a.decode().upper() for a in args[2:]]
+            if "NX" in opts and key in self.data:
+                return None
+            self.data[key] = value
+            self.expires.pop(key, None)
+            if "PX" in opts:
+                self.expires[key] = now + int(opts[opts.index("PX") + 1]) / 1000
+            return "OK"
+        if name == "DEL":
+            return sum(1 for key in args if self.data.pop(key, None) is not None)
+        if name == "EVAL":
+            # only the compare-and-delete script used to release locks
+            key, token = args[2], args[3]
+            if self.data.get(key) != token:
+                return 0
+            del self.data[key]
+            return 1
+        if name == "SCAN":
+            prefix = args[2].rstrip(b"*")
+            return [b"0", [key for key in self.data if key.startswith(prefix)]]
+        if name in ("AUTH", "SELECT"):
+            return "OK"
+        return ValueError(f"unknown command '{name}'")
+
+
+class TestEncoding(AsyncTestCase):
+    def test_round_trip(self):
+        assert decode_value(encode_value({"a": [1, "b"]})) == ({"a": [1, "b"]}, None)
+        large = {"data": "x" * 5000}
+        encoded = encode_value(large, 60)
+        assert len(encoded) < 500  # compressed
+        value, ttl = decode_value(encoded)
+        assert value == large
+        assert 59 < ttl <= 60
+
+    def test_expired_and_invalid(self):
+        with async_mock.patch("time.time", async_mock.MagicMock(return_value=1000)):
+            encoded = encode_value("value", 10)
+        assert decode_value(encoded) == (None, 0)
+        assert encode_value(object()) is None
+        with self.assertRaises(SharedCacheError):
+            decode_value(b"x")
+        with self.assertRaises(SharedCacheError):
+            decode_value(b"q" + encoded[1:])
+
+    def test_backend_from_url(self):
+        backend = shared_backend_from_url("redis://:secret@cache:6380/2")
+        assert isinstance(backend, RedisCacheBackend)
+        assert (backend.host, backend.port, backend.db, backend.password) == (
+            "cache",
+            6380,
+            2,
+            "secret",
+        )
+        with TemporaryDirectory() as temp_dir:
+            backend = shared_backend_from_url(f"file://{temp_dir}")
+            assert isinstance(backend, FileCacheBackend)
+            assert backend.path == temp_dir
+        with self.assertRaises(SharedCacheError):
+            shared_backend_from_url("memcache://host")
+
+
+class TestTieredCacheRedis(AsyncTestCase):
+    async def setUp(self):
+        self.server = StubRedisServer()
+        port = await self.server.start()
+        self.backend = RedisCacheBackend("127.0.0.1", port, db=1, password="pw")
+        self.cache = TieredCache(self.backend, local_ttl=30, lock_poll=0.01)
+
+    async def tearDown(self):
+        await self.cache.close()
+        await self.server.stop()
+
+    async def test_get_set_tiers(self):
+        await self.cache.set(["k1", "k2"], {"value": 1}, 120)
+        assert self.server.data[b"acapy:k1"]
+        assert self.server.expires[b"acapy:k1"] > time.time() + 100
+        assert await self.cache.get("k1") == {"value": 1}
+        assert self.cache.stats["local"]["hits"] == 1
+
+        # another instance only finds the value in the shared tier
+        other = TieredCache(self.backend)
+        assert await other.get("k2") == {"value": 1}
+        assert await other.get("k2") == {"value": 1}
+        assert await other.get("missing") is None
+        stats = other.stats
+        assert stats["shared"]["hits"] == 1
+        assert stats["shared"]["misses"] == 1
+        assert stats["shared"]["hit_ratio"] == 0.5
+        assert stats["local"]["hits"] == 1
+        assert other.local._cache["k2"]["expires"] is not None
+
+        await self.cache.clear("k2")
+        assert b"acapy:k2" not in self.server.data
+        await self.cache.flush()
+        assert not self.server.data
+        assert "AUTH" in self.server.commands and "SELECT" in self.server.commands
+
+    async def test_local_only_values(self):
+        value = object()
+        await self.cache.set("obj", value)
+        assert await self.cache.get("obj") is value
+        assert not self.server.data
+
+    async def test_shared_errors(self):
+        await self.server.stop()
+        await self.backend.close()
+        await self.cache.set("key", "value")
+        assert await self.cache.get("key") == "value"  # local tier still works
+        await self.cache.local.flush()
+        assert await self.cache.get("key") is None
+        await self.cache.clear("key")
+        await self.cache.flush()
+        assert await self.cache.lock_shared("key") is LOCK_UNAVAILABLE
+        await self.cache.unlock_shared("key", "token")
+        assert self.cache.stats["shared"]["errors"] == 6
+        self.server = StubRedisServer()
+        await self.server.start()
+
+    async def test_acquire_shared_unavailable(self):
+        await self.server.stop()
+        await self.backend.close()
+        cache = TieredCache(self.backend, lock_ttl=10)
+        start = time.perf_counter()
+        async with cache.acquire("key") as entry:
+            assert not entry.done
+            assert entry._shared_token is None
+            await entry.set_result("value")
+        assert time.perf_counter() - start < 1
+        assert cache.stats["shared"]["errors"] == 3  # read, lock and write
+        self.server = StubRedisServer()
+        await self.server.start()
+
+    async def test_local_only_keys(self):
+        await self.cache.set(["local::secret", "k1"], {"value": 1}, 120)
+        assert list(self.server.data) == [b"acapy:k1"]
+        local = self.cache.local._cache
+        assert local["local::secret"]["expires"] > local["k1"]["expires"] + 60
+        assert await self.cache.get("local::secret") == {"value": 1}
+        assert await TieredCache(self.backend).get("local::secret") is None
+        await self.cache.clear("local::secret")
+        assert await self.cache.get("local::secret") is None
+
+        async with self.cache.acquire("local::other") as entry:
+            assert not self.server.data.get(b"acapy:lock:local::other")
+            await entry.set_result("value")
+        assert list(self.server.data) == [b"acapy:k1"]
+
+    async def test_server_error(self):
+        with self.assertRaises(SharedCacheError):
+            await self.backend.execute("UNKNOWN")
+
+    async def test_cancelled_command(self):
+        await self.backend.set("key", b"value")
+        reply = asyncio.Event()
+
+        async def stalled_reply():
+            reply.set()
+            await asyncio.sleep(10)
+
+        with async_mock.patch.object(self.backend, "_read_reply", stalled_reply):
+            task = asyncio.ensure_future(self.backend.get("other"))
+            await reply.wait()
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+        assert self.backend._writer is None
+        assert await self.backend.get("key") == b"value"
+
+    async def test_acquire_across_instances(self):
+        other = TieredCache(self.backend, lock_poll=0.01)
+        lock = self.cache.acquire("shared")
+        await lock.__aenter__()
+        assert not lock.done
+        assert b"acapy:lock:shared" in self.server.data
+
+        async def waiter():
+            async with other.acquire("shared") as entry:
+                return entry.result
+
+        task = asyncio.ensure_future(waiter())
+        await asyncio.sleep(0.05)
+        assert not task.done()
+        await lock.set_result({"produced": True}, 60)
+        await lock.__aexit__(None, None, None)
+        assert await asyncio.wait_for(task, 1) == {"produced": True}
+        assert b"acapy:lock:shared" not in self.server.data
+
+    async def test_acquire_takeover(self):
+        other = TieredCache(self.backend, lock_poll=0.01)
+        lock = self.cache.acquire("shared")
+        await lock.__aenter__()
+
+        async def waiter():
+            async with other.acquire("shared") as entry:
+                assert entry._shared_token
+                return entry.result
+
+        task = asyncio.ensure_future(waiter())
+        await asyncio.sleep(0.05)
+        await lock.__aexit__(None, None, None)  # no value produced
+        assert await asyncio.wait_for(task, 1) is None
+        assert b"acapy:lock:shared" not in self.server.data
+
+    async def test_unlock_other_token(self):
+        token = await self.backend.lock("key", 10)
+        await self.backend.unlock("key", "other")
+        assert self.server.data[b"acapy:lock:key"] == token.encode()
+        await self.backend.unlock("key", token)
+        assert b"acapy:lock:key" not in self.server.data
+        assert "EVAL" in self.server.commands
+
+
+class TestTieredCacheFile(AsyncTestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.backend = FileCacheBackend(self.temp_dir.name)
+        self.cache = TieredCache(
+            self.backend, local=InMemoryCache(max_entries=10), lock_ttl=0.2
+        )
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    async def test_get_set_expire(self):
+        await self.cache.set("key", ["value"], 0.05)
+        other = TieredCache(self.backend)
+        assert await other.get("key") == ["value"]
+        await asyncio.sleep(0.06)
+        assert await TieredCache(self.backend).get("key") is None
+        await self.cache.set("key", "value")
+        await self.cache.clear("key")
+        await self.cache.clear("key")
+        assert await TieredCache(self.backend).get("key") is None
+        await self.cache.set("key", "value")
+        await self.cache.flush()
+        assert await TieredCache(self.backend).get("key") is None
+
+    async def test_expired_files_removed(self):
+        await self.backend.set("short", b"value", 0.05)
+        await self.backend.set("long", b"value", 60)
+        await self.backend.set("forever", b"value")
+        assert await self.backend.get("short") == b"value"
+        await asyncio.sleep(0.06)
+        assert await self.backend.get("short") is None
+        assert not os.path.exists(self.backend._file_path("short"))
+        assert await self.backend.get("long") == b"value"
+        assert await self.backend.get("forever") == b"value"
+
+        await self.backend.set("short", b"value", 0.05)
+        abandoned = self.backend._file_path("key") + ".abandoned.tmp"
+        with open(abandoned, "wb"):
+            pass
+        os.utime(abandoned, (time.time() - 120, time.time() - 120))
+        await asyncio.sleep(0.06)
+        self.backend._last_sweep = time.time() - self.backend.sweep_interval
+        await self.backend.set("new", b"value")
+        await self.backend.close()
+        assert not os.path.exists(self.backend._file_path("short"))
+        assert not os.path.exists(abandoned)
+        assert sorted(os.listdir(self.temp_dir.name)) == sorted(
+            os.path.basename(self.backend._file_path(key))
+            for key in ("long", "forever", "new")
+        )
+
+    async def test_lock(self):
+        token = await self.backend.lock("key", 0.05)
+        assert token
+        assert await self.backend.lock("key", 0.05) is None
+        await self.backend.unlock("key", "other")
+        assert await self.backend.lock("key", 0.05) is None
+        await asyncio.sleep(0.06)
+        token2 = await self.backend.lock("key", 1)
+        assert token2
+        await self.backend.unlock("key", token)  # expired token is ignored
+        assert await self.backend.lock("key", 1) is None
+        await self.backend.unlock("key", token2)
+        await self.backend.unlock("key", token2)
+        assert await self.backend.lock("key", 1)
+
+    async def test_file_errors(self):
+        self.temp_dir.cleanup()
+        with self.assertRaises(SharedCacheError):
+            await self.backend.set("key", b"value")
+        await self.cache.set("key", "value")
+        assert self.cache.stats["shared"]["errors"] == 1
+
+    async def test_wait_lock_expiry(self):
+        token = await self.backend.lock("key", 10)
+        with async_mock.patch.object(self.cache, "lock_shared", return_value=None):
+            assert await self.cache.wait_shared("key") == (None, None)
+        await self.backend.unlock("key", token)
@@ -0,0 +1,276 @@
+"""Two-tier cache with a local in-memory tier over a shared backend."""
+
+import asyncio
+import logging
+
+from typing import Any, Optional, Sequence, Text, Tuple, Union
+
+from .base import LOCAL_ONLY_PREFIX, BaseCache, CacheKeyLock
+from .in_memory import InMemoryCache
+from .shared import SharedCacheBackend, SharedCacheError, decode_value, encode_value
+
+LOGGER = logging.getLogger(__name__)
+
+# returned by `TieredCache.lock_shared` when the shared backend cannot be reached
+LOCK_UNAVAILABLE = object()
+
+
+def hit_ratio(hits: int, misses: int) -> float:
+    """Get the proportion of lookups which were hits."""
+    return hits / (hits + misses) if hits + misses else 0.0
+
+
+def is_local_only(key: Text) -> bool:
+    """Check whether a key must not be written to the shared backend."""
+    return key.startswith(LOCAL_ONLY_PREFIX)
+
+
+class SharedCacheKeyLock(CacheKeyLock):
+    """
+    A lock on a cache key which also coordinates with other processes.
+
+    When the value is not found in either tier, a lock is taken in the shared
+    backend. Other processes wait for the lock holder to publish a value before
+    producing it themselves. If the shared backend cannot be reached, only the
+    local lock is held.
+    """
+
+    def __init__(self, cache: "TieredCache", key: Text):
+        """Initialize the key lock."""
+        super().__init__(cache, key)
+        self._shared_token: str = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await super().__aenter__()
+        if not self.done and not self.parent and not is_local_only(self.key):
+            cache: TieredCache = self.cache
+            token = await cache.lock_shared(self.key)
+            if token is LOCK_UNAVAILABLE:
+                return self
+            self._shared_token = token
+            if not token:
+                found, self._shared_token = await cache.wait_shared(self.key)
+                if found is not None and not self.done:
+                    self._future.set_result(found)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit, releasing the shared lock."""
+        await super().__aexit__(exc_type, exc_val, exc_tb)
+        if self._shared_token:
+            token = self._shared_token
+            self._shared_token = None
+            await self.cache.unlock_shared(self.key, token)
+
+
+class TieredCache(BaseCache):
+    """
+    Cache combining a small in-process LRU with a shared backend.
+
+    Reads are served from the local tier when possible, then from the shared
+    backend. Writes go to both tiers. Entries are only kept locally for up to
+    `local_ttl` seconds, which bounds how long a value cleared by another process
+    may still be returned. Values which cannot be serialized as JSON, and values
+    with keys starting with `LOCAL_ONLY_PREFIX`, are kept in the local tier only.
+    Errors from the shared backend are logged and treated as cache misses.
+    """
+
+    def __init__(
+        self,
+        backend: SharedCacheBackend,
+        *,
+        local: InMemoryCache = None,
+        local_ttl: float = 60,
+        lock_ttl: float = 10,
+        lock_poll: float = 0.05,
+    ):
+        """
+        Initialize a `TieredCache` instance.
+
+        Args:
+            backend: The shared cache backend
+            local: The local cache tier
+            local_ttl: The maximum time in seconds to keep a value locally
+            lock_ttl: The time in seconds after which a shared lock expires
+            lock_poll: The interval in seconds between checks for a locked value
+        """
+        super().__init__()
+        self.backend = backend
+        self.local = local or InMemoryCache(max_entries=10000)
+        self.local_ttl = local_ttl
+        self.lock_ttl = lock_ttl
+        self.lock_poll = lock_poll
+        self.shared_hits = 0
+        self.shared_misses = 0
+        self.shared_errors = 0
+
+    @property
+    def stats(self) -> dict:
+        """Accessor for the counters of each cache tier."""
+        local = dict(self.local.stats)
+        local["hit_ratio"] = hit_ratio(local["hits"], local["misses"])
+        return {
+            "local": local,
+            "shared": {
+                "hits": self.shared_hits,
+                "misses": self.shared_misses,
+                "errors": self.shared_errors,
+                "hit_ratio": hit_ratio(self.shared_hits, self.shared_misses),
+            },
+        }
+
+    def _local_ttl(self, ttl: float = None) -> float:
+        """Get the time to live for a value held in the local tier."""
+        if ttl and ttl > 0:
+            return min(ttl, self.local_ttl) if self.local_ttl else ttl
+        return self.local_ttl
+
+    def _shared_error(self, err: Exception, action: str):
+        """Record an error from the shared backend."""
+        self.shared_errors += 1
+        LOGGER.warning("Error %s shared cache: %s", action, err)
+
+    async def get(self, key: Text):
+        """
+        Get an item from the cache.
+
+        Args:
+            key: the key to retrieve an item for
+
+        Returns:
+            The record found or `None`
+
+        """
+        value = await self.local.get(key)
+        if value is not None or is_local_only(key):
+            return value
+        try:
+            data = await self.backend.get(key)
+            if data is not None:
+                value, ttl = decode_value(data)
+        except SharedCacheError as err:
+            self._shared_error(err, "reading from")
+            return None
+        if data is None or ttl == 0:
+            self.shared_misses += 1
+            return None
+        self.shared_hits += 1
+        await self.local.set(key, value, self._local_ttl(ttl))
+        return value
+
+    async def set(self, keys: Union[Text, Sequence[Text]], value: Any, ttl: int = None):
+        """
+        Add an item to the cache with an optional ttl.
+
+        Overwrites existing cache entries.
+
+        Args:
+            keys: the key or keys for which to set an item
+            value: the value to store in the cache
+            ttl: number of seconds that the record should persist
+
+        """
+        keys = [keys] if isinstance(keys, Text) else keys
+        local_keys = [key for key in keys if is_local_only(key)]
+        if local_keys:
+            await self.local.set(local_keys, value, ttl)
+        shared_keys = [key for key in keys if not is_local_only(key)]
+        if not shared_keys:
+            return
+        await self.local.set(shared_keys, value, self._local_ttl(ttl))
+        data = encode_value(value, ttl)
+        if data is None:
+            return
+        try:
+            for key in shared_keys:
+                await self.backend.set(key, data, ttl)
+        except SharedCacheError as err:
+            self._shared_error(err, "writing to")
+
+    async def clear(self, key: Text):
+        """
+        Remove an item from the cache, if present.
+
+        Args:
+            key: the key to remove
+
+        """
+        await self.local.clear(key)
+        if is_local_only(key):
+            return
+        try:
+            await self.backend.delete(key)
+        except SharedCacheError as err:
+            self._shared_error(err, "clearing")
+
+    async def flush(self):
+        """Remove all items from the cache."""
+        await self.local.flush()
+        try:
+            await self.backend.flush()
+        except SharedCacheError as err:
+            self._shared_error(err, "flushing")
+
+    def acquire(self, key: Text):
+        """Acquire a lock on a given cache key."""
+        result = SharedCacheKeyLock(self, key)
+        first = self._key_locks.setdefault(key, result)
+        if first is not result:
+            result.parent = first
+        return result
+
+    async def lock_shared(self, key: Text) -> Union[str, object, None]:
+        """
+        Try to take the shared lock on a key.
+
+        Returns: the token of the lock, `None` if it is held by another process,
+        or `LOCK_UNAVAILABLE` if the shared backend could not be reached
+
+        """
+        try:
+            return await self.backend.lock(key, self.lock_ttl)
+        except SharedCacheError as err:
+            self._shared_error(err, "locking")
+            return LOCK_UNAVAILABLE
+
+    async def unlock_shared(self, key: Text, token: str):
+        """Release the shared lock on a key."""
+        try:
+            await self.backend.unlock(key, token)
+        except SharedCacheError as err:
+            self._shared_error(err, "unlocking")
+
+    async def wait_shared(self, key: Text) -> Tuple[Any, Optional[str]]:
+        """
+        Wait for another process to produce the value for a locked key.
+
+        Returns: a tuple of the value, if one was produced, and the token of the
+        shared lock if it was taken over after the other process released it.
+        Waiting stops early if the shared backend cannot be reached.
+
+        """
+        loop = asyncio.get_event_loop()
+        deadline = loop.time() + self.lock_ttl
+        while loop.time() < deadline:
+            await asyncio.sleep(self.lock_poll)
+            value = await self.get(key)
+            if value is not None:
+                return value, None
+            token = await self.lock_shared(key)
+            if token is LOCK_UNAVAILABLE:
+                return None, None
+            if token:
+                # the holder finished without a value: produce it ourselves
+                return None, token
+        return None, None
+
+    async def close(self):
+        """Close the shared backend."""
+        await self.backend.close()
+
+    def __repr__(self) -> str:
+        """Human readable representation of this instance."""
+        return "<{}(backend={})>".format(
+            self.__class__.__name__, self.backend.__class__.__name__
+        )
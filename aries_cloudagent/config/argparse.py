@@ -183,6 +183,29 @@ class AdminGroup(ArgumentGroup):
             env_var="ACAPY_ADMIN_CLIENT_MAX_REQUEST_SIZE",
             help="Maximum client request size to admin server, in megabytes: default 1",
         )
+        parser.add_argument(
+            "--webhook-event-queue-size",
+            type=BoundedInt(min=0),
+            metavar="<count>",
+            env_var="ACAPY_WEBHOOK_EVENT_QUEUE_SIZE",
+            help=(
+                "Queue up to <count> events for webhooks and admin websockets, so "
+                "that emitting an event does not wait for them to be delivered. "
+                "Set to 0 to deliver them before the event is emitted. "
+                "Default: 1000."
+            ),
+        )
+        parser.add_argument(
+            "--webhook-event-overflow",
+            type=str,
+            choices=("block", "drop_oldest", "drop_newest"),
+            env_var="ACAPY_WEBHOOK_EVENT_OVERFLOW",
+            help=(
+                "Specifies how events are handled when the webhook event queue is "
+                "full: wait for room in the queue, or drop the oldest or the newest "
+                "event. Default: block."
+            ),
+        )
 
     def get_settings(self, args: Namespace):
         """Extract admin settings."""
@@ -218,6 +241,12 @@ class AdminGroup(ArgumentGroup):
             settings["admin.admin_client_max_request_size"] = (
                 args.admin_client_max_request_size or 1
             )
+            if args.webhook_event_queue_size is not None:
+                settings[
+                    "admin.webhook_event_queue_size"
+                ] = args.webhook_event_queue_size
+            if args.webhook_event_overflow:
+                settings["admin.webhook_event_overflow"] = args.webhook_event_overflow
         return settings
 
 
@@ -629,6 +658,60 @@ class GeneralGroup(ArgumentGroup):
             env_var="ACAPY_READ_ONLY_LEDGER",
             help="Sets ledger to read-only to prevent updates. Default: false.",
         )
+        parser.add_argument(
+            "--cache-max-entries",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_CACHE_MAX_ENTRIES",
+            help=(
+                "Set the maximum number of entries held in the shared in-memory "
+                "cache. The least recently used entries are evicted first. "
+                "Default value is 100000."
+            ),
+        )
+        parser.add_argument(
+            "--cache-max-size",
+            type=ByteSize(min=1048576),
+            metavar="<size>",
+            env_var="ACAPY_CACHE_MAX_SIZE",
+            help=(
+                "Set the approximate maximum size in bytes of the values held in "
+                "the shared in-memory cache. The least recently used entries are "
+                "evicted first. Default value is 256M."
+            ),
+        )
+        parser.add_argument(
+            "--cache-shared-url",
+            type=str,
+            metavar="<url>",
+            env_var="ACAPY_CACHE_SHARED_URL",
+            help=(
+                "Share cached values with other agent instances through the cache "
+                "at <url>, which may be a Redis-compatible server "
+                "(redis://[:password@]host[:port][/db]) or a directory on the local "
+                "host (file:///path). The in-memory cache is kept as a local tier "
+                "in front of the shared cache."
+            ),
+        )
+        parser.add_argument(
+            "--cache-local-ttl",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_CACHE_LOCAL_TTL",
+            help=(
+                "Set the maximum number of seconds a value read from the shared "
+                "cache is kept in the local tier. Default value is 60."
+            ),
+        )
+        parser.add_argument(
+            "--concurrent-event-subscribers",
+            action="store_true",
+            env_var="ACAPY_CONCURRENT_EVENT_SUBSCRIBERS",
+            help=(
+                "Run the subscribers to an event concurrently rather than one "
+                "after another. Default: false."
+            ),
+        )
         parser.add_argument(
             "--universal-resolver",
             type=str,
@@ -659,10 +742,117 @@ class GeneralGroup(ArgumentGroup):
             env_var="ACAPY_UNIVERSAL_RESOLVER_BEARER_TOKEN",
             help="Bearer token if universal resolver instance requires authentication.",
         ),
+        parser.add_argument(
+            "--resolver-cache-ttl",
+            type=int,
+            metavar="<seconds>",
+            env_var="ACAPY_RESOLVER_CACHE_TTL",
+            help=(
+                "Set the number of seconds a resolved DID document is cached. "
+                "0 disables caching of resolved documents. Default: 300."
+            ),
+        )
+        parser.add_argument(
+            "--resolver-cache-method-ttl",
+            type=str,
+            nargs="+",
+            metavar="<method>=<seconds>",
+            env_var="ACAPY_RESOLVER_CACHE_METHOD_TTL",
+            help=(
+                "Set the number of seconds resolved DID documents are cached for "
+                "a DID method, overriding --resolver-cache-ttl. "
+                "Multiple can be specified, for example web=60 key=86400."
+            ),
+        )
+        parser.add_argument(
+            "--resolver-not-found-ttl",
+            type=int,
+            metavar="<seconds>",
+            env_var="ACAPY_RESOLVER_NOT_FOUND_TTL",
+            help=(
+                "Set the number of seconds a DID that could not be resolved is "
+                "remembered as not found. 0 disables caching of failed "
+                "resolutions. Default: 30."
+            ),
+        )
+        parser.add_argument(
+            "--resolver-http-limit",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_RESOLVER_HTTP_LIMIT",
+            help=(
+                "Set the maximum number of simultaneous connections opened by the "
+                "DID resolvers fetching documents over HTTP. Default value is 100."
+            ),
+        )
+        parser.add_argument(
+            "--resolver-http-limit-per-host",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_RESOLVER_HTTP_LIMIT_PER_HOST",
+            help=(
+                "Set the maximum number of simultaneous connections opened by the "
+                "DID resolvers to a single host. Default value is 10."
+            ),
+        )
+        parser.add_argument(
+            "--resolver-http-keepalive",
+            type=BoundedInt(min=0),
+            metavar="<seconds>",
+            env_var="ACAPY_RESOLVER_HTTP_KEEPALIVE",
+            help=(
+                "Set the number of seconds an idle DID resolver connection is kept "
+                "open for reuse. Default value is 30."
+            ),
+        )
+        parser.add_argument(
+            "--resolver-http-dns-cache-ttl",
+            type=BoundedInt(min=0),
+            metavar="<seconds>",
+            env_var="ACAPY_RESOLVER_HTTP_DNS_CACHE_TTL",
+            help=(
+                "Set the number of seconds a host name resolved by the DID resolvers "
+                "is cached. Default value is 300."
+            ),
+        )
+        parser.add_argument(
+            "--resolver-http-timeout",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_RESOLVER_HTTP_TIMEOUT",
+            help=(
+                "Set the number of seconds allowed for a DID resolver HTTP request "
+                "to complete. Default value is 30."
+            ),
+        )
+        parser.add_argument(
+            "--resolver-max-concurrency",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_RESOLVER_MAX_CONCURRENCY",
+            help=(
+                "Set the maximum number of DIDs resolved at once when resolving "
+                "several DIDs together. Default value is 10."
+            ),
+        )
+        parser.add_argument(
+            "--jsonld-context-cache-dir",
+            type=str,
+            metavar="<directory>",
+            env_var="ACAPY_JSONLD_CONTEXT_CACHE_DIR",
+            help=(
+                "Keep the JSON-LD contexts fetched from the network in this "
+                "directory, reusing them across restarts. Contexts shipped with "
+                "the agent are never fetched. Default: no directory."
+            ),
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Extract general settings."""
         settings = {}
+        if args.concurrent_event_subscribers:
+            settings["event_bus.concurrent"] = True
+
         if args.external_plugins:
             settings["external_plugins"] = args.external_plugins
 
@@ -699,6 +889,16 @@ class GeneralGroup(ArgumentGroup):
         if args.read_only_ledger:
             settings["read_only_ledger"] = True
 
+        if args.cache_max_entries:
+            settings["cache.max_entries"] = args.cache_max_entries
+        if args.cache_max_size:
+            settings["cache.max_bytes"] = args.cache_max_size
+
+        if args.cache_shared_url:
+            settings["cache.shared_url"] = args.cache_shared_url
+        if args.cache_local_ttl:
+            settings["cache.local_ttl"] = args.cache_local_ttl
+
         if args.universal_resolver_regex and not args.universal_resolver:
             raise ArgsParseError(
                 "--universal-resolver-regex cannot be used without --universal-resolver"
@@ -719,6 +919,35 @@ class GeneralGroup(ArgumentGroup):
         if args.universal_resolver_bearer_token:
             settings["resolver.universal.token"] = args.universal_resolver_bearer_token
 
+        if args.resolver_cache_ttl is not None:
+            settings["resolver.cache.ttl"] = args.resolver_cache_ttl
+        if args.resolver_cache_method_ttl:
+            method_ttl = {}
+            for value_str in args.resolver_cache_method_ttl:
+                method, _, ttl = value_str.partition("=")
+                if not method or not ttl.isdigit():
+                    raise ArgsParseError(
+                        "--resolver-cache-method-ttl values must be <method>=<seconds>"
+                    )
+                method_ttl[method] = int(ttl)
+            settings["resolver.cache.method_ttl"] = method_ttl
+        if args.resolver_not_found_ttl is not None:
+            settings["resolver.cache.not_found_ttl"] = args.resolver_not_found_ttl
+        if args.resolver_http_limit:
+            settings["resolver.http.limit"] = args.resolver_http_limit
+        if args.resolver_http_limit_per_host:
+            settings["resolver.http.limit_per_host"] = args.resolver_http_limit_per_host
+        if args.resolver_http_keepalive is not None:
+            settings["resolver.http.keepalive_timeout"] = args.resolver_http_keepalive
+        if args.resolver_http_dns_cache_ttl is not None:
+            settings["resolver.http.dns_cache_ttl"] = args.resolver_http_dns_cache_ttl
+        if args.resolver_http_timeout:
+            settings["resolver.http.timeout"] = args.resolver_http_timeout
+        if args.resolver_max_concurrency:
+            settings["resolver.max_concurrency"] = args.resolver_max_concurrency
+        if args.jsonld_context_cache_dir:
+            settings["jsonld.cache_dir"] = args.jsonld_context_cache_dir
+
         return settings
 
 
@@ -765,6 +994,16 @@ class RevocationGroup(ArgumentGroup):
                 "revocation received."
             ),
         )
+        parser.add_argument(
+            "--publish-revocations-concurrency",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_PUBLISH_REVOCATIONS_CONCURRENCY",
+            help=(
+                "Sets the maximum number of revocation registries for which "
+                "pending revocations are published at once. Default: 8."
+            ),
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Extract revocation settings."""
@@ -780,6 +1019,10 @@ class RevocationGroup(ArgumentGroup):
             settings[
                 "revocation.monitor_notification"
             ] = args.monitor_revocation_notification
+        if args.publish_revocations_concurrency:
+            settings[
+                "revocation.publish_concurrency"
+            ] = args.publish_revocations_concurrency
         return settings
 
 
@@ -1153,6 +1396,41 @@ class ProtocolGroup(ArgumentGroup):
                 "using unencrypted rather than encrypted tags"
             ),
         )
+        parser.add_argument(
+            "--issuer-signing-workers",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_ISSUER_SIGNING_WORKERS",
+            help=(
+                "Sets the number of threads used to sign issued credentials. "
+                "Default: the number of CPUs."
+            ),
+        )
+        parser.add_argument(
+            "--issuer-cred-def-cache-size",
+            type=int,
+            metavar="<count>",
+            env_var="ACAPY_ISSUER_CRED_DEF_CACHE_SIZE",
+            help=(
+                "Sets the number of credential definitions kept loaded for "
+                "issuing credentials. Default: 32."
+            ),
+        )
+        parser.add_argument(
+            "--vc-holder-indexed-path",
+            type=str,
+            action="append",
+            metavar="<json-path>",
+            env_var="ACAPY_VC_HOLDER_INDEXED_PATH",
+            help=(
+                "Store the string values found at <json-path> in W3C credentials "
+                "as tags, so that presentation requests with const or enum filters "
+                "on the path only load matching credentials. Applies to the askar "
+                "wallet. Credentials stored before the path is added are still "
+                "loaded and filtered after the search. Multiple paths can be "
+                "specified."
+            ),
+        )
 
     def get_settings(self, args: Namespace) -> dict:
         """Get protocol settings."""
@@ -1219,6 +1497,12 @@ class ProtocolGroup(ArgumentGroup):
         if args.exch_use_unencrypted_tags:
             settings["exch_use_unencrypted_tags"] = True
             environ["EXCH_UNENCRYPTED_TAGS"] = "True"
+        if args.issuer_signing_workers:
+            settings["issuer.signing_workers"] = args.issuer_signing_workers
+        if args.issuer_cred_def_cache_size is not None:
+            settings["issuer.cred_def_cache_size"] = args.issuer_cred_def_cache_size
+        if args.vc_holder_indexed_path:
+            settings["vc_holder.indexed_paths"] = args.vc_holder_indexed_path
         return settings
 
 
@@ -1327,6 +1611,72 @@ class TransportGroup(ArgumentGroup):
                 "option will require additional memory to store messages in the queue."
             ),
         )
+        parser.add_argument(
+            "--undelivered-queue-path",
+            type=str,
+            metavar="<path>",
+            env_var="ACAPY_UNDELIVERED_QUEUE_PATH",
+            help=(
+                "Store the undelivered queue in a database file at <path>, so that "
+                "messages held for pickup are kept when the agent restarts. "
+                "Messages are packed before they are stored. By default the queue "
+                "is held in memory."
+            ),
+        )
+        parser.add_argument(
+            "--undelivered-queue-ttl",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_UNDELIVERED_QUEUE_TTL",
+            help=(
+                "Set the number of seconds a message is held in the undelivered "
+                "queue before it is discarded. Default value is 604800 (one week)."
+            ),
+        )
+        parser.add_argument(
+            "--undelivered-queue-key-limit",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_UNDELIVERED_QUEUE_KEY_LIMIT",
+            help=(
+                "Set the maximum number of messages held in the undelivered queue "
+                "for a single recipient key. The oldest messages are discarded "
+                "first. By default there is no limit."
+            ),
+        )
+        parser.add_argument(
+            "--undelivered-queue-key-size",
+            type=ByteSize(min=1024),
+            metavar="<size>",
+            env_var="ACAPY_UNDELIVERED_QUEUE_KEY_SIZE",
+            help=(
+                "Set the maximum total size in bytes of the messages held in the "
+                "undelivered queue for a single recipient key. The oldest messages "
+                "are discarded first. By default there is no limit."
+            ),
+        )
+        parser.add_argument(
+            "--undelivered-queue-limit",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_UNDELIVERED_QUEUE_LIMIT",
+            help=(
+                "Set the maximum number of messages held in the undelivered queue. "
+                "The oldest messages are discarded first. By default there is "
+                "no limit."
+            ),
+        )
+        parser.add_argument(
+            "--undelivered-queue-size",
+            type=ByteSize(min=1024),
+            metavar="<size>",
+            env_var="ACAPY_UNDELIVERED_QUEUE_SIZE",
+            help=(
+                "Set the maximum total size in bytes of the messages held in the "
+                "undelivered queue. The oldest messages are discarded first. By "
+                "default there is no limit."
+            ),
+        )
         parser.add_argument(
             "--max-outbound-retry",
             default=4,
@@ -1338,6 +1688,166 @@ class TransportGroup(ArgumentGroup):
                 "accumulated messages in message queue. Default value is 4."
             ),
         )
+        parser.add_argument(
+            "--outbound-queue-path",
+            type=str,
+            metavar="<path>",
+            env_var="ACAPY_OUTBOUND_QUEUE_PATH",
+            help=(
+                "Persist encoded outbound messages and webhooks awaiting delivery "
+                "to a journal file at <path>. Undelivered messages are restored "
+                "from the journal when the agent restarts. By default the outbound "
+                "queue is held in memory only."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-retry-delay",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_RETRY_DELAY",
+            help=(
+                "Set the delay in seconds before the first retry of an undelivered "
+                "outbound message. The delay doubles with each further attempt, "
+                "up to the maximum retry delay. Default value is 10."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-retry-max-delay",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_RETRY_MAX_DELAY",
+            help=(
+                "Set the maximum delay in seconds between retries of an undelivered "
+                "outbound message. Default value is 300."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-retry-jitter",
+            type=BoundedInt(min=0, max=100),
+            metavar="<percent>",
+            env_var="ACAPY_OUTBOUND_RETRY_JITTER",
+            help=(
+                "Set the percentage of each retry delay which is randomized, so that "
+                "messages which failed together are not all retried together. "
+                "Default value is 25."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-breaker-threshold",
+            type=BoundedInt(min=0),
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_BREAKER_THRESHOLD",
+            help=(
+                "Set the number of consecutive delivery failures after which an "
+                "outbound endpoint is considered unavailable. Messages for the "
+                "endpoint are then held until a single probe delivery succeeds. "
+                "Set to 0 to disable. Default value is 5."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-breaker-reset",
+            type=BoundedInt(min=1),
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_BREAKER_RESET",
+            help=(
+                "Set the delay in seconds before an unavailable outbound endpoint "
+                "is probed again. Default value is 30."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-http-limit",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_HTTP_LIMIT",
+            help=(
+                "Set the maximum number of simultaneous connections opened by the "
+                "HTTP outbound transport. Default value is 200."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-http-limit-per-host",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_HTTP_LIMIT_PER_HOST",
+            help=(
+                "Set the maximum number of simultaneous connections opened by the "
+                "HTTP outbound transport to a single host. Default value is 50."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-http-keepalive",
+            type=BoundedInt(min=0),
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_HTTP_KEEPALIVE",
+            help=(
+                "Set the number of seconds an idle HTTP outbound connection is kept "
+                "open for reuse. Default value is 15."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-http-dns-cache-ttl",
+            type=BoundedInt(min=0),
+            metavar="<seconds>",
+            env_var="ACAPY_OUTBOUND_HTTP_DNS_CACHE_TTL",
+            help=(
+                "Set the number of seconds a resolved host name is cached by the "
+                "HTTP outbound transport. Default value is 10."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-http-batch",
+            type=BoundedInt(min=0),
+            metavar="<count>",
+            env_var="ACAPY_OUTBOUND_HTTP_BATCH",
+            help=(
+                "Queue HTTP outbound messages per endpoint and post them back to "
+                "back over kept-alive connections, with each connection carrying up "
+                "to <count> queued messages before another is opened. Set to 0 to "
+                "post each message independently. Default value is 0."
+            ),
+        )
+        parser.add_argument(
+            "--outbound-http-stats-per-host",
+            action="store_true",
+            env_var="ACAPY_OUTBOUND_HTTP_STATS_PER_HOST",
+            help=(
+                "When timing is collected, also report the HTTP outbound transport "
+                "timings for each target host. Each host adds its own set of stats, "
+                "so this is best kept for agents with a bounded number of peers."
+            ),
+        )
+        parser.add_argument(
+            "--pack-workers",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_PACK_WORKERS",
+            help=(
+                "Set the number of workers packing and unpacking messages. "
+                "Default: the number of CPUs."
+            ),
+        )
+        parser.add_argument(
+            "--pack-worker-type",
+            type=str,
+            choices=("thread", "process"),
+            env_var="ACAPY_PACK_WORKER_TYPE",
+            help=(
+                "Pack and unpack messages in a pool of threads or of processes. "
+                "Processes are only used by the in-memory wallet, other wallets "
+                "fall back to threads. Default: thread."
+            ),
+        )
+        parser.add_argument(
+            "--pack-batch-size",
+            type=BoundedInt(min=1),
+            metavar="<count>",
+            env_var="ACAPY_PACK_BATCH_SIZE",
+            help=(
+                "Send up to <count> messages waiting to be packed or unpacked to a "
+                "worker process at once. Thread workers take messages one at a "
+                "time. Default value is 16."
+            ),
+        )
         parser.add_argument(
             "--ws-heartbeat-interval",
             default=3,
@@ -1380,8 +1890,66 @@ class TransportGroup(ArgumentGroup):
             settings["image_url"] = args.image_url
         if args.max_message_size:
             settings["transport.max_message_size"] = args.max_message_size
+        if args.undelivered_queue_path:
+            settings["transport.undelivered_queue.path"] = args.undelivered_queue_path
+        if args.undelivered_queue_ttl:
+            settings["transport.undelivered_queue.ttl"] = args.undelivered_queue_ttl
+        if args.undelivered_queue_key_limit:
+            settings[
+                "transport.undelivered_queue.max_messages_per_key"
+            ] = args.undelivered_queue_key_limit
+        if args.undelivered_queue_key_size:
+            settings[
+                "transport.undelivered_queue.max_bytes_per_key"
+            ] = args.undelivered_queue_key_size
+        if args.undelivered_queue_limit:
+            settings[
+                "transport.undelivered_queue.max_messages"
+            ] = args.undelivered_queue_limit
+        if args.undelivered_queue_size:
+            settings[
+                "transport.undelivered_queue.max_bytes"
+            ] = args.undelivered_queue_size
         if args.max_outbound_retry:
             settings["transport.max_outbound_retry"] = args.max_outbound_retry
+        if args.outbound_queue_path:
+            settings["transport.outbound_queue_path"] = args.outbound_queue_path
+        if args.outbound_retry_delay:
+            settings["transport.outbound_retry_delay"] = args.outbound_retry_delay
+        if args.outbound_retry_max_delay:
+            settings[
+                "transport.outbound_retry_max_delay"
+            ] = args.outbound_retry_max_delay
+        if args.outbound_retry_jitter is not None:
+            settings["transport.outbound_retry_jitter"] = (
+                args.outbound_retry_jitter / 100
+            )
+        if args.outbound_breaker_threshold is not None:
+            settings[
+                "transport.outbound_breaker_threshold"
+            ] = args.outbound_breaker_threshold
+        if args.outbound_breaker_reset:
+            settings["transport.outbound_breaker_reset"] = args.outbound_breaker_reset
+        if args.outbound_http_limit:
+            settings["transport.http.limit"] = args.outbound_http_limit
+        if args.outbound_http_limit_per_host:
+            settings[
+                "transport.http.limit_per_host"
+            ] = args.outbound_http_limit_per_host
+        if args.outbound_http_keepalive is not None:
+            settings["transport.http.keepalive_timeout"] = args.outbound_http_keepalive
+        if args.outbound_http_dns_cache_ttl is not None:
+            settings["transport.http.dns_cache_ttl"] = args.outbound_http_dns_cache_ttl
+        if args.outbound_http_batch:
+            settings["transport.http.batch_size"] = args.outbound_http_batch
+        if args.outbound_http_stats_per_host:
+            settings["transport.http.stats_per_host"] = True
+        if args.pack_workers:
+            settings["transport.pack.workers"] = args.pack_workers
+        if args.pack_worker_type:
+            settings["transport.pack.worker_type"] = args.pack_worker_type
+        if args.pack_batch_size:
+            settings["transport.pack.batch_size"] = args.pack_batch_size
         if args.ws_heartbeat_interval:
             settings["transport.ws.heartbeat_interval"] = args.ws_heartbeat_interval
         if args.ws_timeout_interval:
@@ -1730,8 +2298,17 @@ class MultitenantGroup(ArgumentGroup):
                 "Specify multitenancy configuration in key=value pairs. "
                 'For example: "wallet_type=askar-profile wallet_name=askar-profile-name" '
                 "Possible values: wallet_name, wallet_key, cache_size, "
-                'key_derivation_method. "wallet_name" is only used when '
-                '"wallet_type" is "askar-profile"'
+                "key_derivation_method, token_cache_size, wallet_cache_size, "
+                "wallet_cache_ttl, route_index_size, route_miss_ttl, route_ttl. "
+                '"wallet_name" is only used when '
+                '"wallet_type" is "askar-profile". '
+                'Setting "wallet_cache_ttl" caches wallet records in each agent '
+                "process for that many seconds. A wallet changed or removed through "
+                "another agent instance, such as a superseded token or a deleted "
+                "wallet, may then still be accepted for up to that long, so only "
+                "enable it for a single agent instance. Defaults to 0 (no caching). "
+                'Sub wallet routes are indexed in each agent process for "route_ttl" '
+                "seconds, defaulting to 60, before they are read again from storage."
             ),
         )
         parser.add_argument(
@@ -2,11 +2,14 @@
 
 from ..cache.base import BaseCache
 from ..cache.in_memory import InMemoryCache
+from ..cache.shared import shared_backend_from_url
+from ..cache.tiered import TieredCache
 from ..core.event_bus import EventBus
 from ..core.goal_code_registry import GoalCodeRegistry
 from ..core.plugin_registry import PluginRegistry
 from ..core.profile import ProfileManager, ProfileManagerProvider
 from ..core.protocol_registry import ProtocolRegistry
+from ..indy.issuer import IndyIssuerSigningPool
 from ..protocols.actionmenu.v1_0.base_service import BaseMenuService
 from ..protocols.actionmenu.v1_0.driver_service import DriverMenuService
 from ..protocols.didcomm_prefix import DIDCommPrefix
@@ -17,6 +20,7 @@ from ..tails.base import BaseTailsServer
 from ..transport.wire_format import BaseWireFormat
 from ..utils.dependencies import is_indy_sdk_module_installed
 from ..utils.stats import Collector
+from ..utils.worker_pool import WORKER_THREAD, WorkerPool
 from ..wallet.did_method import DIDMethods
 from ..wallet.key_type import KeyTypes
 from .base_context import ContextBuilder
@@ -38,7 +42,18 @@ class DefaultContextBuilder(ContextBuilder):
             context.injector.bind_instance(Collector, collector)
 
         # Shared in-memory cache
-        context.injector.bind_instance(BaseCache, InMemoryCache())
+        cache = InMemoryCache(
+            max_entries=context.settings.get("cache.max_entries", 100000),
+            max_bytes=context.settings.get("cache.max_bytes", 256 * 1024 * 1024),
+        )
+        if context.settings.get("cache.shared_url"):
+            # Local tier in front of a cache shared with other agent instances
+            cache = TieredCache(
+                shared_backend_from_url(context.settings["cache.shared_url"]),
+                local=cache,
+                local_ttl=context.settings.get("cache.local_ttl", 60),
+            )
+        context.injector.bind_instance(BaseCache, cache)
 
         # Global protocol registry
         context.injector.bind_instance(ProtocolRegistry, ProtocolRegistry())
@@ -47,7 +62,28 @@ class DefaultContextBuilder(ContextBuilder):
         context.injector.bind_instance(GoalCodeRegistry, GoalCodeRegistry())
 
         # Global event bus
-        context.injector.bind_instance(EventBus, EventBus())
+        context.injector.bind_instance(
+            EventBus,
+            EventBus(concurrent=context.settings.get_bool("event_bus.concurrent")),
+        )
+
+        # Global worker pool for packing and unpacking messages
+        context.injector.bind_instance(
+            WorkerPool,
+            WorkerPool(
+                kind=context.settings.get("transport.pack.worker_type", WORKER_THREAD),
+                max_workers=context.settings.get("transport.pack.workers"),
+                batch_size=context.settings.get("transport.pack.batch_size", 16),
+            ),
+        )
+
+        # Global thread pool for signing issued credentials
+        context.injector.bind_instance(
+            IndyIssuerSigningPool,
+            IndyIssuerSigningPool(
+                max_workers=context.settings.get_int("issuer.signing_workers")
+            ),
+        )
 
         # Global did resolver
         context.injector.bind_instance(DIDResolver, DIDResolver([]))
@@ -41,6 +41,25 @@ class TestArgParse(AsyncTestCase):
                 "http",
                 "--max-outbound-retry",
                 "5",
+                "--outbound-retry-delay",
+                "2",
+                "--outbound-retry-jitter",
+                "50",
+                "--outbound-breaker-threshold",
+                "0",
+                "--outbound-queue-path",
+                "/tmp/outbound.log",
+                "--outbound-http-limit-per-host",
+                "10",
+                "--outbound-http-stats-per-host",
+                "--outbound-http-batch",
+                "8",
+                "--undelivered-queue-key-limit",
+                "100",
+                "--undelivered-queue-size",
+                "64M",
+                "--undelivered-queue-path",
+                "/tmp/undelivered.db",
             ]
         )
 
@@ -52,6 +71,19 @@ class TestArgParse(AsyncTestCase):
         assert settings.get("transport.inbound_configs") == [["http", "0.0.0.0", "80"]]
         assert settings.get("transport.outbound_configs") == ["http"]
         assert result.max_outbound_retry == 5
+        assert settings.get("transport.outbound_retry_delay") == 2
+        assert settings.get("transport.outbound_retry_jitter") == 0.5
+        assert settings.get("transport.outbound_breaker_threshold") == 0
+        assert "transport.outbound_breaker_reset" not in settings
+        assert settings.get("transport.outbound_queue_path") == "/tmp/outbound.log"
+        assert settings.get("transport.http.limit_per_host") == 10
+        assert settings.get("transport.http.batch_size") == 8
+        assert "transport.http.limit" not in settings
+        assert settings.get("transport.http.stats_per_host") is True
+        assert settings.get("transport.undelivered_queue.max_messages_per_key") == 100
+        assert settings.get("transport.undelivered_queue.max_bytes") == 64 * 1024**2
+        assert "transport.undelivered_queue.ttl" not in settings
+        assert settings.get("transport.undelivered_queue.path") == "/tmp/undelivered.db"
 
     async def test_get_genesis_transactions_list_with_ledger_selection(self):
         """Test multiple ledger support related argument parsing."""
@@ -185,6 +217,12 @@ class TestArgParse(AsyncTestCase):
                 "localhost",
                 "--plugin-config",
                 "./aries_cloudagent/config/tests/test_plugins_config.yaml",
+                "--cache-max-entries",
+                "500",
+                "--cache-max-size",
+                "8M",
+                "--cache-shared-url",
+                "redis://cache:6379/1",
             ]
         )
 
@@ -198,6 +236,10 @@ class TestArgParse(AsyncTestCase):
         assert settings.get("plugin_config").get("mock_resolver") == {
             "methods": ["sov", "btcr"]
         }
+        assert settings.get("cache.max_entries") == 500
+        assert settings.get("cache.max_bytes") == 8 * 1024 * 1024
+        assert settings.get("cache.shared_url") == "redis://cache:6379/1"
+        assert "cache.local_ttl" not in settings
 
     async def test_transport_settings_file(self):
         """Test file argument parsing."""
@@ -515,3 +557,75 @@ class TestArgParse(AsyncTestCase):
         )
         with self.assertRaises(argparse.ArgsParseError):
             group.get_settings(result)
+
+    def test_resolver_cache(self):
+        """Test resolver cache flags."""
+        parser = argparse.create_argument_parser()
+        group = argparse.GeneralGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "-e",
+                "test",
+                "--resolver-cache-ttl",
+                "0",
+                "--resolver-cache-method-ttl",
+                "web=60",
+                "key=86400",
+                "--resolver-not-found-ttl",
+                "5",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings["resolver.cache.ttl"] == 0
+        assert settings["resolver.cache.method_ttl"] == {"web": 60, "key": 86400}
+        assert settings["resolver.cache.not_found_ttl"] == 5
+
+        result = parser.parse_args(["-e", "test", "--resolver-cache-method-ttl", "web"])
+        with self.assertRaises(argparse.ArgsParseError):
+            group.get_settings(result)
+
+    def test_resolver_http(self):
+        """Test resolver HTTP client flags."""
+        parser = argparse.create_argument_parser()
+        group = argparse.GeneralGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            [
+                "-e",
+                "test",
+                "--resolver-http-limit",
+                "20",
+                "--resolver-http-limit-per-host",
+                "4",
+                "--resolver-http-keepalive",
+                "0",
+                "--resolver-http-dns-cache-ttl",
+                "60",
+                "--resolver-http-timeout",
+                "5",
+                "--resolver-max-concurrency",
+                "8",
+            ]
+        )
+        settings = group.get_settings(result)
+        assert settings["resolver.http.limit"] == 20
+        assert settings["resolver.http.limit_per_host"] == 4
+        assert settings["resolver.http.keepalive_timeout"] == 0
+        assert settings["resolver.http.dns_cache_ttl"] == 60
+        assert settings["resolver.http.timeout"] == 5
+        assert settings["resolver.max_concurrency"] == 8
+
+    def test_jsonld_context_cache_dir(self):
+        """Test JSON-LD context cache directory flag."""
+        parser = argparse.create_argument_parser()
+        group = argparse.GeneralGroup()
+        group.add_arguments(parser)
+
+        result = parser.parse_args(
+            ["-e", "test", "--jsonld-context-cache-dir", "/tmp/contexts"]
+        )
+        settings = group.get_settings(result)
+        assert settings["jsonld.cache_dir"] == "/tmp/contexts"
@@ -1,8 +1,9 @@
-from tempfile import NamedTemporaryFile
+from tempfile import NamedTemporaryFile, TemporaryDirectory
 
 from asynctest import TestCase as AsyncTestCase
 
 from ...cache.base import BaseCache
+from ...cache.tiered import TieredCache
 from ...core.profile import ProfileManager
 from ...core.protocol_registry import ProtocolRegistry
 from ...transport.wire_format import BaseWireFormat
@@ -36,3 +37,13 @@ class TestDefaultContext(AsyncTestCase):
         )
         result = await builder.build_context()
         assert isinstance(result, InjectionContext)
+
+    async def test_build_context_shared_cache(self):
+        with TemporaryDirectory() as temp_dir:
+            builder = DefaultContextBuilder(
+                settings={"cache.shared_url": f"file://{temp_dir}"}
+            )
+            result = await builder.build_context()
+            cache = result.inject(BaseCache)
+            assert isinstance(cache, TieredCache)
+            assert cache.local.max_entries == 100000
@@ -32,7 +32,9 @@ from ..commands.upgrade import (
     add_version_record,
     upgrade,
 )
+from ..core.event_bus import EventBus
 from ..core.profile import Profile
+from ..indy.issuer import IndyIssuerSigningPool
 from ..indy.verifier import IndyVerifier
 
 from ..ledger.error import LedgerConfigError, LedgerTransactionError
@@ -60,6 +62,7 @@ from ..protocols.coordinate_mediation.v1_0.route_manager_provider import (
 )
 from ..protocols.out_of_band.v1_0.manager import OutOfBandManager
 from ..protocols.out_of_band.v1_0.messages.invitation import HSProto, InvitationMessage
+from ..resolver.http_client import ResolverHTTPClient
 from ..storage.base import BaseStorage
 from ..storage.error import StorageNotFoundError
 from ..transport.inbound.manager import InboundTransportManager
@@ -71,6 +74,7 @@ from ..transport.outbound.status import OutboundSendStatus
 from ..transport.wire_format import BaseWireFormat
 from ..utils.stats import Collector
 from ..utils.task_queue import CompletedTask, TaskQueue
+from ..utils.worker_pool import WorkerPool
 from ..vc.ld_proofs.document_loader import DocumentLoader
 from ..version import RECORD_TYPE_ACAPY_VERSION, __version__
 from ..wallet.did_info import DIDInfo
@@ -214,6 +218,8 @@ class Conductor:
             context.injector.bind_provider(
                 BaseMultitenantManager, MultitenantManagerProvider(self.root_profile)
             )
+            multitenant_mgr = context.inject(BaseMultitenantManager)
+            await multitenant_mgr.load_routing_index()
 
         # Bind route manager provider
         context.injector.bind_provider(
@@ -521,13 +527,23 @@ class Conductor:
         if self.root_profile:
             await self.root_profile.notify(SHUTDOWN_EVENT_TOPIC, {})
 
+        # stop receiving messages and finish handling those in progress
         shutdown = TaskQueue()
         if self.dispatcher:
             shutdown.run(self.dispatcher.complete())
-        if self.admin_server:
-            shutdown.run(self.admin_server.stop())
         if self.inbound_transport_manager:
             shutdown.run(self.inbound_transport_manager.stop())
+        await shutdown.complete(timeout)
+
+        # deliver the queued events, such as webhooks, while the admin server
+        # and outbound transports are still running
+        event_bus = self.context.inject_or(EventBus)
+        if event_bus:
+            await event_bus.close(timeout)
+
+        shutdown = TaskQueue()
+        if self.admin_server:
+            shutdown.run(self.admin_server.stop())
         if self.outbound_transport_manager:
             shutdown.run(self.outbound_transport_manager.stop())
 
@@ -542,6 +558,17 @@ class Conductor:
 
         await shutdown.complete(timeout)
 
+        worker_pool = self.context.inject_or(WorkerPool)
+        if worker_pool:
+            worker_pool.shutdown()
+        signing_pool = self.context.inject_or(IndyIssuerSigningPool)
+        if signing_pool:
+            signing_pool.shutdown()
+
+        resolver_http_client = self.context.inject_or(ResolverHTTPClient)
+        if resolver_http_client:
+            await resolver_http_client.close()
+
     def inbound_message_router(
         self,
         profile: Profile,
@@ -610,6 +637,8 @@ class Conductor:
             "in_sessions": len(self.inbound_transport_manager.sessions),
             "out_encode": 0,
             "out_deliver": 0,
+            "out_held": 0,
+            "out_breakers_open": len(self.outbound_transport_manager.breakers_open),
             "task_active": self.dispatcher.task_queue.current_active,
             "task_done": self.dispatcher.task_queue.total_done,
             "task_failed": self.dispatcher.task_queue.total_failed,
@@ -620,6 +649,11 @@ class Conductor:
                 stats["out_encode"] += 1
             if m.state == QueuedOutboundMessage.STATE_DELIVER:
                 stats["out_deliver"] += 1
+        for breaker in self.outbound_transport_manager.breakers_open.values():
+            stats["out_held"] += len(breaker.held)
+        multitenant_mgr = self.context.inject_or(BaseMultitenantManager)
+        if multitenant_mgr:
+            stats["multitenant_cache"] = multitenant_mgr.cache_stats
         return stats
 
     async def outbound_message_router(
@@ -736,7 +770,9 @@ class Conductor:
         self, profile: Profile, outbound: OutboundMessage
     ) -> OutboundSendStatus:
         """Handle a message that failed delivery via outbound transports."""
-        queued_for_inbound = self.inbound_transport_manager.return_undelivered(outbound)
+        queued_for_inbound = self.inbound_transport_manager.return_undelivered(
+            outbound, profile
+        )
         return (
             OutboundSendStatus.WAITING_FOR_PICKUP
             if queued_for_inbound
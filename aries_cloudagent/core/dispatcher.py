@@ -8,6 +8,7 @@ lifecycle hook callbacks storing state for message threads, etc.
 import asyncio
 import logging
 import os
+import time
 import warnings
 
 from typing import Callable, Coroutine, Optional, Union, Tuple
@@ -30,7 +31,16 @@ from ..transport.inbound.message import InboundMessage
 from ..transport.outbound.message import OutboundMessage
 from ..transport.outbound.status import OutboundSendStatus
 from ..utils.stats import Collector
-from ..utils.task_queue import CompletedTask, PendingTask, TaskQueue
+from ..utils.task_queue import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    CompletedTask,
+    FairTaskQueue,
+    PendingTask,
+    TaskQueueFullError,
+    coro_ident,
+)
 from ..utils.tracing import get_timer, trace_event
 
 from .error import ProtocolMinorVersionNotSupported
@@ -45,6 +55,16 @@ from .util import (
 
 LOGGER = logging.getLogger(__name__)
 
+# cheap messages which should not wait behind expensive ones, by message name
+HIGH_PRIORITY_MESSAGES = {"ack", "ping", "ping_response", "problem-report"}
+
+# messages which are expensive to handle, by protocol and message name
+LOW_PRIORITY_MESSAGES = {
+    ("issue-credential", "issue-credential"),
+    ("issue-credential", "request-credential"),
+    ("present-proof", "presentation"),
+}
+
 
 class ProblemReportParseError(MessageParseError):
     """Error to raise on failure to parse problem-report message."""
@@ -62,21 +82,50 @@ class Dispatcher:
         """Initialize an instance of Dispatcher."""
         self.collector: Collector = None
         self.profile = profile
-        self.task_queue: TaskQueue = None
+        self.task_queue: FairTaskQueue = None
 
     async def setup(self):
         """Perform async instance setup."""
         self.collector = self.profile.inject_or(Collector)
         max_active = int(os.getenv("DISPATCHER_MAX_ACTIVE", 50))
-        self.task_queue = TaskQueue(
-            max_active=max_active, timed=bool(self.collector), trace_fn=self.log_task
+        max_tenant_pending = int(os.getenv("DISPATCHER_MAX_PENDING_PER_TENANT", 1000))
+        max_connection_pending = int(
+            os.getenv("DISPATCHER_MAX_PENDING_PER_CONNECTION", 100)
+        )
+        self.task_queue = FairTaskQueue(
+            max_active=max_active,
+            timed=bool(self.collector),
+            trace_fn=self.log_task,
+            max_tenant_pending=max_tenant_pending,
+            max_connection_pending=max_connection_pending,
         )
 
     def put_task(
-        self, coro: Coroutine, complete: Callable = None, ident: str = None
+        self,
+        coro: Coroutine,
+        complete: Callable = None,
+        ident: str = None,
+        *,
+        priority: str = None,
+        tenant: str = None,
+        connection: str = None,
     ) -> PendingTask:
-        """Run a task in the task queue, potentially blocking other handlers."""
-        return self.task_queue.put(coro, complete, ident)
+        """
+        Run a task in the task queue, potentially blocking other handlers.
+
+        Raises:
+            TaskQueueFullError: If the task must wait and the tenant or connection
+                has too many pending tasks
+
+        """
+        return self.task_queue.put(
+            coro,
+            complete,
+            ident,
+            priority=priority,
+            tenant=tenant,
+            connection=connection,
+        )
 
     def run_task(
         self, coro: Coroutine, complete: Callable = None, ident: str = None
@@ -119,11 +168,61 @@ class Dispatcher:
         Returns:
             A pending task instance resolving to the handler task
 
+        Raises:
+            TaskQueueFullError: If the message must wait and its tenant or
+                connection has too many pending messages
+
         """
-        return self.put_task(
-            self.handle_message(profile, inbound_message, send_outbound),
-            complete,
+        priority = self.message_priority(inbound_message)
+        coro = self.handle_message(profile, inbound_message, send_outbound)
+        ident = coro_ident(coro)
+        task_coro = coro
+        if self.collector:
+            task_coro = self._log_queued(coro, priority, time.perf_counter())
+        connection = inbound_message.receipt.sender_verkey
+        if not connection:
+            # anonymous messages are limited per inbound session rather than
+            # sharing one connection's limit, and not limited without a session
+            connection = ("session", inbound_message.session_id or object())
+        try:
+            pending = self.put_task(
+                task_coro,
+                complete,
+                ident,
+                priority=priority,
+                tenant=profile.settings.get("wallet.id"),
+                connection=connection,
+            )
+        except TaskQueueFullError:
+            task_coro.close()
+            coro.close()
+            raise
+        if self.collector:
+            self.collector.log(
+                f"Dispatcher:pending:{priority}",
+                self.task_queue.priority_pending(priority),
+            )
+        return pending
+
+    def message_priority(self, inbound_message: InboundMessage) -> str:
+        """Determine the priority class for handling an inbound message."""
+        payload = inbound_message.payload
+        message_type = isinstance(payload, dict) and payload.get("@type")
+        if not isinstance(message_type, str):
+            return PRIORITY_NORMAL
+        parts = message_type.rsplit("/", 3)
+        if parts[-1] in HIGH_PRIORITY_MESSAGES:
+            return PRIORITY_HIGH
+        if len(parts) > 2 and (parts[-3], parts[-1]) in LOW_PRIORITY_MESSAGES:
+            return PRIORITY_LOW
+        return PRIORITY_NORMAL
+
+    async def _log_queued(self, coro: Coroutine, priority: str, queued: float):
+        """Log the time a message waited in the queue before handling it."""
+        self.collector.log(
+            f"Dispatcher:queued:{priority}", time.perf_counter() - queued
         )
+        return await coro
 
     async def handle_message(
         self,
@@ -3,6 +3,7 @@
 import asyncio
 from contextlib import contextmanager
 import logging
+import time
 from typing import (
     Any,
     Awaitable,
@@ -19,11 +20,18 @@ from typing import (
 )
 from functools import partial
 
+from ..utils.stats import Collector
+
 if TYPE_CHECKING:  # To avoid circular import error
     from .profile import Profile
 
 LOGGER = logging.getLogger(__name__)
 
+# what a subscriber queue does with an event when it is full
+OVERFLOW_BLOCK = "block"
+OVERFLOW_DROP_NEWEST = "drop_newest"
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+
 
 class Event:
     """A simple event object."""
@@ -79,61 +87,196 @@ class EventWithMetadata(Event):
         return self._metadata
 
 
+class SubscriberQueue:
+    """A bounded queue delivering events to a single subscriber in order."""
+
+    def __init__(
+        self, processor: Callable, max_size: int, overflow: str = OVERFLOW_BLOCK
+    ):
+        """
+        Initialize the subscriber queue.
+
+        Args:
+            processor: async callable accepting profile and event
+            max_size: the maximum number of events waiting for the subscriber
+            overflow: the policy for events arriving when the queue is full:
+                wait for room, drop the new event or drop the oldest event
+
+        """
+        if overflow not in (OVERFLOW_BLOCK, OVERFLOW_DROP_NEWEST, OVERFLOW_DROP_OLDEST):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.processor = processor
+        self.overflow = overflow
+        self.queue = asyncio.Queue(max_size)
+        self.dropped = 0
+        self._worker: asyncio.Task = None
+
+    async def put(self, profile: "Profile", event: Event):
+        """Queue an event for the subscriber, applying the overflow policy."""
+        if not self._worker or self._worker.done():
+            self._worker = asyncio.get_event_loop().create_task(self._run())
+        item = (profile, event, time.perf_counter())
+        if not self.queue.full():
+            self.queue.put_nowait(item)
+        elif self.overflow == OVERFLOW_BLOCK:
+            await self.queue.put(item)
+        else:
+            self.dropped += 1
+            if self.overflow == OVERFLOW_DROP_OLDEST:
+                (_, dropped, _) = self.queue.get_nowait()
+                self.queue.task_done()
+                self.queue.put_nowait(item)
+            else:
+                dropped = event
+            LOGGER.warning(
+                "Subscriber queue full, dropped event %s for %s",
+                dropped.topic,
+                self.processor,
+            )
+
+    async def _run(self):
+        """Deliver queued events to the subscriber."""
+        while True:
+            (profile, event, queued) = await self.queue.get()
+            try:
+                collector = profile and profile.inject_or(Collector)
+                if collector:
+                    collector.log("EventBus:queued", time.perf_counter() - queued)
+                await self.processor(profile, event)
+            except Exception:
+                LOGGER.exception("Error occurred while processing event")
+            finally:
+                self.queue.task_done()
+
+    async def join(self):
+        """Wait until all queued events have been delivered."""
+        await self.queue.join()
+
+    def close(self):
+        """Stop delivering events, discarding any still queued."""
+        if self._worker:
+            self._worker.cancel()
+            self._worker = None
+
+
 class EventBus:
     """A simple event bus implementation."""
 
-    def __init__(self):
-        """Initialize Event Bus."""
+    def __init__(self, *, concurrent: bool = False, cache_size: int = 1024):
+        """
+        Initialize Event Bus.
+
+        Args:
+            concurrent: run the subscribers to an event concurrently rather than
+                one after another
+            cache_size: the number of topics to remember matching patterns for
+
+        """
         self.topic_patterns_to_subscribers: Dict[Pattern, List[Callable]] = {}
+        self.concurrent = concurrent
+        self.cache_size = cache_size
+        self._topic_matches: Dict[str, List[Tuple[Pattern, Match[str]]]] = {}
+        self._queues: Dict[Tuple[Pattern, Callable], SubscriberQueue] = {}
+
+    @property
+    def stats(self) -> dict:
+        """Accessor for the subscriber queue counters."""
+        return {
+            "cached_topics": len(self._topic_matches),
+            "queued": sum(queue.queue.qsize() for queue in self._queues.values()),
+            "dropped": sum(queue.dropped for queue in self._queues.values()),
+        }
+
+    def _match_topic(self, topic: str) -> List[Tuple[Pattern, Match[str]]]:
+        """Find the subscribed patterns matching a topic."""
+        matches = self._topic_matches.get(topic)
+        if matches is None:
+            matches = []
+            for pattern in self.topic_patterns_to_subscribers:
+                match = pattern.match(topic)
+                if match:
+                    matches.append((pattern, match))
+            if self.cache_size:
+                if len(self._topic_matches) >= self.cache_size:
+                    del self._topic_matches[next(iter(self._topic_matches))]
+                self._topic_matches[topic] = matches
+        return matches
 
     async def notify(self, profile: "Profile", event: Event):
         """Notify subscribers of event.
 
+        Subscribers with a queue receive the event through it, others are
+        awaited before returning.
+
         Args:
             profile (Profile): context of the event
             event (Event): event to emit
 
         """
-        # TODO don't block notifier until subscribers have all been called?
-        # TODO trigger each processor but don't await?
-        # TODO log errors but otherwise ignore?
-
         LOGGER.debug("Notifying subscribers: %s", event)
+        start = time.perf_counter()
 
         partials = []
-        for pattern, subscribers in self.topic_patterns_to_subscribers.items():
-            match = pattern.match(event.topic)
-
-            if not match:
-                continue
-
+        queued = []
+        for pattern, match in self._match_topic(event.topic):
+            subscribers = self.topic_patterns_to_subscribers.get(pattern, ())
             for subscriber in subscribers:
-                partials.append(
-                    partial(
-                        subscriber,
-                        profile,
-                        event.with_metadata(EventMetadata(pattern, match)),
+                event_with_metadata = event.with_metadata(EventMetadata(pattern, match))
+                queue = self._queues.get((pattern, subscriber))
+                if queue:
+                    queued.append(partial(queue.put, profile, event_with_metadata))
+                else:
+                    partials.append(
+                        partial(self._process, subscriber, profile, event_with_metadata)
                     )
-                )
 
-        for processor in partials:
-            try:
+        for put in queued:
+            await put()
+        if self.concurrent and len(partials) > 1:
+            await asyncio.gather(*(processor() for processor in partials))
+        else:
+            for processor in partials:
                 await processor()
-            except Exception:
-                LOGGER.exception("Error occurred while processing event")
 
-    def subscribe(self, pattern: Pattern, processor: Callable):
+        if profile and (partials or queued):
+            collector = profile.inject_or(Collector)
+            if collector:
+                collector.log("EventBus:notify", time.perf_counter() - start)
+
+    async def _process(self, processor: Callable, profile: "Profile", event: Event):
+        """Run a subscriber on an event, logging any error."""
+        try:
+            await processor(profile, event)
+        except Exception:
+            LOGGER.exception("Error occurred while processing event")
+
+    def subscribe(
+        self,
+        pattern: Pattern,
+        processor: Callable,
+        *,
+        queue_size: int = 0,
+        overflow: str = OVERFLOW_BLOCK,
+    ):
         """Subscribe to an event.
 
         Args:
             pattern (Pattern): compiled regular expression for matching topics
             processor (Callable): async callable accepting profile and event
+            queue_size (int): if set, deliver events to the processor through a
+                queue of this size instead of awaiting it in `notify`
+            overflow (str): what to do with events when the queue is full
 
         """
         LOGGER.debug("Subscribed: topic %s, processor %s", pattern, processor)
         if pattern not in self.topic_patterns_to_subscribers:
             self.topic_patterns_to_subscribers[pattern] = []
+            self._topic_matches.clear()
         self.topic_patterns_to_subscribers[pattern].append(processor)
+        if queue_size and (pattern, processor) not in self._queues:
+            self._queues[(pattern, processor)] = SubscriberQueue(
+                processor, queue_size, overflow
+            )
 
     def unsubscribe(self, pattern: Pattern, processor: Callable):
         """Unsubscribe from an event.
@@ -152,10 +295,29 @@ class EventBus:
             except ValueError:
                 return
             del self.topic_patterns_to_subscribers[pattern][index]
+            if processor not in self.topic_patterns_to_subscribers[pattern]:
+                queue = self._queues.pop((pattern, processor), None)
+                if queue:
+                    queue.close()
             if not self.topic_patterns_to_subscribers[pattern]:
                 del self.topic_patterns_to_subscribers[pattern]
+                self._topic_matches.clear()
             LOGGER.debug("Unsubscribed: topic %s, processor %s", pattern, processor)
 
+    async def flush(self):
+        """Wait until all queued events have been delivered."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+
+    async def close(self, timeout: float = None):
+        """Deliver the queued events, waiting up to `timeout`, then stop queues."""
+        try:
+            await asyncio.wait_for(self.flush(), timeout)
+        except asyncio.TimeoutError:
+            LOGGER.warning("Discarding %d queued events", self.stats["queued"])
+        for queue in self._queues.values():
+            queue.close()
+
     @contextmanager
     def wait_for_event(
         self,
@@ -6,7 +6,7 @@ from weakref import ref
 
 from ...config.injection_context import InjectionContext
 from ...config.provider import ClassProvider
-from ...storage.base import BaseStorage
+from ...storage.base import BaseStorage, BaseStorageSearch
 from ...storage.vc_holder.base import VCHolder
 from ...utils.classloader import DeferLoad
 from ...wallet.base import BaseWallet
@@ -14,6 +14,7 @@ from ...wallet.base import BaseWallet
 from ..profile import Profile, ProfileManager, ProfileSession
 
 STORAGE_CLASS = DeferLoad("aries_cloudagent.storage.in_memory.InMemoryStorage")
+STORAGE_INDEX_CLASS = DeferLoad("aries_cloudagent.storage.in_memory.InMemoryTagIndex")
 WALLET_CLASS = DeferLoad("aries_cloudagent.wallet.in_memory.InMemoryWallet")
 
 
@@ -35,6 +36,7 @@ class InMemoryProfile(Profile):
         self.local_dids = {}
         self.pair_dids = {}
         self.records = OrderedDict()
+        self.record_index = STORAGE_INDEX_CLASS()
         self.bind_providers()
 
     def bind_providers(self):
@@ -116,7 +118,9 @@ class InMemoryProfileSession(ProfileSession):
 
     def _init_context(self):
         """Initialize the session context."""
-        self._context.injector.bind_instance(BaseStorage, STORAGE_CLASS(self.profile))
+        storage = STORAGE_CLASS(self.profile)
+        self._context.injector.bind_instance(BaseStorage, storage)
+        self._context.injector.bind_instance(BaseStorageSearch, storage)
         self._context.injector.bind_instance(BaseWallet, WALLET_CLASS(self.profile))
 
     @property
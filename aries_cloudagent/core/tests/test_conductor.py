@@ -463,6 +463,9 @@ class TestConductor(IsolatedAsyncioTestCase, Config, TestDIDs):
                 async_mock.MagicMock(state=QueuedOutboundMessage.STATE_ENCODE),
                 async_mock.MagicMock(state=QueuedOutboundMessage.STATE_DELIVER),
             ]
+            mock_outbound_mgr.return_value.breakers_open = {
+                "http://example": async_mock.MagicMock(held=[async_mock.MagicMock()])
+            }
             mock_outbound_mgr.return_value.registered_transports = {
                 "test": async_mock.MagicMock(schemes=["http"])
             }
@@ -476,12 +479,16 @@ class TestConductor(IsolatedAsyncioTestCase, Config, TestDIDs):
                     "in_sessions",
                     "out_encode",
                     "out_deliver",
+                    "out_held",
+                    "out_breakers_open",
                     "task_active",
                     "task_done",
                     "task_failed",
                     "task_pending",
                 ]
             )
+            assert stats["out_held"] == 1
+            assert stats["out_breakers_open"] == 1
 
     async def test_inbound_message_handler(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
@@ -851,6 +858,45 @@ class TestConductor(IsolatedAsyncioTestCase, Config, TestDIDs):
             await conductor.stop()
             admin_stop.assert_awaited_once_with()
 
+    async def test_stop_flushes_events_before_admin_and_outbound(self):
+        builder: ContextBuilder = StubContextBuilder(self.test_settings)
+        conductor = test_module.Conductor(builder)
+
+        with async_mock.patch.object(
+            test_module, "InboundTransportManager", autospec=True
+        ) as mock_inbound_mgr, async_mock.patch.object(
+            test_module, "OutboundTransportManager", autospec=True
+        ) as mock_outbound_mgr, async_mock.patch.object(
+            test_module, "LoggingConfigurator", autospec=True
+        ):
+            mock_outbound_mgr.return_value.registered_transports = {
+                "test": async_mock.MagicMock(schemes=["http"])
+            }
+            await conductor.setup()
+
+            calls = []
+
+            def record(name):
+                async def _record(*args, **kwargs):
+                    calls.append(name)
+
+                return _record
+
+            mock_inbound_mgr.return_value.stop.side_effect = record("inbound")
+            mock_outbound_mgr.return_value.stop.side_effect = record("outbound")
+            conductor.admin_server = async_mock.MagicMock(
+                stop=async_mock.AsyncMock(side_effect=record("admin"))
+            )
+            bus = conductor.context.inject(EventBus)
+            with async_mock.patch.object(
+                bus, "close", async_mock.AsyncMock(side_effect=record("events"))
+            ):
+                await conductor.stop()
+
+            assert calls.index("inbound") < calls.index("events")
+            assert calls.index("events") < calls.index("admin")
+            assert calls.index("events") < calls.index("outbound")
+
     async def test_admin_startx(self):
         builder: ContextBuilder = StubContextBuilder(self.test_settings)
         builder.update_settings(
@@ -1,3 +1,4 @@
+import asyncio
 import json
 
 from async_case import IsolatedAsyncioTestCase
@@ -409,6 +410,105 @@ class TestDispatcher(IsolatedAsyncioTestCase):
         )
         dispatcher.log_task(mock_task)
 
+    async def test_message_priority(self):
+        dispatcher = test_module.Dispatcher(make_profile())
+        for message_type, priority in (
+            ("trust_ping/1.0/ping", test_module.PRIORITY_HIGH),
+            ("issue-credential/2.0/problem-report", test_module.PRIORITY_HIGH),
+            ("present-proof/1.0/presentation", test_module.PRIORITY_LOW),
+            ("present-proof/2.0/presentation", test_module.PRIORITY_LOW),
+            ("present-proof/1.0/request-presentation", test_module.PRIORITY_NORMAL),
+            ("basicmessage/1.0/message", test_module.PRIORITY_NORMAL),
+        ):
+            message = {"@type": DIDCommPrefix.qualify_current(message_type)}
+            assert dispatcher.message_priority(make_inbound(message)) == priority
+        assert (
+            dispatcher.message_priority(make_inbound("not-parsed"))
+            == test_module.PRIORITY_NORMAL
+        )
+        assert (
+            dispatcher.message_priority(make_inbound({"@type": None}))
+            == test_module.PRIORITY_NORMAL
+        )
+
+    async def test_queue_message_fair_share(self):
+        profile = make_profile()
+        dispatcher = test_module.Dispatcher(profile)
+        with async_mock.patch.dict(
+            test_module.os.environ,
+            {
+                "DISPATCHER_MAX_ACTIVE": "1",
+                "DISPATCHER_MAX_PENDING_PER_CONNECTION": "2",
+            },
+        ):
+            await dispatcher.setup()
+        rcv = Receiver()
+        handled = []
+
+        async def handle_message(profile, inbound, send_outbound):
+            handled.append(inbound.payload["@type"].rsplit("/", 1)[-1])
+
+        def make_sent(message_type, sender):
+            return InboundMessage(
+                {"@type": DIDCommPrefix.qualify_current(message_type)},
+                MessageReceipt(sender_verkey=sender),
+            )
+
+        with async_mock.patch.object(dispatcher, "handle_message", handle_message):
+            dispatcher.run_task(asyncio.sleep(0.01))
+            dispatcher.queue_message(
+                profile, make_sent("present-proof/1.0/presentation", "a"), rcv.send
+            )
+            dispatcher.queue_message(
+                profile, make_sent("basicmessage/1.0/message", "a"), rcv.send
+            )
+            with self.assertRaises(test_module.TaskQueueFullError):
+                dispatcher.queue_message(
+                    profile, make_sent("basicmessage/1.0/message", "a"), rcv.send
+                )
+            dispatcher.queue_message(
+                profile, make_sent("trust_ping/1.0/ping", "b"), rcv.send
+            )
+            await dispatcher.task_queue
+        assert handled == ["ping", "message", "presentation"]
+        stats = profile.inject(Collector).extract()
+        assert stats["count"]["Dispatcher:queued:high"] == 1
+        assert stats["max"]["Dispatcher:pending:low"] == 1
+
+    async def test_queue_message_anonymous_senders(self):
+        profile = make_profile()
+        dispatcher = test_module.Dispatcher(profile)
+        with async_mock.patch.dict(
+            test_module.os.environ,
+            {
+                "DISPATCHER_MAX_ACTIVE": "1",
+                "DISPATCHER_MAX_PENDING_PER_CONNECTION": "1",
+            },
+        ):
+            await dispatcher.setup()
+        rcv = Receiver()
+        handled = []
+
+        async def handle_message(profile, inbound, send_outbound):
+            handled.append(inbound.session_id)
+
+        def make_anonymous(session_id):
+            return InboundMessage(
+                {"@type": DIDCommPrefix.qualify_current("basicmessage/1.0/message")},
+                MessageReceipt(),
+                session_id=session_id,
+            )
+
+        with async_mock.patch.object(dispatcher, "handle_message", handle_message):
+            dispatcher.run_task(asyncio.sleep(0.01))
+            # anonymous senders do not share a single connection limit
+            for session_id in ("s1", "s2", None, None):
+                dispatcher.queue_message(profile, make_anonymous(session_id), rcv.send)
+            with self.assertRaises(test_module.TaskQueueFullError):
+                dispatcher.queue_message(profile, make_anonymous("s1"), rcv.send)
+            await dispatcher.task_queue
+        assert sorted(handled, key=str) == [None, None, "s1", "s2"]
+
     async def test_create_send_outbound(self):
         profile = make_profile()
         context = RequestContext(
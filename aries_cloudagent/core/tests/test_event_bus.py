@@ -1,11 +1,13 @@
 """Test Event Bus."""
 
+import asyncio
 import pytest
 import re
 
 from asynctest import mock as async_mock
 
 from .. import event_bus as test_module
+from ...utils.stats import Collector
 from ..event_bus import EventBus, Event
 
 # pylint: disable=redefined-outer-name
@@ -205,3 +207,190 @@ async def test_wait_for_event_condition(event_bus: EventBus, profile, event):
         await event_bus.notify(profile, event)
         assert returned_event.done()
         assert await returned_event == event
+
+
+@pytest.mark.asyncio
+async def test_topic_match_cache(event_bus: EventBus, profile, event, processor):
+    """Test topic matches are cached until the subscriptions change."""
+    event_bus.subscribe(re.compile("^$"), processor)
+    await event_bus.notify(profile, event)
+    assert event_bus.stats["cached_topics"] == 1
+    assert processor.event is None
+
+    event_bus.subscribe(re.compile(".*"), processor)
+    assert event_bus.stats["cached_topics"] == 0
+    await event_bus.notify(profile, event)
+    assert processor.event == event
+
+    event_bus.unsubscribe(re.compile(".*"), processor)
+    processor.event = None
+    await event_bus.notify(profile, event)
+    assert processor.event is None
+
+
+@pytest.mark.asyncio
+async def test_topic_match_cache_bounded(profile, processor):
+    """Test the topic match cache holds at most cache_size topics."""
+    event_bus = EventBus(cache_size=2)
+    event_bus.subscribe(re.compile(".*"), processor)
+    for topic in ("one", "two", "three"):
+        await event_bus.notify(profile, Event(topic))
+    assert event_bus.stats["cached_topics"] == 2
+    assert processor.event == Event("three")
+
+
+@pytest.mark.asyncio
+async def test_notify_concurrent(profile, event):
+    """Test subscribers run concurrently when enabled."""
+    event_bus = EventBus(concurrent=True)
+    started = []
+    release = asyncio.Event()
+
+    async def _wait(profile, event):
+        started.append(event)
+        await release.wait()
+
+    async def _release(profile, event):
+        started.append(event)
+        release.set()
+
+    event_bus.subscribe(re.compile(".*"), _wait)
+    event_bus.subscribe(re.compile(".*"), _release)
+    await asyncio.wait_for(event_bus.notify(profile, event), 1)
+    assert len(started) == 2
+
+
+@pytest.mark.asyncio
+async def test_notify_logs_collector(event_bus: EventBus, profile, event, processor):
+    """Test fan-out latency is logged to the collector."""
+    collector = Collector()
+    profile.inject_or = async_mock.MagicMock(return_value=collector)
+    event_bus.subscribe(re.compile(".*"), processor)
+    await event_bus.notify(profile, event)
+    assert collector.extract()["count"]["EventBus:notify"] == 1
+
+
+@pytest.mark.asyncio
+async def test_queued_subscriber(event_bus: EventBus, profile):
+    """Test queued subscribers receive events in order after notify returns."""
+    received = []
+
+    async def _processor(profile, event):
+        received.append(event.topic)
+
+    event_bus.subscribe(re.compile(".*"), _processor, queue_size=10)
+    for topic in ("one", "two", "three"):
+        await event_bus.notify(profile, Event(topic))
+    await event_bus.flush()
+    assert received == ["one", "two", "three"]
+    assert event_bus.stats["queued"] == 0
+    await event_bus.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_subscriber_error(event_bus: EventBus, profile):
+    """Test errors in queued subscribers are logged and delivery continues."""
+    received = []
+
+    async def _processor(profile, event):
+        if event.topic == "bad":
+            raise Exception()
+        received.append(event.topic)
+
+    event_bus.subscribe(re.compile(".*"), _processor, queue_size=10)
+    with async_mock.patch.object(
+        test_module.LOGGER, "exception", async_mock.MagicMock()
+    ) as mock_log_exc:
+        await event_bus.notify(profile, Event("bad"))
+        await event_bus.notify(profile, Event("good"))
+        await event_bus.flush()
+    mock_log_exc.assert_called_once()
+    assert received == ["good"]
+    await event_bus.close()
+
+
+@pytest.mark.parametrize(
+    "overflow, expected",
+    [
+        (test_module.OVERFLOW_DROP_NEWEST, ["one", "two"]),
+        (test_module.OVERFLOW_DROP_OLDEST, ["two", "three"]),
+    ],
+)
+@pytest.mark.asyncio
+async def test_queued_subscriber_drop(event_bus: EventBus, profile, overflow, expected):
+    """Test full subscriber queues drop events according to the policy."""
+    received = []
+    release = asyncio.Event()
+
+    async def _processor(profile, event):
+        await release.wait()
+        received.append(event.topic)
+
+    event_bus.subscribe(re.compile(".*"), _processor, queue_size=2, overflow=overflow)
+    await event_bus.notify(profile, Event("blocker"))
+    await asyncio.sleep(0)
+    for topic in ("one", "two", "three"):
+        await event_bus.notify(profile, Event(topic))
+    assert event_bus.stats["dropped"] == 1
+
+    release.set()
+    await event_bus.flush()
+    assert received == ["blocker"] + expected
+    await event_bus.close()
+
+
+@pytest.mark.asyncio
+async def test_queued_subscriber_block(event_bus: EventBus, profile):
+    """Test a full subscriber queue makes notify wait for room."""
+    received = []
+    release = asyncio.Event()
+
+    async def _processor(profile, event):
+        await release.wait()
+        received.append(event.topic)
+
+    event_bus.subscribe(re.compile(".*"), _processor, queue_size=1)
+    await event_bus.notify(profile, Event("blocker"))
+    await asyncio.sleep(0)
+    await event_bus.notify(profile, Event("one"))
+    notify = asyncio.ensure_future(event_bus.notify(profile, Event("two")))
+    await asyncio.sleep(0)
+    assert not notify.done()
+
+    release.set()
+    await asyncio.wait_for(notify, 1)
+    await event_bus.flush()
+    assert received == ["blocker", "one", "two"]
+    assert event_bus.stats["dropped"] == 0
+    await event_bus.close()
+
+
+def test_queued_subscriber_bad_overflow(event_bus: EventBus, processor):
+    with pytest.raises(ValueError):
+        event_bus.subscribe(re.compile(".*"), processor, queue_size=1, overflow="x")
+
+
+@pytest.mark.asyncio
+async def test_close(event_bus: EventBus, profile):
+    """Test close delivers queued events, then discards the rest on timeout."""
+    received = []
+    release = asyncio.Event()
+
+    async def _processor(profile, event):
+        if event.topic == "stuck":
+            await release.wait()
+        received.append(event.topic)
+
+    event_bus.subscribe(re.compile(".*"), _processor, queue_size=10)
+    await event_bus.notify(profile, Event("one"))
+    await event_bus.close(1)
+    assert received == ["one"]
+
+    await event_bus.notify(profile, Event("stuck"))
+    await event_bus.notify(profile, Event("two"))
+    with async_mock.patch.object(
+        test_module.LOGGER, "warning", async_mock.MagicMock()
+    ) as mock_log_warn:
+        await event_bus.close(0.01)
+    mock_log_warn.assert_called_once()
+    assert received == ["one"]
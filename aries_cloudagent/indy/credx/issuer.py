@@ -3,13 +3,15 @@
 import asyncio
 import logging
 
-from typing import Sequence, Tuple
+from collections import OrderedDict
+from typing import Dict, Optional, Sequence, Tuple
 
 from aries_askar import AskarError
 
 from indy_credx import (
     Credential,
     CredentialDefinition,
+    CredentialDefinitionPrivate,
     CredentialOffer,
     CredentialRevocationConfig,
     CredxError,
@@ -25,6 +27,7 @@ from ..issuer import (
     IndyIssuer,
     IndyIssuerError,
     IndyIssuerRevocationRegistryFullError,
+    IndyIssuerSigningPool,
     DEFAULT_CRED_DEF_TAG,
     DEFAULT_SIGNATURE_TYPE,
 )
@@ -41,6 +44,144 @@ CATEGORY_REV_REG_DEF = "revocation_reg_def"
 CATEGORY_REV_REG_DEF_PRIVATE = "revocation_reg_def_private"
 CATEGORY_REV_REG_ISSUER = "revocation_reg_def_issuer"
 
+# number of revocation indexes reserved at once for each registry
+REV_REG_INDEX_BLOCK_SIZE = 16
+
+# number of credential definitions kept loaded for each profile
+CRED_DEF_CACHE_SIZE = 32
+
+
+class IssuerCredDef:
+    """Credential definition loaded for issuing credentials."""
+
+    def __init__(
+        self,
+        cred_def: CredentialDefinition,
+        cred_def_private: Optional[CredentialDefinitionPrivate],
+        key_proof: Optional[bytes],
+        schema_id: Optional[str],
+    ):
+        """Initialize the loaded credential definition."""
+        self.cred_def = cred_def
+        self.cred_def_private = cred_def_private
+        self.key_proof = key_proof
+        self.schema_id = schema_id
+
+
+class CredDefCache:
+    """Bounded cache of loaded credential definitions, least recently used first."""
+
+    def __init__(self, capacity: int = CRED_DEF_CACHE_SIZE):
+        """Initialize the cache."""
+        self.capacity = capacity
+        self._entries: "OrderedDict[str, IssuerCredDef]" = OrderedDict()
+
+    def get(self, cred_def_id: str) -> Optional[IssuerCredDef]:
+        """Get a loaded credential definition, if cached."""
+        entry = self._entries.get(cred_def_id)
+        if entry:
+            self._entries.move_to_end(cred_def_id)
+        return entry
+
+    def set(self, cred_def_id: str, entry: IssuerCredDef):
+        """Add a loaded credential definition to the cache."""
+        self._entries[cred_def_id] = entry
+        self._entries.move_to_end(cred_def_id)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+    def remove(self, cred_def_id: str):
+        """Remove a credential definition from the cache."""
+        self._entries.pop(cred_def_id, None)
+
+
+class RevRegIssuanceState:
+    """Revocation registry data held in memory for issuing credentials."""
+
+    def __init__(self, rev_reg_def: RevocationRegistryDefinition, rev_key: bytes):
+        """Initialize the issuance state with the immutable registry data."""
+        self.rev_reg_def = rev_reg_def
+        self.rev_key = rev_key
+        self.rev_reg: bytes = None
+        self.used_ids: Sequence[int] = ()
+        self.next_index = 1
+        self.end_index = 0
+        self.stale = False
+
+    def take_index(self) -> Optional[int]:
+        """Take the next revocation index from the reserved block, if any."""
+        if self.next_index > self.end_index:
+            return None
+        index = self.next_index
+        self.next_index += 1
+        return index
+
+
+class RevRegIndexAllocator:
+    """
+    Allocator of revocation indexes in blocks reserved from the wallet.
+
+    Each block is reserved by advancing the registry's `curr_id` in a single
+    transaction, and its indexes are then handed out from memory. Indexes left
+    over when the profile is closed are given back if no later block has been
+    reserved, and otherwise skipped. Skipped indexes are never used.
+    """
+
+    def __init__(self, block_size: int = REV_REG_INDEX_BLOCK_SIZE):
+        """Initialize the allocator."""
+        self.block_size = block_size
+        self._registries: Dict[str, RevRegIssuanceState] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def get(self, revoc_reg_id: str) -> Optional[RevRegIssuanceState]:
+        """Get the issuance state for a registry, if loaded."""
+        return self._registries.get(revoc_reg_id)
+
+    def set(self, revoc_reg_id: str, state: RevRegIssuanceState):
+        """Set the issuance state for a registry."""
+        self._registries[revoc_reg_id] = state
+
+    def lock(self, revoc_reg_id: str) -> asyncio.Lock:
+        """Get the lock serializing block reservations for a registry."""
+        if revoc_reg_id not in self._locks:
+            self._locks[revoc_reg_id] = asyncio.Lock()
+        return self._locks[revoc_reg_id]
+
+    def mark_stale(self, revoc_reg_id: str):
+        """Flag that the registry accumulator has changed since it was loaded."""
+        state = self._registries.get(revoc_reg_id)
+        if state:
+            state.stale = True
+
+    async def release(self, profile: AskarProfile):
+        """Give back the unused indexes of the reserved blocks, where possible."""
+        for revoc_reg_id, state in self._registries.items():
+            if state.next_index > state.end_index:
+                continue
+            try:
+                async with profile.transaction() as txn:
+                    rev_reg_info = await txn.handle.fetch(
+                        CATEGORY_REV_REG_INFO, revoc_reg_id, for_update=True
+                    )
+                    if not rev_reg_info:
+                        continue
+                    rev_info = rev_reg_info.value_json
+                    if rev_info["curr_id"] != state.end_index:
+                        # a later block has been reserved, skip the unused indexes
+                        continue
+                    rev_info["curr_id"] = state.next_index - 1
+                    await txn.handle.replace(
+                        CATEGORY_REV_REG_INFO, revoc_reg_id, value_json=rev_info
+                    )
+                    await txn.commit()
+            except AskarError as err:
+                LOGGER.warning(
+                    "Could not release revocation indexes for registry %s: %s",
+                    revoc_reg_id,
+                    err,
+                )
+        self._registries.clear()
+
 
 class IndyCredxIssuer(IndyIssuer):
     """Indy-Credx issuer class."""
@@ -60,6 +201,13 @@ class IndyCredxIssuer(IndyIssuer):
         """Accessor for the profile instance."""
         return self._profile
 
+    async def _sign(self, func, *args):
+        """Run a signing call in the shared signing pool, if one is bound."""
+        pool = self._profile.inject_or(IndyIssuerSigningPool)
+        if pool:
+            return await pool.run(func, *args)
+        return await asyncio.get_event_loop().run_in_executor(None, func, *args)
+
     async def create_schema(
         self,
         origin_did: str,
@@ -174,6 +322,7 @@ class IndyCredxIssuer(IndyIssuer):
                 await txn.commit()
         except AskarError as err:
             raise IndyIssuerError("Error storing credential definition") from err
+        self.cred_def_cache.remove(cred_def_id)
         return (cred_def_id, cred_def_json)
 
     async def create_credential_offer(self, credential_definition_id: str) -> str:
@@ -187,35 +336,183 @@ class IndyCredxIssuer(IndyIssuer):
             The new credential offer
 
         """
+        cred_def = await self._get_cred_def(credential_definition_id)
+        if not cred_def or not cred_def.key_proof:
+            raise IndyIssuerError(
+                "Credential definition not found for credential offer"
+            )
+        try:
+            credential_offer = CredentialOffer.create(
+                # The tag holds the full name of the schema,
+                # as opposed to just the sequence number
+                cred_def.schema_id or cred_def.cred_def.schema_id,
+                cred_def.cred_def,
+                cred_def.key_proof,
+            )
+        except CredxError as err:
+            raise IndyIssuerError("Error creating credential offer") from err
+
+        return credential_offer.to_json()
+
+    @property
+    def cred_def_cache(self) -> CredDefCache:
+        """Accessor for the credential definition cache shared by the profile."""
+        if not self._profile.cred_def_cache:
+            size = self._profile.settings.get("issuer.cred_def_cache_size")
+            self._profile.cred_def_cache = CredDefCache(
+                CRED_DEF_CACHE_SIZE if size is None else int(size)
+            )
+        return self._profile.cred_def_cache
+
+    async def _get_cred_def(self, cred_def_id: str) -> Optional[IssuerCredDef]:
+        """Get a credential definition loaded from the wallet, if present."""
+        cache = self.cred_def_cache
+        entry = cache.get(cred_def_id)
+        if entry:
+            return entry
         try:
             async with self._profile.session() as session:
-                cred_def = await session.handle.fetch(
-                    CATEGORY_CRED_DEF, credential_definition_id
+                cred_def = await session.handle.fetch(CATEGORY_CRED_DEF, cred_def_id)
+                cred_def_private = await session.handle.fetch(
+                    CATEGORY_CRED_DEF_PRIVATE, cred_def_id
                 )
                 key_proof = await session.handle.fetch(
-                    CATEGORY_CRED_DEF_KEY_PROOF, credential_definition_id
+                    CATEGORY_CRED_DEF_KEY_PROOF, cred_def_id
                 )
         except AskarError as err:
             raise IndyIssuerError("Error retrieving credential definition") from err
-        if not cred_def or not key_proof:
-            raise IndyIssuerError(
-                "Credential definition not found for credential offer"
-            )
+        if not cred_def:
+            return None
         try:
-            # The tag holds the full name of the schema,
-            # as opposed to just the sequence number
-            schema_id = cred_def.tags.get("schema_id")
-            cred_def = CredentialDefinition.load(cred_def.raw_value)
-
-            credential_offer = CredentialOffer.create(
-                schema_id or cred_def.schema_id,
-                cred_def,
-                key_proof.raw_value,
+            entry = IssuerCredDef(
+                CredentialDefinition.load(cred_def.raw_value),
+                cred_def_private
+                and CredentialDefinitionPrivate.load(cred_def_private.raw_value),
+                key_proof and key_proof.raw_value,
+                cred_def.tags.get("schema_id"),
             )
         except CredxError as err:
-            raise IndyIssuerError("Error creating credential offer") from err
+            raise IndyIssuerError("Error loading credential definition") from err
+        if entry.cred_def_private and entry.key_proof:
+            cache.set(cred_def_id, entry)
+        return entry
 
-        return credential_offer.to_json()
+    @property
+    def rev_reg_allocator(self) -> RevRegIndexAllocator:
+        """Accessor for the revocation index allocator shared by the profile."""
+        if not self._profile.rev_reg_allocator:
+            self._profile.rev_reg_allocator = RevRegIndexAllocator(
+                self._profile.settings.get_int("revocation.index_block_size")
+                or REV_REG_INDEX_BLOCK_SIZE
+            )
+        return self._profile.rev_reg_allocator
+
+    async def _allocate_rev_reg_index(
+        self, revoc_reg_id: str
+    ) -> Tuple[int, RevRegIssuanceState]:
+        """Allocate a revocation index for a new credential."""
+        allocator = self.rev_reg_allocator
+        state = allocator.get(revoc_reg_id)
+        index = state and state.take_index()
+        if index and not state.stale:
+            return index, state
+
+        async with allocator.lock(revoc_reg_id):
+            state = allocator.get(revoc_reg_id)
+            if not index:
+                index = state and state.take_index()
+            if not index:
+                state = await self._reserve_rev_reg_indexes(revoc_reg_id, state)
+                allocator.set(revoc_reg_id, state)
+                index = state.take_index()
+            elif state.stale:
+                await self._refresh_rev_reg(revoc_reg_id, state)
+        return index, state
+
+    async def _reserve_rev_reg_indexes(
+        self, revoc_reg_id: str, state: Optional[RevRegIssuanceState]
+    ) -> RevRegIssuanceState:
+        """Reserve the next block of revocation indexes for a registry."""
+        try:
+            async with self._profile.transaction() as txn:
+                rev_reg = await txn.handle.fetch(CATEGORY_REV_REG, revoc_reg_id)
+                rev_reg_info = await txn.handle.fetch(
+                    CATEGORY_REV_REG_INFO, revoc_reg_id, for_update=True
+                )
+                if not state:
+                    rev_reg_def = await txn.handle.fetch(
+                        CATEGORY_REV_REG_DEF, revoc_reg_id
+                    )
+                    rev_key = await txn.handle.fetch(
+                        CATEGORY_REV_REG_DEF_PRIVATE, revoc_reg_id
+                    )
+                    if not rev_reg_def:
+                        raise IndyIssuerError(
+                            "Revocation registry definition not found"
+                        )
+                    if not rev_key:
+                        raise IndyIssuerError(
+                            "Revocation registry definition private data not found"
+                        )
+                    try:
+                        state = RevRegIssuanceState(
+                            RevocationRegistryDefinition.load(rev_reg_def.raw_value),
+                            rev_key.raw_value,
+                        )
+                    except CredxError as err:
+                        raise IndyIssuerError(
+                            "Error loading revocation registry definition"
+                        ) from err
+                if not rev_reg:
+                    raise IndyIssuerError("Revocation registry not found")
+                if not rev_reg_info:
+                    raise IndyIssuerError("Revocation registry metadata not found")
+                # NOTE: we reserve the indexes ahead of time to keep the
+                # transaction short. The revocation registry itself will NOT
+                # be updated because we always use ISSUANCE_BY_DEFAULT.
+                # If something goes wrong later, the index will be skipped.
+                # FIXME - double check issuance type in case of upgraded wallet?
+                rev_info = rev_reg_info.value_json
+                max_cred_num = state.rev_reg_def.max_cred_num
+                if rev_info["curr_id"] >= max_cred_num:
+                    raise IndyIssuerRevocationRegistryFullError(
+                        "Revocation registry is full"
+                    )
+                state.next_index = rev_info["curr_id"] + 1
+                state.end_index = min(
+                    rev_info["curr_id"] + self.rev_reg_allocator.block_size,
+                    max_cred_num,
+                )
+                rev_info["curr_id"] = state.end_index
+                await txn.handle.replace(
+                    CATEGORY_REV_REG_INFO, revoc_reg_id, value_json=rev_info
+                )
+                await txn.commit()
+        except AskarError as err:
+            raise IndyIssuerError("Error updating revocation registry index") from err
+
+        state.rev_reg = rev_reg.raw_value
+        state.used_ids = rev_info.get("used_ids") or []
+        state.stale = False
+        return state
+
+    async def _refresh_rev_reg(self, revoc_reg_id: str, state: RevRegIssuanceState):
+        """Reload the registry accumulator after credentials have been revoked."""
+        try:
+            async with self._profile.session() as session:
+                rev_reg = await session.handle.fetch(CATEGORY_REV_REG, revoc_reg_id)
+                rev_reg_info = await session.handle.fetch(
+                    CATEGORY_REV_REG_INFO, revoc_reg_id
+                )
+        except AskarError as err:
+            raise IndyIssuerError("Error retrieving revocation registry") from err
+        if not rev_reg:
+            raise IndyIssuerError("Revocation registry not found")
+        if not rev_reg_info:
+            raise IndyIssuerError("Revocation registry metadata not found")
+        state.rev_reg = rev_reg.raw_value
+        state.used_ids = rev_reg_info.value_json.get("used_ids") or []
+        state.stale = False
 
     async def create_credential(
         self,
@@ -242,17 +539,8 @@ class IndyCredxIssuer(IndyIssuer):
 
         """
         credential_definition_id = credential_offer["cred_def_id"]
-        try:
-            async with self._profile.session() as session:
-                cred_def = await session.handle.fetch(
-                    CATEGORY_CRED_DEF, credential_definition_id
-                )
-                cred_def_private = await session.handle.fetch(
-                    CATEGORY_CRED_DEF_PRIVATE, credential_definition_id
-                )
-        except AskarError as err:
-            raise IndyIssuerError("Error retrieving credential definition") from err
-        if not cred_def or not cred_def_private:
+        cred_def = await self._get_cred_def(credential_definition_id)
+        if not cred_def or not cred_def.cred_def_private:
             raise IndyIssuerError(
                 "Credential definition not found for credential issuance"
             )
@@ -273,65 +561,13 @@ class IndyCredxIssuer(IndyIssuer):
             raw_values[attribute] = str(credential_value)
 
         if revoc_reg_id:
-            try:
-                async with self._profile.transaction() as txn:
-                    rev_reg = await txn.handle.fetch(CATEGORY_REV_REG, revoc_reg_id)
-                    rev_reg_info = await txn.handle.fetch(
-                        CATEGORY_REV_REG_INFO, revoc_reg_id, for_update=True
-                    )
-                    rev_reg_def = await txn.handle.fetch(
-                        CATEGORY_REV_REG_DEF, revoc_reg_id
-                    )
-                    rev_key = await txn.handle.fetch(
-                        CATEGORY_REV_REG_DEF_PRIVATE, revoc_reg_id
-                    )
-                    if not rev_reg:
-                        raise IndyIssuerError("Revocation registry not found")
-                    if not rev_reg_info:
-                        raise IndyIssuerError("Revocation registry metadata not found")
-                    if not rev_reg_def:
-                        raise IndyIssuerError(
-                            "Revocation registry definition not found"
-                        )
-                    if not rev_key:
-                        raise IndyIssuerError(
-                            "Revocation registry definition private data not found"
-                        )
-                    # NOTE: we increment the index ahead of time to keep the
-                    # transaction short. The revocation registry itself will NOT
-                    # be updated because we always use ISSUANCE_BY_DEFAULT.
-                    # If something goes wrong later, the index will be skipped.
-                    # FIXME - double check issuance type in case of upgraded wallet?
-                    rev_info = rev_reg_info.value_json
-                    rev_reg_index = rev_info["curr_id"] + 1
-                    try:
-                        rev_reg_def = RevocationRegistryDefinition.load(
-                            rev_reg_def.raw_value
-                        )
-                    except CredxError as err:
-                        raise IndyIssuerError(
-                            "Error loading revocation registry definition"
-                        ) from err
-                    if rev_reg_index > rev_reg_def.max_cred_num:
-                        raise IndyIssuerRevocationRegistryFullError(
-                            "Revocation registry is full"
-                        )
-                    rev_info["curr_id"] = rev_reg_index
-                    await txn.handle.replace(
-                        CATEGORY_REV_REG_INFO, revoc_reg_id, value_json=rev_info
-                    )
-                    await txn.commit()
-            except AskarError as err:
-                raise IndyIssuerError(
-                    "Error updating revocation registry index"
-                ) from err
-
+            rev_reg_index, state = await self._allocate_rev_reg_index(revoc_reg_id)
             revoc = CredentialRevocationConfig(
-                rev_reg_def,
-                rev_key.raw_value,
-                rev_reg.raw_value,
+                state.rev_reg_def,
+                state.rev_key,
+                state.rev_reg,
                 rev_reg_index,
-                rev_info.get("used_ids") or [],
+                state.used_ids,
                 tails_file_path,
             )
             credential_revocation_id = str(rev_reg_index)
@@ -344,11 +580,10 @@ class IndyCredxIssuer(IndyIssuer):
                 credential,
                 _upd_rev_reg,
                 _delta,
-            ) = await asyncio.get_event_loop().run_in_executor(
-                None,
+            ) = await self._sign(
                 Credential.create,
-                cred_def.raw_value,
-                cred_def_private.raw_value,
+                cred_def.cred_def,
+                cred_def.cred_def_private,
                 credential_offer,
                 credential_request,
                 raw_values,
@@ -497,6 +732,7 @@ class IndyCredxIssuer(IndyIssuer):
                         CATEGORY_REV_REG_INFO, revoc_reg_id, value_json=rev_info_upd
                     )
                     await txn.commit()
+                    self.rev_reg_allocator.mark_stale(revoc_reg_id)
             except AskarError as err:
                 raise IndyIssuerError("Error saving revocation registry") from err
             break
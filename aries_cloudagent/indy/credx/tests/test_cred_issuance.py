@@ -6,6 +6,7 @@ from asynctest import mock as async_mock, TestCase as AsyncTestCase
 
 from ....askar.profile import AskarProfileManager
 from ....config.injection_context import InjectionContext
+from ....indy.issuer import IndyIssuerSigningPool
 from ....ledger.base import BaseLedger
 from ....ledger.multiple_ledger.ledger_requests_executor import (
     IndyLedgerRequestsExecutor,
@@ -339,3 +340,204 @@ class TestIndyCredxIssuance(AsyncTestCase):
         )
 
         await self.holder.delete_credential(cred_id)
+
+    async def test_issue_rev_index_blocks(self):
+        self.issuer_profile.context.update_settings({"revocation.index_block_size": 4})
+        (s_id, schema_json) = await self.issuer.create_schema(
+            TEST_DID,
+            SCHEMA_NAME,
+            SCHEMA_VERSION,
+            ["name", "moniker"],
+        )
+        schema = json.loads(schema_json)
+        schema["seqNo"] = SCHEMA_TXN
+        (
+            cd_id,
+            cred_def_json,
+        ) = await self.issuer.create_and_store_credential_definition(
+            TEST_DID, schema, support_revocation=True
+        )
+        cred_def = json.loads(cred_def_json)
+
+        async def curr_id() -> int:
+            async with self.issuer_profile.session() as session:
+                rev_reg_info = await session.handle.fetch(
+                    issuer.CATEGORY_REV_REG_INFO, reg_id
+                )
+            return rev_reg_info.value_json["curr_id"]
+
+        with tempfile.TemporaryDirectory() as tmp_path:
+            (
+                reg_id,
+                reg_def_json,
+                _,
+            ) = await self.issuer.create_and_store_revocation_registry(
+                TEST_DID, cd_id, "CL_ACCUM", "0", 10, tmp_path
+            )
+            tails_path = json.loads(reg_def_json)["value"]["tailsLocation"]
+            cred_offer = json.loads(await self.issuer.create_credential_offer(cd_id))
+            cred_req_json, _ = await self.holder.create_credential_request(
+                cred_offer, cred_def, TEST_DID
+            )
+            cred_req = json.loads(cred_req_json)
+
+            async def issue():
+                return await self.issuer.create_credential(
+                    schema,
+                    cred_offer,
+                    cred_req,
+                    {"name": "NAME", "moniker": "MONIKER"},
+                    revoc_reg_id=reg_id,
+                    tails_file_path=tails_path,
+                )
+
+            cred_rev_ids = [(await issue())[1] for _ in range(6)]
+            assert cred_rev_ids == ["1", "2", "3", "4", "5", "6"]
+            # two blocks of four indexes have been reserved
+            assert await curr_id() == 8
+
+            # the registry definition and private key are not read again
+            with async_mock.patch.object(
+                issuer.RevocationRegistryDefinition,
+                "load",
+                wraps=issuer.RevocationRegistryDefinition.load,
+            ) as mock_load:
+                (_, skipped_ids) = await self.issuer.revoke_credentials(
+                    reg_id, tails_path, (1,)
+                )
+                assert not skipped_ids
+                state = self.issuer.rev_reg_allocator.get(reg_id)
+                assert state.stale
+                cred_json, cred_rev_id = await issue()
+                assert cred_rev_id == "7"
+                assert not state.stale
+                assert state.used_ids == [1]
+                # only revoke_credentials loads the definition
+                assert mock_load.call_count == 1
+
+            # the unused index is given back
+            await self.issuer.rev_reg_allocator.release(self.issuer_profile)
+            assert await curr_id() == 7
+
+            assert [(await issue())[1] for _ in range(3)] == ["8", "9", "10"]
+            with self.assertRaises(issuer.IndyIssuerRevocationRegistryFullError):
+                await issue()
+
+    async def test_release_rev_index_block_skipped(self):
+        allocator = issuer.RevRegIndexAllocator(block_size=4)
+        state = issuer.RevRegIssuanceState(None, b"")
+        state.next_index = 3
+        state.end_index = 4
+        allocator.set(REV_REG_ID, state)
+
+        async with self.issuer_profile.session() as session:
+            # a later block has been reserved by another agent instance
+            await session.handle.insert(
+                issuer.CATEGORY_REV_REG_INFO,
+                REV_REG_ID,
+                value_json={"curr_id": 8, "used_ids": []},
+            )
+
+        await allocator.release(self.issuer_profile)
+        async with self.issuer_profile.session() as session:
+            rev_reg_info = await session.handle.fetch(
+                issuer.CATEGORY_REV_REG_INFO, REV_REG_ID
+            )
+        assert rev_reg_info.value_json["curr_id"] == 8
+        assert not allocator.get(REV_REG_ID)
+
+    async def test_issue_batch_cached_cred_def(self):
+        (s_id, schema_json) = await self.issuer.create_schema(
+            TEST_DID,
+            SCHEMA_NAME,
+            SCHEMA_VERSION,
+            ["name", "moniker"],
+        )
+        schema = json.loads(schema_json)
+        schema["seqNo"] = SCHEMA_TXN
+        (
+            cd_id,
+            cred_def_json,
+        ) = await self.issuer.create_and_store_credential_definition(
+            TEST_DID, schema, support_revocation=False
+        )
+        cred_def = json.loads(cred_def_json)
+        signing_pool = IndyIssuerSigningPool(max_workers=2)
+        self.issuer_profile.context.injector.bind_instance(
+            IndyIssuerSigningPool, signing_pool
+        )
+
+        with async_mock.patch.object(
+            issuer.CredentialDefinitionPrivate,
+            "load",
+            wraps=issuer.CredentialDefinitionPrivate.load,
+        ) as mock_load:
+            requests = []
+            for _ in range(4):
+                cred_offer = json.loads(
+                    await self.issuer.create_credential_offer(cd_id)
+                )
+                (
+                    cred_req_json,
+                    cred_req_meta_json,
+                ) = await self.holder.create_credential_request(
+                    cred_offer, cred_def, TEST_DID
+                )
+                requests.append(
+                    (
+                        cred_offer,
+                        json.loads(cred_req_json),
+                        json.loads(cred_req_meta_json),
+                    )
+                )
+
+            results = await self.issuer.create_credentials_batch(
+                [
+                    {
+                        "schema": schema,
+                        "credential_offer": cred_offer,
+                        "credential_request": cred_req,
+                        "credential_values": (
+                            {"name": f"NAME{i}", "moniker": "MONIKER"} if i else {}
+                        ),
+                    }
+                    for i, (cred_offer, cred_req, _) in enumerate(requests)
+                ]
+            )
+            # the credential definition is loaded once for all offers and credentials
+            assert mock_load.call_count == 1
+        # credentials are signed in the shared signing pool
+        assert signing_pool._executor
+        signing_pool.shutdown()
+
+        assert isinstance(results[0], issuer.IndyIssuerError)
+        for i, (cred_json, cred_rev_id) in enumerate(results[1:], 1):
+            assert cred_rev_id is None
+            cred_id = await self.holder.store_credential(
+                cred_def, json.loads(cred_json), requests[i][2]
+            )
+            found = json.loads(await self.holder.get_credential(cred_id))
+            assert found["attrs"]["name"] == f"NAME{i}"
+
+        # a newly created credential definition replaces the cached one
+        with async_mock.patch.object(
+            self.issuer.cred_def_cache, "remove", async_mock.MagicMock()
+        ) as mock_remove:
+            (other_id, _) = await self.issuer.create_and_store_credential_definition(
+                TEST_DID, schema, tag="other", support_revocation=False
+            )
+            mock_remove.assert_called_once_with(other_id)
+
+
+def test_cred_def_cache():
+    cache = issuer.CredDefCache(capacity=2)
+    entries = [issuer.IssuerCredDef(None, None, None, None) for _ in range(3)]
+    cache.set("a", entries[0])
+    cache.set("b", entries[1])
+    assert cache.get("a") is entries[0]
+    cache.set("c", entries[2])
+    assert cache.get("b") is None
+    assert cache.get("a") is entries[0]
+    cache.remove("a")
+    assert cache.get("a") is None
+    assert cache.get("c") is entries[2]
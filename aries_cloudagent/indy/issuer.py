@@ -1,9 +1,12 @@
 """Base Indy Issuer class."""
 
+import asyncio
+
 from abc import ABC, ABCMeta, abstractmethod
-from typing import Sequence, Tuple
+from typing import Mapping, Sequence, Tuple, Union
 
 from ..core.error import BaseError
+from ..utils.worker_pool import WorkerPool
 
 
 DEFAULT_CRED_DEF_TAG = "default"
@@ -18,6 +21,10 @@ class IndyIssuerRevocationRegistryFullError(IndyIssuerError):
     """Revocation registry is full when issuing a new credential."""
 
 
+class IndyIssuerSigningPool(WorkerPool):
+    """Pool of threads for signing issued credentials, shared by all profiles."""
+
+
 class IndyIssuer(ABC, metaclass=ABCMeta):
     """Base class for Indy Issuer."""
 
@@ -141,6 +148,32 @@ class IndyIssuer(ABC, metaclass=ABCMeta):
 
         """
 
+    async def create_credentials_batch(
+        self, credentials: Sequence[Mapping]
+    ) -> Sequence[Union[Tuple[str, str], IndyIssuerError]]:
+        """
+        Create a batch of credentials.
+
+        Args:
+            credentials: Sequence of keyword arguments for `create_credential`,
+                one mapping for each credential to create
+
+        Returns:
+            A list holding, in order, a tuple of created credential and
+            revocation id or the `IndyIssuerError` raised for each credential
+
+        """
+        results = await asyncio.gather(
+            *(self.create_credential(**args) for args in credentials),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception) and not isinstance(
+                result, IndyIssuerError
+            ):
+                raise result
+        return results
+
     @abstractmethod
     async def revoke_credentials(
         self,
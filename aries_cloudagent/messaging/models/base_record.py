@@ -6,14 +6,29 @@ import sys
 import uuid
 
 from datetime import datetime
-from typing import Any, Mapping, Optional, Sequence, Type, TypeVar, Union
+from typing import (
+    Any,
+    AsyncIterator,
+    Mapping,
+    Optional,
+    Sequence,
+    Type,
+    TypeVar,
+    Union,
+)
 
 from marshmallow import fields
 
 from ...cache.base import BaseCache
 from ...config.settings import BaseSettings
 from ...core.profile import ProfileSession
-from ...storage.base import BaseStorage, StorageDuplicateError, StorageNotFoundError
+from ...storage.base import (
+    DEFAULT_PAGE_SIZE,
+    BaseStorage,
+    BaseStorageSearch,
+    StorageDuplicateError,
+    StorageNotFoundError,
+)
 from ...storage.record import StorageRecord
 
 from ..util import datetime_to_str, time_now
@@ -297,10 +312,17 @@ class BaseRecord(BaseModel):
         post_filter_positive: dict = None,
         post_filter_negative: dict = None,
         alt: bool = False,
+        limit: int = None,
+        offset: int = None,
+        order_by: str = None,
+        descending: bool = False,
     ) -> Sequence[RecordType]:
         """
         Query stored records.
 
+        When `limit`, `offset` or `order_by` are given, the records are read from
+        a storage search page by page rather than loaded all at once.
+
         Args:
             session: The profile session to use
             tag_filter: An optional dictionary of tag filter clauses
@@ -308,8 +330,38 @@ class BaseRecord(BaseModel):
             post_filter_negative: Additional value filters to apply matching negatively
             alt: set to match any (positive=True) value or miss all (positive=False)
                 values in post_filter
+            limit: The maximum number of records to return
+            offset: The number of matching records to skip
+            order_by: The name of a record attribute to sort the results by
+            descending: Whether to sort the results in descending order
         """
 
+        if order_by:
+            return await cls._query_ordered(
+                session,
+                tag_filter,
+                post_filter_positive=post_filter_positive,
+                post_filter_negative=post_filter_negative,
+                alt=alt,
+                limit=limit,
+                offset=offset,
+                order_by=order_by,
+                descending=descending,
+            )
+        if limit is not None or offset:
+            return [
+                record
+                async for record in cls.query_iter(
+                    session,
+                    tag_filter,
+                    post_filter_positive=post_filter_positive,
+                    post_filter_negative=post_filter_negative,
+                    alt=alt,
+                    limit=limit,
+                    offset=offset,
+                )
+            ]
+
         storage = session.inject(BaseStorage)
         rows = await storage.find_all_records(
             cls.RECORD_TYPE,
@@ -336,6 +388,121 @@ class BaseRecord(BaseModel):
                     raise BaseModelError(f"{err}, for record id {record.id}")
         return result
 
+    @classmethod
+    async def query_iter(
+        cls: Type[RecordType],
+        session: ProfileSession,
+        tag_filter: dict = None,
+        *,
+        post_filter_positive: dict = None,
+        post_filter_negative: dict = None,
+        alt: bool = False,
+        limit: int = None,
+        offset: int = None,
+        page_size: int = None,
+    ) -> AsyncIterator[RecordType]:
+        """
+        Iterate over stored records, fetching them from storage page by page.
+
+        The offset and limit are passed on to the storage search unless post
+        filters are given, in which case they apply to the filtered records.
+
+        Args:
+            session: The profile session to use
+            tag_filter: An optional dictionary of tag filter clauses
+            post_filter_positive: Additional value filters to apply matching positively
+            post_filter_negative: Additional value filters to apply matching negatively
+            alt: set to match any (positive=True) value or miss all (positive=False)
+                values in post_filter
+            limit: The maximum number of records to return
+            offset: The number of matching records to skip
+            page_size: The number of records to fetch from storage at a time
+        """
+        if limit is not None and limit <= 0:
+            return
+        post_filter = bool(post_filter_positive or post_filter_negative)
+        options = {"retrieveTags": False}
+        if not post_filter:
+            if offset:
+                options["offset"] = offset
+            if limit is not None:
+                options["limit"] = limit
+        skip = (offset or 0) if post_filter else 0
+        remaining = limit if post_filter else None
+
+        search = session.inject(BaseStorageSearch).search_records(
+            cls.RECORD_TYPE, cls.prefix_tag_filter(tag_filter), page_size, options
+        )
+        try:
+            while True:
+                rows = await search.fetch()
+                if not rows:
+                    break
+                for record in rows:
+                    vals = json.loads(record.value)
+                    if post_filter and not (
+                        match_post_filter(
+                            vals, post_filter_positive, positive=True, alt=alt
+                        )
+                        and match_post_filter(
+                            vals, post_filter_negative, positive=False, alt=alt
+                        )
+                    ):
+                        continue
+                    if skip:
+                        skip -= 1
+                        continue
+                    try:
+                        yield cls.from_storage(record.id, vals)
+                    except BaseModelError as err:
+                        raise BaseModelError(f"{err}, for record id {record.id}")
+                    if remaining is not None:
+                        remaining -= 1
+                        if not remaining:
+                            return
+        finally:
+            await search.close()
+
+    @classmethod
+    async def _query_ordered(
+        cls: Type[RecordType],
+        session: ProfileSession,
+        tag_filter: dict = None,
+        *,
+        order_by: str,
+        descending: bool = False,
+        limit: int = None,
+        offset: int = None,
+        **kwargs,
+    ) -> Sequence[RecordType]:
+        """
+        Query stored records sorted by an attribute.
+
+        Storage searches have no ordering, so the matching records are sorted
+        here. When a limit is given, only the leading `offset + limit` records
+        are retained while reading, which bounds the memory used.
+        """
+        if order_by not in cls._get_schema_class()._declared_fields:
+            raise BaseModelError(
+                f"Cannot order {cls.__name__} records by unknown field: {order_by}"
+            )
+
+        def sort_key(record: BaseRecord):
+            value = getattr(record, order_by, None)
+            # records without a value sort last
+            return (value is None) != descending, "" if value is None else value
+
+        offset = offset or 0
+        keep = offset + limit if limit is not None else None
+        result = []
+        async for record in cls.query_iter(session, tag_filter, **kwargs):
+            result.append(record)
+            if keep is not None and len(result) >= 2 * keep + DEFAULT_PAGE_SIZE:
+                result.sort(key=sort_key, reverse=descending)
+                del result[keep:]
+        result.sort(key=sort_key, reverse=descending)
+        return result[offset:keep]
+
     async def save(
         self,
         session: ProfileSession,
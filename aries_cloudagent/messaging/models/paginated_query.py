@@ -0,0 +1,53 @@
+"""Paging and ordering parameters for admin list requests."""
+
+from aiohttp import web
+from marshmallow import ValidationError, fields, validate
+
+from .openapi import OpenAPISchema
+
+
+class PaginatedQuerySchema(OpenAPISchema):
+    """Parameters and validators for paging and ordering a list of records."""
+
+    limit = fields.Int(
+        description="Maximum number of records to return",
+        required=False,
+        validate=validate.Range(min=1),
+        example=100,
+    )
+    offset = fields.Int(
+        description="Number of matching records to skip",
+        required=False,
+        validate=validate.Range(min=0),
+        example=0,
+    )
+    order_by = fields.Str(
+        description="Record attribute to order the results by",
+        required=False,
+        example="created_at",
+    )
+    descending = fields.Bool(
+        description="Order the results in descending order",
+        required=False,
+        example=False,
+    )
+
+
+def get_paginated_query_params(request: web.BaseRequest) -> dict:
+    """
+    Read the paging and ordering parameters from a request query string.
+
+    Returns:
+        A dictionary of the parameters given, suitable for passing as keyword
+        arguments to `BaseRecord.query`
+
+    """
+    query = {
+        name: request.query[name]
+        for name in PaginatedQuerySchema._declared_fields
+        if request.query.get(name) not in (None, "")
+    }
+    try:
+        return PaginatedQuerySchema().load(query)
+    except ValidationError as err:
+        raise web.HTTPBadRequest(reason=str(err.messages)) from err
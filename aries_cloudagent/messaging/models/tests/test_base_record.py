@@ -260,6 +260,62 @@ class TestBaseRecord(AsyncTestCase):
         )
         assert not result
 
+    async def test_query_paginated(self):
+        session = InMemoryProfile.test_session()
+        for index in range(5):
+            record = ARecordImpl(a=str(index), b="even" if index % 2 else "odd")
+            await record.save(session)
+
+        result = await ARecordImpl.query(session, limit=2, offset=1)
+        assert [record.a for record in result] == ["1", "2"]
+
+        result = await ARecordImpl.query(
+            session, post_filter_positive={"b": "odd"}, limit=1, offset=1
+        )
+        assert [record.a for record in result] == ["2"]
+
+        result = await ARecordImpl.query(session, offset=4)
+        assert [record.a for record in result] == ["4"]
+
+        found = [
+            record.a async for record in ARecordImpl.query_iter(session, page_size=2)
+        ]
+        assert found == ["0", "1", "2", "3", "4"]
+
+        found = [record.a async for record in ARecordImpl.query_iter(session, limit=0)]
+        assert found == []
+
+    async def test_query_ordered(self):
+        session = InMemoryProfile.test_session()
+        for index in (3, 0, 4, 1, 2):
+            record = ARecordImpl(a=str(index), b="b")
+            await record.save(session)
+
+        result = await ARecordImpl.query(session, order_by="a")
+        assert [record.a for record in result] == ["0", "1", "2", "3", "4"]
+
+        result = await ARecordImpl.query(
+            session, order_by="a", descending=True, limit=2, offset=1
+        )
+        assert [record.a for record in result] == ["3", "2"]
+
+        with self.assertRaises(BaseModelError):
+            await ARecordImpl.query(session, order_by="unknown")
+
+    async def test_query_ordered_bounded(self):
+        session = InMemoryProfile.test_session()
+        values = list(range(500))
+        for index in values[::2] + values[1::2]:
+            record = ARecordImpl(a=f"{index:04d}", b="b")
+            await record.save(session)
+
+        result = await ARecordImpl.query(
+            session, order_by="a", descending=True, limit=10, offset=5
+        )
+        assert [record.a for record in result] == [
+            f"{index:04d}" for index in range(494, 484, -1)
+        ]
+
     @async_mock.patch("builtins.print")
     def test_log_state(self, mock_print):
         test_param = "test.log"
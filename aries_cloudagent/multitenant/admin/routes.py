@@ -15,6 +15,10 @@ from ...core.error import BaseError
 from ...core.profile import ProfileManagerProvider
 from ...messaging.models.base import BaseModelError
 from ...messaging.models.openapi import OpenAPISchema
+from ...messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ...messaging.valid import JSONWebToken, UUIDFour
 from ...multitenant.base import BaseMultitenantManager
 from ...storage.error import StorageError, StorageNotFoundError
@@ -209,7 +213,7 @@ class WalletListSchema(OpenAPISchema):
     )
 
 
-class WalletListQueryStringSchema(OpenAPISchema):
+class WalletListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for wallet list request query string."""
 
     wallet_name = fields.Str(description="Wallet name", example="MyNewWallet")
@@ -233,12 +237,14 @@ async def wallets_list(request: web.BaseRequest):
     wallet_name = request.query.get("wallet_name")
     if wallet_name:
         query["wallet_name"] = wallet_name
+    paging = get_paginated_query_params(request)
 
     try:
         async with profile.session() as session:
-            records = await WalletRecord.query(session, tag_filter=query)
+            records = await WalletRecord.query(session, tag_filter=query, **paging)
         results = [format_wallet_record(record) for record in records]
-        results.sort(key=lambda w: w["created_at"])
+        if not paging:
+            results.sort(key=lambda w: w["created_at"])
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
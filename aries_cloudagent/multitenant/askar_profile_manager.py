@@ -4,18 +4,31 @@ from typing import Iterable, Optional, cast
 from ..core.profile import (
     Profile,
 )
+from ..config.base import BaseSettings
 from ..config.wallet import wallet_config
 from ..config.injection_context import InjectionContext
 from ..wallet.models.wallet_record import WalletRecord
 from ..askar.profile import AskarProfile
 from ..multitenant.base import BaseMultitenantManager
 
+from .cache import ProfileCache
+
 
 class AskarProfileMultitenantManager(BaseMultitenantManager):
     """Class for handling askar profile multitenancy."""
 
     DEFAULT_MULTITENANT_WALLET_NAME = "multitenant_sub_wallet"
 
+    # settings determining the ledger pool of a profile
+    LEDGER_POOL_SETTINGS = (
+        "ledger.disabled",
+        "ledger.genesis_transactions",
+        "ledger.pool_name",
+        "ledger.keepalive",
+        "ledger.read_only",
+        "ledger.socks_proxy",
+    )
+
     def __init__(self, profile: Profile, multitenant_profile: AskarProfile = None):
         """Initialize askar profile multitenant Manager.
 
@@ -24,6 +37,12 @@ class AskarProfileMultitenantManager(BaseMultitenantManager):
         """
         super().__init__(profile)
         self._multitenant_profile: Optional[AskarProfile] = multitenant_profile
+        self._profiles = ProfileCache(
+            profile.settings.get_int("multitenant.cache_size") or 100
+        )
+        self._ledger_pools = {}
+        if multitenant_profile:
+            self._add_ledger_pool(multitenant_profile)
 
     @property
     def open_profiles(self) -> Iterable[Profile]:
@@ -51,6 +70,9 @@ class AskarProfileMultitenantManager(BaseMultitenantManager):
         to look different from others, especially since no explicit clean up is
         required for profiles that are no longer in use.
 
+        Profiles are kept in an LRU cache and reused for later requests. Tenants
+        with the same ledger settings share a single ledger pool.
+
         Args:
             base_context: Base context to extend from
             wallet_record: Wallet record to get the context for
@@ -82,14 +104,19 @@ class AskarProfileMultitenantManager(BaseMultitenantManager):
 
             profile, _ = await wallet_config(context, provision=False)
             self._multitenant_profile = cast(AskarProfile, profile)
-
-        profile_context = self._multitenant_profile.context.copy()
+            self._add_ledger_pool(self._multitenant_profile)
 
         if provision:
             await self._multitenant_profile.store.create_profile(
                 wallet_record.wallet_id
             )
 
+        profile = self._profiles.get(wallet_record.wallet_id)
+        if profile:
+            return profile
+
+        profile_context = self._multitenant_profile.context.copy()
+
         extra_settings = {
             "admin.webhook_urls": self.get_webhook_urls(base_context, wallet_record),
             "wallet.askar_profile": wallet_record.wallet_id,
@@ -101,11 +128,49 @@ class AskarProfileMultitenantManager(BaseMultitenantManager):
 
         assert self._multitenant_profile.opened
 
-        return AskarProfile(
+        ledger_pool = self._ledger_pools.get(
+            self._ledger_pool_key(profile_context.settings)
+        )
+        profile = AskarProfile(
             self._multitenant_profile.opened,
             profile_context,
             profile_id=wallet_record.wallet_id,
+            ledger_pool=ledger_pool,
         )
+        if not ledger_pool:
+            self._add_ledger_pool(profile)
+        self._profiles.put(wallet_record.wallet_id, profile)
+
+        return profile
+
+    def _ledger_pool_key(self, settings: BaseSettings) -> tuple:
+        """Get the key identifying the ledger pool for a set of settings."""
+        return tuple(settings.get(name) for name in self.LEDGER_POOL_SETTINGS)
+
+    def _add_ledger_pool(self, profile: AskarProfile):
+        """Record the ledger pool of a profile, to be shared with other tenants."""
+        if profile.ledger_pool:
+            self._ledger_pools.setdefault(
+                self._ledger_pool_key(profile.settings), profile.ledger_pool
+            )
+
+    async def update_wallet(self, wallet_id: str, new_settings: dict) -> WalletRecord:
+        """Update an existing wallet record.
+
+        The cached profile for the wallet, if any, is dropped so that the next
+        request uses the updated settings.
+
+        Args:
+            wallet_id: The wallet id of the wallet record
+            new_settings: The context settings to be updated for this wallet
+
+        Returns:
+            WalletRecord: The updated wallet record
+
+        """
+        wallet_record = await super().update_wallet(wallet_id, new_settings)
+        self._profiles.remove(wallet_id)
+        return wallet_record
 
     async def remove_wallet_profile(self, profile: Profile):
         """Remove the wallet profile instance.
@@ -114,4 +179,5 @@ class AskarProfileMultitenantManager(BaseMultitenantManager):
             profile: The wallet profile instance
 
         """
+        self._profiles.remove(profile.settings.get_str("wallet.id"))
         await profile.remove()
@@ -1,30 +1,42 @@
 """Manager for multitenancy."""
 
 from abc import ABC, abstractmethod
+import asyncio
 from datetime import datetime
+import hashlib
 import logging
-from typing import Iterable, List, Optional, cast
+import re
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, cast
 
 import jwt
 
+from ..cache.in_memory import InMemoryCache
 from ..config.injection_context import InjectionContext
 from ..core.error import BaseError
+from ..core.event_bus import Event, EventBus
 from ..core.profile import Profile, ProfileSession
 from ..protocols.coordinate_mediation.v1_0.manager import (
     MediationManager,
     MediationRecord,
 )
 from ..protocols.coordinate_mediation.v1_0.route_manager import RouteManager
-from ..protocols.routing.v1_0.manager import RouteNotFoundError, RoutingManager
+from ..protocols.routing.v1_0.manager import RECIP_ROUTE_PAUSE, RECIP_ROUTE_RETRY
 from ..protocols.routing.v1_0.models.route_record import RouteRecord
 from ..storage.base import BaseStorage
+from ..storage.error import StorageNotFoundError
 from ..transport.wire_format import BaseWireFormat
 from ..wallet.base import BaseWallet
 from ..wallet.models.wallet_record import WalletRecord
 from .error import WalletKeyMissingError
+from .routing_index import RoutingIndex
 
 LOGGER = logging.getLogger(__name__)
 
+ROUTE_EVENT_PATTERN = re.compile(
+    f"^{RouteRecord.EVENT_NAMESPACE}::{RouteRecord.RECORD_TOPIC}(::.*)?$"
+)
+
 
 class MultitenantManagerError(BaseError):
     """Generic multitenant error."""
@@ -42,6 +54,91 @@ class BaseMultitenantManager(ABC):
         self._profile = profile
         if not profile:
             raise MultitenantManagerError("Missing profile")
+        settings = profile.settings
+        # verified token bodies, by token hash: a token never changes, and it is
+        # checked against the wallet record on every use, so these need no
+        # invalidation
+        self._token_cache = InMemoryCache(
+            max_entries=settings.get_int("multitenant.token_cache_size") or 10000
+        )
+        # wallet records, by wallet id: only invalidated in this process, so a
+        # record changed by another agent instance may be used for up to the
+        # time to live. Disabled unless a time to live is configured.
+        self._wallet_cache = InMemoryCache(
+            max_entries=settings.get_int("multitenant.wallet_cache_size") or 10000
+        )
+        self._wallet_cache_ttl = settings.get_int("multitenant.wallet_cache_ttl") or 0
+        # incremented whenever any wallet record is invalidated
+        self._wallet_generation = 0
+        # sub wallet ids, by recipient key
+        self._routing_index = RoutingIndex(
+            capacity=settings.get_int("multitenant.route_index_size") or 100000,
+            miss_ttl=float(settings.get("multitenant.route_miss_ttl", 5)),
+            route_ttl=float(settings.get("multitenant.route_ttl", 60)),
+        )
+        event_bus = profile.inject_or(EventBus)
+        if event_bus:
+            event_bus.subscribe(ROUTE_EVENT_PATTERN, self._on_route_event)
+
+    @property
+    def cache_stats(self) -> dict:
+        """Accessor for the counters of the token, wallet record and route caches."""
+        return {
+            "tokens": self._token_cache.stats,
+            "wallet_records": self._wallet_cache.stats,
+            "routes": self._routing_index.stats,
+        }
+
+    async def load_routing_index(self):
+        """Load the sub wallet routes from storage into the routing index."""
+        index = self._routing_index
+        async with self._profile.session() as session:
+            async for route in RouteRecord.query_iter(
+                session, {"role": RouteRecord.ROLE_SERVER}
+            ):
+                if route.wallet_id and route.recipient_key:
+                    index.add(route.recipient_key, route.wallet_id)
+        index.loaded = True
+        LOGGER.info("Loaded %d sub wallet routes into routing index", len(index))
+
+    async def _on_route_event(self, profile: Profile, event: Event):
+        """Keep the routing index current with saved and deleted routes."""
+        route = event.payload or {}
+        recipient_key = route.get("recipient_key")
+        if not recipient_key:
+            return
+        if event.topic.endswith(f"::{RouteRecord.STATE_DELETED}"):
+            self._routing_index.remove(recipient_key)
+        elif route.get("wallet_id"):
+            self._routing_index.add(recipient_key, route["wallet_id"])
+        else:
+            # a route to a connection of the base wallet
+            self._routing_index.remove(recipient_key)
+
+    async def _get_wallet_record(self, wallet_id: str) -> WalletRecord:
+        """Get a wallet record, using the wallet record cache.
+
+        A record read from storage is only cached if no wallet record was
+        invalidated while it was being read, so that a superseded record cannot
+        replace a newer one.
+        """
+        if not self._wallet_cache_ttl:
+            async with self._profile.session() as session:
+                return await WalletRecord.retrieve_by_id(session, wallet_id)
+        wallet = await self._wallet_cache.get(wallet_id)
+        if wallet:
+            return wallet
+        generation = self._wallet_generation
+        async with self._profile.session() as session:
+            wallet = await WalletRecord.retrieve_by_id(session, wallet_id)
+        if self._wallet_generation == generation:
+            await self._wallet_cache.set(wallet_id, wallet, self._wallet_cache_ttl)
+        return wallet
+
+    async def _invalidate_wallet_record(self, wallet_id: str):
+        """Remove a wallet record from the cache after it has been changed."""
+        self._wallet_generation += 1
+        await self._wallet_cache.clear(wallet_id)
 
     @property
     @abstractmethod
@@ -228,6 +325,7 @@ class BaseMultitenantManager(ABC):
             wallet_record = await WalletRecord.retrieve_by_id(session, wallet_id)
             wallet_record.update_settings(new_settings)
             await wallet_record.save(session)
+        await self._invalidate_wallet_record(wallet_id)
 
         return wallet_record
 
@@ -270,6 +368,8 @@ class BaseMultitenantManager(ABC):
             )
 
             await wallet.delete_record(session)
+        self._routing_index.remove_wallet(wallet.wallet_id)
+        await self._invalidate_wallet_record(wallet_id)
 
     @abstractmethod
     async def remove_wallet_profile(self, profile: Profile):
@@ -315,6 +415,7 @@ class BaseMultitenantManager(ABC):
         wallet_record.jwt_iat = iat
         async with self._profile.session() as session:
             await wallet_record.save(session)
+        await self._invalidate_wallet_record(wallet_record.wallet_id)
 
         return token
 
@@ -335,17 +436,15 @@ class BaseMultitenantManager(ABC):
             Profile associated with the token
 
         """
-        jwt_secret = self._profile.context.settings.get("multitenant.jwt_secret")
         extra_settings = {}
 
-        token_body = jwt.decode(token, jwt_secret, algorithms=["HS256"])
+        token_body = await self._decode_token(token)
 
         wallet_id = token_body.get("wallet_id")
         wallet_key = token_body.get("wallet_key")
         iat = token_body.get("iat")
 
-        async with self._profile.session() as session:
-            wallet = await WalletRecord.retrieve_by_id(session, wallet_id)
+        wallet = await self._get_wallet_record(wallet_id)
 
         if wallet.requires_external_key:
             if not wallet_key:
@@ -360,6 +459,74 @@ class BaseMultitenantManager(ABC):
 
         return profile
 
+    async def _decode_token(self, token: str) -> dict:
+        """Decode and verify a JWT, using the cache of verified tokens.
+
+        Only the signature and expiry are checked here: whether the token has
+        been superseded is checked against the wallet record on every use.
+        """
+        token_hash = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        token_body = await self._token_cache.get(token_hash)
+        if token_body and token_body.get("exp", float("inf")) > time.time():
+            return token_body
+
+        jwt_secret = self._profile.context.settings.get("multitenant.jwt_secret")
+        token_body = jwt.decode(token, jwt_secret, algorithms=["HS256"])
+        await self._token_cache.set(token_hash, token_body)
+        return token_body
+
+    async def _get_wallet_ids_by_keys(
+        self, recipient_keys: Sequence[str]
+    ) -> Dict[str, Optional[str]]:
+        """Get the sub wallet ids routed to by a batch of recipient keys.
+
+        Keys are looked up in the routing index first. The keys it cannot
+        answer for are fetched from storage in a single query, and the result is
+        added to the index. Keys without a route are queried again, up to
+        `RECIP_ROUTE_RETRY` times, in case their route is still being created;
+        only then are they recorded as missing in the index.
+
+        Returns:
+            A dictionary of each recipient key to its wallet id, or `None`
+
+        """
+        found = self._routing_index.lookup(recipient_keys)
+        missing = [key for key in dict.fromkeys(recipient_keys) if key not in found]
+        attempt = 0
+        while missing:
+            routes: Dict[str, List[RouteRecord]] = {key: [] for key in missing}
+            tag_filter = {
+                "role": RouteRecord.ROLE_SERVER,
+                "recipient_key": missing[0] if len(missing) == 1 else {"$in": missing},
+            }
+            async with self._profile.session() as session:
+                async for route in RouteRecord.query_iter(session, tag_filter):
+                    routes[route.recipient_key].append(route)
+
+            missing = []
+            for key, key_routes in routes.items():
+                if len(key_routes) > 1:
+                    LOGGER.warning(
+                        "More than one route record found with recipient key: %s", key
+                    )
+                    found[key] = None
+                elif key_routes and key_routes[0].wallet_id:
+                    found[key] = key_routes[0].wallet_id
+                    self._routing_index.add(key, found[key])
+                elif key_routes:
+                    # a route to a connection of the base wallet
+                    found[key] = None
+                    self._routing_index.add_missing(key)
+                elif attempt < RECIP_ROUTE_RETRY:
+                    missing.append(key)
+                else:
+                    found[key] = None
+                    self._routing_index.add_missing(key)
+            if missing:
+                attempt += 1
+                await asyncio.sleep(RECIP_ROUTE_PAUSE)
+        return found
+
     async def _get_wallet_by_key(self, recipient_key: str) -> Optional[WalletRecord]:
         """Get the wallet record associated with the recipient key.
 
@@ -368,18 +535,20 @@ class BaseMultitenantManager(ABC):
         Returns:
             Wallet record associated with the recipient key
         """
-        routing_mgr = RoutingManager(self._profile)
+        wallet_ids = await self._get_wallet_ids_by_keys([recipient_key])
+        wallet_id = wallet_ids.get(recipient_key)
+        if wallet_id:
+            return await self._get_routed_wallet(recipient_key, wallet_id)
 
+    async def _get_routed_wallet(
+        self, recipient_key: str, wallet_id: str
+    ) -> WalletRecord:
+        """Get the wallet record for a route, dropping the route if it is stale."""
         try:
-            routing_record = await routing_mgr.get_recipient(recipient_key)
-            async with self._profile.session() as session:
-                wallet = await WalletRecord.retrieve_by_id(
-                    session, routing_record.wallet_id
-                )
-
-            return wallet
-        except RouteNotFoundError:
-            pass
+            return await self._get_wallet_record(wallet_id)
+        except StorageNotFoundError:
+            self._routing_index.remove(recipient_key)
+            raise
 
     async def get_profile_for_key(
         self, context: InjectionContext, recipient_key: str
@@ -410,12 +579,13 @@ class BaseMultitenantManager(ABC):
         wire_format = wire_format or self._profile.inject(BaseWireFormat)
 
         recipient_keys = wire_format.get_recipient_keys(message_body)
+        wallet_ids = await self._get_wallet_ids_by_keys(recipient_keys)
         wallets = []
 
         for key in recipient_keys:
-            wallet = await self._get_wallet_by_key(key)
+            wallet_id = wallet_ids.get(key)
 
-            if wallet:
-                wallets.append(wallet)
+            if wallet_id:
+                wallets.append(await self._get_routed_wallet(key, wallet_id))
 
         return wallets
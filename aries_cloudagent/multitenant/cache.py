@@ -109,5 +109,5 @@ class ProfileCache:
         Args:
             key (str): The key to remove from the cache.
         """
-        del self.profiles[key]
-        del self._cache[key]
+        self.profiles.pop(key, None)
+        self._cache.pop(key, None)
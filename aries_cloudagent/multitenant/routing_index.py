@@ -0,0 +1,134 @@
+"""Index of recipient keys to the sub wallets they route to."""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RoutingIndex:
+    """
+    In-memory index of recipient verkeys to sub wallet ids.
+
+    The index holds at most `capacity` routes, evicting the least recently used
+    ones, so a key missing from the index may still have a stored route. Routes
+    are kept for `route_ttl` seconds, which bounds how long a route changed by
+    another agent instance may still be used. Keys known to have no route are
+    remembered separately for `miss_ttl` seconds.
+    """
+
+    def __init__(
+        self, capacity: int = 100000, miss_ttl: float = 5.0, route_ttl: float = 60.0
+    ):
+        """Initialize the routing index.
+
+        Args:
+            capacity: The maximum number of routes to hold
+            miss_ttl: How long to remember that a key has no route, in seconds
+            route_ttl: How long to keep a route, in seconds, or 0 to keep routes
+                until they are removed
+        """
+        self.capacity = capacity
+        self.miss_ttl = miss_ttl
+        self.route_ttl = route_ttl
+        self.loaded = False
+        # wallet id and expiry time, by recipient key
+        self._routes: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._wallet_keys: Dict[str, Set[str]] = {}
+        self._misses: "OrderedDict[str, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        """Get the number of indexed routes."""
+        return len(self._routes)
+
+    @property
+    def stats(self) -> dict:
+        """Accessor for the index counters."""
+        return {
+            "entries": len(self._routes),
+            "negative_entries": len(self._misses),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def add(self, recipient_key: str, wallet_id: str):
+        """Add or replace the route for a recipient key."""
+        self.remove(recipient_key)
+        self._misses.pop(recipient_key, None)
+        expires = time.perf_counter() + self.route_ttl if self.route_ttl else None
+        self._routes[recipient_key] = (wallet_id, expires)
+        self._wallet_keys.setdefault(wallet_id, set()).add(recipient_key)
+        while len(self._routes) > self.capacity:
+            self.remove(next(iter(self._routes)))
+            self.evictions += 1
+
+    def add_missing(self, recipient_key: str):
+        """Remember that a recipient key has no route to a sub wallet."""
+        if not self.miss_ttl:
+            return
+        self.remove(recipient_key)
+        self._misses.pop(recipient_key, None)
+        self._misses[recipient_key] = time.perf_counter() + self.miss_ttl
+        while len(self._misses) > self.capacity:
+            self._misses.popitem(last=False)
+
+    def remove(self, recipient_key: str):
+        """Remove the route for a recipient key, if indexed."""
+        self._misses.pop(recipient_key, None)
+        route = self._routes.pop(recipient_key, None)
+        if route is not None:
+            wallet_id = route[0]
+            keys = self._wallet_keys[wallet_id]
+            keys.discard(recipient_key)
+            if not keys:
+                del self._wallet_keys[wallet_id]
+
+    def remove_wallet(self, wallet_id: str):
+        """Remove all routes to a sub wallet."""
+        for recipient_key in self._wallet_keys.pop(wallet_id, ()):
+            del self._routes[recipient_key]
+
+    def lookup(self, recipient_keys: Iterable[str]) -> Dict[str, Optional[str]]:
+        """
+        Look up the wallet ids for a batch of recipient keys.
+
+        Returns:
+            A dictionary of the keys found in the index to their wallet id, or
+            `None` for keys known to have no route. Keys which must be looked up
+            in storage are left out.
+
+        """
+        found = {}
+        now = time.perf_counter()
+        for recipient_key in recipient_keys:
+            route = self._routes.get(recipient_key)
+            if route is not None:
+                wallet_id, expires = route
+                if expires is None or expires > now:
+                    self._routes.move_to_end(recipient_key)
+                    found[recipient_key] = wallet_id
+                    self.hits += 1
+                    continue
+                self.remove(recipient_key)
+            expires = self._misses.get(recipient_key)
+            if expires is not None:
+                if expires > now:
+                    found[recipient_key] = None
+                    self.hits += 1
+                    continue
+                del self._misses[recipient_key]
+            self.misses += 1
+        return found
+
+    def clear(self):
+        """Remove all entries from the index."""
+        self._routes.clear()
+        self._wallet_keys.clear()
+        self._misses.clear()
+        self.loaded = False
@@ -1,8 +1,10 @@
 import asyncio
+import random
 
 from asynctest import TestCase as AsyncTestCase
 from asynctest import mock as async_mock
 
+from ...askar.profile import AskarProfile
 from ...config.injection_context import InjectionContext
 from ...core.in_memory import InMemoryProfile
 from ...messaging.responder import BaseResponder
@@ -71,7 +73,10 @@ class TestAskarProfileMultitenantManager(AsyncTestCase):
             assert wallet_config_settings_argument.get("auto_provision") == True
             assert wallet_config_settings_argument.get("wallet.type") == "askar"
             AskarProfile.assert_called_with(
-                sub_wallet_profile.opened, sub_wallet_profile_context, profile_id="test"
+                sub_wallet_profile.opened,
+                sub_wallet_profile_context,
+                profile_id="test",
+                ledger_pool=None,
             )
             assert sub_wallet_profile_context.settings.get("wallet.seed") == "test_seed"
             assert (
@@ -172,3 +177,96 @@ class TestAskarProfileMultitenantManager(AsyncTestCase):
             self.manager._multitenant_profile = sub_wallet_profile
 
         assert len(list(self.manager.open_profiles)) == 1
+
+    def _multitenant_profile(self, settings: dict = None) -> AskarProfile:
+        context = InjectionContext(
+            settings={
+                "ledger.genesis_transactions": "genesis",
+                "wallet.name": self.DEFAULT_MULTIENANT_WALLET_NAME,
+                **(settings or {}),
+            }
+        )
+        return AskarProfile(async_mock.MagicMock(), context)
+
+    async def test_get_wallet_profile_cached(self):
+        multitenant_profile = self._multitenant_profile()
+        self.manager = AskarProfileMultitenantManager(self.profile, multitenant_profile)
+        first = WalletRecord(wallet_id="first", settings={"wallet.id": "first"})
+        second = WalletRecord(
+            wallet_id="second",
+            settings={"wallet.id": "second", "ledger.pool_name": "other"},
+        )
+
+        profile = await self.manager.get_wallet_profile(self.context, first)
+        assert profile.settings.get("wallet.askar_profile") == "first"
+        assert await self.manager.get_wallet_profile(self.context, first) is profile
+        # tenants with the same ledger settings share the ledger pool
+        assert profile.ledger_pool is multitenant_profile.ledger_pool
+
+        other = await self.manager.get_wallet_profile(self.context, second)
+        assert other.ledger_pool is not multitenant_profile.ledger_pool
+        assert other.ledger_pool.name == "other"
+
+        with async_mock.patch.object(
+            WalletRecord, "retrieve_by_id", async_mock.CoroutineMock()
+        ) as mock_retrieve, async_mock.patch.object(
+            WalletRecord, "save", async_mock.CoroutineMock()
+        ):
+            mock_retrieve.return_value = first
+            await self.manager.update_wallet("first", {"wallet.webhook_urls": []})
+        updated = await self.manager.get_wallet_profile(self.context, first)
+        assert updated is not profile
+        assert updated.ledger_pool is multitenant_profile.ledger_pool
+
+        with async_mock.patch.object(
+            AskarProfile, "remove", async_mock.CoroutineMock()
+        ) as mock_remove:
+            await self.manager.remove_wallet_profile(updated)
+            mock_remove.assert_awaited_once_with()
+        assert not self.manager._profiles.has("first")
+
+    async def test_get_wallet_profile_reused(self):
+        # a hot set of tenants sending most of the traffic, with some cold ones
+        tenants = [
+            WalletRecord(wallet_id=f"tenant{idx}", settings={"wallet.id": f"t{idx}"})
+            for idx in range(100)
+        ]
+        rand = random.Random(1)
+        requests = [
+            tenants[rand.randrange(10)]
+            if rand.random() < 0.9
+            else tenants[rand.randrange(100)]
+            for _ in range(1000)
+        ]
+
+        async def run(cache_size: int):
+            profile = InMemoryProfile.test_profile(
+                {"multitenant.cache_size": cache_size}
+            )
+            manager = AskarProfileMultitenantManager(
+                profile, self._multitenant_profile()
+            )
+            with async_mock.patch.object(
+                AskarProfile, "init_ledger_pool", autospec=True
+            ) as init_pool, async_mock.patch(
+                "aries_cloudagent.multitenant.askar_profile_manager.AskarProfile",
+                async_mock.MagicMock(wraps=AskarProfile),
+            ) as profile_cls:
+                for idx, wallet_record in enumerate(requests):
+                    if idx % 2:
+                        # admin request
+                        await manager.get_wallet_profile(profile.context, wallet_record)
+                    else:
+                        # inbound message
+                        await manager.get_wallet_profile(
+                            profile.context,
+                            wallet_record,
+                            {"wallet.key": "key"},
+                        )
+            return profile_cls.call_count, init_pool.call_count
+
+        created, pools_created = await run(100)
+        assert created == len(set(record.wallet_id for record in requests))
+        assert pools_created == 0
+        created, _ = await run(1)
+        assert created > len(requests) / 2
@@ -1,3 +1,7 @@
+import asyncio
+import random
+import time
+
 from datetime import datetime
 
 from asynctest import TestCase as AsyncTestCase
@@ -6,6 +10,7 @@ import jwt
 
 from .. import base as test_module
 from ...config.base import InjectionError
+from ...core.event_bus import EventBus
 from ...core.in_memory import InMemoryProfile
 from ...messaging.responder import BaseResponder
 from ...protocols.coordinate_mediation.v1_0.manager import (
@@ -33,7 +38,7 @@ class MockMultitenantManager(BaseMultitenantManager):
         wallet_record: WalletRecord,
         extra_settings: dict = ...,
         *,
-        provision=False
+        provision=False,
     ):
         """Do nothing."""
 
@@ -52,6 +57,7 @@ class TestBaseMultitenantManager(AsyncTestCase):
 
         self.responder = async_mock.CoroutineMock(send=async_mock.CoroutineMock())
         self.context.injector.bind_instance(BaseResponder, self.responder)
+        self.context.injector.bind_instance(EventBus, EventBus())
 
         self.manager = MockMultitenantManager(self.profile)
 
@@ -342,6 +348,7 @@ class TestBaseMultitenantManager(AsyncTestCase):
 
             retrieve_by_id.return_value = wallet_record
             get_wallet_profile.return_value = wallet_profile
+            self.manager._routing_index.add("test-recipient-key", "test")
 
             await self.manager.remove_wallet("test")
 
@@ -353,6 +360,7 @@ class TestBaseMultitenantManager(AsyncTestCase):
             delete_all_records.assert_called_once_with(
                 RouteRecord.RECORD_TYPE, {"wallet_id": "test"}
             )
+            assert not self.manager._routing_index.lookup(["test-recipient-key"])
 
     async def test_create_auth_token_fails_no_wallet_key_but_required(self):
         self.profile.settings["multitenant.jwt_secret"] = "very_secret_jwt"
@@ -510,6 +518,128 @@ class TestBaseMultitenantManager(AsyncTestCase):
 
             assert profile == mock_profile
 
+    async def test_get_profile_for_token_cached(self):
+        self.profile.settings["multitenant.jwt_secret"] = "very_secret_jwt"
+        self.profile.settings["multitenant.wallet_cache_ttl"] = 60
+        self.manager = MockMultitenantManager(self.profile)
+        wallet_record = WalletRecord(
+            key_management_mode=WalletRecord.MODE_MANAGED,
+            settings={"wallet.type": "indy", "wallet.key": "wallet_key"},
+        )
+        async with self.profile.session() as session:
+            await wallet_record.save(session)
+        token = await self.manager.create_auth_token(wallet_record)
+
+        with async_mock.patch.object(
+            self.manager, "get_wallet_profile", async_mock.CoroutineMock()
+        ) as get_wallet_profile, async_mock.patch.object(
+            WalletRecord, "retrieve_by_id", wraps=WalletRecord.retrieve_by_id
+        ) as retrieve, async_mock.patch.object(
+            test_module.jwt, "decode", wraps=jwt.decode
+        ) as decode:
+            for _ in range(3):
+                await self.manager.get_profile_for_token(self.profile.context, token)
+            assert get_wallet_profile.await_count == 3
+            assert retrieve.call_count == 1
+            assert decode.call_count == 1
+
+            # a new token supersedes the previous one
+            await asyncio.sleep(1)
+            new_token = await self.manager.create_auth_token(wallet_record)
+            with self.assertRaises(MultitenantManagerError):
+                await self.manager.get_profile_for_token(self.profile.context, token)
+            await self.manager.get_profile_for_token(self.profile.context, new_token)
+            assert retrieve.call_count == 2
+
+            await self.manager.update_wallet(
+                wallet_record.wallet_id, {"wallet.webhook_urls": ["http://test"]}
+            )
+            await self.manager.get_profile_for_token(self.profile.context, new_token)
+            assert retrieve.call_count == 4
+            assert get_wallet_profile.call_args[0][1].settings[
+                "wallet.webhook_urls"
+            ] == ["http://test"]
+
+        stats = self.manager.cache_stats
+        assert stats["tokens"]["hits"] == 4
+        assert stats["tokens"]["misses"] == 2
+        assert stats["wallet_records"]["hits"] == 3
+
+    async def test_get_profile_for_token_expired_cached(self):
+        self.profile.settings["multitenant.jwt_secret"] = "very_secret_jwt"
+        token = jwt.encode(
+            {"wallet_id": "test", "exp": int(time.time()) + 60},
+            "very_secret_jwt",
+            algorithm="HS256",
+        )
+        wallet_record = async_mock.MagicMock(requires_external_key=False, jwt_iat=None)
+        with async_mock.patch.object(
+            self.manager, "get_wallet_profile", async_mock.CoroutineMock()
+        ), async_mock.patch.object(
+            WalletRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(return_value=wallet_record),
+        ), async_mock.patch.object(
+            test_module.jwt, "decode", wraps=jwt.decode
+        ) as decode:
+            await self.manager.get_profile_for_token(self.profile.context, token)
+            await self.manager.get_profile_for_token(self.profile.context, token)
+            assert decode.call_count == 1
+
+            # cached tokens are verified again once past their expiry time
+            with async_mock.patch.object(
+                test_module.time, "time", return_value=time.time() + 120
+            ):
+                await self.manager.get_profile_for_token(self.profile.context, token)
+            assert decode.call_count == 2
+
+    async def test_wallet_record_cache_disabled(self):
+        record = WalletRecord(wallet_id="test")
+        assert self.manager._wallet_cache_ttl == 0
+        self.profile.settings["multitenant.wallet_cache_ttl"] = 30
+        assert MockMultitenantManager(self.profile)._wallet_cache_ttl == 30
+        self.profile.settings["multitenant.wallet_cache_ttl"] = 0
+        manager = MockMultitenantManager(self.profile)
+
+        with async_mock.patch.object(
+            WalletRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(return_value=record),
+        ) as retrieve:
+            assert await manager._get_wallet_record("test") is record
+            assert await manager._get_wallet_record("test") is record
+            assert retrieve.call_count == 2
+        assert not manager._wallet_cache._cache
+
+    async def test_wallet_record_cache_invalidated_while_reading(self):
+        self.profile.settings["multitenant.wallet_cache_ttl"] = 60
+        self.manager = MockMultitenantManager(self.profile)
+        stale = WalletRecord(wallet_id="test", jwt_iat=100)
+        current = WalletRecord(wallet_id="test", jwt_iat=200)
+        reading = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_retrieve(session, wallet_id):
+            reading.set()
+            await release.wait()
+            return stale
+
+        with async_mock.patch.object(WalletRecord, "retrieve_by_id", slow_retrieve):
+            reader = asyncio.ensure_future(self.manager._get_wallet_record("test"))
+            await reading.wait()
+            # the record is changed while the read is in progress
+            await self.manager._invalidate_wallet_record("test")
+            release.set()
+            assert await reader is stale
+
+        with async_mock.patch.object(
+            WalletRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(return_value=current),
+        ):
+            # the stale record was not cached
+            assert await self.manager._get_wallet_record("test") is current
+
     async def test_get_profile_for_token_managed_wallet_x_iat_no_match(self):
         iat = 100
 
@@ -600,25 +730,194 @@ class TestBaseMultitenantManager(AsyncTestCase):
         )
 
         return_wallets = [
-            WalletRecord(settings={}),
-            None,
-            None,
-            WalletRecord(settings={}),
+            WalletRecord(wallet_id="wallet-1", settings={}),
+            WalletRecord(wallet_id="wallet-4", settings={}),
         ]
 
         with async_mock.patch.object(
-            self.manager, "_get_wallet_by_key"
-        ) as get_wallet_by_key:
-            get_wallet_by_key.side_effect = return_wallets
+            self.manager,
+            "_get_wallet_ids_by_keys",
+            async_mock.CoroutineMock(
+                return_value={"1": "wallet-1", "2": None, "3": None, "4": "wallet-4"}
+            ),
+        ) as get_wallet_ids, async_mock.patch.object(
+            self.manager, "_get_wallet_record", async_mock.CoroutineMock()
+        ) as get_wallet_record:
+            get_wallet_record.side_effect = return_wallets
 
             wallets = await self.manager.get_wallets_by_message(
                 message_body, mock_wire_format
             )
 
-            assert len(wallets) == 2
-            assert wallets[0] == return_wallets[0]
-            assert wallets[1] == return_wallets[3]
-            assert get_wallet_by_key.call_count == 4
+            assert wallets == return_wallets
+            get_wallet_ids.assert_called_once_with(recipient_keys)
+            assert get_wallet_record.call_count == 2
+
+    async def test_get_wallets_by_message_batched_lookup(self):
+        wallet_records = [WalletRecord(settings={}) for _ in range(3)]
+        async with self.profile.session() as session:
+            for n, wallet_record in enumerate(wallet_records):
+                await wallet_record.save(session)
+                await RouteRecord(
+                    wallet_id=wallet_record.wallet_id, recipient_key=f"key-{n}"
+                ).save(session)
+
+        mock_wire_format = async_mock.MagicMock(
+            get_recipient_keys=lambda message_body: ["key-2", "unknown", "key-0"]
+        )
+        with async_mock.patch.object(
+            RouteRecord, "query_iter", wraps=RouteRecord.query_iter
+        ) as query_iter, async_mock.patch.object(test_module, "RECIP_ROUTE_PAUSE", 0):
+            wallets = await self.manager.get_wallets_by_message({}, mock_wire_format)
+            assert [wallet.wallet_id for wallet in wallets] == [
+                wallet_records[2].wallet_id,
+                wallet_records[0].wallet_id,
+            ]
+            # routes saved through the event bus are indexed, the unknown key
+            # is looked up in storage until the retries run out, then remembered
+            assert query_iter.call_count == test_module.RECIP_ROUTE_RETRY + 1
+            assert query_iter.call_args[0][1]["recipient_key"] == "unknown"
+
+            await self.manager.get_wallets_by_message({}, mock_wire_format)
+            assert query_iter.call_count == test_module.RECIP_ROUTE_RETRY + 1
+
+    async def test_get_wallet_ids_by_keys_duplicate_routes(self):
+        wallet_record = WalletRecord(settings={})
+        async with self.profile.session() as session:
+            await wallet_record.save(session)
+            for _ in range(20):
+                await RouteRecord(
+                    wallet_id=wallet_record.wallet_id, recipient_key="dup-key"
+                ).save(session)
+            await RouteRecord(
+                wallet_id=wallet_record.wallet_id, recipient_key="key"
+            ).save(session)
+        self.manager._routing_index.clear()
+
+        # the duplicate routes do not crowd the other key's route out of the query
+        with async_mock.patch.object(
+            RouteRecord, "query_iter", wraps=RouteRecord.query_iter
+        ) as query_iter:
+            found = await self.manager._get_wallet_ids_by_keys(["dup-key", "key"])
+        assert found == {"dup-key": None, "key": wallet_record.wallet_id}
+        assert query_iter.call_count == 1
+
+    async def test_get_wallet_ids_by_keys_route_created_while_waiting(self):
+        wallet_record = WalletRecord(settings={})
+        async with self.profile.session() as session:
+            await wallet_record.save(session)
+
+        async def create_route(delay):
+            await asyncio.sleep(delay)
+            async with self.profile.session() as session:
+                await RouteRecord(
+                    wallet_id=wallet_record.wallet_id, recipient_key="new-key"
+                ).save(session)
+
+        with async_mock.patch.object(test_module, "RECIP_ROUTE_PAUSE", 0.01):
+            creator = asyncio.ensure_future(create_route(0.03))
+            found = await self.manager._get_wallet_ids_by_keys(["new-key"])
+            await creator
+        assert found == {"new-key": wallet_record.wallet_id}
+        assert self.manager._routing_index.lookup(["new-key"]) == found
+
+    async def test_load_routing_index(self):
+        wallet_record = WalletRecord(settings={})
+        async with self.profile.session() as session:
+            await wallet_record.save(session)
+            await RouteRecord(
+                wallet_id=wallet_record.wallet_id, recipient_key="wallet-key"
+            ).save(session)
+            await RouteRecord(
+                connection_id="conn-id", recipient_key="connection-key"
+            ).save(session)
+
+        manager = MockMultitenantManager(self.profile)
+        await manager.load_routing_index()
+        assert manager._routing_index.loaded
+        assert manager._routing_index.lookup(["wallet-key", "connection-key"]) == {
+            "wallet-key": wallet_record.wallet_id
+        }
+
+    async def test_routing_index_follows_route_events(self):
+        route = RouteRecord(wallet_id="wallet-id", recipient_key="recipient-key")
+        async with self.profile.session() as session:
+            await route.save(session)
+            assert self.manager._routing_index.lookup(["recipient-key"]) == {
+                "recipient-key": "wallet-id"
+            }
+
+            route.wallet_id = "other-wallet-id"
+            await route.save(session)
+            assert self.manager._routing_index.lookup(["recipient-key"]) == {
+                "recipient-key": "other-wallet-id"
+            }
+
+            await route.delete_record(session)
+            assert self.manager._routing_index.lookup(["recipient-key"]) == {}
+
+    async def test_get_wallet_by_key_stale_route_dropped(self):
+        self.manager._routing_index.add("recipient-key", "removed-wallet-id")
+
+        with self.assertRaises(StorageNotFoundError):
+            await self.manager._get_wallet_by_key("recipient-key")
+        assert self.manager._routing_index.lookup(["recipient-key"]) == {}
+
+    async def test_get_wallet_by_key_duplicate_routes(self):
+        async with self.profile.session() as session:
+            for wallet_id in ("wallet-1", "wallet-2"):
+                await RouteRecord(
+                    wallet_id=wallet_id, recipient_key="recipient-key"
+                ).save(session)
+        self.manager._routing_index.clear()
+
+        assert await self.manager._get_wallet_by_key("recipient-key") is None
+
+    async def test_relay_lookup_sessions(self):
+        # 200 tenants with one route each, with a hot set of tenants receiving
+        # most of the messages, each message having two recipients
+        async with self.profile.session() as session:
+            for idx in range(200):
+                wallet_record = WalletRecord(settings={})
+                await wallet_record.save(session)
+                await RouteRecord(
+                    wallet_id=wallet_record.wallet_id, recipient_key=f"key{idx}"
+                ).save(session)
+        rand = random.Random(1)
+        messages = [
+            [
+                f"key{rand.randrange(20) if rand.random() < 0.9 else rand.randrange(200)}"
+                for _ in range(2)
+            ]
+            for _ in range(200)
+        ]
+        mock_wire_format = async_mock.MagicMock(
+            get_recipient_keys=lambda message_body: message_body
+        )
+
+        with async_mock.patch.object(
+            self.profile, "session", wraps=self.profile.session
+        ) as sessions:
+            for message in messages:
+                for key in message:
+                    route = await RoutingManager(self.profile).get_recipient(key)
+                    async with self.profile.session() as session:
+                        await WalletRecord.retrieve_by_id(session, route.wallet_id)
+            unindexed_sessions = sessions.call_count
+
+            self.profile.settings["multitenant.wallet_cache_ttl"] = 60
+            manager = MockMultitenantManager(self.profile)
+            await manager.load_routing_index()
+            sessions.reset_mock()
+            for message in messages:
+                wallets = await manager.get_wallets_by_message(
+                    message, mock_wire_format
+                )
+                assert len(wallets) == 2
+            indexed_sessions = sessions.call_count
+
+        assert manager.cache_stats["routes"]["misses"] == 0
+        assert indexed_sessions < unindexed_sessions / 4
 
     async def test_get_profile_for_key(self):
         mock_wallet = async_mock.MagicMock()
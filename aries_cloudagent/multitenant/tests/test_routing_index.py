@@ -0,0 +1,110 @@
+from unittest import mock
+
+from .. import routing_index as test_module
+from ..routing_index import RoutingIndex
+
+
+def test_add_lookup():
+    index = RoutingIndex()
+    index.add("key-1", "wallet-1")
+    index.add("key-2", "wallet-1")
+
+    assert index.lookup(["key-1", "key-2", "key-3"]) == {
+        "key-1": "wallet-1",
+        "key-2": "wallet-1",
+    }
+    assert index.stats["hits"] == 2
+    assert index.stats["misses"] == 1
+
+
+def test_add_replaces_route():
+    index = RoutingIndex()
+    index.add("key-1", "wallet-1")
+    index.add("key-1", "wallet-2")
+
+    assert index.lookup(["key-1"]) == {"key-1": "wallet-2"}
+    index.remove_wallet("wallet-1")
+    assert index.lookup(["key-1"]) == {"key-1": "wallet-2"}
+
+
+def test_remove_wallet():
+    index = RoutingIndex()
+    index.add("key-1", "wallet-1")
+    index.add("key-2", "wallet-1")
+    index.add("key-3", "wallet-2")
+
+    index.remove_wallet("wallet-1")
+    assert index.lookup(["key-1", "key-2", "key-3"]) == {"key-3": "wallet-2"}
+    assert len(index) == 1
+
+
+def test_capacity_evicts_least_recently_used():
+    index = RoutingIndex(capacity=2)
+    index.add("key-1", "wallet-1")
+    index.add("key-2", "wallet-2")
+    index.lookup(["key-1"])
+    index.add("key-3", "wallet-3")
+
+    assert index.lookup(["key-1", "key-2", "key-3"]) == {
+        "key-1": "wallet-1",
+        "key-3": "wallet-3",
+    }
+    assert index.stats["evictions"] == 1
+
+
+def test_missing_expires():
+    index = RoutingIndex(miss_ttl=5)
+    with mock.patch.object(test_module.time, "perf_counter", return_value=100):
+        index.add_missing("key-1")
+        assert index.lookup(["key-1"]) == {"key-1": None}
+
+    with mock.patch.object(test_module.time, "perf_counter", return_value=106):
+        assert index.lookup(["key-1"]) == {}
+        assert index.stats["negative_entries"] == 0
+
+
+def test_route_expires():
+    index = RoutingIndex(route_ttl=60)
+    with mock.patch.object(test_module.time, "perf_counter", return_value=100):
+        index.add("key-1", "wallet-1")
+        assert index.lookup(["key-1"]) == {"key-1": "wallet-1"}
+
+    with mock.patch.object(test_module.time, "perf_counter", return_value=161):
+        assert index.lookup(["key-1"]) == {}
+        assert len(index) == 0
+        index.remove_wallet("wallet-1")
+
+
+def test_route_expiry_disabled():
+    index = RoutingIndex(route_ttl=0)
+    with mock.patch.object(test_module.time, "perf_counter", return_value=100):
+        index.add("key-1", "wallet-1")
+
+    with mock.patch.object(test_module.time, "perf_counter", return_value=10000):
+        assert index.lookup(["key-1"]) == {"key-1": "wallet-1"}
+
+
+def test_missing_replaced_by_route():
+    index = RoutingIndex()
+    index.add_missing("key-1")
+    index.add("key-1", "wallet-1")
+
+    assert index.lookup(["key-1"]) == {"key-1": "wallet-1"}
+
+
+def test_missing_disabled():
+    index = RoutingIndex(miss_ttl=0)
+    index.add_missing("key-1")
+
+    assert index.lookup(["key-1"]) == {}
+
+
+def test_clear():
+    index = RoutingIndex()
+    index.add("key-1", "wallet-1")
+    index.add_missing("key-2")
+    index.loaded = True
+
+    index.clear()
+    assert index.lookup(["key-1", "key-2"]) == {}
+    assert not index.loaded
@@ -18,6 +18,10 @@ from ....connections.models.conn_record import ConnRecord, ConnRecordSchema
 from ....cache.base import BaseCache
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ....messaging.valid import (
     ENDPOINT,
     INDY_DID,
@@ -167,7 +171,7 @@ class ConnectionStaticResultSchema(OpenAPISchema):
     record = fields.Nested(ConnRecordSchema, required=True)
 
 
-class ConnectionsListQueryStringSchema(OpenAPISchema):
+class ConnectionsListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for connections list request query string."""
 
     alias = fields.Str(
@@ -360,15 +364,21 @@ async def connections_list(request: web.BaseRequest):
         ]
     if request.query.get("connection_protocol"):
         post_filter["connection_protocol"] = request.query["connection_protocol"]
+    paging = get_paginated_query_params(request)
 
     profile = context.profile
     try:
         async with profile.session() as session:
             records = await ConnRecord.query(
-                session, tag_filter, post_filter_positive=post_filter, alt=True
+                session,
+                tag_filter,
+                post_filter_positive=post_filter,
+                alt=True,
+                **paging,
             )
         results = [record.serialize() for record in records]
-        results.sort(key=connection_sort_key)
+        if not paging:
+            results.sort(key=connection_sort_key)
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
 
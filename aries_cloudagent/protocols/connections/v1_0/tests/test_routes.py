@@ -117,6 +117,44 @@ class TestConnectionRoutes(AsyncTestCase):
                     }  # sorted
                 )
 
+    async def test_connections_list_paginated(self):
+        self.request.query = {"limit": "2", "offset": "4", "order_by": "created_at"}
+
+        with async_mock.patch.object(
+            test_module, "ConnRecord", autospec=True
+        ) as mock_conn_rec:
+            mock_conn_rec.query = async_mock.CoroutineMock(
+                return_value=[
+                    async_mock.MagicMock(
+                        serialize=async_mock.MagicMock(return_value={"index": index})
+                    )
+                    for index in (5, 4)
+                ]
+            )
+
+            with async_mock.patch.object(
+                test_module.web, "json_response"
+            ) as mock_response:
+                await test_module.connections_list(self.request)
+                mock_conn_rec.query.assert_called_once_with(
+                    ANY,
+                    {},
+                    post_filter_positive={},
+                    alt=True,
+                    limit=2,
+                    offset=4,
+                    order_by="created_at",
+                )
+                mock_response.assert_called_once_with(
+                    {"results": [{"index": 5}, {"index": 4}]}
+                )
+
+    async def test_connections_list_paginated_x(self):
+        self.request.query = {"limit": "0"}
+
+        with self.assertRaises(test_module.web.HTTPBadRequest):
+            await test_module.connections_list(self.request)
+
     async def test_connections_list_x(self):
         self.request.query = {
             "their_role": ConnRecord.Role.REQUESTER.rfc160,
@@ -14,6 +14,10 @@ from ....admin.request_context import AdminRequestContext
 from ....connections.models.conn_record import ConnRecord
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ....messaging.valid import UUIDFour
 from ....storage.error import StorageError, StorageNotFoundError
 from ...connections.v1_0.routes import ConnectionsConnIdMatchInfoSchema
@@ -90,7 +94,7 @@ class MediationListSchema(OpenAPISchema):
     )
 
 
-class MediationListQueryStringSchema(OpenAPISchema):
+class MediationListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for mediation record list request query string."""
 
     conn_id = CONNECTION_ID_SCHEMA
@@ -198,12 +202,14 @@ async def list_mediation_requests(request: web.BaseRequest):
         tag_filter["connection_id"] = conn_id
     if state:
         tag_filter["state"] = state
+    paging = get_paginated_query_params(request)
 
     try:
         async with context.profile.session() as session:
-            records = await MediationRecord.query(session, tag_filter)
+            records = await MediationRecord.query(session, tag_filter, **paging)
         results = [record.serialize() for record in records]
-        results.sort(key=mediation_sort_key)
+        if not paging:
+            results.sort(key=mediation_sort_key)
     except (StorageError, BaseModelError) as err:
         raise web.HTTPBadRequest(reason=err.roll_up) from err
     return web.json_response({"results": results})
@@ -7,6 +7,10 @@ from marshmallow import fields
 from ....admin.request_context import AdminRequestContext
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ....messaging.valid import UUIDFour
 from ....storage.error import StorageNotFoundError, StorageError
 
@@ -46,7 +50,7 @@ class QueryFeaturesQueryStringSchema(OpenAPISchema):
     )
 
 
-class QueryDiscoveryExchRecordsSchema(OpenAPISchema):
+class QueryDiscoveryExchRecordsSchema(PaginatedQuerySchema):
     """Query string parameter for Discover Features v1.0 exchange record."""
 
     connection_id = fields.Str(
@@ -109,7 +113,9 @@ async def query_records(request: web.BaseRequest):
     if not connection_id:
         try:
             async with context.profile.session() as session:
-                records = await V10DiscoveryExchangeRecord.query(session=session)
+                records = await V10DiscoveryExchangeRecord.query(
+                    session=session, **get_paginated_query_params(request)
+                )
             results = [record.serialize() for record in records]
         except (StorageError, BaseModelError) as err:
             raise web.HTTPBadRequest(reason=err.roll_up) from err
@@ -22,6 +22,10 @@ from ....indy.issuer import IndyIssuerError
 from ....ledger.error import LedgerError
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ....messaging.valid import UUIDFour
 from ....protocols.connections.v1_0.manager import ConnectionManager
 from ....protocols.connections.v1_0.messages.connection_invitation import (
@@ -48,7 +52,7 @@ class TransactionListSchema(OpenAPISchema):
     )
 
 
-class TransactionsListQueryStringSchema(OpenAPISchema):
+class TransactionsListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for transactions list request query string."""
 
 
@@ -159,11 +163,16 @@ async def transactions_list(request: web.BaseRequest):
 
     tag_filter = {}
     post_filter = {}
+    paging = get_paginated_query_params(request)
 
     try:
         async with context.profile.session() as session:
             records = await TransactionRecord.query(
-                session, tag_filter, post_filter_positive=post_filter, alt=True
+                session,
+                tag_filter,
+                post_filter_positive=post_filter,
+                alt=True,
+                **paging,
             )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
@@ -4,14 +4,18 @@ import asyncio
 import json
 import logging
 
-from typing import Mapping, Optional, Tuple
+from typing import Mapping, Optional, Sequence, Tuple, Union
 
-from ....cache.base import BaseCache
+from ....cache.base import LOCAL_ONLY_PREFIX, BaseCache
 from ....connections.models.conn_record import ConnRecord
 from ....core.error import BaseError
 from ....core.profile import Profile
 from ....indy.holder import IndyHolder, IndyHolderError
-from ....indy.issuer import IndyIssuer, IndyIssuerRevocationRegistryFullError
+from ....indy.issuer import (
+    IndyIssuer,
+    IndyIssuerError,
+    IndyIssuerRevocationRegistryFullError,
+)
 from ....ledger.multiple_ledger.ledger_requests_executor import (
     GET_CRED_DEF,
     GET_SCHEMA,
@@ -455,8 +459,10 @@ class CredentialManager:
             cred_req_meta = cred_ex_record.credential_request_metadata
         elif cred_ex_record.state == V10CredentialExchange.STATE_OFFER_RECEIVED:
             nonce = cred_offer_ser["nonce"]
+            # the request metadata is a holder secret: never share it
             cache_key = (
-                f"credential_request::{credential_definition_id}::{holder_did}::{nonce}"
+                f"{LOCAL_ONLY_PREFIX}credential_request::"
+                f"{credential_definition_id}::{holder_did}::{nonce}"
             )
             cred_req_result = None
             cache = self._profile.inject_or(BaseCache)
@@ -615,22 +621,9 @@ class CredentialManager:
             cred_def_id = cred_ex_record.credential_definition_id
 
             issuer = self.profile.inject(IndyIssuer)
-            multitenant_mgr = self.profile.inject_or(BaseMultitenantManager)
-            if multitenant_mgr:
-                ledger_exec_inst = IndyLedgerRequestsExecutor(self.profile)
-            else:
-                ledger_exec_inst = self.profile.inject(IndyLedgerRequestsExecutor)
-            ledger = (
-                await ledger_exec_inst.get_ledger_for_identifier(
-                    schema_id,
-                    txn_record_type=GET_SCHEMA,
-                )
-            )[1]
-            async with ledger:
-                schema = await ledger.get_schema(schema_id)
-                credential_definition = await ledger.get_credential_definition(
-                    cred_ex_record.credential_definition_id
-                )
+            (schema, credential_definition) = await self._get_schema_and_cred_def(
+                schema_id, cred_def_id
+            )
             revocable = credential_definition["value"].get("revocation")
 
             for attempt in range(max(retries, 1)):
@@ -684,39 +677,228 @@ class CredentialManager:
                     "has no active revocation registry"
                 ) from None
 
-            async with self._profile.transaction() as txn:
-                if revocable and cred_rev_id:
-                    issuer_cr_rec = IssuerCredRevRecord(
-                        state=IssuerCredRevRecord.STATE_ISSUED,
-                        cred_ex_id=cred_ex_record.credential_exchange_id,
-                        cred_ex_version=IssuerCredRevRecord.VERSION_1,
-                        rev_reg_id=rev_reg_id,
-                        cred_rev_id=cred_rev_id,
-                    )
-                    await issuer_cr_rec.save(
-                        txn,
-                        reason=(
-                            "Created issuer cred rev record for "
-                            f"rev reg id {rev_reg_id}, index {cred_rev_id}"
-                        ),
+            cred_ex_record = await self._store_issued_credential(
+                cred_ex_record, credential_ser, rev_reg_id, cred_rev_id
+            )
+
+        return (
+            cred_ex_record,
+            self._credential_issue_message(cred_ex_record, credential_ser, comment),
+        )
+
+    async def issue_credentials(
+        self,
+        cred_ex_records: Sequence[V10CredentialExchange],
+        *,
+        comment: str = None,
+        retries: int = 5,
+    ) -> Sequence[Union[Tuple[V10CredentialExchange, CredentialIssue], BaseError]]:
+        """
+        Issue credentials for a batch of credential exchanges.
+
+        The credentials of all exchanges ready for issuance are created in one
+        call to the issuer, which may sign them concurrently.
+
+        Args:
+            cred_ex_records: The credential exchange records
+                for which to issue credentials
+            comment: optional human-readable comment pertaining to credential issue
+
+        Returns:
+            A list holding, in order, a tuple of updated credential exchange
+            record and credential message or the error raised for each exchange
+
+        """
+        results = [None] * len(cred_ex_records)
+        pending = {}
+        for idx, cred_ex_record in enumerate(cred_ex_records):
+            if (
+                cred_ex_record.credential
+                or cred_ex_record.state != V10CredentialExchange.STATE_REQUEST_RECEIVED
+            ):
+                # already issued or not ready for issuance
+                try:
+                    results[idx] = await self.issue_credential(
+                        cred_ex_record, comment=comment, retries=retries
                     )
+                except BaseError as err:
+                    results[idx] = err
+            else:
+                pending[idx] = cred_ex_record
 
-                cred_ex_record = await V10CredentialExchange.retrieve_by_id(
-                    txn, cred_ex_record.credential_exchange_id, for_update=True
+        ledger_data = {}
+        for idx, cred_ex_record in list(pending.items()):
+            key = (cred_ex_record.schema_id, cred_ex_record.credential_definition_id)
+            try:
+                if key not in ledger_data:
+                    ledger_data[key] = await self._get_schema_and_cred_def(*key)
+            except BaseError as err:
+                results[idx] = err
+                del pending[idx]
+
+        issuer = self.profile.inject(IndyIssuer)
+        issued = {}
+        for attempt in range(max(retries, 1)):
+            if not pending:
+                break
+            if attempt > 0:
+                LOGGER.info(
+                    "Waiting 2s before retrying issuance of %d credentials",
+                    len(pending),
                 )
-                if cred_ex_record.state != V10CredentialExchange.STATE_REQUEST_RECEIVED:
-                    raise CredentialManagerError(
-                        f"Credential exchange {cred_ex_record.credential_exchange_id} "
-                        f"in {cred_ex_record.state} state "
-                        f"(must be {V10CredentialExchange.STATE_REQUEST_RECEIVED})"
+                await asyncio.sleep(2)
+
+            registries = {}
+            batch = []
+            for idx, cred_ex_record in pending.items():
+                cred_def_id = cred_ex_record.credential_definition_id
+                (schema, credential_definition) = ledger_data[
+                    (cred_ex_record.schema_id, cred_def_id)
+                ]
+                rev_reg = rev_reg_id = tails_path = None
+                if credential_definition["value"].get("revocation"):
+                    if cred_def_id not in registries:
+                        revoc = IndyRevocation(self._profile)
+                        registries[
+                            cred_def_id
+                        ] = await revoc.get_or_create_active_registry(cred_def_id)
+                    if not registries[cred_def_id]:
+                        continue
+                    issuer_rev_reg, rev_reg = registries[cred_def_id]
+                    rev_reg_id = issuer_rev_reg.revoc_reg_id
+                    tails_path = rev_reg.tails_local_path
+                batch.append(
+                    (
+                        idx,
+                        rev_reg,
+                        {
+                            "schema": schema,
+                            "credential_offer": cred_ex_record._credential_offer.ser,
+                            "credential_request": (
+                                cred_ex_record._credential_request.ser
+                            ),
+                            "credential_values": (
+                                cred_ex_record.credential_proposal_dict
+                            ).credential_proposal.attr_dict(decode=False),
+                            "revoc_reg_id": rev_reg_id,
+                            "tails_file_path": tails_path,
+                        },
                     )
-                cred_ex_record.state = V10CredentialExchange.STATE_ISSUED
-                cred_ex_record.credential = credential_ser
-                cred_ex_record.revoc_reg_id = rev_reg_id
-                cred_ex_record.revocation_id = cred_rev_id
-                await cred_ex_record.save(txn, reason="issue credential")
-                await txn.commit()
+                )
+            if not batch:
+                continue
+
+            created = await issuer.create_credentials_batch(
+                [args for (_, _, args) in batch]
+            )
+            full_registries = set()
+            for (idx, rev_reg, args), result in zip(batch, created):
+                if isinstance(result, IndyIssuerRevocationRegistryFullError):
+                    # unlucky, another instance filled the registry first
+                    continue
+                del pending[idx]
+                if isinstance(result, IndyIssuerError):
+                    results[idx] = result
+                    continue
+                (credential_json, cred_rev_id) = result
+                rev_reg_id = args["revoc_reg_id"]
+                if rev_reg_id and rev_reg.max_creds <= int(cred_rev_id):
+                    full_registries.add(rev_reg_id)
+                issued[idx] = (json.loads(credential_json), rev_reg_id, cred_rev_id)
+            for rev_reg_id in full_registries:
+                revoc = IndyRevocation(self._profile)
+                await revoc.handle_full_registry(rev_reg_id)
+
+        for idx, cred_ex_record in pending.items():
+            results[idx] = CredentialManagerError(
+                f"Cred def id {cred_ex_record.credential_definition_id} "
+                "has no active revocation registry"
+            )
+
+        for idx, (credential_ser, rev_reg_id, cred_rev_id) in issued.items():
+            try:
+                cred_ex_record = await self._store_issued_credential(
+                    cred_ex_records[idx], credential_ser, rev_reg_id, cred_rev_id
+                )
+            except BaseError as err:
+                results[idx] = err
+                continue
+            results[idx] = (
+                cred_ex_record,
+                self._credential_issue_message(cred_ex_record, credential_ser, comment),
+            )
+
+        return results
+
+    async def _get_schema_and_cred_def(
+        self, schema_id: str, cred_def_id: str
+    ) -> Tuple[dict, dict]:
+        """Get the schema and credential definition for issuance from the ledger."""
+        multitenant_mgr = self.profile.inject_or(BaseMultitenantManager)
+        if multitenant_mgr:
+            ledger_exec_inst = IndyLedgerRequestsExecutor(self.profile)
+        else:
+            ledger_exec_inst = self.profile.inject(IndyLedgerRequestsExecutor)
+        ledger = (
+            await ledger_exec_inst.get_ledger_for_identifier(
+                schema_id,
+                txn_record_type=GET_SCHEMA,
+            )
+        )[1]
+        async with ledger:
+            schema = await ledger.get_schema(schema_id)
+            credential_definition = await ledger.get_credential_definition(cred_def_id)
+        return (schema, credential_definition)
+
+    async def _store_issued_credential(
+        self,
+        cred_ex_record: V10CredentialExchange,
+        credential_ser: dict,
+        rev_reg_id: Optional[str],
+        cred_rev_id: Optional[str],
+    ) -> V10CredentialExchange:
+        """Save an issued credential to its exchange record."""
+        async with self._profile.transaction() as txn:
+            if rev_reg_id and cred_rev_id:
+                issuer_cr_rec = IssuerCredRevRecord(
+                    state=IssuerCredRevRecord.STATE_ISSUED,
+                    cred_ex_id=cred_ex_record.credential_exchange_id,
+                    cred_ex_version=IssuerCredRevRecord.VERSION_1,
+                    rev_reg_id=rev_reg_id,
+                    cred_rev_id=cred_rev_id,
+                )
+                await issuer_cr_rec.save(
+                    txn,
+                    reason=(
+                        "Created issuer cred rev record for "
+                        f"rev reg id {rev_reg_id}, index {cred_rev_id}"
+                    ),
+                )
 
+            cred_ex_record = await V10CredentialExchange.retrieve_by_id(
+                txn, cred_ex_record.credential_exchange_id, for_update=True
+            )
+            if cred_ex_record.state != V10CredentialExchange.STATE_REQUEST_RECEIVED:
+                raise CredentialManagerError(
+                    f"Credential exchange {cred_ex_record.credential_exchange_id} "
+                    f"in {cred_ex_record.state} state "
+                    f"(must be {V10CredentialExchange.STATE_REQUEST_RECEIVED})"
+                )
+            cred_ex_record.state = V10CredentialExchange.STATE_ISSUED
+            cred_ex_record.credential = credential_ser
+            cred_ex_record.revoc_reg_id = rev_reg_id
+            cred_ex_record.revocation_id = cred_rev_id
+            await cred_ex_record.save(txn, reason="issue credential")
+            await txn.commit()
+        return cred_ex_record
+
+    def _credential_issue_message(
+        self,
+        cred_ex_record: V10CredentialExchange,
+        credential_ser: dict,
+        comment: str = None,
+    ) -> CredentialIssue:
+        """Create the credential issue message for an exchange."""
         credential_message = CredentialIssue(
             comment=comment,
             credentials_attach=[CredentialIssue.wrap_indy_credential(credential_ser)],
@@ -725,8 +907,7 @@ class CredentialManager:
         credential_message.assign_trace_decorator(
             self._profile.settings, cred_ex_record.trace
         )
-
-        return (cred_ex_record, credential_message)
+        return credential_message
 
     async def receive_credential(
         self, message: CredentialIssue, connection_id: Optional[str]
@@ -1,5 +1,7 @@
 """Credential exchange admin routes."""
 
+from collections import Counter
+
 from aiohttp import web
 from aiohttp_apispec import (
     docs,
@@ -15,6 +17,7 @@ from ...out_of_band.v1_0.models.oob_record import OobRecord
 from ....wallet.util import default_did_from_verkey
 from ....admin.request_context import AdminRequestContext
 from ....connections.models.conn_record import ConnRecord
+from ....core.error import BaseError
 from ....core.profile import Profile
 from ....indy.holder import IndyHolderError
 from ....indy.issuer import IndyIssuerError
@@ -22,6 +25,10 @@ from ....ledger.error import LedgerError
 from ....messaging.credential_definitions.util import CRED_DEF_TAGS
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ....messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_DID,
@@ -52,7 +59,7 @@ class IssueCredentialModuleResponseSchema(OpenAPISchema):
     """Response schema for Issue Credential Module."""
 
 
-class V10CredentialExchangeListQueryStringSchema(OpenAPISchema):
+class V10CredentialExchangeListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for credential exchange list query."""
 
     connection_id = fields.UUID(
@@ -273,6 +280,31 @@ class V10CredentialIssueRequestSchema(OpenAPISchema):
     )
 
 
+class V10CredentialIssueBatchRequestSchema(V10CredentialIssueRequestSchema):
+    """Request schema for sending credentials for several exchanges."""
+
+    cred_ex_ids = fields.List(
+        fields.Str(description="Credential exchange identifier", **UUID4),
+        required=True,
+        validate=validate.Length(min=1),
+        description="Credential exchange identifiers, each given once",
+    )
+
+
+class V10CredentialIssueBatchResultSchema(OpenAPISchema):
+    """Result schema for issuing a credential within a batch."""
+
+    cred_ex_id = fields.Str(description="Credential exchange identifier", **UUID4)
+    record = fields.Nested(V10CredentialExchangeSchema, required=False)
+    error = fields.Str(description="Reason issuance failed", required=False)
+
+
+class V10CredentialIssueBatchResponseSchema(OpenAPISchema):
+    """Response schema for sending credentials for several exchanges."""
+
+    results = fields.List(fields.Nested(V10CredentialIssueBatchResultSchema))
+
+
 class V10CredentialProblemReportRequestSchema(OpenAPISchema):
     """Request schema for sending problem report."""
 
@@ -321,6 +353,7 @@ async def credential_exchange_list(request: web.BaseRequest):
         for k in ("connection_id", "role", "state")
         if request.query.get(k, "") != ""
     }
+    paging = get_paginated_query_params(request)
 
     try:
         async with context.profile.session() as session:
@@ -328,6 +361,7 @@ async def credential_exchange_list(request: web.BaseRequest):
                 session=session,
                 tag_filter=tag_filter,
                 post_filter_positive=post_filter,
+                **paging,
             )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
@@ -1150,6 +1184,116 @@ async def credential_exchange_issue(request: web.BaseRequest):
     return web.json_response(result)
 
 
+@docs(
+    tags=["issue-credential v1.0"],
+    summary="Send holders credentials for several exchanges",
+)
+@request_schema(V10CredentialIssueBatchRequestSchema())
+@response_schema(V10CredentialIssueBatchResponseSchema(), 200, description="")
+async def credential_exchange_issue_batch(request: web.BaseRequest):
+    """
+    Request handler for sending credentials for several exchanges at once.
+
+    Args:
+        request: aiohttp request object
+
+    Returns:
+        The outcome of issuance for each credential exchange
+
+    """
+    r_time = get_timer()
+
+    context: AdminRequestContext = request["context"]
+    profile = context.profile
+    outbound_handler = request["outbound_message_router"]
+
+    body = await request.json()
+    comment = body.get("comment")
+    cred_ex_ids = body.get("cred_ex_ids")
+    if not cred_ex_ids:
+        raise web.HTTPBadRequest(reason="No credential exchange identifiers given")
+    duplicates = sorted(
+        cred_ex_id for cred_ex_id, count in Counter(cred_ex_ids).items() if count > 1
+    )
+    if duplicates:
+        raise web.HTTPBadRequest(
+            reason=f"Duplicate credential exchange identifiers: {', '.join(duplicates)}"
+        )
+
+    results = {}
+    cred_ex_records = []
+    async with profile.session() as session:
+        for cred_ex_id in cred_ex_ids:
+            try:
+                cred_ex_record = await V10CredentialExchange.retrieve_by_id(
+                    session, cred_ex_id
+                )
+                if cred_ex_record.connection_id:
+                    connection_record = await ConnRecord.retrieve_by_id(
+                        session, cred_ex_record.connection_id
+                    )
+                    if not connection_record.is_ready:
+                        results[cred_ex_id] = {
+                            "cred_ex_id": cred_ex_id,
+                            "error": (
+                                f"Connection {connection_record.connection_id} "
+                                "not ready"
+                            ),
+                        }
+                        continue
+            except StorageError as err:
+                results[cred_ex_id] = {"cred_ex_id": cred_ex_id, "error": err.roll_up}
+                continue
+            cred_ex_records.append(cred_ex_record)
+
+    credential_manager = CredentialManager(profile)
+    try:
+        issued = await credential_manager.issue_credentials(
+            cred_ex_records, comment=comment
+        )
+    except (
+        BaseModelError,
+        CredentialManagerError,
+        IndyIssuerError,
+        LedgerError,
+        StorageError,
+    ) as err:
+        raise web.HTTPBadRequest(reason=err.roll_up) from err
+
+    for cred_ex_record, outcome in zip(cred_ex_records, issued):
+        cred_ex_id = cred_ex_record.credential_exchange_id
+        if isinstance(outcome, BaseError):
+            async with profile.session() as session:
+                await cred_ex_record.save_error_state(session, reason=outcome.roll_up)
+            await outbound_handler(
+                problem_report_for_record(
+                    cred_ex_record, ProblemReportReason.ISSUANCE_ABANDONED.value
+                ),
+                connection_id=cred_ex_record.connection_id,
+            )
+            results[cred_ex_id] = {"cred_ex_id": cred_ex_id, "error": outcome.roll_up}
+            continue
+
+        (cred_ex_record, credential_issue_message) = outcome
+        await outbound_handler(
+            credential_issue_message, connection_id=cred_ex_record.connection_id
+        )
+        trace_event(
+            context.settings,
+            credential_issue_message,
+            outcome="credential_exchange_issue_batch.END",
+            perf_counter=r_time,
+        )
+        results[cred_ex_id] = {
+            "cred_ex_id": cred_ex_id,
+            "record": cred_ex_record.serialize(),
+        }
+
+    return web.json_response(
+        {"results": [results[cred_ex_id] for cred_ex_id in cred_ex_ids]}
+    )
+
+
 @docs(
     tags=["issue-credential v1.0"],
     summary="Store a received credential",
@@ -1370,6 +1514,10 @@ async def register(app: web.Application):
                 "/issue-credential/records/{cred_ex_id}/issue",
                 credential_exchange_issue,
             ),
+            web.post(
+                "/issue-credential/issue-batch",
+                credential_exchange_issue_batch,
+            ),
             web.post(
                 "/issue-credential/records/{cred_ex_id}/store",
                 credential_exchange_store,
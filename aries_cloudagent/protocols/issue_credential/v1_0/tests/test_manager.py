@@ -1262,6 +1262,89 @@ class TestCredentialManager(AsyncTestCase):
                 )
                 assert "has no active revocation registry" in context.message
 
+    async def test_issue_credentials(self):
+        exchanges = []
+        for i in range(3):
+            exchange = V10CredentialExchange(
+                credential_exchange_id=f"dummy-cxid-{i}",
+                connection_id="test_conn_id",
+                credential_definition_id=CRED_DEF_ID,
+                credential_offer=INDY_OFFER,
+                credential_request=INDY_CRED_REQ,
+                credential_proposal_dict=CredentialProposal(
+                    credential_proposal=CredentialPreview.deserialize(
+                        {"attributes": [{"name": "attr", "value": f"value-{i}"}]}
+                    ),
+                    cred_def_id=CRED_DEF_ID,
+                    schema_id=SCHEMA_ID,
+                ).serialize(),
+                initiator=V10CredentialExchange.INITIATOR_SELF,
+                role=V10CredentialExchange.ROLE_ISSUER,
+                state=(
+                    V10CredentialExchange.STATE_OFFER_SENT
+                    if i == 2
+                    else V10CredentialExchange.STATE_REQUEST_RECEIVED
+                ),
+                thread_id=f"thread-id-{i}",
+                new_with_id=True,
+            )
+            await exchange.save(self.session)
+            exchanges.append(exchange)
+
+        issuer = async_mock.MagicMock()
+        issuer.create_credentials_batch = async_mock.CoroutineMock(
+            side_effect=[
+                [
+                    (json.dumps({"indy": "credential-0"}), "9"),
+                    test_module.IndyIssuerRevocationRegistryFullError("full"),
+                ],
+                [(json.dumps({"indy": "credential-1"}), "1")],
+            ]
+        )
+        self.context.injector.bind_instance(IndyIssuer, issuer)
+
+        with async_mock.patch.object(
+            test_module, "IndyRevocation", autospec=True
+        ) as revoc, async_mock.patch.object(
+            test_module.asyncio, "sleep", async_mock.CoroutineMock()
+        ) as mock_sleep:
+            revoc.return_value = async_mock.MagicMock(
+                get_or_create_active_registry=async_mock.CoroutineMock(
+                    return_value=(
+                        async_mock.MagicMock(revoc_reg_id=REV_REG_ID),
+                        async_mock.MagicMock(
+                            tails_local_path="dummy-path", max_creds=9
+                        ),
+                    )
+                ),
+                handle_full_registry=async_mock.CoroutineMock(),
+            )
+            results = await self.manager.issue_credentials(
+                exchanges, comment="comment", retries=2
+            )
+
+            mock_sleep.assert_awaited_once()
+            revoc.return_value.handle_full_registry.assert_awaited_once_with(REV_REG_ID)
+
+        first_batch = issuer.create_credentials_batch.call_args_list[0][0][0]
+        assert [args["credential_values"] for args in first_batch] == [
+            {"attr": "value-0"},
+            {"attr": "value-1"},
+        ]
+        assert first_batch[0]["schema"] == SCHEMA
+        assert first_batch[0]["revoc_reg_id"] == REV_REG_ID
+        assert first_batch[0]["tails_file_path"] == "dummy-path"
+        # the ledger is read once for the batch
+        self.ledger.get_credential_definition.assert_awaited_once_with(CRED_DEF_ID)
+
+        for i, cred_rev_id in enumerate(("9", "1")):
+            (ret_exchange, ret_cred_issue) = results[i]
+            assert ret_exchange.state == V10CredentialExchange.STATE_ISSUED
+            assert ret_exchange.revocation_id == cred_rev_id
+            assert ret_cred_issue.indy_credential() == {"indy": f"credential-{i}"}
+            assert ret_cred_issue._thread_id == f"thread-id-{i}"
+        assert isinstance(results[2], CredentialManagerError)
+
     async def test_receive_credential(self):
         connection_id = "test_conn_id"
 
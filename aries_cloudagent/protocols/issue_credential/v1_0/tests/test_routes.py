@@ -1044,6 +1044,107 @@ class TestCredentialRoutes(AsyncTestCase):
                 mock_cred_ex_record.serialize.return_value
             )
 
+    async def test_credential_exchange_issue_batch(self):
+        self.request.json = async_mock.CoroutineMock(
+            return_value={"cred_ex_ids": ["cx-1", "cx-2", "cx-3", "cx-4"]}
+        )
+        cred_ex_recs = {
+            cred_ex_id: async_mock.MagicMock(
+                credential_exchange_id=cred_ex_id,
+                connection_id=f"conn-{cred_ex_id}",
+                save_error_state=async_mock.CoroutineMock(),
+            )
+            for cred_ex_id in ("cx-1", "cx-2", "cx-3")
+        }
+
+        async def retrieve_cred_ex(_session, cred_ex_id):
+            if cred_ex_id not in cred_ex_recs:
+                raise test_module.StorageNotFoundError("not found")
+            return cred_ex_recs[cred_ex_id]
+
+        async def retrieve_conn(_session, conn_id):
+            return async_mock.MagicMock(
+                connection_id=conn_id, is_ready=conn_id != "conn-cx-3"
+            )
+
+        with async_mock.patch.object(
+            test_module, "ConnRecord", autospec=True
+        ) as mock_conn_rec, async_mock.patch.object(
+            test_module, "CredentialManager", autospec=True
+        ) as mock_credential_manager, async_mock.patch.object(
+            test_module, "V10CredentialExchange", autospec=True
+        ) as mock_cred_ex, async_mock.patch.object(
+            test_module.web, "json_response"
+        ) as mock_response:
+            mock_cred_ex.retrieve_by_id = async_mock.CoroutineMock(
+                side_effect=retrieve_cred_ex
+            )
+            mock_conn_rec.retrieve_by_id = async_mock.CoroutineMock(
+                side_effect=retrieve_conn
+            )
+            issued_rec = async_mock.MagicMock(connection_id="conn-cx-1")
+            mock_credential_manager.return_value.issue_credentials = (
+                async_mock.CoroutineMock(
+                    return_value=[
+                        (issued_rec, async_mock.MagicMock()),
+                        test_module.CredentialManagerError("no registry"),
+                    ]
+                )
+            )
+
+            await test_module.credential_exchange_issue_batch(self.request)
+
+            mock_credential_manager.return_value.issue_credentials.assert_awaited_once_with(
+                [cred_ex_recs["cx-1"], cred_ex_recs["cx-2"]], comment=None
+            )
+            cred_ex_recs["cx-2"].save_error_state.assert_awaited_once()
+            # credential for cx-1, problem report for cx-2
+            assert self.request_dict["outbound_message_router"].await_count == 2
+            results = mock_response.call_args[0][0]["results"]
+            assert results[0] == {
+                "cred_ex_id": "cx-1",
+                "record": issued_rec.serialize.return_value,
+            }
+            assert [r["cred_ex_id"] for r in results] == [
+                "cx-1",
+                "cx-2",
+                "cx-3",
+                "cx-4",
+            ]
+            assert all("error" in r for r in results[1:])
+
+    async def test_credential_exchange_issue_batch_x(self):
+        self.request.json = async_mock.CoroutineMock(return_value={"cred_ex_ids": []})
+        with self.assertRaises(test_module.web.HTTPBadRequest):
+            await test_module.credential_exchange_issue_batch(self.request)
+
+        self.request.json = async_mock.CoroutineMock(
+            return_value={"cred_ex_ids": ["cx-1", "cx-2", "cx-1"]}
+        )
+        with async_mock.patch.object(
+            test_module, "V10CredentialExchange", autospec=True
+        ) as mock_cred_ex, self.assertRaises(test_module.web.HTTPBadRequest) as context:
+            await test_module.credential_exchange_issue_batch(self.request)
+        assert "cx-1" in context.exception.reason
+        mock_cred_ex.retrieve_by_id.assert_not_called()
+
+        self.request.json = async_mock.CoroutineMock(
+            return_value={"cred_ex_ids": ["cx-1"]}
+        )
+        with async_mock.patch.object(
+            test_module, "CredentialManager", autospec=True
+        ) as mock_credential_manager, async_mock.patch.object(
+            test_module, "V10CredentialExchange", autospec=True
+        ) as mock_cred_ex:
+            mock_cred_ex.retrieve_by_id = async_mock.CoroutineMock(
+                return_value=async_mock.MagicMock(connection_id=None)
+            )
+            mock_credential_manager.return_value.issue_credentials = (
+                async_mock.CoroutineMock(side_effect=test_module.LedgerError())
+            )
+            with self.assertRaises(test_module.web.HTTPBadRequest):
+                await test_module.credential_exchange_issue_batch(self.request)
+
     async def test_credential_exchange_issue_bad_cred_ex_id(self):
         self.request.json = async_mock.CoroutineMock()
         self.request.match_info = {"cred_ex_id": "dummy"}
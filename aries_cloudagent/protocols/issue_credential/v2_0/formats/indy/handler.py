@@ -7,7 +7,7 @@ import json
 from typing import Mapping, Tuple
 import asyncio
 
-from ......cache.base import BaseCache
+from ......cache.base import LOCAL_ONLY_PREFIX, BaseCache
 from ......indy.issuer import IndyIssuer, IndyIssuerRevocationRegistryFullError
 from ......indy.holder import IndyHolder, IndyHolderError
 from ......indy.models.cred import IndyCredentialSchema
@@ -289,7 +289,11 @@ class IndyCredFormatHandler(V20CredFormatHandler):
                 "metadata": json.loads(metadata_json),
             }
 
-        cache_key = f"credential_request::{cred_def_id}::{holder_did}::{nonce}"
+        # the request metadata is a holder secret: never share it
+        cache_key = (
+            f"{LOCAL_ONLY_PREFIX}credential_request::"
+            f"{cred_def_id}::{holder_did}::{nonce}"
+        )
         cred_req_result = None
         cache = self.profile.inject_or(BaseCache)
         if cache:
@@ -32,6 +32,7 @@ from ......vc.ld_proofs import (
     LinkedDataProof,
     ProofPurpose,
     WalletKeyPair,
+    run_jsonld,
 )
 from ......vc.ld_proofs.constants import SECURITY_CONTEXT_BBS_URL
 from ......wallet.base import BaseWallet, DIDInfo
@@ -407,8 +408,10 @@ class LDProofCredFormatHandler(V20CredFormatHandler):
         detail = await self._prepare_detail(detail)
 
         document_loader = self.profile.inject(DocumentLoader)
-        missing_properties = get_properties_without_context(
-            detail.credential.serialize(), document_loader
+        missing_properties = await run_jsonld(
+            get_properties_without_context,
+            detail.credential.serialize(),
+            document_loader,
         )
 
         if len(missing_properties) > 0:
@@ -600,7 +603,9 @@ class LDProofCredFormatHandler(V20CredFormatHandler):
             raise V20CredFormatError(f"Received invalid credential: {result}")
 
         # Saving expanded type as a cred_tag
-        expanded = jsonld.expand(cred_dict)
+        expanded = await run_jsonld(
+            jsonld.expand, cred_dict, {"documentLoader": document_loader}
+        )
         types = JsonLdProcessor.get_values(
             expanded[0],
             "@type",
@@ -30,6 +30,7 @@ from .......wallet.key_type import BLS12381G2, ED25519
 from .......wallet.error import WalletNotFoundError
 from .......wallet.did_method import SOV
 from .......wallet.base import BaseWallet
+from .......resolver.did_resolver import DIDResolver
 
 from ....models.detail.ld_proof import V20CredExRecordLDProof
 from ....models.cred_ex_record import V20CredExRecord
@@ -428,6 +429,48 @@ class TestV20LDProofCredFormatHandler(AsyncTestCase):
         # assert data is encoded as base64
         assert attachment.data.base64
 
+    async def test_create_offer_remote_context(self):
+        context_url = "https://w3id.org/security/suites/ed25519-2020/v1"
+        detail = deepcopy(LD_PROOF_VC_DETAIL)
+        detail["credential"]["@context"].append(context_url)
+        detail["credential"]["credentialSubject"] = {"ed25519Test": "value"}
+        cred_proposal = V20CredProposal(
+            formats=[
+                V20CredFormat(
+                    attach_id="0",
+                    format_=ATTACHMENT_FORMAT[CRED_20_PROPOSAL][
+                        V20CredFormat.Format.LD_PROOF.api
+                    ],
+                )
+            ],
+            filters_attach=[AttachDecorator.data_base64(detail, ident="0")],
+        )
+
+        self.context.injector.bind_instance(DIDResolver, DIDResolver([]))
+        document_loader = DocumentLoader(self.profile)
+        self.context.injector.bind_instance(DocumentLoader, document_loader)
+        remote_document = {
+            "contextUrl": None,
+            "documentUrl": context_url,
+            "document": {
+                "@context": {"ed25519Test": "https://example.org/ed25519Test"}
+            },
+        }
+
+        with async_mock.patch.object(
+            LDProofCredFormatHandler,
+            "_assert_can_issue_with_id_and_proof_type",
+            async_mock.CoroutineMock(),
+        ), async_mock.patch.object(
+            document_loader,
+            "_load_http_document",
+            async_mock.CoroutineMock(return_value=remote_document),
+        ) as mock_load:
+            (cred_format, attachment) = await self.handler.create_offer(cred_proposal)
+
+        mock_load.assert_called_once_with(context_url, async_mock.ANY)
+        assert attachment.content == detail
+
     async def test_create_offer_adds_bbs_context(self):
         cred_proposal = V20CredProposal(
             formats=[
@@ -26,6 +26,10 @@ from ....ledger.error import LedgerError
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ....messaging.valid import (
     INDY_CRED_DEF_ID,
     INDY_DID,
@@ -58,7 +62,7 @@ class V20IssueCredentialModuleResponseSchema(OpenAPISchema):
     """Response schema for v2.0 Issue Credential Module."""
 
 
-class V20CredExRecordListQueryStringSchema(OpenAPISchema):
+class V20CredExRecordListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for credential exchange record list query."""
 
     connection_id = fields.UUID(
@@ -460,6 +464,7 @@ async def credential_exchange_list(request: web.BaseRequest):
         for k in ("connection_id", "role", "state")
         if request.query.get(k, "") != ""
     }
+    paging = get_paginated_query_params(request)
 
     try:
         async with profile.session() as session:
@@ -467,6 +472,7 @@ async def credential_exchange_list(request: web.BaseRequest):
                 session=session,
                 tag_filter=tag_filter,
                 post_filter_positive=post_filter,
+                **paging,
             )
 
         results = []
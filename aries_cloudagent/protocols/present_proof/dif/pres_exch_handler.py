@@ -13,9 +13,10 @@ import re
 import logging
 
 from datetime import datetime
+from functools import lru_cache
 from dateutil.parser import parse as dateutil_parser
 from dateutil.parser import ParserError
-from jsonpath_ng import parse
+from jsonpath_ng import JSONPath, parse
 from pyld import jsonld
 from pyld.jsonld import JsonLdProcessor
 from typing import Sequence, Optional, Tuple, Union, Dict, List
@@ -25,6 +26,7 @@ from uuid import uuid4
 from ....core.error import BaseError
 from ....core.profile import Profile
 from ....did.did_key import DIDKey
+from ....storage.vc_holder.base import PATH_TAG_PREFIX
 from ....storage.vc_holder.vc_record import VCRecord
 from ....vc.ld_proofs import (
     Ed25519Signature2018,
@@ -64,6 +66,79 @@ PYTZ_TIMEZONE_PATTERN = re.compile(r"(([a-zA-Z]+)(?:\/)([a-zA-Z]+))")
 LIST_INDEX_PATTERN = re.compile(r"\[(\W+)\]|\[(\d+)\]")
 LOGGER = logging.getLogger(__name__)
 
+# field paths matching record attributes which VC holders always index
+ISSUER_ID_PATHS = ("$.issuer", "$.issuer.id")
+GIVEN_ID_PATHS = ("$.id",)
+SUBJECT_ID_PATHS = ("$.credentialSubject.id",)
+
+
+@lru_cache(maxsize=1024)
+def compile_jsonpath(path: str) -> JSONPath:
+    """Parse a JSON path expression, reusing the result for repeated paths."""
+    return parse(path)
+
+
+def constraint_search_args(
+    constraints: Constraints, indexed_paths: Sequence[str] = ()
+) -> dict:
+    """
+    Translate the indexable parts of a constraint into VC holder search arguments.
+
+    Only fields with a single `const` or `enum` filter on a path the holder
+    indexes are translated, so that the search returns every credential that
+    could satisfy the constraint. The constraint must still be applied to the
+    credentials found.
+
+    Args:
+        constraints: Constraints of an input descriptor
+        indexed_paths: JSON paths the holder stores as tags
+    Return:
+        dict of keyword arguments for `VCHolder.search_credentials`
+
+    """
+    args = {}
+    tag_query = {}
+    for field in (constraints and constraints._fields) or ():
+        _filter = field._filter
+        if (
+            not _filter
+            or _filter._not
+            or _filter._type
+            or _filter.fmt
+            or _filter.pattern
+            or _filter.minimum is not None
+            or _filter.maximum is not None
+            or _filter.min_length is not None
+            or _filter.max_length is not None
+            or _filter.exclusive_min is not None
+            or _filter.exclusive_max is not None
+        ):
+            continue
+        if _filter.const is not None:
+            values = [_filter.const]
+        elif _filter.enums:
+            values = list(_filter.enums)
+        else:
+            continue
+        if len(field.paths) != 1 or not all(isinstance(v, str) for v in values):
+            continue
+        path = field.paths[0]
+        if path in indexed_paths:
+            tag_query[PATH_TAG_PREFIX + path] = (
+                values[0] if len(values) == 1 else {"$in": values}
+            )
+        elif len(values) != 1:
+            continue
+        elif path in ISSUER_ID_PATHS:
+            args["issuer_id"] = values[0]
+        elif path in GIVEN_ID_PATHS:
+            args["given_id"] = values[0]
+        elif path in SUBJECT_ID_PATHS:
+            args["subject_ids"] = values
+    if tag_query:
+        args["tag_query"] = tag_query
+    return args
+
 
 class DIFPresExchError(BaseError):
     """Base class for DIF Presentation Exchange related errors."""
@@ -375,6 +450,7 @@ class DIFPresExchHandler:
         document_loader = self.profile.inject(DocumentLoader)
 
         result = []
+        is_holder_field_ids = self.field_ids_for_is_holder(constraints)
         for credential in credentials:
             if constraints.subject_issuer == "required" and not self.subject_is_issuer(
                 credential=credential
@@ -382,7 +458,6 @@ class DIFPresExchHandler:
                 continue
 
             applicable = False
-            is_holder_field_ids = self.field_ids_for_is_holder(constraints)
             for field in constraints._fields:
                 applicable = await self.filter_by_field(field, credential)
                 # all fields in the constraint should be satisfied
@@ -524,7 +599,7 @@ class DIFPresExchHandler:
             unflatten_dict = {}
             for field in constraints._fields:
                 for path in field.paths:
-                    jsonpath = parse(path)
+                    jsonpath = compile_jsonpath(path)
                     match = jsonpath.find(credential_dict)
                     if len(match) == 0:
                         continue
@@ -591,7 +666,7 @@ class DIFPresExchHandler:
                     "is not currently supported"
                 )
             try:
-                jsonpath = parse(path)
+                jsonpath = compile_jsonpath(path)
                 match = jsonpath.find(credential_dict)
             except KeyError:
                 continue
@@ -1062,17 +1137,56 @@ class DIFPresExchHandler:
         self, credentials: Sequence[VCRecord], records_list: Sequence[str]
     ) -> Sequence[VCRecord]:
         """Return filtered list of credentials using records_list."""
-        filtered_cred = []
-        for credential in credentials:
-            if credential.record_id in records_list:
-                filtered_cred.append(credential)
-        return filtered_cred
+        record_ids = set(records_list)
+        return [
+            credential
+            for credential in credentials
+            if credential.record_id in record_ids
+        ]
+
+    async def filter_descriptor(
+        self,
+        descriptor: InputDescriptors,
+        credentials: Sequence[VCRecord],
+        records_filter: dict = None,
+    ) -> Sequence[VCRecord]:
+        """
+        Return the credentials applicable to an input descriptor.
+
+        The record id and schema filters are applied in a single pass over the
+        credentials, before the constraints are applied to the remaining ones.
+
+        Args:
+            descriptor: InputDescriptors
+            credentials: Sequence of credentials to check against
+            records_filter: dict of input_descriptor ID key to list of record ids
+        Return:
+            Sequence of applicable VCRecords
+
+        """
+        record_ids = None
+        if records_filter and (descriptor.id in records_filter):
+            record_ids = set(records_filter[descriptor.id])
+        filtered_by_schema = [
+            credential
+            for credential in credentials
+            if (record_ids is None or credential.record_id in record_ids)
+            and await self._credential_match_schema_filter_helper(
+                credential=credential, filter=descriptor.schemas.uri_groups
+            )
+        ]
+        # Filter credentials based upon path expressions specified in constraints
+        return await self.filter_constraints(
+            constraints=descriptor.constraint,
+            credentials=filtered_by_schema,
+        )
 
     async def apply_requirements(
         self,
         req: Requirement,
         credentials: Sequence[VCRecord],
         records_filter: dict = None,
+        descriptor_results: dict = None,
     ) -> dict:
         """
         Apply Requirement.
@@ -1080,36 +1194,30 @@ class DIFPresExchHandler:
         Args:
             req: Requirement
             credentials: Sequence of credentials to check against
+            records_filter: dict of input_descriptor ID key to list of record ids
+            descriptor_results: dict of input_descriptor ID key to the applicable
+                credentials, shared between the nested requirements so that each
+                input descriptor is only applied once
         Return:
             dict of input_descriptor ID key to list of credential_json
         """
+        if descriptor_results is None:
+            descriptor_results = {}
         # Dict for storing descriptor_id keys and list of applicable
         # credentials values
         result = {}
         # Get all input_descriptors attached to the PresentationDefinition
         descriptor_list = req.input_descriptors or []
         for descriptor in descriptor_list:
-            # Filter credentials to apply filtering
-            # upon by matching each credentialSchema.id
-            # or expanded types on each InputDescriptor's schema URIs
-            if records_filter and (descriptor.id in records_filter):
-                filtered_creds_by_descriptor_id = await self.filter_creds_record_id(
-                    credentials, records_filter.get(descriptor.id)
-                )
-                filtered_by_schema = await self.filter_schema(
-                    credentials=filtered_creds_by_descriptor_id,
-                    schemas=descriptor.schemas,
+            # Filter credentials by record id, by matching each credentialSchema.id
+            # or expanded types on each InputDescriptor's schema URIs and
+            # by the path expressions specified in constraints
+            filtered = descriptor_results.get(descriptor.id)
+            if filtered is None:
+                filtered = await self.filter_descriptor(
+                    descriptor, credentials, records_filter
                 )
-            else:
-                filtered_by_schema = await self.filter_schema(
-                    credentials=credentials,
-                    schemas=descriptor.schemas,
-                )
-            # Filter credentials based upon path expressions specified in constraints
-            filtered = await self.filter_constraints(
-                constraints=descriptor.constraint,
-                credentials=filtered_by_schema,
-            )
+                descriptor_results[descriptor.id] = filtered
             if len(filtered) != 0:
                 result[descriptor.id] = filtered
 
@@ -1125,7 +1233,7 @@ class DIFPresExchHandler:
         for requirement in req.nested_req:
             # recursive call
             result = await self.apply_requirements(
-                requirement, credentials, records_filter
+                requirement, credentials, records_filter, descriptor_results
             )
             if result == {}:
                 continue
@@ -1245,17 +1353,22 @@ class DIFPresExchHandler:
             srs=pd.submission_requirements, descriptors=pd.input_descriptors
         )
         result = []
+        descriptor_results = {}
         if req.nested_req:
             for nested_req in req.nested_req:
                 res = await self.apply_requirements(
                     req=nested_req,
                     credentials=credentials,
                     records_filter=records_filter,
+                    descriptor_results=descriptor_results,
                 )
                 result.append(res)
         else:
             res = await self.apply_requirements(
-                req=req, credentials=credentials, records_filter=records_filter
+                req=req,
+                credentials=credentials,
+                records_filter=records_filter,
+                descriptor_results=descriptor_results,
             )
             result.append(res)
 
@@ -1428,7 +1541,7 @@ class DIFPresExchHandler:
             constraint = inp_desc_id_contraint_map.get(desc_map_item_id)
             schema_filter = inp_desc_id_schemas_map.get(desc_map_item_id)
             desc_map_item_path = desc_map_item.get("path")
-            jsonpath = parse(desc_map_item_path)
+            jsonpath = compile_jsonpath(desc_map_item_path)
             match = jsonpath.find(pres)
             if len(match) == 0:
                 raise DIFPresExchError(
@@ -1464,7 +1577,7 @@ class DIFPresExchHandler:
         """Return field_paths that are applicable to oneof_filter."""
         applied_field_paths = []
         for path in field_paths:
-            jsonpath = parse(path)
+            jsonpath = compile_jsonpath(path)
             match = jsonpath.find(cred_dict)
             if len(match) > 0:
                 applied_field_paths.append(path)
@@ -1577,7 +1690,7 @@ class DIFPresExchHandler:
                 return path
             split_by_index = re.split(r"\[(\d+)\]", to_check, 1)
             if len(split_by_index) > 1:
-                jsonpath = parse(split_by_index[0])
+                jsonpath = compile_jsonpath(split_by_index[0])
                 match = jsonpath.find(cred_dict)
                 if len(match) > 0:
                     if isinstance(match[0].value, dict):
@@ -1589,7 +1702,7 @@ class DIFPresExchHandler:
 
     def nested_get(self, input_dict: dict, path: str) -> Union[Dict, List]:
         """Return dict or list from nested dict given list of nested_key."""
-        jsonpath = parse(path)
+        jsonpath = compile_jsonpath(path)
         match = jsonpath.find(input_dict)
         if len(match) > 1:
             return_list = []
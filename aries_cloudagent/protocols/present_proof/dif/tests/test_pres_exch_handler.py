@@ -3757,3 +3757,133 @@ class TestPresExchHandler:
             ),
             datetime,
         )
+
+    def test_compile_jsonpath_cached(self):
+        path = "$.credentialSubject.givenName"
+        assert test_module.compile_jsonpath(path) is test_module.compile_jsonpath(path)
+        assert (
+            test_module.compile_jsonpath(path)
+            .find({"credentialSubject": {"givenName": "Jane"}})[0]
+            .value
+            == "Jane"
+        )
+
+    @pytest.mark.asyncio
+    async def test_apply_requirements_shares_descriptor_results(self, profile):
+        dif_pres_exch_handler = DIFPresExchHandler(profile)
+        pd = PresentationDefinition.deserialize(
+            {
+                "id": "32f54163-7166-48f1-93d8-ff217bdb0653",
+                "submission_requirements": [
+                    {"name": "Degree", "rule": "all", "from": "A"},
+                    {"name": "Degree again", "rule": "all", "from": "A"},
+                ],
+                "input_descriptors": [
+                    {
+                        "id": "degree_input",
+                        "group": ["A"],
+                        "schema": [{"uri": "https://example.org/examples/degree.json"}],
+                        "constraints": {
+                            "fields": [{"path": ["$.credentialSubject.degree"]}]
+                        },
+                    }
+                ],
+            }
+        )
+        cred = VCRecord(
+            contexts=["https://www.w3.org/2018/credentials/v1"],
+            expanded_types=[],
+            issuer_id="https://example.edu/issuers/565049",
+            subject_ids=["did:sov:LjgpST2rjsoxYegQDRm7EL"],
+            proof_types=["Ed25519Signature2018"],
+            schema_ids=["https://example.org/examples/degree.json"],
+            cred_value={"credentialSubject": {"degree": "BSc"}},
+            given_id="http://example.edu/credentials/3732",
+            record_id="test1",
+        )
+        other_cred = VCRecord(
+            contexts=["https://www.w3.org/2018/credentials/v1"],
+            expanded_types=[],
+            issuer_id="https://example.edu/issuers/565049",
+            subject_ids=["did:sov:LjgpST2rjsoxYegQDRm7EL"],
+            proof_types=["Ed25519Signature2018"],
+            schema_ids=["https://example.org/examples/other.json"],
+            cred_value={"credentialSubject": {"degree": "BSc"}},
+            given_id="http://example.edu/credentials/3733",
+            record_id="test2",
+        )
+        req = await dif_pres_exch_handler.make_requirement(
+            srs=pd.submission_requirements, descriptors=pd.input_descriptors
+        )
+        with async_mock.patch.object(
+            dif_pres_exch_handler,
+            "filter_descriptor",
+            wraps=dif_pres_exch_handler.filter_descriptor,
+        ) as mock_filter_descriptor:
+            descriptor_results = {}
+            for nested_req in req.nested_req:
+                result = await dif_pres_exch_handler.apply_requirements(
+                    nested_req,
+                    [cred, other_cred],
+                    descriptor_results=descriptor_results,
+                )
+                assert result == {"degree_input": [cred]}
+        mock_filter_descriptor.assert_called_once()
+
+        result = await dif_pres_exch_handler.apply_requirements(
+            req.nested_req[0],
+            [cred, other_cred],
+            records_filter={"degree_input": ["test2"]},
+        )
+        assert result == {}
+
+    def test_constraint_search_args(self):
+        constraints = Constraints.deserialize(
+            {
+                "fields": [
+                    {"path": ["$.issuer"], "filter": {"const": "did:example:issuer"}},
+                    {"path": ["$.id"], "filter": {"enum": ["urn:uuid:1"]}},
+                    {
+                        "path": ["$.credentialSubject.id"],
+                        "filter": {"const": "did:example:subject"},
+                    },
+                    {
+                        "path": ["$.credentialSubject.degree"],
+                        "filter": {"enum": ["BSc", "MSc"]},
+                    },
+                    {
+                        "path": ["$.credentialSubject.givenName"],
+                        "filter": {"type": "string", "const": "Cai"},
+                    },
+                    {
+                        "path": ["$.credentialSubject.club"],
+                        "filter": {"const": "Club 1"},
+                    },
+                    {
+                        "path": ["$.credentialSubject.familyName", "$.familyName"],
+                        "filter": {"const": "Leblanc"},
+                    },
+                ]
+            }
+        )
+        assert test_module.constraint_search_args(constraints) == {
+            "issuer_id": "did:example:issuer",
+            "given_id": "urn:uuid:1",
+            "subject_ids": ["did:example:subject"],
+        }
+        assert test_module.constraint_search_args(
+            constraints,
+            [
+                "$.credentialSubject.degree",
+                "$.credentialSubject.givenName",
+                "$.credentialSubject.familyName",
+            ],
+        ) == {
+            "issuer_id": "did:example:issuer",
+            "given_id": "urn:uuid:1",
+            "subject_ids": ["did:example:subject"],
+            "tag_query": {
+                "path:$.credentialSubject.degree": {"$in": ["BSc", "MSc"]},
+            },
+        }
+        assert test_module.constraint_search_args(None) == {}
@@ -24,6 +24,10 @@ from ....ledger.error import LedgerError
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ....messaging.valid import (
     INDY_EXTRA_WQL,
     NUM_STR_NATURAL,
@@ -51,7 +55,7 @@ class V10PresentProofModuleResponseSchema(OpenAPISchema):
     """Response schema for Present Proof Module."""
 
 
-class V10PresentationExchangeListQueryStringSchema(OpenAPISchema):
+class V10PresentationExchangeListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for presentation exchange list query."""
 
     connection_id = fields.UUID(
@@ -230,6 +234,7 @@ async def presentation_exchange_list(request: web.BaseRequest):
         for k in ("connection_id", "role", "state")
         if request.query.get(k, "") != ""
     }
+    paging = get_paginated_query_params(request)
 
     try:
         async with context.profile.session() as session:
@@ -237,6 +242,7 @@ async def presentation_exchange_list(request: web.BaseRequest):
                 session=session,
                 tag_filter=tag_filter,
                 post_filter_positive=post_filter,
+                **paging,
             )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
@@ -26,7 +26,11 @@ from ......wallet.key_type import ED25519, BLS12381G2
 from .....problem_report.v1_0.message import ProblemReport
 
 from ....dif.pres_exch import PresentationDefinition, SchemaInputDescriptor
-from ....dif.pres_exch_handler import DIFPresExchHandler, DIFPresExchError
+from ....dif.pres_exch_handler import (
+    DIFPresExchHandler,
+    DIFPresExchError,
+    constraint_search_args,
+)
 from ....dif.pres_proposal_schema import DIFProofProposalSchema
 from ....dif.pres_request_schema import (
     DIFProofRequestSchema,
@@ -310,12 +314,18 @@ class DIFPresFormatHandler(V20PresFormatHandler):
                             "BbsBlsSignature2020 and Ed25519Signature2018"
                             " signature types are supported"
                         )
+                # only load the credentials which can satisfy the constraints
+                search_args = constraint_search_args(
+                    input_descriptor.constraint, holder.indexed_paths
+                )
                 if one_of_uri_groups:
                     records = []
                     cred_group_record_ids = set()
                     for uri_group in one_of_uri_groups:
                         search = holder.search_credentials(
-                            proof_types=proof_type, pd_uri_list=uri_group
+                            proof_types=proof_type,
+                            pd_uri_list=uri_group,
+                            **search_args,
                         )
                         max_results = 1000
                         cred_group = await search.fetch(max_results)
@@ -329,7 +339,7 @@ class DIFPresFormatHandler(V20PresFormatHandler):
                         records = records + cred_group_vcrecord_list
                 else:
                     search = holder.search_credentials(
-                        proof_types=proof_type, pd_uri_list=uri_list
+                        proof_types=proof_type, pd_uri_list=uri_list, **search_args
                     )
                     # Defaults to page_size but would like to include all
                     # For now, setting to 1000
@@ -24,6 +24,10 @@ from ....ledger.error import LedgerError
 from ....messaging.decorators.attach_decorator import AttachDecorator
 from ....messaging.models.base import BaseModelError
 from ....messaging.models.openapi import OpenAPISchema
+from ....messaging.models.paginated_query import (
+    PaginatedQuerySchema,
+    get_paginated_query_params,
+)
 from ....messaging.valid import (
     INDY_EXTRA_WQL,
     NUM_STR_NATURAL,
@@ -66,7 +70,7 @@ class V20PresentProofModuleResponseSchema(OpenAPISchema):
     """Response schema for Present Proof Module."""
 
 
-class V20PresExRecordListQueryStringSchema(OpenAPISchema):
+class V20PresExRecordListQueryStringSchema(PaginatedQuerySchema):
     """Parameters and validators for presentation exchange list query."""
 
     connection_id = fields.UUID(
@@ -375,6 +379,7 @@ async def present_proof_list(request: web.BaseRequest):
         for k in ("connection_id", "role", "state")
         if request.query.get(k, "") != ""
     }
+    paging = get_paginated_query_params(request)
 
     try:
         async with profile.session() as session:
@@ -382,6 +387,7 @@ async def present_proof_list(request: web.BaseRequest):
                 session=session,
                 tag_filter=tag_filter,
                 post_filter_positive=post_filter,
+                **paging,
             )
         results = [record.serialize() for record in records]
     except (StorageError, BaseModelError) as err:
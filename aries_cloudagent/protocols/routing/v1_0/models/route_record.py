@@ -1,5 +1,7 @@
 """An object for containing information on an individual route."""
 
+from typing import Optional
+
 from marshmallow import EXCLUDE, fields, validates_schema, ValidationError
 
 from .....core.profile import ProfileSession
@@ -16,6 +18,8 @@ class RouteRecord(BaseRecord):
 
     RECORD_TYPE = "forward_route"
     RECORD_ID_NAME = "record_id"
+    RECORD_TOPIC = "route"
+    EVENT_NAMESPACE = "acapy::routing"
     ROLE_CLIENT = "client"
     ROLE_SERVER = "server"
     TAG_NAMES = {"connection_id", "role", "recipient_key", "wallet_id"}
@@ -28,7 +32,7 @@ class RouteRecord(BaseRecord):
         connection_id: str = None,
         wallet_id: str = None,
         recipient_key: str = None,
-        **kwargs
+        **kwargs,
     ):
         """Initialize route record.
 
@@ -95,6 +99,28 @@ class RouteRecord(BaseRecord):
         tag_filter = {"connection_id": connection_id}
         return await cls.retrieve_by_tag_filter(session, tag_filter)
 
+    async def post_save(
+        self,
+        session: ProfileSession,
+        new_record: bool,
+        last_state: Optional[str],
+        event: bool = None,
+    ):
+        """Emit an event for every saved route, so route indexes can follow."""
+        await super().post_save(
+            session, new_record, last_state, True if event is None else event
+        )
+
+    async def delete_record(self, session: ProfileSession):
+        """Remove the stored route and emit a route deleted event."""
+        record_id = self._id
+        await super().delete_record(session)
+        if record_id:
+            await session.profile.notify(
+                f"{self.EVENT_NAMESPACE}::{self.RECORD_TOPIC}::{self.STATE_DELETED}",
+                self.serialize(),
+            )
+
     @property
     def record_value(self) -> dict:
         """Accessor for JSON record value."""
@@ -1,7 +1,11 @@
+import re
+
 from asynctest import TestCase as AsyncTestCase
 from marshmallow.exceptions import ValidationError
 
-from ..route_record import RouteRecordSchema
+from ......core.event_bus import EventBus
+from ......core.in_memory import InMemoryProfile
+from ..route_record import RouteRecord, RouteRecordSchema
 
 
 class TestConnRecord(AsyncTestCase):
@@ -13,3 +17,25 @@ class TestConnRecord(AsyncTestCase):
 
         schema.validate_fields({"connection_id": "dummy"})
         schema.validate_fields({"wallet_id": "dummy"})
+
+    async def test_route_record_events(self):
+        profile = InMemoryProfile.test_profile()
+        event_bus = EventBus()
+        profile.context.injector.bind_instance(EventBus, event_bus)
+        topics = []
+
+        async def _on_event(profile, event):
+            topics.append(event.topic)
+
+        event_bus.subscribe(re.compile("^acapy::routing::route"), _on_event)
+        record = RouteRecord(wallet_id="dummy", recipient_key="dummy-key")
+        async with profile.session() as session:
+            await record.save(session)
+            await record.save(session)
+            await record.delete_record(session)
+
+        assert topics == [
+            "acapy::routing::route",
+            "acapy::routing::route",
+            "acapy::routing::route::deleted",
+        ]
@@ -6,6 +6,7 @@ from ..config.injection_context import InjectionContext
 from ..config.provider import ClassProvider
 
 from ..resolver.did_resolver import DIDResolver
+from ..resolver.http_client import ResolverHTTPClient
 
 LOGGER = logging.getLogger(__name__)
 
@@ -17,6 +18,12 @@ async def setup(context: InjectionContext):
         LOGGER.warning("No DID Resolver instance found in context")
         return
 
+    # connection pool shared by the resolvers fetching documents over HTTP
+    if not context.inject_or(ResolverHTTPClient):
+        context.injector.bind_instance(
+            ResolverHTTPClient, ResolverHTTPClient.from_settings(context.settings)
+        )
+
     key_resolver = ClassProvider(
         "aries_cloudagent.resolver.default.key.KeyDIDResolver"
     ).provide(context.settings, context.injector)
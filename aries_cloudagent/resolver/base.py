@@ -132,6 +132,15 @@ class BaseDIDResolver(ABC):
 
         return bool(supported_did_regex.match(did))
 
+    def cache_ttl(self, document: dict) -> Optional[int]:
+        """Return how long a resolved document may be cached, in seconds.
+
+        Override this method when the resolution of a DID reports how long the
+        result remains valid. `None` applies the TTL configured for the method
+        and 0 prevents the document from being cached.
+        """
+        return None
+
     async def resolve(
         self,
         profile: Profile,
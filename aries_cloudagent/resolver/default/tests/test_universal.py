@@ -54,7 +54,7 @@ class MockClientSession:
     def __init__(self, response: MockResponse = None):
         self.response = response
 
-    def __call__(self, headers):
+    def __call__(self):
         return self
 
     async def __aenter__(self):
@@ -64,18 +64,19 @@ class MockClientSession:
     async def __aexit__(self, err_type, err_value, err_exc):
         """For use as async context."""
 
-    def get(self, endpoint):
+    def get(self, endpoint, headers=None):
         """Return response."""
+        self.headers = headers
         return self.response
 
 
 @pytest.fixture
 def mock_client_session():
-    temp = test_module.aiohttp.ClientSession
+    temp = test_module.ResolverHTTPClient
     session = MockClientSession()
-    test_module.aiohttp.ClientSession = session
+    test_module.ResolverHTTPClient = session
     yield session
-    test_module.aiohttp.ClientSession = temp
+    test_module.ResolverHTTPClient = temp
 
 
 @pytest.mark.asyncio
@@ -220,3 +221,24 @@ async def test_supported_did_regex_not_setup():
     resolver = UniversalResolver()
     with pytest.raises(ResolverError):
         resolver.supported_did_regex
+
+
+@pytest.mark.asyncio
+async def test_setup_shared_http_client(resolver: UniversalResolver):
+    settings = Settings({"resolver.universal.token": "secret"})
+    http_client = MockClientSession(
+        MockResponse(200, {"didDocument": {"id": "did:example:123"}})
+    )
+    context = async_mock.MagicMock(
+        settings=settings, inject_or=async_mock.MagicMock(return_value=http_client)
+    )
+    with async_mock.patch.object(
+        UniversalResolver,
+        "_get_supported_did_regex",
+        async_mock.CoroutineMock(return_value=re.compile("^did:sov:.*$")),
+    ):
+        await resolver.setup(context)
+
+    assert resolver.http_client is http_client
+    await resolver.resolve(async_mock.MagicMock(), "did:sov:WRfXPg8dantKVubE3HX8pw")
+    assert http_client.headers == {"Authorization": "Bearer secret"}
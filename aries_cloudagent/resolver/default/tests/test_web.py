@@ -1,6 +1,12 @@
 """Test did:web Resolver."""
 
+import json
+
 import pytest
+from asynctest import mock as async_mock
+
+from ...base import DIDNotFound, ResolverError
+from ...http_client import ResolverHTTPClient
 from ..web import WebDIDResolver
 
 
@@ -25,3 +31,55 @@ def test_transformation_domain_with_port(resolver):
     did = "did:web:localhost%3A443"
     url = resolver._WebDIDResolver__transform_to_url(did)
     assert url == "https://localhost:443/.well-known/did.json"
+
+
+class MockResponse:
+    def __init__(self, status: int, text: str):
+        self.status = status
+        self._text = text
+
+    async def text(self):
+        return self._text
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, err_type, err_value, err_exc):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_resolve_shared_http_client(resolver):
+    did = "did:web:example.com"
+    http_client = async_mock.MagicMock(
+        get=async_mock.MagicMock(
+            return_value=MockResponse(200, json.dumps({"id": did}))
+        )
+    )
+    context = async_mock.MagicMock(
+        inject_or=async_mock.MagicMock(return_value=http_client)
+    )
+    await resolver.setup(context)
+    assert resolver.http_client is http_client
+
+    profile = async_mock.MagicMock()
+    doc = await resolver.resolve(profile, did)
+    assert doc["id"] == did
+    http_client.get.assert_called_once_with("https://example.com/.well-known/did.json")
+
+    http_client.get.return_value = MockResponse(404, "Not found")
+    with pytest.raises(DIDNotFound):
+        await resolver.resolve(profile, did)
+
+    http_client.get.return_value = MockResponse(500, "Server error")
+    with pytest.raises(ResolverError):
+        await resolver.resolve(profile, did)
+
+    http_client.get.return_value = MockResponse(200, "not json")
+    with pytest.raises(ResolverError):
+        await resolver.resolve(profile, did)
+
+
+def test_default_http_client(resolver):
+    assert isinstance(resolver.http_client, ResolverHTTPClient)
+    assert resolver.http_client is resolver.http_client
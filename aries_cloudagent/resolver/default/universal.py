@@ -4,11 +4,10 @@ import logging
 import re
 from typing import Iterable, Optional, Pattern, Sequence, Union, Text
 
-import aiohttp
-
 from ...config.injection_context import InjectionContext
 from ...core.profile import Profile
 from ..base import BaseDIDResolver, DIDNotFound, ResolverError, ResolverType
+from ..http_client import ResolverHTTPClient
 
 LOGGER = logging.getLogger(__name__)
 DEFAULT_ENDPOINT = "https://dev.uniresolver.io/1.0"
@@ -42,6 +41,7 @@ class UniversalResolver(BaseDIDResolver):
         super().__init__(ResolverType.NON_NATIVE)
         self._endpoint = endpoint
         self._supported_did_regex = supported_did_regex
+        self._http_client: ResolverHTTPClient = None
 
         self.__default_headers = (
             {"Authorization": f"Bearer {bearer_token}"} if bearer_token else {}
@@ -50,6 +50,9 @@ class UniversalResolver(BaseDIDResolver):
     async def setup(self, context: InjectionContext):
         """Perform setup, populate supported method list, configuration."""
 
+        # share the resolvers' pooled connections
+        self._http_client = context.inject_or(ResolverHTTPClient)
+
         # configure endpoint
         endpoint = context.settings.get_str("resolver.universal")
         if endpoint == "DEFAULT" or not endpoint:
@@ -69,6 +72,13 @@ class UniversalResolver(BaseDIDResolver):
 
         self._supported_did_regex = supported_did_regex
 
+    @property
+    def http_client(self) -> ResolverHTTPClient:
+        """Accessor for the HTTP client, shared by the resolvers once set up."""
+        if not self._http_client:
+            self._http_client = ResolverHTTPClient()
+        return self._http_client
+
     @property
     def supported_did_regex(self) -> Pattern:
         """Return supported methods regex."""
@@ -85,30 +95,32 @@ class UniversalResolver(BaseDIDResolver):
     ) -> dict:
         """Resolve DID through remote universal resolver."""
 
-        async with aiohttp.ClientSession(headers=self.__default_headers) as session:
-            async with session.get(f"{self._endpoint}/identifiers/{did}") as resp:
-                if resp.status == 200:
-                    doc = await resp.json()
-                    did_doc = doc["didDocument"]
-                    LOGGER.info("Retrieved doc: %s", did_doc)
-                    return did_doc
-                if resp.status == 404:
-                    raise DIDNotFound(f"{did} not found by {self.__class__.__name__}")
-
-                text = await resp.text()
-                raise ResolverError(
-                    f"Unexpected status from universal resolver ({resp.status}): {text}"
-                )
+        async with self.http_client.get(
+            f"{self._endpoint}/identifiers/{did}", headers=self.__default_headers
+        ) as resp:
+            if resp.status == 200:
+                doc = await resp.json()
+                did_doc = doc["didDocument"]
+                LOGGER.info("Retrieved doc: %s", did_doc)
+                return did_doc
+            if resp.status == 404:
+                raise DIDNotFound(f"{did} not found by {self.__class__.__name__}")
+
+            text = await resp.text()
+            raise ResolverError(
+                f"Unexpected status from universal resolver ({resp.status}): {text}"
+            )
 
     async def _fetch_resolver_props(self) -> dict:
         """Retrieve universal resolver properties."""
-        async with aiohttp.ClientSession(headers=self.__default_headers) as session:
-            async with session.get(f"{self._endpoint}/properties/") as resp:
-                if 200 <= resp.status < 400:
-                    return await resp.json()
-                raise ResolverError(
-                    "Failed to retrieve resolver properties: " + await resp.text()
-                )
+        async with self.http_client.get(
+            f"{self._endpoint}/properties/", headers=self.__default_headers
+        ) as resp:
+            if 200 <= resp.status < 400:
+                return await resp.json()
+            raise ResolverError(
+                "Failed to retrieve resolver properties: " + await resp.text()
+            )
 
     async def _get_supported_did_regex(self) -> Pattern:
         props = await self._fetch_resolver_props()
@@ -4,8 +4,6 @@ import urllib.parse
 
 from typing import Optional, Pattern, Sequence, Text
 
-import aiohttp
-
 from pydid import DID, DIDDocument
 
 from ...config.injection_context import InjectionContext
@@ -18,6 +16,7 @@ from ..base import (
     ResolverError,
     ResolverType,
 )
+from ..http_client import ResolverHTTPClient
 
 
 class WebDIDResolver(BaseDIDResolver):
@@ -26,9 +25,18 @@ class WebDIDResolver(BaseDIDResolver):
     def __init__(self):
         """Initialize Web DID Resolver."""
         super().__init__(ResolverType.NATIVE)
+        self._http_client: ResolverHTTPClient = None
 
     async def setup(self, context: InjectionContext):
         """Perform required setup for Web DID resolution."""
+        self._http_client = context.inject_or(ResolverHTTPClient)
+
+    @property
+    def http_client(self) -> ResolverHTTPClient:
+        """Accessor for the HTTP client, shared by the resolvers once set up."""
+        if not self._http_client:
+            self._http_client = ResolverHTTPClient()
+        return self._http_client
 
     @property
     def supported_did_regex(self) -> Pattern:
@@ -66,19 +74,16 @@ class WebDIDResolver(BaseDIDResolver):
         """Resolve did:web DIDs."""
 
         url = self.__transform_to_url(did)
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status == 200:
-                    try:
-                        # Validate DIDDoc with pyDID
-                        did_doc = DIDDocument.from_json(await response.text())
-                        return did_doc.serialize()
-                    except Exception as err:
-                        raise ResolverError(
-                            "Response was incorrectly formatted"
-                        ) from err
-                if response.status == 404:
-                    raise DIDNotFound(f"No document found for {did}")
-                raise ResolverError(
-                    "Could not find doc for {}: {}".format(did, await response.text())
-                )
+        async with self.http_client.get(url) as response:
+            if response.status == 200:
+                try:
+                    # Validate DIDDoc with pyDID
+                    did_doc = DIDDocument.from_json(await response.text())
+                    return did_doc.serialize()
+                except Exception as err:
+                    raise ResolverError("Response was incorrectly formatted") from err
+            if response.status == 404:
+                raise DIDNotFound(f"No document found for {did}")
+            raise ResolverError(
+                "Could not find doc for {}: {}".format(did, await response.text())
+            )
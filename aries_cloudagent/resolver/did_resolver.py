@@ -5,15 +5,19 @@ responsible for keeping track of all resolvers. more importantly
 retrieving did's from different sources provided by the method type.
 """
 
+import asyncio
+import copy
 from datetime import datetime
 from itertools import chain
 import logging
-from typing import List, Optional, Sequence, Text, Tuple, Union
+import time
+from typing import Dict, List, Optional, Sequence, Text, Tuple, Union
 
 from pydid import DID, DIDError, DIDUrl, Resource
 import pydid
 from pydid.doc.doc import BaseDIDDocument, IDNotFoundError
 
+from ..cache.base import BaseCache
 from ..core.profile import Profile
 from .base import (
     BaseDIDResolver,
@@ -22,10 +26,16 @@ from .base import (
     ResolutionMetadata,
     ResolutionResult,
     ResolverError,
+    ResolverType,
 )
 
 LOGGER = logging.getLogger(__name__)
 
+CACHE_KEY_PREFIX = "did_resolver::"
+DEFAULT_CACHE_TTL = 300
+DEFAULT_NOT_FOUND_TTL = 30
+DEFAULT_MAX_CONCURRENCY = 10
+
 
 class DIDResolver:
     """did resolver singleton."""
@@ -33,36 +43,170 @@ class DIDResolver:
     def __init__(self, resolvers: List[BaseDIDResolver] = None):
         """Create DID Resolver."""
         self.resolvers = resolvers or []
+        self._stats: Dict[str, dict] = {}
 
     def register_resolver(self, resolver: BaseDIDResolver):
         """Register a new resolver."""
         self.resolvers.append(resolver)
 
+    @property
+    def stats(self) -> Dict[str, dict]:
+        """
+        Accessor for resolution statistics, per DID method.
+
+        Each method reports cache hits and misses, the number of resolutions
+        performed and their total and average duration in seconds.
+        """
+        return {
+            method: {
+                **stats,
+                "average": (
+                    stats["resolve_time"] / stats["resolutions"]
+                    if stats["resolutions"]
+                    else 0.0
+                ),
+            }
+            for method, stats in self._stats.items()
+        }
+
+    def _method_stats(self, method: str) -> dict:
+        """Get the statistics for a DID method, creating them as needed."""
+        if method not in self._stats:
+            self._stats[method] = {
+                "hits": 0,
+                "misses": 0,
+                "not_found": 0,
+                "resolutions": 0,
+                "resolve_time": 0.0,
+            }
+        return self._stats[method]
+
+    def cache_ttl(
+        self,
+        profile: Profile,
+        method: str,
+        resolver: BaseDIDResolver = None,
+        document: dict = None,
+    ) -> int:
+        """
+        Determine how long to cache a resolution result, in seconds.
+
+        A TTL reported by the resolver for the document takes precedence over
+        the configured TTL for the DID method. Not-found results (without a
+        resolver) use the shorter negative TTL.
+        """
+        settings = profile.settings
+        if not resolver:
+            return settings.get("resolver.cache.not_found_ttl", DEFAULT_NOT_FOUND_TTL)
+        ttl = resolver.cache_ttl(document) if document is not None else None
+        if ttl is None:
+            method_ttls = settings.get("resolver.cache.method_ttl") or {}
+            ttl = method_ttls.get(
+                method, settings.get("resolver.cache.ttl", DEFAULT_CACHE_TTL)
+            )
+        return ttl
+
     async def _resolve(
         self,
         profile: Profile,
         did: Union[str, DID],
         service_accept: Optional[Sequence[Text]] = None,
-    ) -> Tuple[BaseDIDResolver, dict]:
-        """Retrieve doc and return with resolver."""
-        # TODO Cache results
+    ) -> ResolutionResult:
+        """Retrieve doc and its resolution metadata, using the cache if available."""
         if isinstance(did, DID):
             did = str(did)
         else:
             DID.validate(did)
-        for resolver in await self._match_did_to_resolver(profile, did):
+        method = DID(did).method
+        stats = self._method_stats(method)
+
+        cache = profile.inject_or(BaseCache)
+        if not cache:
+            stats["misses"] += 1
+            _, result = await self._resolve_uncached(profile, did, service_accept)
+            return result
+
+        cache_key = CACHE_KEY_PREFIX + did
+        if service_accept:
+            cache_key += "::" + ",".join(service_accept)
+
+        # concurrent resolutions of the same DID wait on the first one
+        async with cache.acquire(cache_key) as entry:
+            if entry.result:
+                stats["hits"] += 1
+                return self._cached_result(did, entry.result)
+
+            stats["misses"] += 1
             try:
-                LOGGER.debug("Resolving DID %s with %s", did, resolver)
-                document = await resolver.resolve(
-                    profile,
-                    did,
-                    service_accept,
+                resolver, result = await self._resolve_uncached(
+                    profile, did, service_accept
                 )
-                return resolver, document
-            except DIDNotFound:
-                LOGGER.debug("DID %s not found by resolver %s", did, resolver)
+            except DIDNotFound as err:
+                ttl = self.cache_ttl(profile, method)
+                if ttl:
+                    await entry.set_result({"not_found": str(err)}, ttl)
+                raise
+
+            ttl = self.cache_ttl(profile, method, resolver, result.did_document)
+            if ttl:
+                # cache a copy, so the caller's changes to the document are
+                # not seen by later resolutions
+                await entry.set_result(
+                    {
+                        "did_document": copy.deepcopy(result.did_document),
+                        "metadata": result.metadata.serialize(),
+                    },
+                    ttl,
+                )
+            return result
+
+    @staticmethod
+    def _cached_result(did: str, cached: dict) -> ResolutionResult:
+        """Restore a resolution result from a copy of its cache entry."""
+        if "not_found" in cached:
+            raise DIDNotFound(cached["not_found"] or f"DID {did} could not be resolved")
+        metadata = dict(cached["metadata"])
+        metadata["resolver_type"] = ResolverType(metadata["resolver_type"])
+        return ResolutionResult(
+            copy.deepcopy(cached["did_document"]), ResolutionMetadata(**metadata)
+        )
 
-        raise DIDNotFound(f"DID {did} could not be resolved")
+    async def _resolve_uncached(
+        self,
+        profile: Profile,
+        did: str,
+        service_accept: Optional[Sequence[Text]] = None,
+    ) -> Tuple[BaseDIDResolver, ResolutionResult]:
+        """Retrieve doc and return with the resolver that resolved it."""
+        stats = self._method_stats(DID(did).method)
+        resolution_start_time = datetime.utcnow()
+        start = time.perf_counter()
+        try:
+            for resolver in await self._match_did_to_resolver(profile, did):
+                try:
+                    LOGGER.debug("Resolving DID %s with %s", did, resolver)
+                    document = await resolver.resolve(
+                        profile,
+                        did,
+                        service_accept,
+                    )
+                    break
+                except DIDNotFound:
+                    LOGGER.debug("DID %s not found by resolver %s", did, resolver)
+            else:
+                stats["not_found"] += 1
+                raise DIDNotFound(f"DID {did} could not be resolved")
+        finally:
+            stats["resolutions"] += 1
+            stats["resolve_time"] += time.perf_counter() - start
+
+        time_now = datetime.utcnow()
+        duration = int((time_now - resolution_start_time).total_seconds() * 1000)
+        retrieved_time = time_now.strftime("%Y-%m-%dT%H:%M:%SZ")
+        resolver_metadata = ResolutionMetadata(
+            resolver.type, type(resolver).__qualname__, retrieved_time, duration
+        )
+        return resolver, ResolutionResult(document, resolver_metadata)
 
     async def resolve(
         self,
@@ -71,24 +215,58 @@ class DIDResolver:
         service_accept: Optional[Sequence[Text]] = None,
     ) -> dict:
         """Resolve a DID."""
-        _, doc = await self._resolve(profile, did, service_accept)
-        return doc
+        result = await self._resolve(profile, did, service_accept)
+        return result.did_document
+
+    async def resolve_many(
+        self,
+        profile: Profile,
+        dids: Sequence[Union[str, DID]],
+        service_accept: Optional[Sequence[Text]] = None,
+        *,
+        max_concurrency: int = None,
+    ) -> List[Union[dict, ResolverError]]:
+        """
+        Resolve several DIDs concurrently.
+
+        Args:
+            profile: the profile to resolve the DIDs with
+            dids: the DIDs to resolve
+            service_accept: the accepted service types
+            max_concurrency: the maximum number of DIDs being resolved at once,
+                defaulting to the `resolver.max_concurrency` setting
+
+        Returns:
+            The resolved documents in the order of `dids`, with the resolver
+            error in place of each DID that could not be resolved
+
+        """
+        if not max_concurrency:
+            max_concurrency = profile.settings.get(
+                "resolver.max_concurrency", DEFAULT_MAX_CONCURRENCY
+            )
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _resolve_one(did: Union[str, DID]) -> Union[dict, ResolverError]:
+            async with semaphore:
+                try:
+                    return await self.resolve(profile, did, service_accept)
+                except ResolverError as err:
+                    return err
+                except DIDError as err:
+                    return ResolverError(f"Invalid DID {did}: {err}")
+
+        return await asyncio.gather(*(_resolve_one(did) for did in dids))
 
     async def resolve_with_metadata(
         self, profile: Profile, did: Union[str, DID]
     ) -> ResolutionResult:
-        """Resolve a DID and return the ResolutionResult."""
-        resolution_start_time = datetime.utcnow()
-
-        resolver, doc = await self._resolve(profile, did)
+        """
+        Resolve a DID and return the ResolutionResult.
 
-        time_now = datetime.utcnow()
-        duration = int((time_now - resolution_start_time).total_seconds() * 1000)
-        retrieved_time = time_now.strftime("%Y-%m-%dT%H:%M:%SZ")
-        resolver_metadata = ResolutionMetadata(
-            resolver.type, type(resolver).__qualname__, retrieved_time, duration
-        )
-        return ResolutionResult(doc, resolver_metadata)
+        The metadata of a cached result describes the original resolution.
+        """
+        return await self._resolve(profile, did)
 
     async def _match_did_to_resolver(
         self, profile: Profile, did: str
@@ -120,7 +298,6 @@ class DIDResolver:
         document: Optional[BaseDIDDocument] = None,
     ) -> Resource:
         """Dereference a DID URL to its corresponding DID Doc object."""
-        # TODO Use cached DID Docs when possible
         try:
             parsed = DIDUrl.parse(did_url)
             if not parsed.did:
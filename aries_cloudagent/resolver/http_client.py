@@ -0,0 +1,84 @@
+"""Pooled HTTP client shared by the DID resolvers."""
+
+from typing import Mapping
+
+from aiohttp import ClientSession, ClientTimeout, DummyCookieJar, TCPConnector
+
+from ..config.base import BaseSettings
+
+
+class ResolverHTTPClient:
+    """
+    Long-lived HTTP client for resolvers fetching DID documents over HTTP.
+
+    Connections are kept alive and reused across resolutions, and host name
+    lookups are cached, up to the configured limits. The session is created on
+    first use and must be closed when the agent shuts down.
+    """
+
+    def __init__(
+        self,
+        *,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        keepalive_timeout: float = 30,
+        dns_cache_ttl: int = 300,
+        timeout: float = 30,
+    ):
+        """
+        Initialize the HTTP client.
+
+        Args:
+            limit: the maximum number of simultaneous connections
+            limit_per_host: the maximum number of simultaneous connections to
+                a single host
+            keepalive_timeout: the number of seconds an idle connection is kept
+            dns_cache_ttl: the number of seconds a resolved host name is cached
+            timeout: the number of seconds allowed for a request to complete
+
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = timeout
+        self._session: ClientSession = None
+
+    @classmethod
+    def from_settings(cls, settings: BaseSettings) -> "ResolverHTTPClient":
+        """Create an HTTP client configured by the resolver settings."""
+        return cls(
+            limit=settings.get("resolver.http.limit", 100),
+            limit_per_host=settings.get("resolver.http.limit_per_host", 10),
+            keepalive_timeout=settings.get("resolver.http.keepalive_timeout", 30),
+            dns_cache_ttl=settings.get("resolver.http.dns_cache_ttl", 300),
+            timeout=settings.get("resolver.http.timeout", 30),
+        )
+
+    @property
+    def session(self) -> ClientSession:
+        """Accessor for the client session, created on first use."""
+        if not self._session or self._session.closed:
+            connector = TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=self.dns_cache_ttl,
+            )
+            self._session = ClientSession(
+                connector=connector,
+                cookie_jar=DummyCookieJar(),
+                timeout=ClientTimeout(total=self.timeout),
+                trust_env=True,
+            )
+        return self._session
+
+    def get(self, url: str, headers: Mapping[str, str] = None):
+        """Perform a GET request, for use as an async context manager."""
+        return self.session.get(url, headers=headers)
+
+    async def close(self):
+        """Close the session and its pooled connections."""
+        if self._session:
+            await self._session.close()
+            self._session = None
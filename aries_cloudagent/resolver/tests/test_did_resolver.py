@@ -2,6 +2,8 @@
 
 from typing import Pattern
 
+import asyncio
+import copy
 import re
 
 import pytest
@@ -9,6 +11,9 @@ import pytest
 from asynctest import mock as async_mock
 from pydid import DID, DIDDocument, VerificationMethod, BasicDIDDocument
 
+from ...cache.base import BaseCache
+from ...cache.in_memory import InMemoryCache
+from ...core.in_memory import InMemoryProfile
 from ..base import (
     BaseDIDResolver,
     DIDMethodNotSupported,
@@ -17,6 +22,7 @@ from ..base import (
     ResolverError,
     ResolverType,
 )
+from .. import did_resolver as test_module
 from ..did_resolver import DIDResolver
 
 from . import DOC
@@ -71,6 +77,7 @@ class MockResolver(BaseDIDResolver):
             "^did:(?:{}):.*$".format("|".join(supported_methods))
         )
         self.resolved = resolved
+        self.calls = 0
 
     @property
     def supported_did_regex(self) -> Pattern:
@@ -80,6 +87,8 @@ class MockResolver(BaseDIDResolver):
         pass
 
     async def _resolve(self, profile, did, accept):
+        self.calls += 1
+        await asyncio.sleep(0)
         if isinstance(self.resolved, Exception):
             raise self.resolved
         return self.resolved.serialize()
@@ -96,7 +105,7 @@ def resolver():
 
 @pytest.fixture
 def profile():
-    yield async_mock.MagicMock()
+    yield InMemoryProfile.test_profile()
 
 
 def test_create_resolver(resolver):
@@ -207,3 +216,115 @@ async def test_resolve_did_x_not_found(profile):
     resolver = DIDResolver([cowsay_resolver_not_found])
     with pytest.raises(DIDNotFound):
         await resolver.resolve(profile, py_did)
+
+
+@pytest.fixture
+def cached_profile():
+    yield InMemoryProfile.test_profile(bind={BaseCache: InMemoryCache()})
+
+
+@pytest.mark.asyncio
+async def test_resolve_cached(cached_profile):
+    sov = MockResolver(["sov"], DIDDocument.deserialize(DOC))
+    resolver = DIDResolver([sov])
+    first = await resolver.resolve_with_metadata(cached_profile, TEST_DID0)
+    second = await resolver.resolve_with_metadata(cached_profile, TEST_DID0)
+    assert sov.calls == 1
+    assert second.did_document == first.did_document
+    assert second.metadata == first.metadata
+    assert await resolver.resolve(cached_profile, DID(TEST_DID0)) == first.did_document
+    assert sov.calls == 1
+
+    stats = resolver.stats["sov"]
+    assert stats["hits"] == 2
+    assert stats["misses"] == 1
+    assert stats["resolutions"] == 1
+    assert stats["average"] == stats["resolve_time"]
+
+
+@pytest.mark.asyncio
+async def test_resolve_cached_copies(cached_profile):
+    sov = MockResolver(["sov"], DIDDocument.deserialize(DOC))
+    resolver = DIDResolver([sov])
+    first = await resolver.resolve(cached_profile, TEST_DID0)
+    expected = copy.deepcopy(first)
+    first["service"] = []
+    second = await resolver.resolve(cached_profile, TEST_DID0)
+    assert second == expected
+    second["verificationMethod"].clear()
+    assert await resolver.resolve(cached_profile, TEST_DID0) == expected
+    assert sov.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_cached_coalesced(cached_profile):
+    sov = MockResolver(["sov"], DIDDocument.deserialize(DOC))
+    resolver = DIDResolver([sov])
+    docs = await asyncio.gather(
+        *(resolver.resolve(cached_profile, TEST_DID0) for _ in range(5))
+    )
+    assert docs == [docs[0]] * 5
+    assert sov.calls == 1
+
+
+@pytest.mark.asyncio
+async def test_resolve_cached_ttl(cached_profile):
+    sov = MockResolver(["sov"], DIDDocument.deserialize(DOC))
+    resolver = DIDResolver([sov])
+
+    cached_profile.settings["resolver.cache.method_ttl"] = {"sov": 0}
+    await resolver.resolve(cached_profile, TEST_DID0)
+    await resolver.resolve(cached_profile, TEST_DID0)
+    assert sov.calls == 2
+
+    with async_mock.patch.object(sov, "cache_ttl", return_value=10):
+        await resolver.resolve(cached_profile, TEST_DID0)
+        await resolver.resolve(cached_profile, TEST_DID0)
+    assert sov.calls == 3
+    assert resolver.cache_ttl(cached_profile, "sov") == 30
+    assert resolver.cache_ttl(cached_profile, "web", sov, DOC) == 300
+
+
+@pytest.mark.asyncio
+async def test_resolve_cached_x_not_found(cached_profile):
+    cowsay = MockResolver(["cowsay"], resolved=DIDNotFound())
+    resolver = DIDResolver([cowsay])
+    did = "did:cowsay:EiDahaOGH-liLLdDtTxEAdc8i-cfCz-WUcQdRJheMVNn3A"
+    for _ in range(2):
+        with pytest.raises(DIDNotFound):
+            await resolver.resolve(cached_profile, did)
+    assert cowsay.calls == 1
+    assert resolver.stats["cowsay"]["not_found"] == 1
+
+    cached_profile.settings["resolver.cache.not_found_ttl"] = 0
+    await cached_profile.inject(BaseCache).flush()
+    for _ in range(2):
+        with pytest.raises(DIDNotFound):
+            await resolver.resolve(cached_profile, did)
+    assert cowsay.calls == 3
+
+
+@pytest.mark.asyncio
+async def test_resolve_many(profile):
+    sov = MockResolver(["sov"], DIDDocument.deserialize(DOC))
+    cowsay = MockResolver(["cowsay"], resolved=DIDNotFound())
+    resolver = DIDResolver([sov, cowsay])
+    dids = [
+        TEST_DID0,
+        "did:cowsay:EiDahaOGH-liLLdDtTxEAdc8i-cfCz-WUcQdRJheMVNn3A",
+        TEST_DID1,
+        "not-a-did",
+    ]
+    with async_mock.patch.object(
+        test_module.asyncio, "Semaphore", wraps=asyncio.Semaphore
+    ) as mock_semaphore:
+        results = await resolver.resolve_many(profile, dids, max_concurrency=2)
+    mock_semaphore.assert_called_once_with(2)
+    assert isinstance(results[0], dict)
+    assert isinstance(results[1], DIDNotFound)
+    assert isinstance(results[2], DIDMethodNotSupported)
+    assert isinstance(results[3], ResolverError)
+
+    results = await resolver.resolve_many(profile, [TEST_DID0] * 20)
+    assert len(results) == 20
+    assert all(isinstance(result, dict) for result in results)
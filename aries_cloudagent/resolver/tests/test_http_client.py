@@ -0,0 +1,41 @@
+from asynctest import TestCase as AsyncTestCase
+
+from ...config.settings import Settings
+from ..http_client import ResolverHTTPClient
+
+
+class TestResolverHTTPClient(AsyncTestCase):
+    def test_from_settings(self):
+        client = ResolverHTTPClient.from_settings(
+            Settings(
+                {
+                    "resolver.http.limit": 5,
+                    "resolver.http.limit_per_host": 2,
+                    "resolver.http.keepalive_timeout": 1,
+                    "resolver.http.dns_cache_ttl": 0,
+                    "resolver.http.timeout": 3,
+                }
+            )
+        )
+        assert client.limit == 5
+        assert client.limit_per_host == 2
+        assert client.keepalive_timeout == 1
+        assert client.dns_cache_ttl == 0
+        assert client.timeout == 3
+
+        client = ResolverHTTPClient.from_settings(Settings())
+        assert client.limit == 100
+        assert client.limit_per_host == 10
+
+    async def test_session(self):
+        client = ResolverHTTPClient(limit=5, limit_per_host=2, timeout=3)
+        session = client.session
+        assert client.session is session
+        assert session.connector.limit == 5
+        assert session.connector.limit_per_host == 2
+        assert session.timeout.total == 3
+
+        await client.close()
+        assert session.closed
+        assert client.session is not session
+        await client.close()
@@ -1,20 +1,25 @@
 """Classes to manage credential revocation."""
 
+import asyncio
 import json
 import logging
-from typing import Mapping, Sequence, Text
+from typing import Mapping, Sequence, Text, Tuple
 
 from ..protocols.revocation_notification.v1_0.models.rev_notification_record import (
     RevNotificationRecord,
 )
 from ..core.error import BaseError
-from ..core.profile import Profile
+from ..core.profile import Profile, ProfileSession
 from ..indy.issuer import IndyIssuer
 from ..storage.error import StorageNotFoundError
 from .indy import IndyRevocation
 from .models.issuer_cred_rev_record import IssuerCredRevRecord
 from .models.issuer_rev_reg_record import IssuerRevRegRecord
-from .util import notify_pending_cleared_event, notify_revocation_published_event
+from .util import (
+    notify_pending_cleared_event,
+    notify_revocation_publish_progress_event,
+    notify_revocation_published_event,
+)
 from ..protocols.issue_credential.v1_0.models.credential_exchange import (
     V10CredentialExchange,
 )
@@ -23,6 +28,17 @@ from ..protocols.issue_credential.v2_0.models.cred_ex_record import (
 )
 
 
+# default number of revocation registries to publish at once
+PUBLISH_CONCURRENCY = 8
+# maximum number of credential revocation states to update per transaction
+REVOKED_STATE_BATCH_SIZE = 256
+
+PUBLISH_STAGE_REVOKED = "revoked"
+PUBLISH_STAGE_STORED = "stored"
+PUBLISH_STAGE_SENT = "sent"
+PUBLISH_STAGE_FAILED = "failed"
+
+
 class RevocationManagerError(BaseError):
     """Revocation manager error."""
 
@@ -183,6 +199,8 @@ class RevocationManager:
     async def publish_pending_revocations(
         self,
         rrid2crid: Mapping[Text, Sequence[Text]] = None,
+        *,
+        concurrency: int = None,
     ) -> Mapping[Text, Sequence[Text]]:
         """
         Publish pending revocations to the ledger.
@@ -205,14 +223,17 @@ class RevocationManager:
                     - pending ["1", "2"] from revocation registry tagged 1
                     - no pending revocations from any other revocation registries.
 
+            concurrency: The maximum number of revocation registries to publish
+                at once, defaulting to the `revocation.publish_concurrency` setting
+
         Returns: mapping from each revocation registry id to its cred rev ids published.
         """
-        result = {}
         issuer = self._profile.inject(IndyIssuer)
 
         async with self._profile.session() as session:
             issuer_rr_recs = await IssuerRevRegRecord.query_by_pending(session)
 
+        pending = []
         for issuer_rr_rec in issuer_rr_recs:
             rrid = issuer_rr_rec.revoc_reg_id
             if rrid2crid:
@@ -225,29 +246,97 @@ class RevocationManager:
             if limit_crids:
                 crids = crids.intersection(limit_crids)
             if crids:
-                (delta_json, failed_crids) = await issuer.revoke_credentials(
-                    issuer_rr_rec.revoc_reg_id,
-                    issuer_rr_rec.tails_local_path,
-                    crids,
+                pending.append((issuer_rr_rec, crids))
+
+        limit = (
+            concurrency
+            or self._profile.settings.get_int("revocation.publish_concurrency")
+            or PUBLISH_CONCURRENCY
+        )
+        semaphore = asyncio.Semaphore(limit)
+
+        async def _publish(issuer_rr_rec: IssuerRevRegRecord, crids: set):
+            async with semaphore:
+                return await self._publish_registry(issuer, issuer_rr_rec, crids)
+
+        outcomes = await asyncio.gather(
+            *(_publish(issuer_rr_rec, crids) for issuer_rr_rec, crids in pending),
+            return_exceptions=True,
+        )
+
+        # report the first failure once every registry has been attempted
+        result = {}
+        error = None
+        for (issuer_rr_rec, _), outcome in zip(pending, outcomes):
+            if isinstance(outcome, BaseException):
+                error = error or outcome
+            else:
+                result[issuer_rr_rec.revoc_reg_id] = outcome
+        if error:
+            raise error
+
+        return result
+
+    async def _publish_registry(
+        self,
+        issuer: IndyIssuer,
+        issuer_rr_rec: IssuerRevRegRecord,
+        crids: set,
+    ) -> Sequence[Text]:
+        """
+        Publish the pending revocations for one revocation registry.
+
+        Once the registry record is updated, the credential revocation states
+        are written while the registry entry is sent to the ledger.
+
+        Returns: the cred rev ids published
+
+        """
+        rrid = issuer_rr_rec.revoc_reg_id
+        try:
+            (delta_json, failed_crids) = await issuer.revoke_credentials(
+                rrid,
+                issuer_rr_rec.tails_local_path,
+                crids,
+            )
+            published = sorted(crid for crid in crids if crid not in failed_crids)
+            await notify_revocation_publish_progress_event(
+                self._profile, rrid, PUBLISH_STAGE_REVOKED, published
+            )
+            async with self._profile.transaction() as txn:
+                issuer_rr_upd = await IssuerRevRegRecord.retrieve_by_id(
+                    txn, issuer_rr_rec.record_id, for_update=True
                 )
-                async with self._profile.transaction() as txn:
-                    issuer_rr_upd = await IssuerRevRegRecord.retrieve_by_id(
-                        txn, issuer_rr_rec.record_id, for_update=True
-                    )
-                    if delta_json:
-                        issuer_rr_upd.revoc_reg_entry = json.loads(delta_json)
-                    await issuer_rr_upd.clear_pending(txn, crids)
-                    await txn.commit()
-                await self.set_cred_revoked_state(issuer_rr_rec.revoc_reg_id, crids)
+                if delta_json:
+                    issuer_rr_upd.revoc_reg_entry = json.loads(delta_json)
+                await issuer_rr_upd.clear_pending(txn, crids)
+                await txn.commit()
+
+            async def _send_entry():
                 if delta_json:
                     await issuer_rr_upd.send_entry(self._profile)
-                published = sorted(crid for crid in crids if crid not in failed_crids)
-                result[issuer_rr_rec.revoc_reg_id] = published
-                await notify_revocation_published_event(
-                    self._profile, issuer_rr_rec.revoc_reg_id, crids
+
+            async def _set_revoked():
+                await self.set_cred_revoked_state(rrid, crids)
+                await notify_revocation_publish_progress_event(
+                    self._profile, rrid, PUBLISH_STAGE_STORED, published
                 )
 
-        return result
+            await asyncio.gather(_set_revoked(), _send_entry())
+        except Exception as err:
+            self._logger.warning(
+                "Error publishing revocations for registry %s: %s", rrid, err
+            )
+            await notify_revocation_publish_progress_event(
+                self._profile, rrid, PUBLISH_STAGE_FAILED, error=str(err)
+            )
+            raise
+
+        await notify_revocation_publish_progress_event(
+            self._profile, rrid, PUBLISH_STAGE_SENT, published
+        )
+        await notify_revocation_published_event(self._profile, rrid, crids)
+        return published
 
     async def clear_pending_revocations(
         self, purge: Mapping[Text, Sequence[Text]] = None
@@ -303,6 +392,9 @@ class RevocationManager:
         """
         Update credentials state to credential_revoked.
 
+        The credential revocation records and their credential exchange records
+        are updated in batches, each in a single transaction.
+
         Args:
             rev_reg_id: revocation registry ID
             cred_rev_ids: list of credential revocation IDs
@@ -311,50 +403,47 @@ class RevocationManager:
             None
 
         """
-        for cred_rev_id in cred_rev_ids:
-            cred_ex_id = None
-
-            try:
-                async with self._profile.transaction() as txn:
-                    rev_rec = await IssuerCredRevRecord.retrieve_by_ids(
-                        txn, rev_reg_id, cred_rev_id, for_update=True
-                    )
-                    cred_ex_id = rev_rec.cred_ex_id
-                    cred_ex_version = rev_rec.cred_ex_version
+        cred_rev_ids = sorted({str(cred_rev_id) for cred_rev_id in cred_rev_ids})
+        for pos in range(0, len(cred_rev_ids), REVOKED_STATE_BATCH_SIZE):
+            end = pos + REVOKED_STATE_BATCH_SIZE
+            batch = cred_rev_ids[pos:end]
+            async with self._profile.transaction() as txn:
+                rev_recs = await IssuerCredRevRecord.query(
+                    txn,
+                    {
+                        "rev_reg_id": rev_reg_id,
+                        "cred_rev_id": (
+                            batch[0] if len(batch) == 1 else {"$in": batch}
+                        ),
+                    },
+                )
+                for rev_rec in rev_recs:
                     rev_rec.state = IssuerCredRevRecord.STATE_REVOKED
                     await rev_rec.save(txn, reason="revoke credential")
-                    await txn.commit()
+                    await self._set_cred_ex_revoked_state(
+                        txn, rev_rec.cred_ex_id, rev_rec.cred_ex_version
+                    )
+                await txn.commit()
+
+    async def _set_cred_ex_revoked_state(
+        self, txn: ProfileSession, cred_ex_id: str, cred_ex_version: str
+    ):
+        """Mark the credential exchange record of a revoked credential, if any."""
+        cred_ex_types: Tuple = (
+            (V10CredentialExchange, V10CredentialExchange.STATE_CREDENTIAL_REVOKED),
+            (V20CredExRecord, V20CredExRecord.STATE_CREDENTIAL_REVOKED),
+        )
+        if cred_ex_version == IssuerCredRevRecord.VERSION_1:
+            cred_ex_types = cred_ex_types[:1]
+        elif cred_ex_version == IssuerCredRevRecord.VERSION_2:
+            cred_ex_types = cred_ex_types[1:]
+        for cred_ex_cls, state in cred_ex_types:
+            try:
+                cred_ex_record = await cred_ex_cls.retrieve_by_id(
+                    txn, cred_ex_id, for_update=True
+                )
             except StorageNotFoundError:
                 continue
-
-            async with self._profile.transaction() as txn:
-                if (
-                    not cred_ex_version
-                    or cred_ex_version == IssuerCredRevRecord.VERSION_1
-                ):
-                    try:
-                        cred_ex_record = await V10CredentialExchange.retrieve_by_id(
-                            txn, cred_ex_id, for_update=True
-                        )
-                        cred_ex_record.state = (
-                            V10CredentialExchange.STATE_CREDENTIAL_REVOKED
-                        )
-                        await cred_ex_record.save(txn, reason="revoke credential")
-                        await txn.commit()
-                        continue  # skip 2.0 record check
-                    except StorageNotFoundError:
-                        pass
-
-                if (
-                    not cred_ex_version
-                    or cred_ex_version == IssuerCredRevRecord.VERSION_2
-                ):
-                    try:
-                        cred_ex_record = await V20CredExRecord.retrieve_by_id(
-                            txn, cred_ex_id, for_update=True
-                        )
-                        cred_ex_record.state = V20CredExRecord.STATE_CREDENTIAL_REVOKED
-                        await cred_ex_record.save(txn, reason="revoke credential")
-                        await txn.commit()
-                    except StorageNotFoundError:
-                        pass
+            cred_ex_record.state = state
+            await cred_ex_record.save(txn, reason="revoke credential")
+            break
@@ -1,16 +1,17 @@
 """Classes for managing a revocation registry."""
-import http
+import asyncio
 import logging
 import os
 import re
 
 from os.path import join
 from pathlib import Path
+from typing import Dict
 
-from requests import Session
-from requests.exceptions import RequestException
+from aiohttp import ClientError, ClientSession, ClientTimeout
 
 from ...indy.util import indy_client_dir
+from ...utils.repeat import RepeatSequence
 
 from ..error import RevocationError
 import hashlib
@@ -18,6 +19,14 @@ import base58
 
 LOGGER = logging.getLogger(__name__)
 
+TAILS_CHUNK_SIZE = 65536  # should be multiple of 32 bytes for sha256
+TAILS_MAX_ATTEMPTS = 5
+TAILS_RETRY_INTERVAL = 1.0
+TAILS_READ_TIMEOUT = 30.0
+
+# tails file downloads in progress, by tails hash
+TAILS_DOWNLOADS: Dict[str, asyncio.Future] = {}
+
 
 class RevocationRegistry:
     """Manage a revocation registry and tails file."""
@@ -155,51 +164,119 @@ class RevocationRegistry:
         return tails_file_path.is_file()
 
     async def retrieve_tails(self):
-        """Fetch the tails file from the public URI."""
+        """
+        Fetch the tails file from the public URI.
+
+        Concurrent requests for the same tails file share a single download.
+        """
         if not self._tails_public_uri:
             raise RevocationError("Tails file public URI is empty")
 
+        tails_hash = self.tails_hash
+        download = TAILS_DOWNLOADS.get(tails_hash)
+        if not download or download.done():
+            download = asyncio.ensure_future(
+                self._download_tails(
+                    self._tails_public_uri,
+                    Path(self.get_receiving_tails_local_path()),
+                )
+            )
+            TAILS_DOWNLOADS[tails_hash] = download
+
+            def _done(fut: asyncio.Future):
+                if TAILS_DOWNLOADS.get(tails_hash) is fut:
+                    del TAILS_DOWNLOADS[tails_hash]
+
+            download.add_done_callback(_done)
+        # a cancelled waiter must not cancel the download for the others
+        self.tails_local_path = await asyncio.shield(download)
+        return self.tails_local_path
+
+    async def _download_tails(self, tails_uri: str, tails_file_path: Path) -> str:
+        """
+        Download a tails file, verifying its hash.
+
+        The file is streamed into a temporary file which replaces the tails file
+        once its hash is verified. After a failure partway through, the
+        download resumes from the bytes already received if the server
+        supports range requests.
+        """
         LOGGER.info(
             "Downloading the tails file for the revocation registry: %s",
             self.registry_id,
         )
 
-        tails_file_path = Path(self.get_receiving_tails_local_path())
         tails_file_dir = tails_file_path.parent
-        if not tails_file_dir.exists():
-            tails_file_dir.mkdir(parents=True)
+        tails_file_dir.mkdir(parents=True, exist_ok=True)
+        temp_file_path = tails_file_path.with_name(tails_file_path.name + ".part")
 
-        buffer_size = 65536  # should be multiple of 32 bytes for sha256
         file_hasher = hashlib.sha256()
-        with open(tails_file_path, "wb", buffer_size) as tails_file:
-            with Session() as req_session:
-                try:
-                    resp = req_session.get(self._tails_public_uri, stream=True)
-                    # Should this directly raise an Error?
-                    if resp.status_code != http.HTTPStatus.OK:
+        received = 0
+        timeout = ClientTimeout(
+            sock_connect=TAILS_READ_TIMEOUT, sock_read=TAILS_READ_TIMEOUT
+        )
+        try:
+            async with ClientSession(timeout=timeout, trust_env=True) as session:
+                async for attempt in RepeatSequence(
+                    TAILS_MAX_ATTEMPTS, TAILS_RETRY_INTERVAL, 0.25
+                ):
+                    headers = {"Range": f"bytes={received}-"} if received else None
+                    try:
+                        async with session.get(tails_uri, headers=headers) as resp:
+                            resumed = (
+                                received
+                                and resp.status == 206
+                                and resp.headers.get("Content-Range", "").startswith(
+                                    f"bytes {received}-"
+                                )
+                            )
+                            if not resumed:
+                                # start over from the beginning of the file
+                                file_hasher = hashlib.sha256()
+                                received = 0
+                                if resp.status != 200:
+                                    raise ClientError(
+                                        "Unexpected status code for tails file: "
+                                        f"{resp.status}"
+                                    )
+                            with open(
+                                temp_file_path, "ab" if received else "wb"
+                            ) as tails_file:
+                                async for buf in resp.content.iter_chunked(
+                                    TAILS_CHUNK_SIZE
+                                ):
+                                    tails_file.write(buf)
+                                    file_hasher.update(buf)
+                                    received += len(buf)
+                        break
+                    except (ClientError, asyncio.TimeoutError) as err:
+                        if attempt.final:
+                            raise RevocationError(
+                                f"Error retrieving tails file: {err}"
+                            ) from err
                         LOGGER.warning(
-                            f"Unexpected status code for tails file: {resp.status_code}"
+                            "Error retrieving tails file, %d bytes received: %s",
+                            received,
+                            err,
                         )
-                    for buf in resp.iter_content(chunk_size=buffer_size):
-                        tails_file.write(buf)
-                        file_hasher.update(buf)
-                except RequestException as rx:
-                    raise RevocationError(f"Error retrieving tails file: {rx}")
-
-        download_tails_hash = base58.b58encode(file_hasher.digest()).decode("utf-8")
-        if download_tails_hash != self.tails_hash:
+
+            download_tails_hash = base58.b58encode(file_hasher.digest()).decode("utf-8")
+            if download_tails_hash != self.tails_hash:
+                raise RevocationError(
+                    "The hash of the downloaded tails file does not match."
+                )
+            os.replace(temp_file_path, tails_file_path)
+        except BaseException:
             try:
-                os.remove(tails_file_path)
-                tails_file_dir.rmdir()
+                if temp_file_path.exists():
+                    os.remove(temp_file_path)
+                if not any(tails_file_dir.iterdir()):
+                    tails_file_dir.rmdir()
             except OSError as err:
                 LOGGER.warning(f"Could not delete invalid tails file: {err}")
+            raise
 
-            raise RevocationError(
-                "The hash of the downloaded tails file does not match."
-            )
-
-        self.tails_local_path = str(tails_file_path)
-        return self.tails_local_path
+        return str(tails_file_path)
 
     async def get_or_fetch_local_tails_path(self):
         """Get the local tails path, retrieving from the remote if necessary."""
@@ -1,7 +1,8 @@
-import json
-
-import pytest
+import asyncio
+import hashlib
 
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 from copy import deepcopy
 from pathlib import Path
@@ -45,7 +46,20 @@ REV_REG_DEF = {
 
 
 class TestRevocationRegistry(AsyncTestCase):
-    def tearDown(self):
+    async def setUp(self):
+        self.server = None
+        self.requests = []
+        self.fail_after = []
+        self.ranges = True
+        self.tails_data = bytes(range(256)) * 1024
+        self.tails_hash = base58.b58encode(
+            hashlib.sha256(self.tails_data).digest()
+        ).decode("utf-8")
+        self.tails_local = f"{TAILS_DIR}{REV_REG_ID}/{self.tails_hash}"
+
+    async def tearDown(self):
+        if self.server:
+            await self.server.close()
         rmtree(TAILS_DIR, ignore_errors=True)
 
     async def test_init(self):
@@ -99,75 +113,96 @@ class TestRevocationRegistry(AsyncTestCase):
         rev_reg = RevocationRegistry.from_definition(REV_REG_DEF, public_def=False)
         with self.assertRaises(RevocationError) as x_retrieve:
             await rev_reg.retrieve_tails()
-            assert x_retrieve.message.contains("Tails file public URI is empty")
+        assert "Tails file public URI is empty" in x_retrieve.exception.message
 
-        rr_def_public = deepcopy(REV_REG_DEF)
-        rr_def_public["value"]["tailsLocation"] = "http://sample.ca:8088/path"
-        rev_reg = RevocationRegistry.from_definition(rr_def_public, public_def=True)
-
-        more_magic = async_mock.MagicMock()
-        with async_mock.patch.object(
-            test_module, "Session", autospec=True
-        ) as mock_session:
-            mock_session.return_value.__enter__ = async_mock.MagicMock(
-                return_value=more_magic
-            )
-            more_magic.get = async_mock.MagicMock(
-                side_effect=test_module.RequestException("Not this time")
-            )
+        rev_reg = await self._public_rev_reg("/tails")
+        assert await rev_reg.get_or_fetch_local_tails_path() == self.tails_local
+        with open(self.tails_local, "rb") as tails_file:
+            assert tails_file.read() == self.tails_data
+        assert self.requests == [None]
+        assert not Path(f"{self.tails_local}.part").exists()
 
-            with self.assertRaises(RevocationError) as x_retrieve:
-                await rev_reg.retrieve_tails()
-                assert x_retrieve.message.contains("Error retrieving tails file")
-
-            rmtree(TAILS_DIR, ignore_errors=True)
-
-        more_magic = async_mock.MagicMock()
-        with async_mock.patch.object(
-            test_module, "Session", autospec=True
-        ) as mock_session:
-            mock_session.return_value.__enter__ = async_mock.MagicMock(
-                return_value=more_magic
-            )
-            more_magic.get = async_mock.MagicMock(
-                return_value=async_mock.MagicMock(
-                    iter_content=async_mock.MagicMock(
-                        side_effect=[(b"abcd1234",), (b"",)]
-                    )
-                )
-            )
+    async def test_retrieve_tails_hash_mismatch(self):
+        self.tails_data = b"not the tails file"
+        rev_reg = await self._public_rev_reg("/tails")
+
+        with self.assertRaises(RevocationError) as x_retrieve:
+            await rev_reg.retrieve_tails()
+        assert "does not match" in x_retrieve.exception.message
+        assert not Path(self.tails_local).parent.exists()
+
+    async def test_retrieve_tails_bad_status(self):
+        rev_reg = await self._public_rev_reg("/missing")
 
+        with async_mock.patch.object(test_module, "TAILS_RETRY_INTERVAL", 0):
             with self.assertRaises(RevocationError) as x_retrieve:
                 await rev_reg.retrieve_tails()
-                assert x_retrieve.message.contains(
-                    "The hash of the downloaded tails file does not match."
-                )
-
-            rmtree(TAILS_DIR, ignore_errors=True)
-
-        more_magic = async_mock.MagicMock()
-        with async_mock.patch.object(
-            test_module, "Session", autospec=True
-        ) as mock_session, async_mock.patch.object(
-            base58, "b58encode", async_mock.MagicMock()
-        ) as mock_b58enc, async_mock.patch.object(
-            Path, "is_file", autospec=True
-        ) as mock_is_file:
-            mock_session.return_value.__enter__ = async_mock.MagicMock(
-                return_value=more_magic
-            )
-            more_magic.get = async_mock.MagicMock(
-                return_value=async_mock.MagicMock(
-                    iter_content=async_mock.MagicMock(
-                        side_effect=[(b"abcd1234",), (b"",)]
-                    )
-                )
-            )
-            mock_is_file.return_value = False
-
-            mock_b58enc.return_value = async_mock.MagicMock(
-                decode=async_mock.MagicMock(return_value=TAILS_HASH)
-            )
-            await rev_reg.get_or_fetch_local_tails_path()
-
-            rmtree(TAILS_DIR, ignore_errors=True)
+        assert "Error retrieving tails file" in x_retrieve.exception.message
+        assert not Path(self.tails_local).exists()
+
+    async def test_retrieve_tails_resume(self):
+        self.fail_after = [100000]
+        rev_reg = await self._public_rev_reg("/tails")
+
+        with async_mock.patch.object(test_module, "TAILS_RETRY_INTERVAL", 0):
+            await rev_reg.retrieve_tails()
+        with open(self.tails_local, "rb") as tails_file:
+            assert tails_file.read() == self.tails_data
+        assert self.requests[0] is None
+        assert self.requests[1].startswith("bytes=")
+        # the second request resumes after the bytes already received
+        assert 0 < int(self.requests[1][6:-1]) <= 100000
+
+    async def test_retrieve_tails_resume_unsupported(self):
+        self.fail_after = [100000]
+        self.ranges = False
+        rev_reg = await self._public_rev_reg("/tails")
+
+        with async_mock.patch.object(test_module, "TAILS_RETRY_INTERVAL", 0):
+            await rev_reg.retrieve_tails()
+        with open(self.tails_local, "rb") as tails_file:
+            assert tails_file.read() == self.tails_data
+        assert len(self.requests) == 2
+
+    async def test_retrieve_tails_concurrent(self):
+        rev_regs = [await self._public_rev_reg("/tails") for _ in range(5)]
+
+        paths = await asyncio.gather(
+            *(rev_reg.retrieve_tails() for rev_reg in rev_regs)
+        )
+        assert paths == [self.tails_local] * 5
+        assert self.requests == [None]
+        assert not test_module.TAILS_DOWNLOADS
+
+    async def _public_rev_reg(self, path: str) -> RevocationRegistry:
+        if not self.server:
+            app = web.Application()
+            app.add_routes([web.get("/tails", self._tails_route)])
+            self.server = TestServer(app)
+            await self.server.start_server()
+        rr_def_public = deepcopy(REV_REG_DEF)
+        rr_def_public["value"]["tailsLocation"] = str(self.server.make_url(path))
+        rr_def_public["value"]["tailsHash"] = self.tails_hash
+        return RevocationRegistry.from_definition(rr_def_public, public_def=True)
+
+    async def _tails_route(self, request: web.Request):
+        range_header = request.headers.get("Range")
+        self.requests.append(range_header)
+        await asyncio.sleep(0.01)
+        start = 0
+        response = web.StreamResponse()
+        if range_header and self.ranges:
+            start = int(range_header[6:-1])
+            response.set_status(206)
+            response.headers[
+                "Content-Range"
+            ] = f"bytes {start}-{len(self.tails_data) - 1}/{len(self.tails_data)}"
+        response.content_length = len(self.tails_data) - start
+        await response.prepare(request)
+        end = self.fail_after.pop(0) if self.fail_after else len(self.tails_data)
+        await response.write(self.tails_data[start:end])
+        if end < len(self.tails_data):
+            request.transport.close()
+            return response
+        await response.write_eof()
+        return response
@@ -1,4 +1,6 @@
+import asyncio
 import json
+import re
 
 from asynctest import mock as async_mock
 from asynctest import TestCase as AsyncTestCase
@@ -7,6 +9,7 @@ from aries_cloudagent.revocation.models.issuer_cred_rev_record import (
     IssuerCredRevRecord,
 )
 
+from ...core.event_bus import EventBus
 from ...core.in_memory import InMemoryProfile
 from ...indy.issuer import IndyIssuer
 from ...protocols.issue_credential.v1_0.models.credential_exchange import (
@@ -334,6 +337,136 @@ class TestRevocationManager(AsyncTestCase):
             mock_issuer_rev_reg_records[0].clear_pending.assert_called_once()
             mock_issuer_rev_reg_records[1].clear_pending.assert_not_called()
 
+    async def test_publish_pending_revocations_concurrent(self):
+        delta = {
+            "ver": "1.0",
+            "value": {"prevAccum": "1 ...", "accum": "21 ...", "issued": [1, 2, 3]},
+        }
+        mock_issuer_rev_reg_records = [
+            async_mock.MagicMock(
+                record_id=idx,
+                revoc_reg_id=f"{TEST_DID}:4:{CRED_DEF_ID}:CL_ACCUM:tag{idx}",
+                tails_local_path=TAILS_LOCAL,
+                pending_pub=["1", "2"],
+                send_entry=async_mock.CoroutineMock(),
+                clear_pending=async_mock.CoroutineMock(),
+            )
+            for idx in range(10)
+        ]
+        running = []
+        max_running = []
+
+        async def revoke_credentials(*args):
+            running.append(args[0])
+            max_running.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(args[0])
+            return json.dumps(delta), []
+
+        events = []
+
+        async def _on_event(profile, event):
+            events.append(event.payload)
+
+        event_bus = EventBus()
+        event_bus.subscribe(
+            re.compile("^acapy::REVOCATION::publish-progress::.*"), _on_event
+        )
+        self.profile.context.injector.bind_instance(EventBus, event_bus)
+
+        with async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "query_by_pending",
+            async_mock.CoroutineMock(return_value=mock_issuer_rev_reg_records),
+        ), async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(
+                side_effect=lambda _, id, **args: mock_issuer_rev_reg_records[id]
+            ),
+        ):
+            issuer = async_mock.MagicMock(IndyIssuer, autospec=True)
+            issuer.revoke_credentials = revoke_credentials
+            self.profile.context.injector.bind_instance(IndyIssuer, issuer)
+
+            result = await self.manager.publish_pending_revocations(concurrency=3)
+
+        assert result == {
+            rec.revoc_reg_id: ["1", "2"] for rec in mock_issuer_rev_reg_records
+        }
+        assert max(max_running) == 3
+        for rec in mock_issuer_rev_reg_records:
+            rec.send_entry.assert_called_once_with(self.profile)
+            stages = [
+                event["stage"]
+                for event in events
+                if event["rev_reg_id"] == rec.revoc_reg_id
+            ]
+            assert stages == ["revoked", "stored", "sent"]
+
+    async def test_publish_pending_revocations_registry_fails(self):
+        delta = {
+            "ver": "1.0",
+            "value": {"prevAccum": "1 ...", "accum": "21 ...", "issued": [1, 2, 3]},
+        }
+        mock_issuer_rev_reg_records = [
+            async_mock.MagicMock(
+                record_id=idx,
+                revoc_reg_id=f"{TEST_DID}:4:{CRED_DEF_ID}:CL_ACCUM:tag{idx}",
+                tails_local_path=TAILS_LOCAL,
+                pending_pub=["1"],
+                send_entry=async_mock.CoroutineMock(),
+                clear_pending=async_mock.CoroutineMock(),
+            )
+            for idx in range(3)
+        ]
+        mock_issuer_rev_reg_records[1].send_entry.side_effect = test_module.BaseError(
+            "ledger down"
+        )
+        events = []
+
+        async def _on_event(profile, event):
+            events.append(event.payload)
+
+        event_bus = EventBus()
+        event_bus.subscribe(
+            re.compile("^acapy::REVOCATION::publish-progress::.*"), _on_event
+        )
+        self.profile.context.injector.bind_instance(EventBus, event_bus)
+
+        with async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "query_by_pending",
+            async_mock.CoroutineMock(return_value=mock_issuer_rev_reg_records),
+        ), async_mock.patch.object(
+            test_module.IssuerRevRegRecord,
+            "retrieve_by_id",
+            async_mock.CoroutineMock(
+                side_effect=lambda _, id, **args: mock_issuer_rev_reg_records[id]
+            ),
+        ):
+            issuer = async_mock.MagicMock(IndyIssuer, autospec=True)
+            issuer.revoke_credentials = async_mock.CoroutineMock(
+                return_value=(json.dumps(delta), [])
+            )
+            self.profile.context.injector.bind_instance(IndyIssuer, issuer)
+
+            with self.assertRaises(test_module.BaseError):
+                await self.manager.publish_pending_revocations()
+
+        # the other registries are still published
+        for idx in (0, 2):
+            mock_issuer_rev_reg_records[idx].send_entry.assert_called_once()
+            mock_issuer_rev_reg_records[idx].clear_pending.assert_called_once()
+        failed = [event for event in events if event["stage"] == "failed"]
+        assert failed == [
+            {
+                "rev_reg_id": mock_issuer_rev_reg_records[1].revoc_reg_id,
+                "stage": "failed",
+                "error": "ledger down",
+            }
+        ]
+
     async def test_clear_pending(self):
         mock_issuer_rev_reg_records = [
             async_mock.MagicMock(
@@ -504,3 +637,58 @@ class TestRevocationManager(AsyncTestCase):
                 session, crev_record.record_id
             )
             assert check_crev_record.state == IssuerCredRevRecord.STATE_REVOKED
+
+    async def test_set_revoked_state_bulk(self):
+        cred_ex_ids = []
+        async with self.profile.session() as session:
+            for cred_rev_id in range(1, 301):
+                if cred_rev_id % 2:
+                    exchange_record = V10CredentialExchange(
+                        initiator=V10CredentialExchange.INITIATOR_SELF,
+                        role=V10CredentialExchange.ROLE_ISSUER,
+                        state=V10CredentialExchange.STATE_ISSUED,
+                    )
+                    await exchange_record.save(session)
+                    cred_ex_id = exchange_record.credential_exchange_id
+                    version = IssuerCredRevRecord.VERSION_1
+                else:
+                    exchange_record = V20CredExRecord(
+                        initiator=V20CredExRecord.INITIATOR_SELF,
+                        role=V20CredExRecord.ROLE_ISSUER,
+                        state=V20CredExRecord.STATE_ISSUED,
+                    )
+                    await exchange_record.save(session)
+                    cred_ex_id = exchange_record.cred_ex_id
+                    version = None
+                cred_ex_ids.append(cred_ex_id)
+                await IssuerCredRevRecord(
+                    cred_ex_id=cred_ex_id,
+                    cred_ex_version=version,
+                    rev_reg_id=REV_REG_ID,
+                    cred_rev_id=str(cred_rev_id),
+                ).save(session)
+
+        with async_mock.patch.object(
+            self.profile, "transaction", wraps=self.profile.transaction
+        ) as transaction:
+            await self.manager.set_cred_revoked_state(
+                REV_REG_ID, [str(crid) for crid in range(1, 281)]
+            )
+            # 280 records in batches of 256
+            assert transaction.call_count == 2
+
+        async with self.profile.session() as session:
+            revoked = await IssuerCredRevRecord.query_by_ids(
+                session, rev_reg_id=REV_REG_ID, state=IssuerCredRevRecord.STATE_REVOKED
+            )
+            assert len(revoked) == 280
+            for idx, cred_ex_id in enumerate(cred_ex_ids):
+                if idx % 2:
+                    cred_ex = await V20CredExRecord.retrieve_by_id(session, cred_ex_id)
+                    revoked_state = V20CredExRecord.STATE_CREDENTIAL_REVOKED
+                else:
+                    cred_ex = await V10CredentialExchange.retrieve_by_id(
+                        session, cred_ex_id
+                    )
+                    revoked_state = V10CredentialExchange.STATE_CREDENTIAL_REVOKED
+                assert (cred_ex.state == revoked_state) == (idx < 280)
@@ -14,6 +14,7 @@ REVOCATION_ENTRY_ENDORSED_EVENT = "ENTRY_ENDORSED"
 REVOCATION_ENTRY_EVENT = "SEND_ENTRY"
 REVOCATION_PUBLISHED_EVENT = "published"
 REVOCATION_CLEAR_PENDING_EVENT = "clear-pending"
+REVOCATION_PUBLISH_PROGRESS_EVENT = "publish-progress"
 
 
 async def notify_revocation_reg_init_event(
@@ -69,6 +70,25 @@ async def notify_revocation_published_event(
     await profile.notify(topic, {"rev_reg_id": rev_reg_id, "crids": crids})
 
 
+async def notify_revocation_publish_progress_event(
+    profile: Profile,
+    rev_reg_id: str,
+    stage: str,
+    crids: Sequence[str] = None,
+    error: str = None,
+):
+    """Send notification of progress publishing revocations for a registry."""
+    topic = (
+        f"{REVOCATION_EVENT_PREFIX}{REVOCATION_PUBLISH_PROGRESS_EVENT}::{rev_reg_id}"
+    )
+    payload = {"rev_reg_id": rev_reg_id, "stage": stage}
+    if crids is not None:
+        payload["crids"] = crids
+    if error:
+        payload["error"] = error
+    await profile.notify(topic, payload)
+
+
 async def notify_pending_cleared_event(
     profile: Profile,
     rev_reg_id: str,
@@ -262,11 +262,14 @@ class AskarStorageSearchSession(BaseStorageSearchSession):
             type_filter: Filter string
             tag_query: Tags to search
             page_size: Size of page to return
+            options: Dictionary of backend-specific options, including the
+                `offset` and `limit` of the matching records to return
 
         """
         self.tag_query = tag_query
         self.type_filter = type_filter
         self.page_size = page_size or DEFAULT_PAGE_SIZE
+        self.options = options or {}
         self._done = False
         self._profile = profile
         self._scan = None
@@ -372,6 +375,8 @@ class AskarStorageSearchSession(BaseStorageSearchSession):
             self._scan = self._profile.store.scan(
                 self.type_filter,
                 self.tag_query,
+                offset=self.options.get("offset"),
+                limit=self.options.get("limit"),
                 profile=self._profile.settings.get("wallet.askar_profile"),
             )
         except AskarError as err:
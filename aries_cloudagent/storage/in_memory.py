@@ -1,6 +1,8 @@
 """Basic in-memory storage implementation (non-wallet)."""
 
-from typing import Mapping, Sequence
+import itertools
+
+from typing import Iterable, Mapping, Sequence, Set
 
 from ..core.in_memory import InMemoryProfile
 
@@ -31,6 +33,7 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
 
         """
         self.profile = profile
+        self.index: InMemoryTagIndex = profile.record_index
 
     async def add_record(self, record: StorageRecord):
         """
@@ -48,6 +51,7 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         if record.id in self.profile.records:
             raise StorageDuplicateError("Duplicate record")
         self.profile.records[record.id] = record
+        self.index.add(record)
 
     async def get_record(
         self, record_type: str, record_id: str, options: Mapping = None
@@ -89,7 +93,9 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         oldrec = self.profile.records.get(record.id)
         if not oldrec:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        self.profile.records[record.id] = oldrec._replace(value=value, tags=tags)
+        newrec = oldrec._replace(value=value, tags=tags)
+        self.profile.records[record.id] = newrec
+        self.index.update(oldrec, newrec)
 
     async def delete_record(self, record: StorageRecord):
         """
@@ -105,7 +111,7 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         validate_record(record, delete=True)
         if record.id not in self.profile.records:
             raise StorageNotFoundError("Record not found: {}".format(record.id))
-        del self.profile.records[record.id]
+        self.index.remove(self.profile.records.pop(record.id))
 
     async def find_all_records(
         self,
@@ -114,11 +120,10 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         options: Mapping = None,
     ):
         """Retrieve all records matching a particular type filter and tag query."""
-        results = []
-        for record in self.profile.records.values():
-            if record.type == type_filter and tag_query_match(record.tags, tag_query):
-                results.append(record)
-        return results
+        records = self.profile.records
+        return [
+            records[record_id] for record_id in self.index.find(type_filter, tag_query)
+        ]
 
     async def delete_all_records(
         self,
@@ -126,12 +131,8 @@ class InMemoryStorage(BaseStorage, BaseStorageSearch):
         tag_query: Mapping = None,
     ):
         """Remove all records matching a particular type filter and tag query."""
-        ids = []
-        for record_id, record in self.profile.records.items():
-            if record.type == type_filter and tag_query_match(record.tags, tag_query):
-                ids.append(record_id)
-        for record_id in ids:
-            del self.profile.records[record_id]
+        for record_id in self.index.find(type_filter, tag_query):
+            self.index.remove(self.profile.records.pop(record_id))
 
     def search_records(
         self,
@@ -254,14 +255,19 @@ class InMemoryStorageSearch(BaseStorageSearchSession):
             type_filter: Filter string
             tag_query: Tags to search
             page_size: Size of page to return
-            options: Dictionary of backend-specific options
+            options: Dictionary of backend-specific options, including the
+                `offset` and `limit` of the matching records to return
 
         """
-        self._cache = profile.records.copy()
-        self._iter = iter(self._cache)
+        options = options or {}
+        self._profile = profile
+        self._cache = None
+        self._iter = None
         self.page_size = page_size or DEFAULT_PAGE_SIZE
         self.tag_query = tag_query
         self.type_filter = type_filter
+        self._skip = options.get("offset") or 0
+        self._remaining = options.get("limit")
 
     async def fetch(self, max_count: int = None) -> Sequence[StorageRecord]:
         """
@@ -278,30 +284,181 @@ class InMemoryStorageSearch(BaseStorageSearchSession):
             StorageSearchError: If the search query has not been opened
 
         """
-        if self._cache is None:
-            raise StorageSearchError("Search query is complete")
-
-        ret = []
-        check_type = self.type_filter
-        i = max_count or self.page_size
-
-        while i > 0:
-            try:
-                id = next(self._iter)
-            except StopIteration:
-                break
-            record = self._cache[id]
-            if record.type == check_type and tag_query_match(
-                record.tags, self.tag_query
-            ):
-                ret.append(record)
-                i -= 1
-
+        if self._iter is None:
+            if not self._profile:
+                raise StorageSearchError("Search query is complete")
+            # resolve the matching records when the search is first used
+            records = self._profile.records
+            self._cache = [
+                records[record_id]
+                for record_id in self._profile.record_index.find(
+                    self.type_filter, self.tag_query
+                )
+            ]
+            self._iter = itertools.islice(
+                self._cache,
+                self._skip,
+                None if self._remaining is None else self._skip + self._remaining,
+            )
+            self._profile = None
+
+        ret = list(itertools.islice(self._iter, max_count or self.page_size))
         if not ret:
             self._cache = None
+            self._iter = None
 
         return ret
 
     async def close(self):
         """Dispose of the search query."""
         self._cache = None
+        self._iter = None
+        self._profile = None
+
+
+class InMemoryTagIndex:
+    """
+    Secondary index of in-memory records by type and tag value.
+
+    Tag queries are resolved against sets of record identifiers, so their cost
+    grows with the number of matching records and distinct tag values rather
+    than with the total number of stored records. The index is updated as
+    records are added, updated and deleted.
+    """
+
+    def __init__(self, records: Iterable[StorageRecord] = None):
+        """
+        Initialize a `InMemoryTagIndex` instance.
+
+        Args:
+            records: Existing records to be indexed
+
+        """
+        self._seq = {}
+        self._counter = itertools.count()
+        self._by_type = {}
+        self._by_tag = {}
+        for record in records or ():
+            self.add(record)
+
+    def __len__(self) -> int:
+        """Get the number of indexed records."""
+        return len(self._seq)
+
+    def add(self, record: StorageRecord):
+        """Add a record to the index."""
+        self._seq[record.id] = next(self._counter)
+        self._by_type.setdefault(record.type, set()).add(record.id)
+        self._add_tags(record)
+
+    def update(self, old: StorageRecord, new: StorageRecord):
+        """Replace the tags of an indexed record, keeping its position."""
+        self._remove_tags(old)
+        self._add_tags(new)
+
+    def remove(self, record: StorageRecord):
+        """Remove a record from the index."""
+        self._remove_tags(record)
+        del self._seq[record.id]
+        ids = self._by_type[record.type]
+        ids.discard(record.id)
+        if not ids:
+            del self._by_type[record.type]
+
+    def _add_tags(self, record: StorageRecord):
+        """Add the tag values of a record to the index."""
+        for name, value in (record.tags or {}).items():
+            if value is not None:
+                values = self._by_tag.setdefault((record.type, name), {})
+                values.setdefault(value, set()).add(record.id)
+
+    def _remove_tags(self, record: StorageRecord):
+        """Remove the tag values of a record from the index."""
+        for name, value in (record.tags or {}).items():
+            values = self._by_tag.get((record.type, name))
+            ids = values and values.get(value)
+            if ids:
+                ids.discard(record.id)
+                if not ids:
+                    del values[value]
+                    if not values:
+                        del self._by_tag[(record.type, name)]
+
+    def find(self, type_filter: str, tag_query: Mapping = None) -> Sequence[str]:
+        """
+        Find the identifiers of the records matching a type and tag query.
+
+        Returns:
+            The matching record identifiers, in the order the records were added
+
+        """
+        all_ids = self._by_type.get(type_filter)
+        if not all_ids:
+            return []
+        found = self._match_query(type_filter, tag_query, all_ids)
+        return sorted(found, key=self._seq.__getitem__)
+
+    def _match_query(self, type_filter: str, tag_query: Mapping, all_ids: Set[str]):
+        """Get the set of record identifiers matching a tag query."""
+        if not tag_query:
+            return all_ids
+        clauses = []
+        for k, v in tag_query.items():
+            if k == "$or":
+                if not isinstance(v, list):
+                    raise StorageSearchError("Expected list for $or filter value")
+                ids = set()
+                for opt in v:
+                    ids.update(self._match_query(type_filter, opt, all_ids))
+            elif k == "$and":
+                if not isinstance(v, list):
+                    raise StorageSearchError("Expected list for $and filter value")
+                ids = self._intersect(
+                    [self._match_query(type_filter, opt, all_ids) for opt in v],
+                    all_ids,
+                )
+            elif k == "$not":
+                if not isinstance(v, dict):
+                    raise StorageSearchError("Expected dict for $not filter value")
+                ids = all_ids - self._match_query(type_filter, v, all_ids)
+            elif k[0] == "$":
+                raise StorageSearchError("Unexpected filter operator: {}".format(k))
+            elif isinstance(v, str):
+                ids = self._by_tag.get((type_filter, k), {}).get(v, set())
+            elif isinstance(v, dict):
+                ids = self._match_value(self._by_tag.get((type_filter, k), {}), v)
+            else:
+                raise StorageSearchError(
+                    "Expected string or dict for filter value, got {}".format(v)
+                )
+            if not ids:
+                return set()
+            clauses.append(ids)
+        return self._intersect(clauses, all_ids)
+
+    @staticmethod
+    def _match_value(values: Mapping[str, Set[str]], match: dict) -> Set[str]:
+        """Get the set of record identifiers with a tag value matching a subquery."""
+        if len(match) != 1:
+            raise StorageSearchError("Unsupported subquery: {}".format(match))
+        ids = set()
+        if isinstance(match.get("$in"), list):
+            for value in match["$in"]:
+                ids.update(values.get(value, ()))
+            return ids
+        for value, value_ids in values.items():
+            try:
+                if tag_value_match(value, match):
+                    ids.update(value_ids)
+            except ValueError:
+                # a non-numeric value never matches a range query
+                pass
+        return ids
+
+    @staticmethod
+    def _intersect(clauses: Sequence[Set[str]], all_ids: Set[str]) -> Set[str]:
+        """Intersect sets of record identifiers, starting with the smallest."""
+        if not clauses:
+            return all_ids
+        clauses = sorted(clauses, key=len)
+        return clauses[0].intersection(*clauses[1:])
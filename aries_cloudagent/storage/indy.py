@@ -238,6 +238,8 @@ class IndySdkStorageSearch(BaseStorageSearchSession):
             type_filter: Filter string
             tag_query: Tags to search
             page_size: Size of page to return
+            options: Dictionary of backend-specific options, including the
+                `offset` and `limit` of the matching records to return
 
         """
         self._handle = None
@@ -247,6 +249,8 @@ class IndySdkStorageSearch(BaseStorageSearchSession):
         self.page_size = page_size or DEFAULT_PAGE_SIZE
         self.tag_query = tag_query
         self.type_filter = type_filter
+        self._skip = self.options.get("offset") or 0
+        self._remaining = self.options.get("limit")
 
     async def fetch(self, max_count: int = None) -> Sequence[StorageRecord]:
         """
@@ -267,17 +271,19 @@ class IndySdkStorageSearch(BaseStorageSearchSession):
             raise StorageSearchError("Search query is complete")
         await self._open()
 
-        try:
-            result_json = await non_secrets.fetch_wallet_search_next_records(
-                self.store.wallet.handle, self._handle, max_count or self.page_size
-            )
-        except IndyError as x_indy:
-            raise StorageSearchError(str(x_indy)) from x_indy
-
-        results = json.loads(result_json)
+        count = max_count or self.page_size
+        if self._remaining is not None:
+            count = min(count, self._remaining)
+        # the wallet search has no offset, so skipped records are fetched in pages
+        while self._skip:
+            skipped = await self._fetch_next(min(self._skip, self.page_size))
+            self._skip = self._skip - len(skipped) if skipped else 0
+        results = await self._fetch_next(count) if count else []
+        if self._remaining is not None:
+            self._remaining -= len(results)
         ret = []
-        if results["records"]:
-            for row in results["records"]:
+        if results:
+            for row in results:
                 ret.append(
                     StorageRecord(
                         type=self.type_filter,
@@ -292,6 +298,16 @@ class IndySdkStorageSearch(BaseStorageSearchSession):
 
         return ret
 
+    async def _fetch_next(self, count: int) -> Sequence[dict]:
+        """Fetch the next rows from the wallet search."""
+        try:
+            result_json = await non_secrets.fetch_wallet_search_next_records(
+                self.store.wallet.handle, self._handle, count
+            )
+        except IndyError as x_indy:
+            raise StorageSearchError(str(x_indy)) from x_indy
+        return json.loads(result_json)["records"] or []
+
     async def _open(self):
         """Start the search query."""
         if self._handle:
@@ -374,5 +374,5 @@ class TestAskarStorageSearchSession(AsyncTestCase):
             assert storageSearchSession._scan == askar_profile_scan
             askar_profile.settings.get.assert_called_once_with("wallet.askar_profile")
             askar_profile.store.scan.assert_called_once_with(
-                "filter", "tagQuery", profile=profile
+                "filter", "tagQuery", offset=None, limit=None, profile=profile
             )
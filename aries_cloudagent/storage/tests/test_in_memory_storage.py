@@ -11,6 +11,7 @@ from ...storage.error import (
 )
 from ...storage.in_memory import (
     InMemoryStorage,
+    InMemoryTagIndex,
     tag_value_match,
     tag_query_match,
 )
@@ -205,6 +206,22 @@ class TestInMemoryStorageSearch:
             count += 1
         assert count == 1
 
+    @pytest.mark.asyncio
+    async def test_search_offset_limit(self, store_search):
+        records = [
+            StorageRecord(type="TYPE", value=str(index), tags={}) for index in range(10)
+        ]
+        for record in records:
+            await store_search.add_record(record)
+        search = store_search.search_records(
+            "TYPE", {}, None, {"offset": 3, "limit": 5}
+        )
+        rows = await search.fetch(2)
+        assert [row.value for row in rows] == ["3", "4"]
+        rows = await search.fetch(10)
+        assert [row.value for row in rows] == ["5", "6", "7"]
+        assert not await search.fetch()
+
     @pytest.mark.asyncio
     async def test_closed_search(self, store_search):
         search = store_search.search_records("TYPE", {}, None)
@@ -275,3 +292,119 @@ class TestInMemoryTagQuery:
         with pytest.raises(StorageSearchError) as excinfo:
             tag_query_match(TAGS, {"a": -1})
         assert "Expected string or dict for filter value" in str(excinfo.value)
+
+
+class TestInMemoryTagIndex:
+    QUERIES = [
+        None,
+        {},
+        {"color": "red"},
+        {"color": "red", "size": "3"},
+        {"color": {"$in": ["red", "blue"]}},
+        {"color": {"$neq": "red"}},
+        {"size": {"$gt": "2"}},
+        {"size": {"$lte": "2"}},
+        {"$or": [{"color": "red"}, {"size": "0"}]},
+        {"$and": [{"color": "blue"}, {"size": {"$lt": "3"}}]},
+        {"$not": {"color": "red"}},
+        {"$or": [{}, {"color": "none"}]},
+        {"$and": []},
+        {"missing": "red"},
+        {"missing": {"$neq": "red"}},
+    ]
+
+    @staticmethod
+    def make_records(count: int, rtype: str = "TYPE"):
+        colors = ("red", "green", "blue")
+        return [
+            StorageRecord(
+                type=rtype,
+                value=str(index),
+                tags={"color": colors[index % 3], "size": str(index % 5)},
+                id=f"{rtype}-{index}",
+            )
+            for index in range(count)
+        ]
+
+    @pytest.mark.asyncio
+    async def test_index_matches_scan(self, store):
+        for record in self.make_records(30) + self.make_records(5, "OTHER"):
+            await store.add_record(record)
+        for query in self.QUERIES:
+            expected = [
+                record.id
+                for record in store.profile.records.values()
+                if record.type == "TYPE" and tag_query_match(record.tags, query)
+            ]
+            found = await store.find_all_records("TYPE", query)
+            assert [record.id for record in found] == expected, query
+
+        with pytest.raises(StorageSearchError):
+            await store.find_all_records("TYPE", {"size": {"$gt": "1", "$lt": "3"}})
+        with pytest.raises(StorageSearchError):
+            await store.find_all_records("TYPE", {"$or": {"color": "red"}})
+        with pytest.raises(StorageSearchError):
+            await store.find_all_records("TYPE", {"color": 1})
+        assert await store.find_all_records("MISSING", {"color": "red"}) == []
+
+    @pytest.mark.asyncio
+    async def test_index_maintenance(self, store):
+        records = self.make_records(6)
+        for record in records:
+            await store.add_record(record)
+
+        await store.update_record(records[0], "new", {"color": "purple"})
+        found = await store.find_all_records("TYPE", {"color": "purple"})
+        assert [record.id for record in found] == [records[0].id]
+        found = await store.find_all_records("TYPE", {"size": "0"})
+        assert [record.id for record in found] == [records[5].id]
+        # updated records keep their position
+        found = await store.find_all_records("TYPE", {"color": {"$neq": "green"}})
+        assert [record.id for record in found] == [
+            records[0].id,
+            records[2].id,
+            records[3].id,
+            records[5].id,
+        ]
+
+        await store.delete_record(records[3])
+        found = await store.find_all_records("TYPE", {"color": "red"})
+        assert found == []
+
+        await store.delete_all_records("TYPE", {"color": {"$in": ["blue", "green"]}})
+        found = await store.find_all_records("TYPE")
+        assert [record.id for record in found] == [records[0].id]
+        assert len(store.index) == 1
+
+        await store.delete_record(records[0])
+        assert len(store.index) == 0
+        assert not store.index._by_type and not store.index._by_tag
+
+    def test_index_selective_query(self):
+        class CountingDict(dict):
+            lookups = 0
+
+            def __getitem__(self, key):
+                self.lookups += 1
+                return super().__getitem__(key)
+
+        count = 10000
+        records = [
+            record._replace(tags={**record.tags, "value": record.value})
+            for record in self.make_records(count)
+        ]
+        index = InMemoryTagIndex(records)
+        index._seq = CountingDict(index._seq)
+        queries = [
+            {"value": str(count // 2)},
+            {"color": "red", "value": {"$in": ["3", "6", "7"]}},
+            {"$or": [{"value": "1"}, {"size": "1", "value": "11"}]},
+        ]
+        found = [index.find("TYPE", query) for query in queries]
+        assert found == [
+            [f"TYPE-{count // 2}"],
+            ["TYPE-3", "TYPE-6"],
+            ["TYPE-1", "TYPE-11"],
+        ]
+        # only the matching records are visited, not every stored record
+        assert index._seq.lookups == 5
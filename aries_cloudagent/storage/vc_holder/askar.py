@@ -4,6 +4,8 @@ import json
 
 from dateutil.parser import parse as dateutil_parser
 from dateutil.parser import ParserError
+from functools import lru_cache
+from jsonpath_ng import JSONPath, parse
 from typing import Mapping, Sequence
 
 from ...askar.profile import AskarProfile
@@ -11,10 +13,19 @@ from ...askar.profile import AskarProfile
 from ..askar import AskarStorage, AskarStorageSearch, AskarStorageSearchSession
 from ..record import StorageRecord
 
-from .base import VCHolder, VCRecordSearch
+from .base import PATH_TAG_PREFIX, VCHolder, VCRecordSearch
 from .vc_record import VCRecord
 from .xform import VC_CRED_RECORD_TYPE
 
+# tag listing the JSON paths which were indexed when a credential was stored
+INDEXED_PATH_TAG = "indexed_path"
+
+
+@lru_cache(maxsize=256)
+def _compile_path(path: str) -> JSONPath:
+    """Parse an indexed JSON path."""
+    return parse(path)
+
 
 class AskarVCHolder(VCHolder):
     """Askar VC record storage class."""
@@ -22,6 +33,32 @@ class AskarVCHolder(VCHolder):
     def __init__(self, profile: AskarProfile):
         """Initialize the Indy-SDK VC holder instance."""
         self._profile = profile
+        self._indexed_paths = tuple(
+            profile.settings.get("vc_holder.indexed_paths") or ()
+        )
+
+    @property
+    def indexed_paths(self) -> Sequence[str]:
+        """Accessor for the JSON paths whose values are stored as tags."""
+        return self._indexed_paths
+
+    def path_tags(self, cred: VCRecord) -> dict:
+        """Extract the tags for the string values found at the indexed paths."""
+        tags = {}
+        for path in self._indexed_paths:
+            values = set()
+            for match in _compile_path(path).find(cred.cred_value or {}):
+                value = match.value
+                # typed literals are compared on their value
+                if isinstance(value, dict):
+                    value = value.get("@value")
+                if isinstance(value, str):
+                    values.add(value)
+            if values:
+                tags[PATH_TAG_PREFIX + path] = (
+                    values.pop() if len(values) == 1 else values
+                )
+        return tags
 
     def build_type_or_schema_query(self, uri_list: Sequence[str]) -> dict:
         """Build and return indy-specific type_or_schema_query."""
@@ -47,6 +84,10 @@ class AskarVCHolder(VCHolder):
 
         """
         record = vc_to_storage_record(cred)
+        for tagname, tagval in self.path_tags(cred).items():
+            record.tags[f"cstm:{tagname}"] = tagval
+        if self._indexed_paths:
+            record.tags[INDEXED_PATH_TAG] = set(self._indexed_paths)
         async with self._profile.session() as session:
             await AskarStorage(session).add_record(record)
 
@@ -120,19 +161,34 @@ class AskarVCHolder(VCHolder):
             if vals is None:
                 pass
             elif len(vals) > 1:
-                query.append({"$or": [{k: v for v in vals}]})
+                query.append({"$or": [{k: v} for v in vals]})
             else:
                 query.append({k: vals[0]})
 
         def _make_custom_query(query):
             result = {}
+            path_clauses = []
             for k, v in query.items():
                 if isinstance(v, (list, set)) and k != "$exist":
                     result[k] = [_make_custom_query(cl) for cl in v]
                 elif k.startswith("$"):
                     result[k] = v
+                elif k.startswith(PATH_TAG_PREFIX):
+                    # credentials stored before the path was indexed have no tag
+                    # for it, so they are returned for the caller to filter
+                    path = k.replace(PATH_TAG_PREFIX, "", 1)
+                    path_clauses.append(
+                        {
+                            "$or": [
+                                {f"cstm:{k}": v},
+                                {"$not": {INDEXED_PATH_TAG: path}},
+                            ]
+                        }
+                    )
                 else:
                     result[f"cstm:{k}"] = v
+            if path_clauses:
+                return {"$and": ([result] if result else []) + path_clauses}
             return result
 
         query = []
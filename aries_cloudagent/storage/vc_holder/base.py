@@ -5,10 +5,23 @@ from typing import Mapping, Sequence
 
 from .vc_record import VCRecord
 
+# prefix of the tags holding the values found at an indexed JSON path
+PATH_TAG_PREFIX = "path:"
+
 
 class VCHolder(ABC):
     """Abstract base class for a verifiable credential holder."""
 
+    @property
+    def indexed_paths(self) -> Sequence[str]:
+        """
+        Accessor for the JSON paths whose values are stored as tags.
+
+        A path is indexed as the tag `path:<path>`, which can be used in the
+        `tag_query` of a search.
+        """
+        return ()
+
     @abstractmethod
     async def store_credential(self, cred: VCRecord):
         """
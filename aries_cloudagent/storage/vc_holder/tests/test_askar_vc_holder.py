@@ -4,7 +4,7 @@ import pytest
 from ....askar.profile import AskarProfileManager
 from ....config.injection_context import InjectionContext
 
-from ..base import VCHolder
+from ..base import PATH_TAG_PREFIX, VCHolder
 from ..vc_record import VCRecord
 
 from . import test_in_memory_vc_holder as in_memory
@@ -19,8 +19,8 @@ VC_SCHEMA_ID = "https://example.org/examples/degree.json"
 VC_GIVEN_ID = "http://example.edu/credentials/3732"
 
 
-async def make_profile():
-    context = InjectionContext()
+async def make_profile(settings: dict = None):
+    context = InjectionContext(settings=settings)
     profile = await AskarProfileManager().provision(
         context,
         {
@@ -125,3 +125,74 @@ class TestAskarVCHolder(in_memory.TestInMemoryVCHolder):
         search = holder.search_credentials(pd_uri_list=test_uri_list)
         rows = await search.fetch()
         assert rows == [record]
+
+    @pytest.mark.asyncio
+    async def test_search_subject_ids_any(self, holder: VCHolder):
+        record = test_record()
+        await holder.store_credential(record)
+
+        search = holder.search_credentials(
+            subject_ids=["did:example:other", VC_SUBJECT_ID]
+        )
+        assert await search.fetch() == [record]
+
+    @pytest.mark.asyncio
+    async def test_indexed_paths(self):
+        profile = await make_profile(
+            {
+                "vc_holder.indexed_paths": [
+                    "$.credentialSubject.givenName",
+                    "$.credentialSubject.degree",
+                ]
+            }
+        )
+        holder = profile.inject(VCHolder)
+        assert holder.indexed_paths == (
+            "$.credentialSubject.givenName",
+            "$.credentialSubject.degree",
+        )
+        record = test_record()
+        await holder.store_credential(record)
+
+        given_name_tag = PATH_TAG_PREFIX + "$.credentialSubject.givenName"
+        search = holder.search_credentials(tag_query={given_name_tag: "Cai"})
+        rows = await search.fetch()
+        assert [row.record_id for row in rows] == [record.record_id]
+        assert rows[0].cred_tags[given_name_tag] == "Cai"
+
+        search = holder.search_credentials(
+            tag_query={given_name_tag: {"$in": ["Bob", "Cai"]}}
+        )
+        assert len(await search.fetch()) == 1
+        search = holder.search_credentials(tag_query={given_name_tag: "Bob"})
+        assert await search.fetch() == []
+        await profile.close()
+
+    @pytest.mark.asyncio
+    async def test_indexed_paths_added(self):
+        profile = await make_profile()
+        holder = profile.inject(VCHolder)
+        # stored before the path is indexed
+        old_record = test_record()
+        await holder.store_credential(old_record)
+
+        profile.settings["vc_holder.indexed_paths"] = ["$.credentialSubject.givenName"]
+        holder = profile.inject(VCHolder)
+        record = test_record()
+        await holder.store_credential(record)
+        other = test_record()
+        other.cred_value["credentialSubject"]["givenName"] = "Bob"
+        await holder.store_credential(other)
+
+        given_name_tag = PATH_TAG_PREFIX + "$.credentialSubject.givenName"
+        search = holder.search_credentials(tag_query={given_name_tag: "Cai"})
+        rows = await search.fetch()
+        assert sorted(row.record_id for row in rows) == sorted(
+            [old_record.record_id, record.record_id]
+        )
+        search = holder.search_credentials(tag_query={given_name_tag: "Bob"})
+        rows = await search.fetch()
+        assert sorted(row.record_id for row in rows) == sorted(
+            [old_record.record_id, other.record_id]
+        )
+        await profile.close()
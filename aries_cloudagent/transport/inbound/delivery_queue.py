@@ -5,8 +5,13 @@ The delivery queue holds and manages messages that have not yet
 been delivered to their intended destination.
 
 """
+import heapq
+import itertools
 import time
 
+from collections import OrderedDict
+from typing import Iterable, Sequence
+
 from ..outbound.message import OutboundMessage
 
 
@@ -25,6 +30,17 @@ class QueuedMessage:
         """
         self.msg = msg
         self.timestamp = time.time()
+        self.keys = set()
+        self.size = self.message_size(msg)
+
+    @staticmethod
+    def message_size(msg: OutboundMessage) -> int:
+        """Estimate the size in bytes of a queued message."""
+        payload = msg.enc_payload if msg.enc_payload is not None else msg.payload
+        try:
+            return len(payload)
+        except TypeError:
+            return 0
 
     def older_than(self, compare_timestamp: float) -> bool:
         """
@@ -45,15 +61,47 @@ class DeliveryQueue:
     Manages undelivered messages.
     """
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        *,
+        ttl_seconds: int = None,
+        max_messages_per_key: int = None,
+        max_bytes_per_key: int = None,
+        max_messages: int = None,
+        max_bytes: int = None,
+    ) -> None:
         """
         Initialize an instance of DeliveryQueue.
 
-        This uses an in memory structure to queue messages.
+        This uses an in memory structure to queue messages. Each recipient key maps
+        to an ordered index of its messages, so that taking the oldest message or
+        removing a specific message does not depend on the length of the queue.
+        Expired messages are found through a heap ordered by timestamp, and are
+        removed as the queue is accessed rather than by sweeping every key.
+
+        When a limit is reached the oldest messages are evicted to make room.
+
+        Args:
+            ttl_seconds: The time in seconds to keep undelivered messages
+            max_messages_per_key: The maximum number of messages per recipient key
+            max_bytes_per_key: The maximum total message size per recipient key
+            max_messages: The maximum number of messages in the queue
+            max_bytes: The maximum total message size in the queue
         """
 
         self.queue_by_key = {}
-        self.ttl_seconds = 604800  # one week
+        self.ttl_seconds = ttl_seconds or 604800  # one week
+        self.max_messages_per_key = max_messages_per_key
+        self.max_bytes_per_key = max_bytes_per_key
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.bytes_by_key = {}
+        self.total_messages = 0
+        self.total_bytes = 0
+        self.evicted = 0
+        self.expired = 0
+        self._expiry = []
+        self._seq = itertools.count()
 
     def expire_messages(self, ttl=None):
         """
@@ -65,10 +113,64 @@ class DeliveryQueue:
 
         ttl_seconds = ttl or self.ttl_seconds
         horizon = time.time() - ttl_seconds
-        for key in self.queue_by_key.keys():
-            self.queue_by_key[key] = [
-                wm for wm in self.queue_by_key[key] if not wm.older_than(horizon)
-            ]
+        expiry = self._expiry
+        while expiry and expiry[0][0] < horizon:
+            wrapped = heapq.heappop(expiry)[2]
+            if wrapped.keys:
+                self._remove_wrapped(wrapped)
+                self.expired += 1
+
+    def _remove_wrapped(self, wrapped: QueuedMessage):
+        """Remove a queued message for all of its recipient keys."""
+        for key in list(wrapped.keys):
+            self._remove_from_key(key, wrapped)
+
+    def _remove_from_key(self, key: str, wrapped: QueuedMessage):
+        """Remove a queued message for a single recipient key."""
+        messages = self.queue_by_key.get(key)
+        if messages is None or messages.pop(id(wrapped.msg), None) is None:
+            return
+        wrapped.keys.discard(key)
+        self.bytes_by_key[key] -= wrapped.size
+        if not messages:
+            del self.queue_by_key[key]
+            del self.bytes_by_key[key]
+        if not wrapped.keys:
+            self.total_messages -= 1
+            self.total_bytes -= wrapped.size
+            # drop stale expiry entries once they dominate the heap
+            if len(self._expiry) > 2 * self.total_messages + 1000:
+                self._expiry[:] = [entry for entry in self._expiry if entry[2].keys]
+                heapq.heapify(self._expiry)
+
+    def _evict_oldest(self) -> bool:
+        """Evict the oldest message in the queue."""
+        expiry = self._expiry
+        while expiry:
+            wrapped = heapq.heappop(expiry)[2]
+            if wrapped.keys:
+                self._remove_wrapped(wrapped)
+                self.evicted += 1
+                return True
+        return False
+
+    def _over_key_limit(self, key: str) -> bool:
+        """Check whether the messages for a key exceed the per-key limits."""
+        return bool(
+            self.max_messages_per_key
+            and len(self.queue_by_key[key]) > self.max_messages_per_key
+            or self.max_bytes_per_key
+            and self.bytes_by_key[key] > self.max_bytes_per_key
+        )
+
+    def _over_limit(self) -> bool:
+        """Check whether the queue exceeds the global limits."""
+        return bool(
+            self.max_messages
+            and self.total_messages > self.max_messages
+            or self.max_bytes
+            and self.total_bytes > self.max_bytes
+        )
 
     def add_message(self, msg: OutboundMessage):
         """
@@ -84,11 +186,34 @@ class DeliveryQueue:
             keys.update(msg.target.recipient_keys)
         if msg.reply_to_verkey:
             keys.add(msg.reply_to_verkey)
+        if not keys:
+            return
+        self.expire_messages()
         wrapped_msg = QueuedMessage(msg)
         for recipient_key in keys:
+            # a message queued again for the same key replaces the earlier entry
+            self.remove_message_for_key(recipient_key, msg)
             if recipient_key not in self.queue_by_key:
-                self.queue_by_key[recipient_key] = []
-            self.queue_by_key[recipient_key].append(wrapped_msg)
+                self.queue_by_key[recipient_key] = OrderedDict()
+                self.bytes_by_key[recipient_key] = 0
+            self.queue_by_key[recipient_key][id(msg)] = wrapped_msg
+            wrapped_msg.keys.add(recipient_key)
+            self.bytes_by_key[recipient_key] += wrapped_msg.size
+        self.total_messages += 1
+        self.total_bytes += wrapped_msg.size
+        heapq.heappush(
+            self._expiry, (wrapped_msg.timestamp, next(self._seq), wrapped_msg)
+        )
+
+        for recipient_key in keys:
+            while recipient_key in self.queue_by_key and self._over_key_limit(
+                recipient_key
+            ):
+                oldest = next(iter(self.queue_by_key[recipient_key].values()))
+                self._remove_from_key(recipient_key, oldest)
+                self.evicted += 1
+        while self._over_limit() and self._evict_oldest():
+            pass
 
     def has_message_for_key(self, key: str):
         """
@@ -97,6 +222,7 @@ class DeliveryQueue:
         Args:
             key: The key to use for lookup
         """
+        self.expire_messages()
         if key in self.queue_by_key and len(self.queue_by_key[key]):
             return True
         return False
@@ -108,6 +234,7 @@ class DeliveryQueue:
         Args:
             key: The key to use for lookup
         """
+        self.expire_messages()
         if key in self.queue_by_key:
             return len(self.queue_by_key[key])
         else:
@@ -120,18 +247,47 @@ class DeliveryQueue:
         Args:
             key: The key to use for lookup
         """
+        self.expire_messages()
         if key in self.queue_by_key:
-            return self.queue_by_key[key].pop(0).msg
+            wrapped_msg = next(iter(self.queue_by_key[key].values()))
+            self._remove_from_key(key, wrapped_msg)
+            return wrapped_msg.msg
 
-    def inspect_all_messages_for_key(self, key: str):
+    def get_messages_for_key(
+        self, key: str, count: int, offset: int = 0
+    ) -> Sequence[OutboundMessage]:
+        """
+        Return up to `count` of the oldest messages for key.
+
+        The messages are not removed from the queue.
+
+        Args:
+            key: The key to use for lookup
+            count: The maximum number of messages to return
+            offset: The number of oldest messages to skip
+        """
+        self.expire_messages()
+        if key in self.queue_by_key:
+            return [
+                wrapped_msg.msg
+                for wrapped_msg in itertools.islice(
+                    self.queue_by_key[key].values(), offset, offset + count
+                )
+            ]
+        return []
+
+    def inspect_all_messages_for_key(self, key: str) -> Iterable[OutboundMessage]:
         """
         Return all messages for key.
 
+        Messages may be removed from the queue while iterating.
+
         Args:
             key: The key to use for lookup
         """
+        self.expire_messages()
         if key in self.queue_by_key:
-            for wrapped_msg in self.queue_by_key[key]:
+            for wrapped_msg in list(self.queue_by_key[key].values()):
                 yield wrapped_msg.msg
 
     def remove_message_for_key(self, key: str, msg: OutboundMessage):
@@ -142,10 +298,11 @@ class DeliveryQueue:
             key: The key to use for lookup
             msg: The message to remove from the queue
         """
-        if key in self.queue_by_key:
-            for wrapped_msg in self.queue_by_key[key]:
-                if wrapped_msg.msg == msg:
-                    self.queue_by_key[key].remove(wrapped_msg)
-                    if not self.queue_by_key[key]:
-                        del self.queue_by_key[key]
-                    break  # exit processing loop
+        messages = self.queue_by_key.get(key)
+        if messages:
+            wrapped_msg = messages.get(id(msg))
+            if wrapped_msg and wrapped_msg.msg is msg:
+                self._remove_from_key(key, wrapped_msg)
+
+    def close(self):
+        """Release the resources held by the queue."""
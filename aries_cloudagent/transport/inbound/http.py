@@ -5,6 +5,7 @@ import logging
 from aiohttp import web
 
 from ...messaging.error import MessageParseError
+from ...utils.task_queue import TaskQueueFullError
 from ..error import WireFormatParseError
 from ..wire_format import DIDCOMM_V0_MIME_TYPE, DIDCOMM_V1_MIME_TYPE
 from .base import BaseInboundTransport, InboundTransportSetupError
@@ -94,6 +95,9 @@ class HttpTransport(BaseInboundTransport):
                 inbound = await session.receive(body)
             except (MessageParseError, WireFormatParseError):
                 raise web.HTTPBadRequest()
+            except TaskQueueFullError:
+                # ask the sender to slow down
+                raise web.HTTPTooManyRequests(headers={"Retry-After": "1"})
 
             if inbound.receipt.direct_response_requested:
                 # Wait for the message to be processed. Only send a response if a response
@@ -3,12 +3,13 @@
 import logging
 import uuid
 from collections import OrderedDict
-from typing import Callable, Coroutine
+from typing import Callable, Coroutine, Union
 
 from ...core.profile import Profile
 from ...utils.classloader import ClassLoader, ModuleLoadError, ClassNotFoundError
 from ...utils.task_queue import CompletedTask, TaskQueue
 
+from ..error import WireFormatError
 from ..outbound.message import OutboundMessage
 from ..wire_format import BaseWireFormat
 
@@ -18,6 +19,7 @@ from .base import (
     InboundTransportRegistrationError,
 )
 from .delivery_queue import DeliveryQueue
+from .persistent_queue import PersistentDeliveryQueue
 from .message import InboundMessage
 from .session import InboundSession
 
@@ -43,7 +45,8 @@ class InboundTransportManager:
         self.running_transports = {}
         self.sessions = OrderedDict()
         self.task_queue = TaskQueue()
-        self.undelivered_queue: DeliveryQueue = None
+        self.undelivered_queue: Union[DeliveryQueue, PersistentDeliveryQueue] = None
+        self.undelivered_batch_size = 10
 
     async def setup(self):
         """Perform setup operations."""
@@ -63,8 +66,26 @@ class InboundTransportManager:
             )
 
         # Setup queue for undelivered messages
-        if self.profile.context.settings.get("transport.enable_undelivered_queue"):
-            self.undelivered_queue = DeliveryQueue()
+        settings = self.profile.context.settings
+        if settings.get("transport.enable_undelivered_queue"):
+            queue_args = dict(
+                ttl_seconds=settings.get("transport.undelivered_queue.ttl"),
+                max_messages_per_key=settings.get(
+                    "transport.undelivered_queue.max_messages_per_key"
+                ),
+                max_bytes_per_key=settings.get(
+                    "transport.undelivered_queue.max_bytes_per_key"
+                ),
+                max_messages=settings.get("transport.undelivered_queue.max_messages"),
+                max_bytes=settings.get("transport.undelivered_queue.max_bytes"),
+            )
+            queue_path = settings.get("transport.undelivered_queue.path")
+            if queue_path:
+                self.undelivered_queue = PersistentDeliveryQueue(
+                    queue_path, **queue_args
+                )
+            else:
+                self.undelivered_queue = DeliveryQueue(**queue_args)
 
     def register(self, config: InboundTransportConfiguration) -> str:
         """
@@ -139,6 +160,10 @@ class InboundTransportManager:
         await self.task_queue.complete(None if wait else 0)
         for transport in self.running_transports.values():
             await transport.stop()
+        if isinstance(self.undelivered_queue, PersistentDeliveryQueue):
+            await self.undelivered_queue.aclose()
+        elif self.undelivered_queue:
+            self.undelivered_queue.close()
 
     async def create_session(
         self,
@@ -179,7 +204,7 @@ class InboundTransportManager:
         """Handle completion of message dispatch."""
         session: InboundSession = self.sessions.get(message.session_id)
         if session and session.accept_undelivered and not session.response_buffered:
-            self.process_undelivered(session)
+            self.task_queue.run(self.process_undelivered(session))
 
         message.dispatch_processing_complete()
 
@@ -217,34 +242,87 @@ class InboundTransportManager:
             LOGGER.debug("Returned message to socket %s", session.session_id)
         return accepted
 
-    def return_undelivered(self, outbound: OutboundMessage) -> bool:
+    def return_undelivered(
+        self, outbound: OutboundMessage, profile: Profile = None
+    ) -> bool:
         """
         Add an undelivered message to the undelivered queue.
 
         At this point the message could not be associated with an inbound
-        session and could not be delivered via an outbound transport.
+        session and could not be delivered via an outbound transport. Messages
+        added to a persistent queue are packed first, using the given profile.
         """
+        if isinstance(self.undelivered_queue, PersistentDeliveryQueue):
+            self.task_queue.run(self._persist_undelivered(outbound, profile))
+            return True
         if self.undelivered_queue:
             self.undelivered_queue.add_message(outbound)
             return True
         return False
 
-    def process_undelivered(self, session: InboundSession):
+    async def _persist_undelivered(self, outbound: OutboundMessage, profile: Profile):
+        """Pack an undelivered message, if required, and add it to the queue."""
+        if outbound.enc_payload is None:
+            if outbound.reply_to_verkey:
+                recip_keys = [outbound.reply_to_verkey]
+            else:
+                recip_keys = outbound.target and outbound.target.recipient_keys
+            sender_key = outbound.reply_from_verkey or (
+                outbound.target and outbound.target.sender_key
+            )
+            profile = profile or self.profile
+            try:
+                if not outbound.payload or not recip_keys:
+                    raise WireFormatError("No payload or recipient keys to encode")
+                wire_format = profile.inject(BaseWireFormat)
+                async with profile.session() as session:
+                    outbound.enc_payload = await wire_format.encode_message(
+                        session, outbound.payload, recip_keys, None, sender_key
+                    )
+            except WireFormatError as e:
+                LOGGER.warning("Error packing undelivered message: %s", str(e))
+                return
+        await self._call_queue("add_message", outbound)
+
+    async def _call_queue(self, method: str, *args):
+        """Call a method of the undelivered queue, off the event loop if it blocks."""
+        queue = self.undelivered_queue
+        if isinstance(queue, PersistentDeliveryQueue):
+            return await queue.run(getattr(queue, method), *args)
+        return getattr(queue, method)(*args)
+
+    async def process_undelivered(self, session: InboundSession):
         """
         Interact with undelivered queue to find applicable messages.
 
+        Messages for each of the session's keys are read in batches until one
+        is accepted, the session asks to retry later, or none are left.
+
         Args:
             session: The inbound session
         """
         if session and session.can_respond and self.undelivered_queue:
             for key in session.reply_verkeys:
-                for (
-                    undelivered_message
-                ) in self.undelivered_queue.inspect_all_messages_for_key(key):
-                    if session.accept_response(undelivered_message):
-                        LOGGER.debug(
-                            "Sending previously undelivered message via inbound session"
-                        )
-                        self.undelivered_queue.remove_message_for_key(
-                            key, undelivered_message
-                        )
+                offset = 0
+                while True:
+                    batch = await self._call_queue(
+                        "get_messages_for_key", key, self.undelivered_batch_size, offset
+                    )
+                    for undelivered_message in batch:
+                        result = session.accept_response(undelivered_message)
+                        if result:
+                            LOGGER.debug(
+                                "Sending previously undelivered message "
+                                "via inbound session"
+                            )
+                            await self._call_queue(
+                                "remove_message_for_key", key, undelivered_message
+                            )
+                            # the session holds a single response: it calls
+                            # back for more once this one is delivered
+                            return
+                        elif result.retry:
+                            return
+                    if len(batch) < self.undelivered_batch_size:
+                        break
+                    offset += len(batch)
@@ -0,0 +1,394 @@
+"""
+A persistent delivery queue.
+
+Holds undelivered messages in an SQLite database, so that messages waiting for
+pickup survive a restart of the agent.
+
+"""
+
+import asyncio
+import json
+import logging
+import sqlite3
+import time
+import weakref
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Sequence
+
+from ..outbound.message import OutboundMessage
+from .delivery_queue import QueuedMessage
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PersistentDeliveryQueue:
+    """
+    PersistentDeliveryQueue class.
+
+    Manages undelivered messages in a database file, indexed by recipient key.
+    Only encoded messages are stored, without their plaintext payload: messages
+    which have not been packed are not added. The interface matches the
+    in-memory `DeliveryQueue`. Its methods block on the database: callers on the
+    event loop should invoke them through `run`, which uses the thread dedicated
+    to the queue, and close the queue with `aclose`.
+    """
+
+    SCHEMA = (
+        """CREATE TABLE IF NOT EXISTS messages (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created REAL NOT NULL,
+            size INTEGER NOT NULL,
+            payload BLOB,
+            encoded INTEGER NOT NULL,
+            meta TEXT NOT NULL
+        )""",
+        "CREATE INDEX IF NOT EXISTS ix_messages_created ON messages (created)",
+        """CREATE TABLE IF NOT EXISTS message_keys (
+            recipient_key TEXT NOT NULL,
+            message_id INTEGER NOT NULL,
+            PRIMARY KEY (recipient_key, message_id)
+        ) WITHOUT ROWID""",
+        """CREATE INDEX IF NOT EXISTS ix_message_keys_message
+            ON message_keys (message_id)""",
+    )
+
+    META_FIELDS = (
+        "connection_id",
+        "reply_thread_id",
+        "reply_to_verkey",
+        "reply_from_verkey",
+    )
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        ttl_seconds: int = None,
+        max_messages_per_key: int = None,
+        max_bytes_per_key: int = None,
+        max_messages: int = None,
+        max_bytes: int = None,
+        expire_interval: float = 60.0,
+    ) -> None:
+        """
+        Initialize an instance of PersistentDeliveryQueue.
+
+        Expired messages are never returned, and are deleted from the database
+        at most once per `expire_interval` as the queue is accessed. When a limit
+        is reached the oldest messages are evicted to make room.
+
+        Args:
+            path: The path to the database file
+            ttl_seconds: The time in seconds to keep undelivered messages
+            max_messages_per_key: The maximum number of messages per recipient key
+            max_bytes_per_key: The maximum total message size per recipient key
+            max_messages: The maximum number of messages in the queue
+            max_bytes: The maximum total message size in the queue
+            expire_interval: The minimum time in seconds between expiry sweeps
+        """
+        self.path = path
+        self.ttl_seconds = ttl_seconds or 604800  # one week
+        self.max_messages_per_key = max_messages_per_key
+        self.max_bytes_per_key = max_bytes_per_key
+        self.max_messages = max_messages
+        self.max_bytes = max_bytes
+        self.expire_interval = expire_interval
+        self.evicted = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="undelivered"
+        )
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self.SCHEMA:
+            self._conn.execute(statement)
+        self._expire_at = 0.0
+        self._message_ids = weakref.WeakKeyDictionary()
+
+    async def run(self, func: Callable, *args) -> Any:
+        """
+        Run a queue method in the thread dedicated to the queue.
+
+        Calls are run one at a time, in the order they were made.
+        """
+        return await asyncio.get_event_loop().run_in_executor(
+            self._executor, func, *args
+        )
+
+    def _close_connection(self):
+        """Close the database connection."""
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def close(self):
+        """Wait for pending calls and close the database connection."""
+        self._executor.shutdown(wait=True)
+        self._close_connection()
+
+    async def aclose(self):
+        """Close the database connection once pending calls have completed."""
+        await self.run(self._close_connection)
+        self._executor.shutdown(wait=False)
+
+    def _horizon(self, ttl: int = None) -> float:
+        """Get the creation time before which messages are expired."""
+        return time.time() - (ttl or self.ttl_seconds)
+
+    def expire_messages(self, ttl=None):
+        """
+        Expire messages that are past the time limit.
+
+        Args:
+            ttl: Optional. Allows override of configured ttl
+        """
+        horizon = self._horizon(ttl)
+        with self._conn:
+            self._conn.execute(
+                """DELETE FROM message_keys WHERE message_id IN
+                (SELECT id FROM messages WHERE created < ?)""",
+                (horizon,),
+            )
+            deleted = self._conn.execute(
+                "DELETE FROM messages WHERE created < ?", (horizon,)
+            ).rowcount
+        if deleted:
+            LOGGER.debug("Expired %d undelivered messages", deleted)
+        self._expire_at = time.time() + self.expire_interval
+
+    def _maybe_expire(self):
+        """Sweep expired messages if the expiry interval has passed."""
+        if time.time() >= self._expire_at:
+            self.expire_messages()
+
+    def add_message(self, msg: OutboundMessage):
+        """
+        Add an OutboundMessage to delivery queue.
+
+        The message is added once per recipient key
+
+        Args:
+            msg: The OutboundMessage to add
+        """
+        self.add_messages((msg,))
+
+    def add_messages(self, msgs: Iterable[OutboundMessage]):
+        """
+        Add a sequence of OutboundMessages to the delivery queue.
+
+        All of the messages are stored in a single transaction.
+
+        Args:
+            msgs: The OutboundMessages to add
+        """
+        self._maybe_expire()
+        now = time.time()
+        added_keys = set()
+        with self._conn:
+            for msg in msgs:
+                keys = set()
+                if msg.target:
+                    keys.update(msg.target.recipient_keys)
+                if msg.reply_to_verkey:
+                    keys.add(msg.reply_to_verkey)
+                if not keys:
+                    continue
+                if msg.enc_payload is None:
+                    LOGGER.warning(
+                        "Not storing undelivered message which is not packed"
+                    )
+                    continue
+                payload, encoded, meta = self._encode(msg)
+                msg_id = self._conn.execute(
+                    "INSERT INTO messages (created, size, payload, encoded, meta) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (now, QueuedMessage.message_size(msg), payload, encoded, meta),
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO message_keys (recipient_key, message_id) "
+                    "VALUES (?, ?)",
+                    ((key, msg_id) for key in keys),
+                )
+                self._message_ids[msg] = msg_id
+                added_keys.update(keys)
+            self._enforce_limits(added_keys)
+
+    def _enforce_limits(self, keys: Iterable[str]):
+        """Evict the oldest messages while the queue exceeds its limits."""
+        evict_keys = []
+        if self.max_messages_per_key or self.max_bytes_per_key:
+            for key in keys:
+                rows = self._conn.execute(
+                    """SELECT k.message_id, m.size FROM message_keys k
+                    JOIN messages m ON m.id = k.message_id
+                    WHERE k.recipient_key = ? ORDER BY k.message_id DESC""",
+                    (key,),
+                ).fetchall()
+                count = size = 0
+                for msg_id, msg_size in rows:
+                    count += 1
+                    size += msg_size
+                    if (
+                        self.max_messages_per_key
+                        and count > self.max_messages_per_key
+                        or self.max_bytes_per_key
+                        and size > self.max_bytes_per_key
+                    ):
+                        evict_keys.append((key, msg_id))
+        if evict_keys:
+            self._conn.executemany(
+                "DELETE FROM message_keys WHERE recipient_key = ? AND message_id = ?",
+                evict_keys,
+            )
+            self._conn.execute(
+                """DELETE FROM messages WHERE NOT EXISTS
+                (SELECT 1 FROM message_keys WHERE message_id = messages.id)"""
+            )
+            self.evicted += len(evict_keys)
+
+        if self.max_messages or self.max_bytes:
+            count, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM messages"
+            ).fetchone()
+            if (
+                self.max_messages
+                and count > self.max_messages
+                or self.max_bytes
+                and size > self.max_bytes
+            ):
+                evict_ids = []
+                for msg_id, msg_size in self._conn.execute(
+                    "SELECT id, size FROM messages ORDER BY id"
+                ):
+                    if not (
+                        self.max_messages
+                        and count > self.max_messages
+                        or self.max_bytes
+                        and size > self.max_bytes
+                    ):
+                        break
+                    evict_ids.append((msg_id,))
+                    count -= 1
+                    size -= msg_size
+                self._conn.executemany(
+                    "DELETE FROM message_keys WHERE message_id = ?", evict_ids
+                )
+                self._conn.executemany("DELETE FROM messages WHERE id = ?", evict_ids)
+                self.evicted += len(evict_ids)
+
+    def _encode(self, msg: OutboundMessage):
+        """Convert an outbound message to a database row."""
+        meta = {
+            field: getattr(msg, field)
+            for field in self.META_FIELDS
+            if getattr(msg, field) is not None
+        }
+        payload = msg.enc_payload
+        if isinstance(payload, str):
+            payload = payload.encode("utf-8")
+            meta["text"] = True
+        return payload, 1, json.dumps(meta)
+
+    def _decode(self, msg_id: int, payload: bytes, encoded: int, meta: str):
+        """Convert a database row to an outbound message."""
+        meta = json.loads(meta)
+        if meta.pop("text", False):
+            payload = payload.decode("utf-8")
+        if encoded:
+            msg = OutboundMessage(payload=None, enc_payload=payload, **meta)
+        else:
+            msg = OutboundMessage(payload=payload, **meta)
+        self._message_ids[msg] = msg_id
+        return msg
+
+    def has_message_for_key(self, key: str):
+        """
+        Check for queued messages by key.
+
+        Args:
+            key: The key to use for lookup
+        """
+        return bool(self.get_messages_for_key(key, 1))
+
+    def message_count_for_key(self, key: str):
+        """
+        Count of queued messages by key.
+
+        Args:
+            key: The key to use for lookup
+        """
+        self._maybe_expire()
+        return self._conn.execute(
+            """SELECT COUNT(*) FROM message_keys k
+            JOIN messages m ON m.id = k.message_id
+            WHERE k.recipient_key = ? AND m.created >= ?""",
+            (key, self._horizon()),
+        ).fetchone()[0]
+
+    def get_messages_for_key(
+        self, key: str, count: int, offset: int = 0
+    ) -> Sequence[OutboundMessage]:
+        """
+        Return up to `count` of the oldest messages for key.
+
+        The messages are not removed from the queue.
+
+        Args:
+            key: The key to use for lookup
+            count: The maximum number of messages to return
+            offset: The number of oldest messages to skip
+        """
+        self._maybe_expire()
+        rows = self._conn.execute(
+            """SELECT m.id, m.payload, m.encoded, m.meta FROM message_keys k
+            JOIN messages m ON m.id = k.message_id
+            WHERE k.recipient_key = ? AND m.created >= ?
+            ORDER BY k.message_id LIMIT ? OFFSET ?""",
+            (key, self._horizon(), count, offset),
+        ).fetchall()
+        return [self._decode(*row) for row in rows]
+
+    def get_one_message_for_key(self, key: str):
+        """
+        Remove and return a matching message.
+
+        Args:
+            key: The key to use for lookup
+        """
+        for msg in self.get_messages_for_key(key, 1):
+            self.remove_message_for_key(key, msg)
+            return msg
+
+    def inspect_all_messages_for_key(self, key: str) -> Iterable[OutboundMessage]:
+        """
+        Return all messages for key.
+
+        Messages may be removed from the queue while iterating.
+
+        Args:
+            key: The key to use for lookup
+        """
+        yield from self.get_messages_for_key(key, -1)
+
+    def remove_message_for_key(self, key: str, msg: OutboundMessage):
+        """
+        Remove specified message from queue for key.
+
+        Args:
+            key: The key to use for lookup
+            msg: The message to remove from the queue
+        """
+        msg_id = self._message_ids.get(msg)
+        if msg_id is None:
+            return
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM message_keys WHERE recipient_key = ? AND message_id = ?",
+                (key, msg_id),
+            )
+            self._conn.execute(
+                """DELETE FROM messages WHERE id = ? AND NOT EXISTS
+                (SELECT 1 FROM message_keys WHERE message_id = ?)""",
+                (msg_id, msg_id),
+            )
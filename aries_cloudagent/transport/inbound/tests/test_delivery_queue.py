@@ -64,3 +64,108 @@ class TestDeliveryQueue(AsyncTestCase):
     async def test_count_zero_with_no_items(self):
         queue = DeliveryQueue()
         assert queue.message_count_for_key("aaa") == 0
+
+    async def test_message_order_and_removal(self):
+        queue = DeliveryQueue()
+        msgs = [
+            OutboundMessage(
+                payload=str(idx), target=ConnectionTarget(recipient_keys=["aaa"])
+            )
+            for idx in range(5)
+        ]
+        for msg in msgs:
+            queue.add_message(msg)
+        queue.add_message(msgs[0])  # queued again moves to the back
+        assert queue.message_count_for_key("aaa") == 5
+        assert queue.total_messages == 5
+
+        queue.remove_message_for_key("aaa", msgs[2])
+        queue.remove_message_for_key("aaa", msgs[2])
+        queue.remove_message_for_key("bbb", msgs[3])
+        assert queue.get_one_message_for_key("aaa") is msgs[1]
+        for msg in queue.inspect_all_messages_for_key("aaa"):
+            queue.remove_message_for_key("aaa", msg)
+        assert queue.message_count_for_key("aaa") == 0
+        assert queue.get_one_message_for_key("aaa") is None
+        assert queue.total_messages == 0
+        assert queue.total_bytes == 0
+
+    async def test_message_multiple_keys(self):
+        queue = DeliveryQueue()
+        msg = OutboundMessage(
+            payload="xyz",
+            target=ConnectionTarget(recipient_keys=["aaa", "bbb"]),
+            reply_to_verkey="ccc",
+        )
+        queue.add_message(msg)
+        queue.add_message(OutboundMessage(payload="none"))
+        assert queue.total_messages == 1
+        assert queue.total_bytes == 3
+        assert queue.get_one_message_for_key("bbb") is msg
+        assert queue.has_message_for_key("aaa")
+        assert queue.total_messages == 1
+        queue.expire_messages(ttl=-10)
+        assert not queue.has_message_for_key("aaa")
+        assert not queue.has_message_for_key("ccc")
+        assert queue.expired == 1
+        assert queue.total_messages == 0
+
+    async def test_message_key_limits(self):
+        queue = DeliveryQueue(max_messages_per_key=2, max_bytes_per_key=10)
+        target = ConnectionTarget(recipient_keys=["aaa"])
+        msgs = [OutboundMessage(payload="xxx", target=target) for _ in range(3)]
+        for msg in msgs:
+            queue.add_message(msg)
+        assert list(queue.inspect_all_messages_for_key("aaa")) == msgs[1:]
+        queue.add_message(
+            OutboundMessage(payload="{}", enc_payload=b"y" * 8, target=target)
+        )
+        assert queue.message_count_for_key("aaa") == 1
+        assert queue.evicted == 3
+        assert queue.bytes_by_key["aaa"] == 8
+
+    async def test_message_global_limits(self):
+        queue = DeliveryQueue(max_messages=3, max_bytes=100)
+        msgs = [
+            OutboundMessage(
+                payload="x" * 10,
+                target=ConnectionTarget(recipient_keys=[f"key{idx}"]),
+            )
+            for idx in range(4)
+        ]
+        for msg in msgs:
+            queue.add_message(msg)
+        assert not queue.has_message_for_key("key0")
+        assert queue.total_messages == 3
+        queue.add_message(
+            OutboundMessage(
+                payload="x" * 95, target=ConnectionTarget(recipient_keys=["big"])
+            )
+        )
+        assert queue.total_messages == 1
+        assert queue.has_message_for_key("big")
+        assert queue.evicted == 4
+
+    async def test_message_lazy_expiry(self):
+        queue = DeliveryQueue(ttl_seconds=60)
+        target = ConnectionTarget(recipient_keys=["aaa"])
+        with async_mock.patch("time.time", async_mock.MagicMock(return_value=1000)):
+            queue.add_message(OutboundMessage(payload="old", target=target))
+        with async_mock.patch("time.time", async_mock.MagicMock(return_value=1050)):
+            fresh = OutboundMessage(payload="fresh", target=target)
+            queue.add_message(fresh)
+            assert queue.message_count_for_key("aaa") == 2
+        with async_mock.patch("time.time", async_mock.MagicMock(return_value=1070)):
+            assert queue.get_one_message_for_key("aaa") is fresh
+        assert queue.expired == 1
+        assert not queue._expiry or queue._expiry[0][2].keys == set()
+
+    async def test_expiry_heap_compaction(self):
+        queue = DeliveryQueue()
+        target = ConnectionTarget(recipient_keys=["aaa"])
+        for idx in range(2000):
+            queue.add_message(OutboundMessage(payload=str(idx), target=target))
+        while queue.get_one_message_for_key("aaa"):
+            pass
+        assert len(queue._expiry) <= 1000
+        assert not queue.queue_by_key and not queue.bytes_by_key
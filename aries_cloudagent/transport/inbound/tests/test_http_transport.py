@@ -148,6 +148,19 @@ class TestHttpTransport(AioHTTPTestCase):
 
         await self.transport.stop()
 
+    async def test_send_message_queue_full(self):
+        await self.transport.start()
+
+        self.receive_message = async_mock.MagicMock(
+            side_effect=test_module.TaskQueueFullError()
+        )
+        test_message = {"test": "message"}
+        async with self.client.post("/", json=test_message) as resp:
+            assert resp.status == 429
+            assert resp.headers["Retry-After"] == "1"
+
+        await self.transport.stop()
+
     async def test_invite_message_handler(self):
         await self.transport.start()
 
@@ -1,4 +1,7 @@
 import asyncio
+import os
+
+from tempfile import TemporaryDirectory
 
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
@@ -9,6 +12,8 @@ from ...outbound.message import OutboundMessage
 from ...wire_format import BaseWireFormat
 from ..base import InboundTransportConfiguration, InboundTransportRegistrationError
 from ..manager import InboundTransportManager
+from ..persistent_queue import PersistentDeliveryQueue
+from ..session import AcceptResult
 
 
 class TestInboundTransportManager(AsyncTestCase):
@@ -155,7 +160,12 @@ class TestInboundTransportManager(AsyncTestCase):
             "http", wire_format=test_wire_format, accept_undelivered=True
         )
         inbound_msg = await session.parse_inbound("payload")
-        mgr.dispatch_complete(inbound_msg, None)
+        with async_mock.patch.object(
+            mgr, "process_undelivered", async_mock.CoroutineMock()
+        ) as mock_process:
+            mgr.dispatch_complete(inbound_msg, None)
+            await mgr.task_queue.complete()
+            mock_process.assert_awaited_once_with(session)
 
     async def test_close_x(self):
         mgr = InboundTransportManager(self.profile, None)
@@ -184,10 +194,136 @@ class TestInboundTransportManager(AsyncTestCase):
         with async_mock.patch.object(
             session, "accept_response", return_value=True
         ) as mock_accept:
-            mgr.process_undelivered(session)
+            await mgr.process_undelivered(session)
             mock_accept.assert_called_once_with(test_outbound)
         assert not mgr.undelivered_queue.has_message_for_key(test_verkey)
 
+    async def test_process_undelivered_pages(self):
+        self.profile.context.update_settings(
+            {"transport.enable_undelivered_queue": True}
+        )
+        test_verkey = "test-verkey"
+        mgr = InboundTransportManager(self.profile, None)
+        await mgr.setup()
+        mgr.undelivered_batch_size = 2
+        for idx in range(5):
+            assert mgr.return_undelivered(
+                OutboundMessage(payload=f"msg{idx}", reply_to_verkey=test_verkey)
+            )
+
+        session = await mgr.create_session(
+            "http", can_respond=True, wire_format=async_mock.MagicMock()
+        )
+        session.add_reply_verkeys(test_verkey)
+
+        # messages not matching the session are skipped across batches
+        with async_mock.patch.object(
+            session,
+            "accept_response",
+            async_mock.MagicMock(
+                side_effect=lambda msg: AcceptResult(msg.payload == "msg4")
+            ),
+        ) as mock_accept:
+            await mgr.process_undelivered(session)
+            assert mock_accept.call_count == 5
+        assert [
+            msg.payload
+            for msg in mgr.undelivered_queue.inspect_all_messages_for_key(test_verkey)
+        ] == ["msg0", "msg1", "msg2", "msg3"]
+
+        # the queue is exhausted without a match
+        with async_mock.patch.object(
+            session, "accept_response", return_value=AcceptResult(False)
+        ) as mock_accept:
+            await mgr.process_undelivered(session)
+            assert mock_accept.call_count == 4
+
+    async def test_process_undelivered_persistent(self):
+        with TemporaryDirectory() as temp_dir:
+            self.profile.context.update_settings(
+                {
+                    "transport.enable_undelivered_queue": True,
+                    "transport.undelivered_queue.path": os.path.join(
+                        temp_dir, "undelivered.db"
+                    ),
+                    "transport.undelivered_queue.max_messages_per_key": 3,
+                }
+            )
+            test_verkey = "test-verkey"
+            mgr = InboundTransportManager(self.profile, None)
+            await mgr.setup()
+            assert isinstance(mgr.undelivered_queue, PersistentDeliveryQueue)
+
+            for idx in range(4):
+                assert mgr.return_undelivered(
+                    OutboundMessage(
+                        payload=None,
+                        enc_payload=b"packed%d" % idx,
+                        reply_to_verkey=test_verkey,
+                    )
+                )
+
+            await mgr.task_queue.complete()
+            assert mgr.undelivered_queue.max_messages_per_key == 3
+
+            session = await mgr.create_session(
+                "http", can_respond=True, wire_format=async_mock.MagicMock()
+            )
+            session.add_reply_verkeys(test_verkey)
+            with async_mock.patch.object(
+                session,
+                "accept_response",
+                async_mock.MagicMock(
+                    side_effect=[AcceptResult(True), AcceptResult(False, True)]
+                ),
+            ) as mock_accept:
+                await mgr.process_undelivered(session)
+                assert mock_accept.call_count == 1
+                # the oldest message was evicted at the limit
+                assert mock_accept.call_args_list[0][0][0].enc_payload == b"packed1"
+            assert mgr.undelivered_queue.message_count_for_key(test_verkey) == 2
+            await mgr.stop()
+
+    async def test_return_undelivered_persistent_packed(self):
+        with TemporaryDirectory() as temp_dir:
+            self.profile.context.update_settings(
+                {
+                    "transport.enable_undelivered_queue": True,
+                    "transport.undelivered_queue.path": os.path.join(
+                        temp_dir, "undelivered.db"
+                    ),
+                }
+            )
+            wire_format = async_mock.MagicMock(
+                encode_message=async_mock.CoroutineMock(return_value=b"packed")
+            )
+            self.profile.context.injector.bind_instance(BaseWireFormat, wire_format)
+            mgr = InboundTransportManager(self.profile, None)
+            await mgr.setup()
+
+            assert mgr.return_undelivered(
+                OutboundMessage(
+                    payload='{"secret": true}',
+                    reply_to_verkey="recip-verkey",
+                    reply_from_verkey="sender-verkey",
+                )
+            )
+            # a message which cannot be packed is not stored
+            assert mgr.return_undelivered(OutboundMessage(payload="no keys"))
+            await mgr.task_queue.complete()
+
+            assert wire_format.encode_message.call_args[0][1:] == (
+                '{"secret": true}',
+                ["recip-verkey"],
+                None,
+                "sender-verkey",
+            )
+            [stored] = mgr.undelivered_queue.get_messages_for_key("recip-verkey", 5)
+            assert stored.enc_payload == b"packed"
+            assert stored.payload is None
+            await mgr.stop()
+            assert mgr.undelivered_queue._conn is None
+
     async def test_return_undelivered_false(self):
         self.profile.context.update_settings(
             {"transport.enable_undelivered_queue": False}
@@ -0,0 +1,187 @@
+import os
+
+from tempfile import TemporaryDirectory
+
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from ....connections.models.connection_target import ConnectionTarget
+from ....transport.outbound.message import OutboundMessage
+
+from ..persistent_queue import PersistentDeliveryQueue
+
+
+class TestPersistentDeliveryQueue(AsyncTestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "undelivered.db")
+        self.queue = PersistentDeliveryQueue(self.path)
+
+    def tearDown(self):
+        self.queue.close()
+        self.temp_dir.cleanup()
+
+    async def test_message_add_get_by_key(self):
+        msg = OutboundMessage(
+            payload=None,
+            enc_payload="x",
+            target=ConnectionTarget(recipient_keys=["aaa"]),
+        )
+        self.queue.add_message(msg)
+        self.queue.add_message(OutboundMessage(payload=None, enc_payload="none"))
+        assert self.queue.has_message_for_key("aaa")
+        assert not self.queue.has_message_for_key("bbb")
+        fetched = self.queue.get_one_message_for_key("aaa")
+        assert fetched.enc_payload == "x"
+        assert not self.queue.has_message_for_key("aaa")
+        assert self.queue.get_one_message_for_key("aaa") is None
+
+    async def test_unpacked_message_not_stored(self):
+        self.queue.add_message(
+            OutboundMessage(payload='{"secret": true}', reply_to_verkey="aaa")
+        )
+        assert not self.queue.has_message_for_key("aaa")
+        assert (
+            self.queue._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+        )
+
+    async def test_restore_and_batch(self):
+        for idx in range(5):
+            self.queue.add_message(
+                OutboundMessage(
+                    payload='{"plain": true}',
+                    enc_payload=b"packed%d" % idx,
+                    reply_to_verkey="aaa",
+                    reply_from_verkey="bbb",
+                    target=ConnectionTarget(recipient_keys=["ccc"]),
+                )
+            )
+        self.queue.close()
+
+        self.queue = PersistentDeliveryQueue(self.path)
+        assert self.queue.message_count_for_key("aaa") == 5
+        batch = self.queue.get_messages_for_key("aaa", 3)
+        assert [msg.enc_payload for msg in batch] == [
+            b"packed0",
+            b"packed1",
+            b"packed2",
+        ]
+        assert batch[0].payload is None  # plaintext is not stored
+        assert batch[0].reply_from_verkey == "bbb"
+        for msg in batch:
+            self.queue.remove_message_for_key("aaa", msg)
+        self.queue.remove_message_for_key("aaa", OutboundMessage(payload="unknown"))
+        assert self.queue.message_count_for_key("aaa") == 2
+        assert self.queue.message_count_for_key("ccc") == 5
+
+        remaining = list(self.queue.inspect_all_messages_for_key("ccc"))
+        for msg in remaining:
+            self.queue.remove_message_for_key("ccc", msg)
+        assert not self.queue.has_message_for_key("ccc")
+        assert self.queue.message_count_for_key("aaa") == 2
+
+    async def test_message_ttl(self):
+        self.queue.add_message(
+            OutboundMessage(payload=None, enc_payload=b"x", reply_to_verkey="aaa")
+        )
+        assert self.queue.get_messages_for_key("aaa", 1)[0].enc_payload == b"x"
+        self.queue.expire_messages(ttl=-10)
+        assert not self.queue.has_message_for_key("aaa")
+
+    async def test_message_ttl_lazy(self):
+        self.queue.ttl_seconds = 60
+        with async_mock.patch("time.time", async_mock.MagicMock(return_value=1000)):
+            self.queue.add_message(
+                OutboundMessage(payload=None, enc_payload="old", reply_to_verkey="aaa")
+            )
+        with async_mock.patch("time.time", async_mock.MagicMock(return_value=1070)):
+            # expired messages are hidden before the next sweep
+            assert not self.queue.has_message_for_key("aaa")
+            self.queue._expire_at = 0
+            assert self.queue.message_count_for_key("aaa") == 0
+        assert (
+            self.queue._conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0] == 0
+        )
+
+    async def test_limits(self):
+        self.queue.max_messages_per_key = 2
+        for idx in range(3):
+            self.queue.add_message(
+                OutboundMessage(
+                    payload=None,
+                    enc_payload=b"a%d" % idx,
+                    target=ConnectionTarget(recipient_keys=["aaa", "bbb"]),
+                )
+            )
+        assert [
+            msg.enc_payload for msg in self.queue.get_messages_for_key("aaa", 5)
+        ] == [
+            b"a1",
+            b"a2",
+        ]
+        assert self.queue.evicted == 2
+
+        self.queue.max_messages_per_key = None
+        self.queue.max_bytes_per_key = 5
+        self.queue.add_message(
+            OutboundMessage(payload=None, enc_payload=b"xxxx", reply_to_verkey="aaa")
+        )
+        assert [
+            msg.enc_payload for msg in self.queue.get_messages_for_key("aaa", 5)
+        ] == [b"xxxx"]
+        assert self.queue.message_count_for_key("bbb") == 2
+
+        self.queue.max_bytes_per_key = None
+        self.queue.max_messages = 2
+        self.queue.add_message(
+            OutboundMessage(payload=None, enc_payload=b"c", reply_to_verkey="ccc")
+        )
+        assert not self.queue.has_message_for_key("bbb")
+        assert self.queue.message_count_for_key("aaa") == 1
+        assert self.queue.has_message_for_key("ccc")
+
+        self.queue.max_messages = None
+        self.queue.max_bytes = 6
+        self.queue.add_message(
+            OutboundMessage(payload=None, enc_payload=b"dd", reply_to_verkey="ddd")
+        )
+        assert not self.queue.has_message_for_key("aaa")
+        assert (
+            self.queue._conn.execute("SELECT COUNT(*) FROM message_keys").fetchone()[0]
+            == 2
+        )
+
+    async def test_run_offset(self):
+        for idx in range(5):
+            self.queue.add_message(
+                OutboundMessage(
+                    payload=None, enc_payload=b"%d" % idx, reply_to_verkey="aaa"
+                )
+            )
+        batch = await self.queue.run(self.queue.get_messages_for_key, "aaa", 2, 3)
+        assert [msg.enc_payload for msg in batch] == [b"3", b"4"]
+        await self.queue.aclose()
+        assert self.queue._conn is None
+
+    async def test_pickup_indexed(self):
+        # pickup searches the recipient key's messages rather than scanning them all
+        for idx in range(20):
+            self.queue.add_message(
+                OutboundMessage(
+                    payload=None, enc_payload=b"x", reply_to_verkey=f"key{idx % 5}"
+                )
+            )
+        statements = []
+        self.queue._conn.set_trace_callback(statements.append)
+        for msg in self.queue.get_messages_for_key("key0", 10):
+            self.queue.remove_message_for_key("key0", msg)
+        self.queue._conn.set_trace_callback(None)
+        assert self.queue.message_count_for_key("key0") == 0
+
+        plans = [
+            row[-1]
+            for sql in statements
+            if sql.lstrip().upper().startswith(("SELECT", "DELETE"))
+            for row in self.queue._conn.execute("EXPLAIN QUERY PLAN " + sql)
+        ]
+        assert plans
+        assert not [detail for detail in plans if detail.startswith("SCAN")]
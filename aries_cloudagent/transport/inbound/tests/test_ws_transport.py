@@ -103,3 +103,17 @@ class TestWsTransport(AioHTTPTestCase):
             assert result == {"response": "ok"}
 
         await self.transport.stop()
+
+    async def test_message_queue_full(self):
+        await self.transport.start()
+
+        self.receive_message = async_mock.MagicMock(
+            side_effect=test_module.TaskQueueFullError()
+        )
+        async with self.client.ws_connect("/") as ws:
+            await ws.send_json({"test": "message"})
+            msg = await asyncio.wait_for(ws.receive(), 1.0)
+            assert msg.type == test_module.WSMsgType.CLOSE
+            assert ws.close_code == 1013
+
+        await self.transport.stop()
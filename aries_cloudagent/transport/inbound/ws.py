@@ -7,6 +7,7 @@ from typing import Optional
 from aiohttp import WSMessage, WSMsgType, web
 
 from ...messaging.error import MessageParseError
+from ...utils.task_queue import TaskQueueFullError
 from ..error import WireFormatParseError
 from .base import BaseInboundTransport, InboundTransportSetupError
 
@@ -120,6 +121,8 @@ class WsTransport(BaseInboundTransport):
                             await session.receive(msg.data)
                         except (MessageParseError, WireFormatParseError):
                             await ws.close(1003)  # unsupported data error
+                        except TaskQueueFullError:
+                            await ws.close(code=1013)  # try again later
                     elif msg.type == WSMsgType.ERROR:
                         LOGGER.error(
                             "Websocket connection closed with exception: %s",
@@ -1,11 +1,15 @@
 """Http outbound transport."""
 
+import asyncio
 import logging
+from collections import deque
 from typing import Union
 
 from aiohttp import ClientSession, DummyCookieJar, TCPConnector
+from yarl import URL
 
 from ...core.profile import Profile
+from ...utils.stats import Timer
 
 from ..stats import StatsTracer
 from ..wire_format import DIDCOMM_V0_MIME_TYPE, DIDCOMM_V1_MIME_TYPE
@@ -13,22 +17,51 @@ from ..wire_format import DIDCOMM_V0_MIME_TYPE, DIDCOMM_V1_MIME_TYPE
 from .base import BaseOutboundTransport, OutboundTransportError
 
 
+class EndpointLane:
+    """Messages waiting to be posted to a single endpoint."""
+
+    def __init__(self, endpoint: str):
+        """Initialize the endpoint lane."""
+        url = URL(endpoint)
+        self.endpoint = endpoint
+        self.host = f"{url.host}:{url.port}"
+        self.queue = deque()
+        self.workers = set()
+
+
 class HttpTransport(BaseOutboundTransport):
     """Http outbound transport class."""
 
     schemes = ("http", "https")
     is_external = False
 
+    JSON_HEADERS = {"Content-Type": "application/json"}
+    DIDCOMM_V0_HEADERS = {"Content-Type": DIDCOMM_V0_MIME_TYPE}
+    DIDCOMM_V1_HEADERS = {"Content-Type": DIDCOMM_V1_MIME_TYPE}
+
     def __init__(self, **kwargs) -> None:
         """Initialize an `HttpTransport` instance."""
         super().__init__(**kwargs)
         self.client_session: ClientSession = None
         self.connector: TCPConnector = None
         self.logger = logging.getLogger(__name__)
+        settings = self.root_profile.settings if self.root_profile else {}
+        self.limit = settings.get("transport.http.limit", 200)
+        self.limit_per_host = settings.get("transport.http.limit_per_host", 50)
+        self.keepalive_timeout = settings.get("transport.http.keepalive_timeout", 15)
+        self.dns_cache_ttl = settings.get("transport.http.dns_cache_ttl", 10)
+        self.batch_size = settings.get("transport.http.batch_size", 0)
+        self.stats_per_host = settings.get("transport.http.stats_per_host", False)
+        self.lanes = {}
 
     async def start(self):
         """Start the transport."""
-        self.connector = TCPConnector(limit=200, limit_per_host=50)
+        self.connector = TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=self.dns_cache_ttl,
+        )
         session_args = {
             "cookie_jar": DummyCookieJar(),
             "connector": self.connector,
@@ -36,13 +69,25 @@ class HttpTransport(BaseOutboundTransport):
         }
         if self.collector:
             session_args["trace_configs"] = [
-                StatsTracer(self.collector, "outbound-http:")
+                StatsTracer(
+                    self.collector, "outbound-http:", per_host=self.stats_per_host
+                )
             ]
         self.client_session = ClientSession(**session_args)
         return self
 
     async def stop(self):
         """Stop the transport."""
+        for lane in list(self.lanes.values()):
+            for worker in list(lane.workers):
+                worker.cancel()
+            while lane.queue:
+                result = lane.queue.popleft()[-1]
+                if not result.done():
+                    result.set_exception(
+                        OutboundTransportError("Transport stopped before delivery")
+                    )
+        self.lanes = {}
         await self.client_session.close()
         self.client_session = None
 
@@ -65,16 +110,38 @@ class HttpTransport(BaseOutboundTransport):
         """
         if not endpoint:
             raise OutboundTransportError("No endpoint provided")
-        headers = metadata or {}
-        if api_key is not None:
-            headers["x-api-key"] = api_key
+        headers = self.message_headers(profile, payload, metadata, api_key)
+        if self.batch_size:
+            await self.enqueue_post(endpoint, payload, headers)
+        else:
+            await self.post(endpoint, payload, headers)
+
+    def message_headers(
+        self,
+        profile: Profile,
+        payload: Union[str, bytes],
+        metadata: dict = None,
+        api_key: str = None,
+    ) -> dict:
+        """Build the request headers for a message."""
         if isinstance(payload, bytes):
-            if profile.settings.get("emit_new_didcomm_mime_type"):
-                headers["Content-Type"] = DIDCOMM_V1_MIME_TYPE
+            settings = profile.settings if profile else {}
+            if settings.get("emit_new_didcomm_mime_type"):
+                content_headers = self.DIDCOMM_V1_HEADERS
             else:
-                headers["Content-Type"] = DIDCOMM_V0_MIME_TYPE
+                content_headers = self.DIDCOMM_V0_HEADERS
         else:
-            headers["Content-Type"] = "application/json"
+            content_headers = self.JSON_HEADERS
+        if not metadata and api_key is None:
+            return content_headers
+        headers = metadata or {}
+        if api_key is not None:
+            headers["x-api-key"] = api_key
+        headers.update(content_headers)
+        return headers
+
+    async def post(self, endpoint: str, payload: Union[str, bytes], headers: dict):
+        """Post a single message to an endpoint."""
         self.logger.debug(
             "Posting to %s; Data: %s; Headers: %s", endpoint, payload, headers
         )
@@ -88,3 +155,60 @@ class HttpTransport(BaseOutboundTransport):
                         f"caused by: {response.reason}"
                     )
                 )
+
+    async def enqueue_post(
+        self, endpoint: str, payload: Union[str, bytes], headers: dict
+    ):
+        """
+        Queue a message for an endpoint lane and wait for it to be posted.
+
+        Messages for the same endpoint are posted back to back by a small number of
+        lane workers, each carrying up to `batch_size` queued messages over its
+        kept-alive connection. A new worker is only added when the queue outgrows
+        the existing workers, up to the per-host connection limit.
+        """
+        lane = self.lanes.get(endpoint)
+        if not lane:
+            lane = self.lanes[endpoint] = EndpointLane(endpoint)
+        result = asyncio.get_event_loop().create_future()
+        lane.queue.append((payload, headers, Timer.now(), result))
+        if not lane.workers or (
+            len(lane.queue) > len(lane.workers) * self.batch_size
+            and len(lane.workers) < self.limit_per_host
+        ):
+            worker = asyncio.get_event_loop().create_task(self._lane_worker(lane))
+            lane.workers.add(worker)
+        await result
+
+    async def _lane_worker(self, lane: EndpointLane):
+        """Post queued messages for an endpoint until the lane is empty."""
+        try:
+            while lane.queue:
+                payload, headers, queued_at, result = lane.queue.popleft()
+                if result.done():
+                    continue  # the sender has given up
+                if self.collector:
+                    waited = Timer.now() - queued_at
+                    self.collector.log("outbound-http:lane_queued", waited, queued_at)
+                    if self.stats_per_host:
+                        self.collector.log(
+                            f"outbound-http:{lane.host}:lane_queued", waited, queued_at
+                        )
+                try:
+                    await self.post(lane.endpoint, payload, headers)
+                except asyncio.CancelledError:
+                    if not result.done():
+                        result.set_exception(
+                            OutboundTransportError("Transport stopped during delivery")
+                        )
+                    raise
+                except Exception as err:
+                    if not result.done():
+                        result.set_exception(err)
+                else:
+                    if not result.done():
+                        result.set_result(None)
+        finally:
+            lane.workers.discard(asyncio.current_task())
+            if not lane.workers and self.lanes.get(lane.endpoint) is lane:
+                del self.lanes[lane.endpoint]
@@ -0,0 +1,251 @@
+"""Append-only journal for persisting the outbound message queue."""
+
+import asyncio
+import base64
+import json
+import logging
+import os
+
+from typing import Any, Mapping, Sequence
+from uuid import uuid4
+
+LOGGER = logging.getLogger(__name__)
+
+
+class OutboundJournalError(Exception):
+    """Error raised when the outbound journal cannot be read or written."""
+
+
+class OutboundJournal:
+    """
+    Persist encoded outbound messages and their retry state to disk.
+
+    Each change is appended to a log file as a single JSON line. Appends are
+    buffered and written with a single fsync per batch, so a crash may lose the
+    changes made within the last flush interval. Once enough delivered entries
+    have accumulated the log is rewritten to contain only the live entries.
+    """
+
+    OP_ADD = "add"
+    OP_RETRY = "retry"
+    OP_REMOVE = "remove"
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        flush_interval: float = 0.05,
+        flush_size: int = 1000,
+        compact_min: int = 1000,
+    ):
+        """
+        Initialize the outbound journal.
+
+        Args:
+            path: The path to the journal file
+            flush_interval: The maximum delay in seconds before appends are synced
+            flush_size: The number of appends which triggers an immediate sync
+            compact_min: The minimum number of stale lines before compaction
+
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.compact_min = compact_min
+        self.entries = {}
+        self._dead = 0
+        self._file = None
+        self._flush_handle: asyncio.Handle = None
+        self._flush_task: asyncio.Task = None
+        self._pending = []
+
+    @property
+    def opened(self) -> bool:
+        """Accessor for the opened state of the journal."""
+        return bool(self._file)
+
+    def open(self) -> Sequence[dict]:
+        """
+        Open the journal, returning the entries which are still live.
+
+        The existing log is compacted before any new entries are appended.
+        """
+        entries = {}
+        if os.path.exists(self.path):
+            with open(self.path, "r", encoding="utf-8") as log:
+                for line_no, line in enumerate(log, 1):
+                    try:
+                        op = json.loads(line)
+                    except json.JSONDecodeError:
+                        # a torn write at the end of the log is expected after a crash
+                        LOGGER.warning(
+                            "Ignoring corrupt outbound journal line %d in %s",
+                            line_no,
+                            self.path,
+                        )
+                        continue
+                    self._apply(entries, op)
+        self.entries = entries
+        self._dead = 0
+        self._write_snapshot(list(entries.values()))
+        self._file = open(self.path, "a", encoding="utf-8")
+        return list(entries.values())
+
+    @classmethod
+    def _apply(cls, entries: dict, op: Mapping[str, Any]):
+        """Apply a logged operation to a set of entries."""
+        kind = op.get("op")
+        entry_id = op.get("id")
+        if kind == cls.OP_ADD:
+            entries[entry_id] = op
+        elif kind == cls.OP_RETRY and entry_id in entries:
+            entries[entry_id]["retries"] = op["retries"]
+            entries[entry_id]["attempts"] = op["attempts"]
+        elif kind == cls.OP_REMOVE:
+            entries.pop(entry_id, None)
+
+    def add(
+        self,
+        endpoint: str,
+        payload,
+        *,
+        retries: int = None,
+        attempts: int = 0,
+        metadata: dict = None,
+        api_key: str = None,
+    ) -> str:
+        """
+        Record a new outbound message.
+
+        Returns: the identifier of the journal entry
+
+        """
+        entry_id = uuid4().hex
+        entry = {
+            "op": self.OP_ADD,
+            "id": entry_id,
+            "endpoint": endpoint,
+            "retries": retries,
+            "attempts": attempts,
+        }
+        if isinstance(payload, bytes):
+            entry["payload_b64"] = base64.b64encode(payload).decode("ascii")
+        else:
+            entry["payload"] = payload
+        if metadata:
+            entry["metadata"] = metadata
+        if api_key:
+            entry["api_key"] = api_key
+        self.entries[entry_id] = entry
+        self._append(entry)
+        return entry_id
+
+    def update(self, entry_id: str, retries: int, attempts: int):
+        """Record the updated retry state of an outbound message."""
+        if entry_id in self.entries:
+            op = {
+                "op": self.OP_RETRY,
+                "id": entry_id,
+                "retries": retries,
+                "attempts": attempts,
+            }
+            self._apply(self.entries, op)
+            self._append(op)
+            self._dead += 1
+
+    def remove(self, entry_id: str):
+        """Record the completion of an outbound message."""
+        if self.entries.pop(entry_id, None):
+            self._append({"op": self.OP_REMOVE, "id": entry_id})
+            self._dead += 2
+
+    @staticmethod
+    def entry_payload(entry: Mapping[str, Any]):
+        """Get the decoded payload of a journal entry."""
+        if "payload_b64" in entry:
+            return base64.b64decode(entry["payload_b64"])
+        return entry.get("payload")
+
+    def _append(self, op: dict):
+        """Buffer a logged operation and schedule a sync."""
+        if not self._file:
+            raise OutboundJournalError("Outbound journal is not open")
+        self._pending.append(json.dumps(op))
+        if self._flush_task:
+            return
+        if len(self._pending) >= self.flush_size:
+            self._start_flush()
+        elif not self._flush_handle:
+            self._flush_handle = asyncio.get_event_loop().call_later(
+                self.flush_interval, self._start_flush
+            )
+
+    def _start_flush(self):
+        """Start a background sync of the buffered operations."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._flush_task:
+            self._flush_task = asyncio.get_event_loop().create_task(self.flush())
+            self._flush_task.add_done_callback(self._flush_done)
+
+    def _flush_done(self, task: asyncio.Task):
+        """Handle completion of a background sync."""
+        self._flush_task = None
+        if not task.cancelled() and task.exception():
+            LOGGER.error(
+                "Error writing outbound journal %s",
+                self.path,
+                exc_info=task.exception(),
+            )
+        if self._pending and self._file:
+            self._start_flush()
+
+    async def flush(self):
+        """Write and sync all buffered operations."""
+        loop = asyncio.get_event_loop()
+        while self._pending:
+            lines = self._pending
+            self._pending = []
+            if self._dead >= self.compact_min and self._dead > len(self.entries):
+                # the snapshot already reflects all the buffered operations
+                entries = list(self.entries.values())
+                self._dead = 0
+                await loop.run_in_executor(None, self._compact, entries)
+            else:
+                await loop.run_in_executor(None, self._write_lines, lines)
+
+    def _write_lines(self, lines: Sequence[str]):
+        """Append lines to the journal file and sync it."""
+        self._file.write("\n".join(lines) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def _write_snapshot(self, entries: Sequence[dict]):
+        """Replace the journal file with a set of live entries."""
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as snapshot:
+            for entry in entries:
+                snapshot.write(json.dumps(entry) + "\n")
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(temp_path, self.path)
+
+    def _compact(self, entries: Sequence[dict]):
+        """Compact the journal file, dropping completed entries."""
+        self._file.close()
+        self._write_snapshot(entries)
+        self._file = open(self.path, "a", encoding="utf-8")
+
+    async def close(self):
+        """Sync any buffered operations and close the journal file."""
+        if not self._file:
+            return
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        while self._flush_task:
+            await self._flush_task
+        await self.flush()
+        self._file.close()
+        self._file = None
@@ -1,11 +1,14 @@
 """Outbound transport manager."""
 
 import asyncio
+import heapq
+import itertools
 import json
 import logging
 import time
 
-from typing import Callable, Type, Union
+from collections import deque
+from typing import Callable, Dict, Set, Type, Union
 from urllib.parse import urlparse
 
 from ...connections.models.connection_target import ConnectionTarget
@@ -23,7 +26,9 @@ from .base import (
     OutboundDeliveryError,
     OutboundTransportRegistrationError,
 )
+from .journal import OutboundJournal
 from .message import OutboundMessage
+from .retry import CircuitBreaker, RetryPolicy, endpoint_key
 
 LOGGER = logging.getLogger(__name__)
 MODULE_BASE_PATH = "aries_cloudagent.transport.outbound"
@@ -52,6 +57,7 @@ class QueuedOutboundMessage:
         self.error: Exception = None
         self.message = message
         self.payload: Union[str, bytes] = None
+        self.attempts = 0
         self.retries = None
         self.retry_at: float = None
         self.state = self.STATE_NEW
@@ -60,6 +66,7 @@ class QueuedOutboundMessage:
         self.transport_id: str = transport_id
         self.metadata: dict = None
         self.api_key: str = None
+        self.journal_id: str = None
 
 
 class OutboundTransportManager:
@@ -79,9 +86,30 @@ class OutboundTransportManager:
         self.root_profile = profile
         self.loop = asyncio.get_event_loop()
         self.handle_not_delivered = handle_not_delivered
-        self.outbound_buffer = []
+        # every message accepted by the process loop and not yet done
+        self.outbound_buffer: Set[QueuedOutboundMessage] = set()
         self.outbound_event = asyncio.Event()
         self.outbound_new = []
+        # messages ready for delivery, in arrival order
+        self.outbound_pending = deque()
+        # messages awaiting retry, ordered by (retry_at, sequence)
+        self.outbound_retry = []
+        # finished messages awaiting cleanup by the process loop
+        self.outbound_done = deque()
+        self._retry_seq = itertools.count()
+        # circuit breakers for failing endpoints, and the subset currently open
+        self.breakers: Dict[str, CircuitBreaker] = {}
+        self.breakers_open: Dict[str, CircuitBreaker] = {}
+        self.breaker_threshold = self.root_profile.settings.get(
+            "transport.outbound_breaker_threshold", 5
+        )
+        self.breaker_reset = self.root_profile.settings.get(
+            "transport.outbound_breaker_reset", 30
+        )
+        self.retry_policy = RetryPolicy.from_settings(self.root_profile.settings)
+        journal_path = self.root_profile.settings.get("transport.outbound_queue_path")
+        self.journal = OutboundJournal(journal_path) if journal_path else None
+        self.collector = self.root_profile.inject_or(Collector)
         self.registered_schemes = {}
         self.registered_transports = {}
         self.running_transports = {}
@@ -186,14 +214,53 @@ class OutboundTransportManager:
 
     async def start(self):
         """Start all transports and feed messages from the queue."""
-        for transport_id in self.registered_transports:
+        starting = [
             self.task_queue.run(self.start_transport(transport_id))
+            for transport_id in self.registered_transports
+        ]
+        if self.journal:
+            # persisted messages can only be restored once the transports are up
+            if starting:
+                await asyncio.wait(starting)
+            await self.restore_journal()
+
+    async def restore_journal(self):
+        """Open the outbound journal and queue any undelivered messages."""
+        entries = await self.loop.run_in_executor(None, self.journal.open)
+        for entry in entries:
+            try:
+                transport_id = self.get_running_transport_for_endpoint(
+                    entry["endpoint"]
+                )
+            except OutboundDeliveryError:
+                LOGGER.warning(
+                    "Dropping persisted outbound message for %s: no running transport",
+                    entry["endpoint"],
+                )
+                self.journal.remove(entry["id"])
+                continue
+            queued = QueuedOutboundMessage(self.root_profile, None, None, transport_id)
+            queued.endpoint = entry["endpoint"]
+            queued.payload = OutboundJournal.entry_payload(entry)
+            queued.metadata = entry.get("metadata")
+            queued.api_key = entry.get("api_key")
+            queued.retries = entry["retries"]
+            queued.attempts = entry["attempts"]
+            queued.journal_id = entry["id"]
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            self.outbound_new.append(queued)
+        if entries:
+            LOGGER.info("Restored %d persisted outbound messages", len(entries))
+            self.process_queued()
 
     async def stop(self, wait: bool = True):
         """Stop all running transports."""
         if self._process_task and not self._process_task.done():
             self._process_task.cancel()
         await self.task_queue.complete(None if wait else 0)
+        if self.journal:
+            # undelivered messages remain in the journal for the next start
+            await self.journal.close()
         for transport in self.running_transports.values():
             await transport.stop()
         self.running_transports = {}
@@ -355,7 +422,7 @@ class OutboundTransportManager:
         """
         if self._process_task and not self._process_task.done():
             self.outbound_event.set()
-        elif self.outbound_new or self.outbound_buffer:
+        elif self.outbound_new or self.outbound_buffer or self.outbound_done:
             self._process_task = self.loop.create_task(self._process_loop())
             self._process_task.add_done_callback(lambda task: self._process_done(task))
         return self._process_task
@@ -370,69 +437,142 @@ class OutboundTransportManager:
         if self._process_task and self._process_task.done():
             self._process_task = None
 
+    def _queue_pending(self, queued: QueuedOutboundMessage):
+        """Mark a message as ready for delivery."""
+        if self.journal and self.journal.opened and not queued.journal_id:
+            queued.journal_id = self.journal.add(
+                queued.endpoint,
+                queued.payload,
+                retries=queued.retries,
+                attempts=queued.attempts,
+                metadata=queued.metadata,
+                api_key=queued.api_key,
+            )
+        queued.state = QueuedOutboundMessage.STATE_PENDING
+        self.outbound_pending.append(queued)
+
+    def _queue_retry(self, queued: QueuedOutboundMessage):
+        """Schedule a message for redelivery at its `retry_at` time."""
+        if self.journal and queued.journal_id and self.journal.opened:
+            self.journal.update(queued.journal_id, queued.retries, queued.attempts)
+        queued.state = QueuedOutboundMessage.STATE_RETRY
+        heapq.heappush(
+            self.outbound_retry, (queued.retry_at, next(self._retry_seq), queued)
+        )
+
+    def _queue_done(self, queued: QueuedOutboundMessage):
+        """Mark a message as finished, successfully or not."""
+        if self.journal and queued.journal_id and self.journal.opened:
+            self.journal.remove(queued.journal_id)
+            queued.journal_id = None
+        queued.state = QueuedOutboundMessage.STATE_DONE
+        self.outbound_done.append(queued)
+
+    def _retry_delay(self, loop_time: float) -> float:
+        """Get the delay until the next scheduled retry or endpoint probe, if any."""
+        wake_times = [
+            breaker.probe_at
+            for breaker in self.breakers_open.values()
+            if breaker.held and breaker.state == CircuitBreaker.STATE_OPEN
+        ]
+        if self.outbound_retry:
+            wake_times.append(self.outbound_retry[0][0])
+        if wake_times:
+            return max(min(wake_times) - loop_time, 0.0)
+
+    def _get_breaker(
+        self, queued: QueuedOutboundMessage, create: bool = False
+    ) -> CircuitBreaker:
+        """Look up the circuit breaker for the endpoint of a queued message."""
+        if not self.breaker_threshold:
+            return None
+        key = endpoint_key(queued.endpoint)
+        if not key:
+            return None
+        breaker = self.breakers.get(key)
+        if not breaker and create:
+            breaker = CircuitBreaker(
+                key,
+                self.breaker_threshold,
+                self.breaker_reset,
+                self.retry_policy.max_delay,
+            )
+            self.breakers[key] = breaker
+        return breaker
+
+    def _breaker_opened(self, breaker: CircuitBreaker, now: float):
+        """Handle an endpoint being marked as unavailable."""
+        LOGGER.warning(
+            "Outbound endpoint %s failed %d times, holding messages until it recovers",
+            breaker.key,
+            breaker.failures,
+        )
+        self.breakers_open[breaker.key] = breaker
+        if self.collector:
+            self.collector.log("outbound-breaker:open", now - breaker.failed_at)
+
+    def _breaker_closed(self, breaker: CircuitBreaker, now: float):
+        """Handle an endpoint recovering, releasing any held messages."""
+        LOGGER.info(
+            "Outbound endpoint %s recovered, releasing %d held messages",
+            breaker.key,
+            len(breaker.held),
+        )
+        del self.breakers_open[breaker.key]
+        while breaker.held:
+            self._queue_pending(breaker.held.popleft())
+        if self.collector:
+            self.collector.log("outbound-breaker:close", now - breaker.opened_at)
+
     async def _process_loop(self):
         """Continually kick off encoding and delivery on outbound messages."""
         # Note: this method should not call async methods apart from
         # waiting for the updated event, to avoid yielding to other queue methods
 
+        # Each pass only visits messages which changed state since the last pass:
+        # finished messages, retries which have come due, new messages and
+        # messages ready for delivery. Messages being encoded or delivered are
+        # tracked in `outbound_buffer` and handed back by the completion hooks.
+
         while True:
             self.outbound_event.clear()
             loop_time = get_timer()
-            upd_buffer = []
-            retry_count = 0
-
-            for queued in self.outbound_buffer:
-                if queued.state == QueuedOutboundMessage.STATE_DONE:
-                    if queued.error:
-                        LOGGER.exception(
-                            "Outbound message could not be delivered to %s",
-                            queued.endpoint,
-                            exc_info=queued.error,
-                        )
-                        if self.handle_not_delivered and queued.message:
-                            self.handle_not_delivered(queued.profile, queued.message)
-                    continue  # remove from buffer
-
-                deliver = False
-
-                if queued.state == QueuedOutboundMessage.STATE_PENDING:
-                    deliver = True
-                elif queued.state == QueuedOutboundMessage.STATE_RETRY:
-                    if queued.retry_at < loop_time:
-                        queued.retry_at = None
-                        deliver = True
-                    else:
-                        retry_count += 1
-
-                if deliver:
-                    queued.state = QueuedOutboundMessage.STATE_DELIVER
-                    p_time = trace_event(
-                        self.root_profile.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.START."
-                        + queued.endpoint,
-                    )
-                    self.deliver_queued_message(queued)
-                    trace_event(
-                        self.root_profile.settings,
-                        queued.message if queued.message else queued.payload,
-                        outcome="OutboundTransportManager.DELIVER.END."
-                        + queued.endpoint,
-                        perf_counter=p_time,
-                    )
 
-                upd_buffer.append(queued)
+            while self.outbound_done:
+                queued = self.outbound_done.popleft()
+                self.outbound_buffer.discard(queued)
+                if queued.error:
+                    LOGGER.exception(
+                        "Outbound message could not be delivered to %s",
+                        queued.endpoint,
+                        exc_info=queued.error,
+                    )
+                    if self.handle_not_delivered and queued.message:
+                        self.handle_not_delivered(queued.profile, queued.message)
+
+            while self.outbound_retry and self.outbound_retry[0][0] <= loop_time:
+                queued = heapq.heappop(self.outbound_retry)[2]
+                queued.retry_at = None
+                self._queue_pending(queued)
+
+            for breaker in self.breakers_open.values():
+                # release a single held message to probe the endpoint
+                if (
+                    breaker.held
+                    and breaker.state == CircuitBreaker.STATE_OPEN
+                    and breaker.probe_at <= loop_time
+                ):
+                    self._queue_pending(breaker.held.popleft())
 
-            new_pending = 0
             new_messages = self.outbound_new
             self.outbound_new = []
 
             for queued in new_messages:
+                self.outbound_buffer.add(queued)
                 if queued.state == QueuedOutboundMessage.STATE_NEW:
                     if queued.message and queued.message.enc_payload:
                         queued.payload = queued.message.enc_payload
-                        queued.state = QueuedOutboundMessage.STATE_PENDING
-                        new_pending += 1
+                        self._queue_pending(queued)
                     else:
                         queued.state = QueuedOutboundMessage.STATE_ENCODE
                         p_time = trace_event(
@@ -447,20 +587,46 @@ class OutboundTransportManager:
                             outcome="OutboundTransportManager.ENCODE.END",
                             perf_counter=p_time,
                         )
-                else:
-                    new_pending += 1
+                elif queued.state == QueuedOutboundMessage.STATE_PENDING:
+                    self._queue_pending(queued)
+
+            while self.outbound_pending:
+                queued = self.outbound_pending.popleft()
+                breaker = self._get_breaker(queued)
+                if breaker and not breaker.allow(loop_time):
+                    # endpoint is unavailable, hold the message without
+                    # consuming a retry until the breaker closes
+                    queued.state = QueuedOutboundMessage.STATE_RETRY
+                    breaker.held.append(queued)
+                    continue
+                queued.state = QueuedOutboundMessage.STATE_DELIVER
+                p_time = trace_event(
+                    self.root_profile.settings,
+                    queued.message if queued.message else queued.payload,
+                    outcome="OutboundTransportManager.DELIVER.START." + queued.endpoint,
+                )
+                self.deliver_queued_message(queued)
+                trace_event(
+                    self.root_profile.settings,
+                    queued.message if queued.message else queued.payload,
+                    outcome="OutboundTransportManager.DELIVER.END." + queued.endpoint,
+                    perf_counter=p_time,
+                )
 
-                upd_buffer.append(queued)
+            if not self.outbound_buffer:
+                break
+            if self.outbound_new or self.outbound_done or self.outbound_pending:
+                continue
 
-            self.outbound_buffer = upd_buffer
-            if self.outbound_buffer:
-                if (not new_pending) and (not retry_count):
-                    await self.outbound_event.wait()
-                elif retry_count:
-                    # only retries - yield here so we don't hog resources
-                    await asyncio.sleep(0.05)
+            retry_delay = self._retry_delay(get_timer())
+            if retry_delay is None:
+                await self.outbound_event.wait()
             else:
-                break
+                # sleep until the next retry is due unless woken by a state change
+                try:
+                    await asyncio.wait_for(self.outbound_event.wait(), retry_delay)
+                except asyncio.TimeoutError:
+                    pass
 
     def encode_queued_message(self, queued: QueuedOutboundMessage) -> asyncio.Task:
         """Kick off encoding of a queued message."""
@@ -492,9 +658,9 @@ class OutboundTransportManager:
         """Handle completion of queued message encoding."""
         if completed.exc_info:
             queued.error = completed.exc_info
-            queued.state = QueuedOutboundMessage.STATE_DONE
+            self._queue_done(queued)
         else:
-            queued.state = QueuedOutboundMessage.STATE_PENDING
+            self._queue_pending(queued)
         queued.task = None
         self.process_queued()
 
@@ -515,8 +681,12 @@ class OutboundTransportManager:
 
     def finished_deliver(self, queued: QueuedOutboundMessage, completed: CompletedTask):
         """Handle completion of queued message delivery."""
+        now = get_timer()
         if completed.exc_info:
             queued.error = completed.exc_info
+            breaker = self._get_breaker(queued, create=True)
+            if breaker and breaker.record_failure(now):
+                self._breaker_opened(breaker, now)
 
             if queued.retries:
                 if LOGGER.isEnabledFor(logging.DEBUG):
@@ -539,18 +709,26 @@ class OutboundTransportManager:
                         queued.endpoint,
                         queued.error,
                     )
+                queued.retry_at = time.perf_counter() + self.retry_policy.next_delay(
+                    queued.attempts
+                )
+                queued.attempts += 1
                 queued.retries -= 1
-                queued.state = QueuedOutboundMessage.STATE_RETRY
-                queued.retry_at = time.perf_counter() + 10
+                self._queue_retry(queued)
             else:
                 LOGGER.exception(
                     ">>> Outbound message failed to deliver, NOT Re-queued.",
                     exc_info=queued.error,
                 )
-                queued.state = QueuedOutboundMessage.STATE_DONE
+                self._queue_done(queued)
         else:
             queued.error = None
-            queued.state = QueuedOutboundMessage.STATE_DONE
+            breaker = self._get_breaker(queued)
+            if breaker:
+                if breaker.record_success(now):
+                    self._breaker_closed(breaker, now)
+                del self.breakers[breaker.key]
+            self._queue_done(queued)
         queued.task = None
         self.process_queued()
 
@@ -0,0 +1,161 @@
+"""Outbound delivery retry policy and per-endpoint circuit breaker."""
+
+import random
+
+from collections import deque
+from typing import Any, Mapping
+from urllib.parse import urlparse
+
+
+class RetryPolicy:
+    """Exponential backoff with jitter for failed outbound deliveries."""
+
+    def __init__(
+        self,
+        delay: float = 10.0,
+        max_delay: float = 300.0,
+        factor: float = 2.0,
+        jitter: float = 0.25,
+    ):
+        """
+        Initialize the retry policy.
+
+        Args:
+            delay: The delay in seconds before the first retry
+            max_delay: The upper bound on any retry delay
+            factor: The multiplier applied to the delay after each failure
+            jitter: The fraction of each delay which is randomized, between 0 and 1
+
+        """
+        self.delay = delay
+        self.max_delay = max(max_delay, delay)
+        self.factor = factor
+        self.jitter = min(max(jitter, 0.0), 1.0)
+
+    @classmethod
+    def from_settings(cls, settings: Mapping[str, Any]) -> "RetryPolicy":
+        """Create a retry policy from the agent settings."""
+        policy = cls()
+        return cls(
+            delay=settings.get("transport.outbound_retry_delay", policy.delay),
+            max_delay=settings.get(
+                "transport.outbound_retry_max_delay", policy.max_delay
+            ),
+            jitter=settings.get("transport.outbound_retry_jitter", policy.jitter),
+        )
+
+    def next_delay(self, attempt: int) -> float:
+        """
+        Get the delay before the next retry.
+
+        Args:
+            attempt: The number of failed attempts before this one, from zero
+
+        """
+        delay = min(self.delay * (self.factor**attempt), self.max_delay)
+        return delay - delay * self.jitter * random.random()
+
+
+class CircuitBreaker:
+    """Track the health of a single outbound endpoint."""
+
+    STATE_CLOSED = "closed"
+    STATE_OPEN = "open"
+    STATE_HALF_OPEN = "half-open"
+
+    def __init__(self, key: str, threshold: int, reset_delay: float, max_delay: float):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            key: The endpoint identifier (scheme and network location)
+            threshold: The number of consecutive failures which opens the breaker
+            reset_delay: The delay before the first probe of an open endpoint
+            max_delay: The upper bound on the delay between probes
+
+        """
+        self.key = key
+        self.threshold = threshold
+        self.reset_delay = reset_delay
+        self.max_delay = max(max_delay, reset_delay)
+        self.failures = 0
+        self.failed_at: float = None
+        self.opened_at: float = None
+        self.probe_at: float = None
+        self.probes = 0
+        self.state = self.STATE_CLOSED
+        # messages held back while the endpoint is unavailable
+        self.held = deque()
+
+    @property
+    def closed(self) -> bool:
+        """Accessor for the closed state."""
+        return self.state == self.STATE_CLOSED
+
+    def allow(self, now: float) -> bool:
+        """
+        Check whether a delivery may be attempted.
+
+        An open breaker permits a single probe once its reset delay has passed,
+        and then refuses further deliveries until the probe has completed.
+        """
+        if self.state == self.STATE_CLOSED:
+            return True
+        if self.state == self.STATE_OPEN and self.probe_at <= now:
+            self.state = self.STATE_HALF_OPEN
+            return True
+        return False
+
+    def record_success(self, now: float) -> bool:
+        """
+        Record a successful delivery.
+
+        Returns: True if the breaker was closed by this result
+
+        """
+        self.failures = 0
+        self.failed_at = None
+        if self.state == self.STATE_CLOSED:
+            return False
+        self.state = self.STATE_CLOSED
+        self.probes = 0
+        self.probe_at = None
+        return True
+
+    def record_failure(self, now: float) -> bool:
+        """
+        Record a failed delivery.
+
+        Returns: True if the breaker was opened by this result
+
+        """
+        self.failures += 1
+        if self.failed_at is None:
+            self.failed_at = now
+        if self.state == self.STATE_HALF_OPEN:
+            self.probes += 1
+            self.state = self.STATE_OPEN
+            self.probe_at = now + min(
+                self.reset_delay * (2**self.probes), self.max_delay
+            )
+        elif self.state == self.STATE_CLOSED and self.failures >= self.threshold:
+            self.state = self.STATE_OPEN
+            self.opened_at = now
+            self.probe_at = now + self.reset_delay
+            return True
+        return False
+
+    def __repr__(self) -> str:
+        """Generate string representation for logging."""
+        return (
+            f"<{self.__class__.__name__} key={self.key} state={self.state} "
+            f"failures={self.failures} held={len(self.held)}>"
+        )
+
+
+def endpoint_key(endpoint: str) -> str:
+    """Get the circuit breaker key for an endpoint URL."""
+    if not isinstance(endpoint, str):
+        return None
+    parsed = urlparse(endpoint)
+    return f"{parsed.scheme}://{parsed.netloc}" if parsed.netloc else None
@@ -118,6 +118,107 @@ class TestHttpTransport(AioHTTPTestCase):
             "outbound-http:POST": 1,
         }
 
+    async def test_stats_per_host(self):
+        server_addr = f"http://localhost:{self.server.port}"
+        profile = InMemoryProfile.test_profile({"transport.http.stats_per_host": True})
+
+        transport = HttpTransport(root_profile=profile)
+        transport.collector = Collector()
+        async with transport:
+            await asyncio.wait_for(
+                transport.handle_message(self.profile, b"{}", server_addr), 5.0
+            )
+
+        results = transport.collector.extract()
+        host = f"localhost:{self.server.port}"
+        assert results["count"] == {
+            "outbound-http:dns_resolve": 1,
+            "outbound-http:connect": 1,
+            "outbound-http:POST": 1,
+            f"outbound-http:{host}:dns_resolve": 1,
+            f"outbound-http:{host}:connect": 1,
+            f"outbound-http:{host}:POST": 1,
+        }
+
+    async def test_settings(self):
+        profile = InMemoryProfile.test_profile(
+            {
+                "transport.http.limit": 20,
+                "transport.http.limit_per_host": 5,
+                "transport.http.keepalive_timeout": 60,
+                "transport.http.dns_cache_ttl": 300,
+            }
+        )
+        transport = HttpTransport(root_profile=profile)
+        await transport.start()
+        assert transport.connector.limit == 20
+        assert transport.connector.limit_per_host == 5
+        assert transport.connector._keepalive_timeout == 60
+        assert transport.connector._cached_hosts._ttl == 300
+        await transport.stop()
+
+    async def test_handle_message_batch(self):
+        server_addr = f"http://localhost:{self.server.port}"
+        profile = InMemoryProfile.test_profile({"transport.http.batch_size": 2})
+        transport = HttpTransport(root_profile=profile)
+        transport.collector = Collector()
+
+        async with transport:
+            await asyncio.wait_for(
+                asyncio.gather(
+                    *(
+                        transport.handle_message(
+                            self.profile, f'{{"idx": {idx}}}', server_addr
+                        )
+                        for idx in range(5)
+                    )
+                ),
+                5.0,
+            )
+            assert not transport.lanes
+
+        assert sorted(result["idx"] for result in self.message_results) == list(
+            range(5)
+        )
+        results = transport.collector.extract()
+        host = f"localhost:{self.server.port}"
+        assert results["count"]["outbound-http:lane_queued"] == 5
+        assert f"outbound-http:{host}:lane_queued" not in results["count"]
+        # one worker per two queued messages, each reusing its connection
+        assert results["count"]["outbound-http:connect"] == 3
+        assert results["count"]["outbound-http:POST"] == 5
+
+    async def test_handle_message_batch_error(self):
+        server_addr = f"http://localhost:{self.server.port}/missing"
+        profile = InMemoryProfile.test_profile({"transport.http.batch_size": 10})
+        transport = HttpTransport(root_profile=profile)
+
+        async with transport:
+            with pytest.raises(OutboundTransportError):
+                await asyncio.wait_for(
+                    transport.handle_message(self.profile, "{}", server_addr), 5.0
+                )
+
+    async def test_stop_batch_pending(self):
+        profile = InMemoryProfile.test_profile({"transport.http.batch_size": 10})
+        transport = HttpTransport(root_profile=profile)
+        await transport.start()
+        with async_mock.patch.object(
+            transport, "post", async_mock.CoroutineMock()
+        ) as mock_post:
+            mock_post.side_effect = lambda *args: asyncio.sleep(10)
+            sends = [
+                asyncio.ensure_future(
+                    transport.handle_message(self.profile, "{}", "http://localhost")
+                )
+                for _ in range(2)
+            ]
+            await asyncio.sleep(0.01)
+            await transport.stop()
+            for send in sends:
+                with pytest.raises(OutboundTransportError):
+                    await send
+
     async def test_transport_coverage(self):
         transport = HttpTransport()
         assert transport.wire_format is None
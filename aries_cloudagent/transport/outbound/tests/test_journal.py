@@ -0,0 +1,99 @@
+import json
+import os
+
+from tempfile import TemporaryDirectory
+
+from asynctest import TestCase as AsyncTestCase
+
+from ..journal import OutboundJournal, OutboundJournalError
+
+
+class TestOutboundJournal(AsyncTestCase):
+    def setUp(self):
+        self.temp_dir = TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "outbound.log")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def read_lines(self):
+        with open(self.path) as log:
+            return [json.loads(line) for line in log]
+
+    async def test_persist_and_restore(self):
+        journal = OutboundJournal(self.path)
+        assert not journal.opened
+        with self.assertRaises(OutboundJournalError):
+            journal.add("http://host/", "{}")
+        assert journal.open() == []
+
+        id_str = journal.add(
+            "http://host/topic/x/",
+            '{"a": 1}',
+            retries=3,
+            metadata={"x-wallet-id": "w1"},
+            api_key="key",
+        )
+        id_bytes = journal.add("http://host/", b"\x00packed", retries=4)
+        id_done = journal.add("http://host/", b"done", retries=4)
+        journal.update(id_bytes, 2, 2)
+        journal.update("missing", 1, 1)
+        journal.remove(id_done)
+        journal.remove("missing")
+        await journal.close()
+        assert not journal.opened
+
+        restored = OutboundJournal(self.path)
+        entries = {entry["id"]: entry for entry in restored.open()}
+        assert set(entries) == {id_str, id_bytes}
+        assert OutboundJournal.entry_payload(entries[id_str]) == '{"a": 1}'
+        assert entries[id_str]["metadata"] == {"x-wallet-id": "w1"}
+        assert entries[id_str]["api_key"] == "key"
+        assert OutboundJournal.entry_payload(entries[id_bytes]) == b"\x00packed"
+        assert entries[id_bytes]["retries"] == 2
+        assert entries[id_bytes]["attempts"] == 2
+        # opening compacts the log to the live entries
+        assert len(self.read_lines()) == 2
+        await restored.close()
+
+    async def test_batched_flush(self):
+        journal = OutboundJournal(self.path, flush_interval=60, flush_size=3)
+        journal.open()
+        journal.add("http://host/", "1")
+        journal.add("http://host/", "2")
+        assert journal._flush_handle and not journal._flush_task
+        assert self.read_lines() == []
+        journal.add("http://host/", "3")
+        assert journal._flush_task and not journal._flush_handle
+        await journal._flush_task
+        assert len(self.read_lines()) == 3
+        await journal.close()
+
+    async def test_compact(self):
+        journal = OutboundJournal(self.path, flush_interval=60, compact_min=10)
+        journal.open()
+        keep = journal.add("http://host/", "keep")
+        for idx in range(10):
+            journal.remove(journal.add("http://host/", str(idx)))
+        await journal.flush()
+        lines = self.read_lines()
+        assert [line["id"] for line in lines] == [keep]
+
+        journal.remove(keep)
+        await journal.close()
+        journal = OutboundJournal(self.path)
+        assert journal.open() == []
+        await journal.close()
+
+    async def test_torn_write(self):
+        journal = OutboundJournal(self.path)
+        journal.open()
+        entry_id = journal.add("http://host/", "ok")
+        await journal.close()
+        with open(self.path, "a") as log:
+            log.write('{"op": "add", "id": "torn", "endp')
+
+        journal = OutboundJournal(self.path)
+        entries = journal.open()
+        assert [entry["id"] for entry in entries] == [entry_id]
+        await journal.close()
@@ -1,13 +1,19 @@
+import asyncio
 import json
+import os
+
+from tempfile import TemporaryDirectory
 
 from asynctest import TestCase as AsyncTestCase, mock as async_mock
 
 from ....core.in_memory import InMemoryProfile
 from ....connections.models.connection_target import ConnectionTarget
 from ....core.in_memory import InMemoryProfile
+from ....utils.stats import Collector
 from ...wire_format import BaseWireFormat
 
 from .. import manager as test_module
+from ..journal import OutboundJournal
 from ..manager import (
     OutboundDeliveryError,
     OutboundTransportManager,
@@ -181,7 +187,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             mgr._process_done(mock_task)
 
     async def test_process_finished_x(self):
-        mock_queued = async_mock.MagicMock(retries=1)
+        mock_queued = async_mock.MagicMock(retries=1, attempts=0)
         mock_task = async_mock.MagicMock(
             exc_info=(KeyError, KeyError("nope"), None),
         )
@@ -204,7 +210,8 @@ class TestOutboundTransportManager(AsyncTestCase):
         profile = InMemoryProfile.test_profile()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(profile, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
+        mgr._queue_retry(mock_queued)
 
         with async_mock.patch.object(
             test_module, "trace_event", async_mock.MagicMock()
@@ -213,6 +220,7 @@ class TestOutboundTransportManager(AsyncTestCase):
             with self.assertRaises(KeyError):  # cover retry logic and bail
                 await mgr._process_loop()
             assert mock_queued.retry_at is None
+            assert not mgr.outbound_retry
 
     async def test_process_loop_retry_later(self):
         mock_queued = async_mock.MagicMock(
@@ -223,15 +231,84 @@ class TestOutboundTransportManager(AsyncTestCase):
         profile = InMemoryProfile.test_profile()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(profile, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
+        mgr._queue_retry(mock_queued)
 
         with async_mock.patch.object(
-            test_module.asyncio, "sleep", async_mock.CoroutineMock()
-        ) as mock_sleep_x:
-            mock_sleep_x.side_effect = KeyError()
+            test_module.asyncio, "wait_for", async_mock.CoroutineMock()
+        ) as mock_wait_for:
+            mock_wait_for.side_effect = KeyError()
             with self.assertRaises(KeyError):  # cover retry logic and bail
                 await mgr._process_loop()
             assert mock_queued.retry_at is not None
+            assert 3500 < mock_wait_for.call_args[0][1] <= 3600
+            mock_wait_for.call_args[0][0].close()
+
+    async def test_process_loop_retry_wakeup(self):
+        profile = InMemoryProfile.test_profile()
+        mgr = OutboundTransportManager(profile)
+        queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+        queued.endpoint = "http://localhost"
+        queued.retry_at = test_module.get_timer() + 0.05
+        mgr._queue_retry(queued)
+        mgr.outbound_buffer.add(queued)
+
+        def deliver(queued):
+            mgr._queue_done(queued)
+            mgr.process_queued()
+
+        with async_mock.patch.object(
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver, async_mock.patch.object(
+            test_module, "trace_event", async_mock.MagicMock()
+        ):
+            mock_deliver.side_effect = deliver
+            await asyncio.wait_for(mgr._process_loop(), 5)
+            mock_deliver.assert_called_once_with(queued)
+            assert not mgr.outbound_buffer
+            assert not mgr.outbound_retry
+
+    async def test_process_loop_retry_backlog(self):
+        # retries which are not yet due are not visited when delivering others
+        profile = InMemoryProfile.test_profile()
+        mgr = OutboundTransportManager(profile)
+        retry_at = test_module.get_timer() + 3600
+        for _ in range(100):
+            queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+            queued.retry_at = retry_at
+            mgr._queue_retry(queued)
+            mgr.outbound_buffer.add(queued)
+
+        delivered = asyncio.Event()
+        done = []
+
+        def deliver(queued):
+            mgr._queue_done(queued)
+            mgr.process_queued()
+            done.append(queued)
+            if len(done) == 10:
+                delivered.set()
+
+        with async_mock.patch.object(
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver, async_mock.patch.object(
+            test_module, "trace_event", async_mock.MagicMock()
+        ), async_mock.patch.object(
+            test_module, "heapq", async_mock.MagicMock(wraps=test_module.heapq)
+        ) as mock_heapq:
+            mock_deliver.side_effect = deliver
+            for _ in range(10):
+                queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+                queued.endpoint = "http://localhost"
+                queued.state = QueuedOutboundMessage.STATE_PENDING
+                mgr.outbound_new.append(queued)
+                task = mgr.process_queued()
+                await asyncio.sleep(0)
+            await asyncio.wait_for(delivered.wait(), 5)
+            task.cancel()
+            assert not mock_heapq.heappop.called
+        assert len(mgr.outbound_retry) == 100
+        assert len(mgr.outbound_buffer) == 100
 
     async def test_process_loop_new(self):
         profile = InMemoryProfile.test_profile()
@@ -290,20 +367,25 @@ class TestOutboundTransportManager(AsyncTestCase):
         profile = InMemoryProfile.test_profile()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(profile, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
+        mgr.outbound_done.append(mock_queued)
 
         await mgr._process_loop()
+        mock_handle_not_delivered.assert_called_once_with(
+            mock_queued.profile, mock_queued.message
+        )
+        assert not mgr.outbound_buffer
 
     async def test_finished_deliver_x_log_debug(self):
         mock_queued = async_mock.MagicMock(
-            state=QueuedOutboundMessage.STATE_DONE, retries=1
+            state=QueuedOutboundMessage.STATE_DONE, retries=1, attempts=0
         )
         mock_completed_x = async_mock.MagicMock(exc_info=KeyError("an error occurred"))
 
         profile = InMemoryProfile.test_profile()
         mock_handle_not_delivered = async_mock.MagicMock()
         mgr = OutboundTransportManager(profile, mock_handle_not_delivered)
-        mgr.outbound_buffer.append(mock_queued)
+        mgr.outbound_buffer.add(mock_queued)
         with async_mock.patch.object(
             test_module.LOGGER, "exception", async_mock.MagicMock()
         ) as mock_logger_exception, async_mock.patch.object(
@@ -315,6 +397,207 @@ class TestOutboundTransportManager(AsyncTestCase):
         ) as mock_process:
             mock_logger_enabled.return_value = True  # cover debug logging
             mgr.finished_deliver(mock_queued, mock_completed_x)
+            assert mock_queued.state == QueuedOutboundMessage.STATE_RETRY
+            assert mgr.outbound_retry[0][2] is mock_queued
+
+    async def test_circuit_breaker_hold_and_probe(self):
+        collector = Collector()
+        profile = InMemoryProfile.test_profile(
+            {
+                "transport.outbound_breaker_threshold": 1,
+                "transport.outbound_breaker_reset": 60,
+            },
+            bind={Collector: collector},
+        )
+        mgr = OutboundTransportManager(profile)
+
+        def make_queued(path: str):
+            queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+            queued.endpoint = f"http://example:8020/{path}"
+            queued.retries = 2
+            return queued
+
+        failed = make_queued("a")
+        mgr.outbound_buffer.add(failed)
+        failed.state = QueuedOutboundMessage.STATE_DELIVER
+        with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+            mgr.finished_deliver(
+                failed, async_mock.MagicMock(exc_info=(KeyError, KeyError(), None))
+            )
+        assert failed.state == QueuedOutboundMessage.STATE_RETRY
+        assert failed.attempts == 1
+        assert failed.retries == 1
+        breaker = mgr.breakers_open["http://example:8020"]
+        assert collector.extract(["outbound-breaker:open"])["count"] == {
+            "outbound-breaker:open": 1
+        }
+
+        held = [make_queued("b"), make_queued("c")]
+        for queued in held:
+            queued.state = QueuedOutboundMessage.STATE_PENDING
+            mgr.outbound_new.append(queued)
+
+        with async_mock.patch.object(
+            mgr, "deliver_queued_message", async_mock.MagicMock()
+        ) as mock_deliver, async_mock.patch.object(
+            test_module.asyncio, "wait_for", async_mock.CoroutineMock()
+        ) as mock_wait_for:
+            mock_wait_for.side_effect = KeyError()
+            with self.assertRaises(KeyError):
+                await mgr._process_loop()
+            mock_wait_for.call_args[0][0].close()
+            mock_deliver.assert_not_called()
+            assert list(breaker.held) == held
+            assert all(q.state == QueuedOutboundMessage.STATE_RETRY for q in held)
+            assert 0 < mock_wait_for.call_args[0][1] <= 10  # next retry is due first
+
+            breaker.probe_at = test_module.get_timer() - 1
+            with self.assertRaises(KeyError):
+                await mgr._process_loop()
+            mock_wait_for.call_args[0][0].close()
+            mock_deliver.assert_called_once_with(held[0])
+            assert list(breaker.held) == held[1:]
+            assert breaker.state == breaker.STATE_HALF_OPEN
+
+        with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+            mgr.finished_deliver(held[0], async_mock.MagicMock(exc_info=None))
+        assert not mgr.breakers_open
+        assert not mgr.breakers
+        assert not breaker.held
+        assert list(mgr.outbound_pending) == held[1:]
+        assert held[1].state == QueuedOutboundMessage.STATE_PENDING
+        assert collector.extract(["outbound-breaker:close"])["count"] == {
+            "outbound-breaker:close": 1
+        }
+
+    async def test_circuit_breaker_disabled(self):
+        profile = InMemoryProfile.test_profile(
+            {"transport.outbound_breaker_threshold": 0}
+        )
+        mgr = OutboundTransportManager(profile)
+        queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+        queued.endpoint = "http://example:8020/"
+        queued.retries = 1
+        with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+            mgr.finished_deliver(
+                queued, async_mock.MagicMock(exc_info=(KeyError, KeyError(), None))
+            )
+        assert not mgr.breakers
+        assert queued.state == QueuedOutboundMessage.STATE_RETRY
+
+    async def test_journal_restore(self):
+        with TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "outbound.log")
+            profile = InMemoryProfile.test_profile(
+                {"transport.outbound_queue_path": path}
+            )
+            mgr = OutboundTransportManager(profile)
+            transport = async_mock.MagicMock(
+                schemes=["http"],
+                is_external=False,
+                start=async_mock.CoroutineMock(),
+                stop=async_mock.CoroutineMock(),
+                handle_message=async_mock.CoroutineMock(
+                    side_effect=OutboundDeliveryError()
+                ),
+            )
+            mgr.register_class(
+                async_mock.MagicMock(schemes=["http"], return_value=transport),
+                "transport_cls",
+            )
+            await mgr.start()
+            assert mgr.journal.opened
+
+            with async_mock.patch.object(mgr, "process_queued", async_mock.MagicMock()):
+                mgr.enqueue_webhook("topic", {"a": 1}, "http://example", max_attempts=3)
+            queued = mgr.outbound_new.pop()
+            mgr._queue_pending(queued)
+            assert queued.journal_id in mgr.journal.entries
+            queued.retries, queued.attempts = 1, 1
+            queued.retry_at = test_module.get_timer() + 3600
+            mgr._queue_retry(queued)
+            await mgr.stop()
+            assert not mgr.journal.opened
+
+            restart = OutboundTransportManager(profile)
+            restart.register_class(
+                async_mock.MagicMock(schemes=["http"], return_value=transport),
+                "transport_cls",
+            )
+            with async_mock.patch.object(
+                restart, "process_queued", async_mock.MagicMock()
+            ) as mock_process:
+                await restart.start()
+                mock_process.assert_called_once_with()
+            assert len(restart.outbound_new) == 1
+            restored = restart.outbound_new[0]
+            assert restored.journal_id == queued.journal_id
+            assert restored.endpoint == "http://example/topic/topic/"
+            assert json.loads(restored.payload) == {"a": 1}
+            assert restored.retries == 1 and restored.attempts == 1
+            assert restored.profile is profile
+            assert restored.state == QueuedOutboundMessage.STATE_PENDING
+
+            restart._queue_done(restored)
+            assert restored.journal_id is None
+            assert not restart.journal.entries
+            await restart.journal.close()
+
+    async def test_journal_restore_no_transport(self):
+        with TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "outbound.log")
+            journal = OutboundJournal(path)
+            journal.open()
+            journal.add("xmpp://example", "{}", retries=1)
+            await journal.close()
+
+            profile = InMemoryProfile.test_profile(
+                {"transport.outbound_queue_path": path}
+            )
+            mgr = OutboundTransportManager(profile)
+            await mgr.start()
+            assert not mgr.outbound_new
+            assert not mgr.journal.entries
+            await mgr.stop()
+
+    async def test_journal_batched_sync(self):
+        # enqueued messages are synced to the journal in batches
+        with TemporaryDirectory() as temp_dir:
+            profile = InMemoryProfile.test_profile(
+                {"transport.outbound_queue_path": os.path.join(temp_dir, "out.log")}
+            )
+            mgr = OutboundTransportManager(profile)
+            transport = async_mock.MagicMock(
+                schemes=["http"],
+                start=async_mock.CoroutineMock(),
+                stop=async_mock.CoroutineMock(),
+            )
+            mgr.register_class(
+                async_mock.MagicMock(schemes=["http"], return_value=transport),
+                "transport_cls",
+            )
+            await mgr.start()
+            await mgr.task_queue
+
+            def deliver(queued):
+                mgr._queue_done(queued)
+
+            with async_mock.patch.object(
+                mgr,
+                "deliver_queued_message",
+                async_mock.MagicMock(side_effect=deliver),
+            ) as mock_deliver, async_mock.patch.object(
+                os, "fsync", wraps=os.fsync
+            ) as mock_fsync:
+                for idx in range(500):
+                    mgr.enqueue_webhook("topic", {"idx": idx}, "http://example")
+                    if idx % 100 == 0:
+                        await asyncio.sleep(0)
+                await mgr.flush()
+                await mgr.stop()
+            assert mock_deliver.call_count == 500
+            assert 0 < mock_fsync.call_count < 50
+            assert not mgr.journal.entries
 
     async def test_should_encode_outbound_message(self):
         base_wire_format = BaseWireFormat()
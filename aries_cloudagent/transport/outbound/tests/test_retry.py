@@ -0,0 +1,87 @@
+from asynctest import TestCase as AsyncTestCase, mock as async_mock
+
+from .. import retry as test_module
+from ..retry import CircuitBreaker, RetryPolicy, endpoint_key
+
+
+class TestRetryPolicy(AsyncTestCase):
+    def test_from_settings(self):
+        policy = RetryPolicy.from_settings({})
+        assert policy.delay == 10
+        assert policy.max_delay == 300
+        assert policy.jitter == 0.25
+
+        policy = RetryPolicy.from_settings(
+            {
+                "transport.outbound_retry_delay": 2,
+                "transport.outbound_retry_max_delay": 60,
+                "transport.outbound_retry_jitter": 0.5,
+            }
+        )
+        assert policy.delay == 2
+        assert policy.max_delay == 60
+        assert policy.jitter == 0.5
+
+    def test_next_delay(self):
+        policy = RetryPolicy(delay=1, max_delay=20, jitter=0)
+        assert [policy.next_delay(attempt) for attempt in range(6)] == [
+            1,
+            2,
+            4,
+            8,
+            16,
+            20,
+        ]
+
+    def test_next_delay_jitter(self):
+        policy = RetryPolicy(delay=8, max_delay=100, jitter=0.5)
+        with async_mock.patch.object(
+            test_module.random, "random", async_mock.MagicMock(return_value=1.0)
+        ):
+            assert policy.next_delay(0) == 4
+            assert policy.next_delay(1) == 8
+        delays = {policy.next_delay(2) for _ in range(20)}
+        assert all(16 <= delay <= 32 for delay in delays)
+        assert len(delays) > 1
+
+
+class TestCircuitBreaker(AsyncTestCase):
+    def test_open_probe_close(self):
+        breaker = CircuitBreaker("http://host", 2, 30, 300)
+        assert breaker.closed
+        assert breaker.allow(0)
+
+        assert not breaker.record_failure(1)
+        assert breaker.closed
+        assert breaker.record_failure(2)
+        assert breaker.state == CircuitBreaker.STATE_OPEN
+        assert breaker.probe_at == 32
+        assert not breaker.record_failure(3)  # already open
+
+        assert not breaker.allow(10)
+        assert breaker.allow(32)
+        assert breaker.state == CircuitBreaker.STATE_HALF_OPEN
+        assert not breaker.allow(33)  # single probe in flight
+
+        assert breaker.record_success(34)
+        assert breaker.closed
+        assert breaker.failures == 0
+        assert not breaker.record_success(35)
+
+    def test_probe_failure_backoff(self):
+        breaker = CircuitBreaker("http://host", 1, 30, 100)
+        assert breaker.record_failure(0)
+        assert breaker.allow(30)
+        assert not breaker.record_failure(31)
+        assert breaker.state == CircuitBreaker.STATE_OPEN
+        assert breaker.probe_at == 31 + 60
+        assert breaker.allow(91)
+        breaker.record_failure(92)
+        assert breaker.probe_at == 92 + 100
+        assert "open" in repr(breaker)
+
+    def test_endpoint_key(self):
+        assert endpoint_key("http://host:8020/topic/x/") == "http://host:8020"
+        assert endpoint_key("ws://host/") == "ws://host"
+        assert endpoint_key("localhost") is None
+        assert endpoint_key(None) is None
@@ -184,16 +184,37 @@ class PackWireFormat(BaseWireFormat):
         if routing_keys:
             recip_keys = recipient_keys
             for router_key in routing_keys:
-                message = json.loads(message.decode("utf-8"))
-                fwd_msg = Forward(to=recip_keys[0], msg=message)
+                fwd_json = self.forward_json(recip_keys[0], message)
                 # Forwards are anon packed
                 recip_keys = [router_key]
                 try:
-                    message = await wallet.pack_message(fwd_msg.to_json(), recip_keys)
+                    message = await wallet.pack_message(fwd_json, recip_keys)
                 except WalletError as e:
                     raise WireFormatEncodeError("Forward message pack failed") from e
         return message
 
+    @staticmethod
+    def forward_json(to: str, message: bytes) -> str:
+        """
+        Wrap a packed message in a forward message.
+
+        The packed message is inserted as it is, rather than being parsed and
+        serialized again along with the forward message.
+
+        Args:
+            to: The recipient key of the packed message
+            message: The packed message
+
+        Returns:
+            The forward message JSON
+
+        """
+        fwd_msg = Forward(to=to, msg={}).serialize()
+        del fwd_msg["msg"]
+        return '{}, "msg": {}}}'.format(
+            json.dumps(fwd_msg)[:-1], message.decode("utf-8")
+        )
+
     def get_recipient_keys(self, message_body: Union[str, bytes]) -> List[str]:
         """
         Get all recipient keys from a wire message.
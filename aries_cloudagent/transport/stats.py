@@ -8,11 +8,20 @@ from ..utils.stats import Collector
 class StatsTracer(aiohttp.TraceConfig):
     """Attach hooks to client session events and report statistics."""
 
-    def __init__(self, collector: Collector, prefix: str):
-        """Initialize the `StatsTracer` instance."""
+    def __init__(self, collector: Collector, prefix: str, per_host: bool = False):
+        """
+        Initialize the `StatsTracer` instance.
+
+        Args:
+            collector: The stats collector to report to
+            prefix: The prefix for the reported stat names
+            per_host: Also report each stat under a name including the target host
+
+        """
         super().__init__()
         self.collector = collector
         self.prefix = prefix
+        self.per_host = per_host
         self.on_request_start.append(self.request_start)
         self.on_connection_queued_start.append(self.connection_queued_start)
         self.on_connection_queued_end.append(self.connection_queued_end)
@@ -25,13 +34,26 @@ class StatsTracer(aiohttp.TraceConfig):
         self.on_connection_create_end.append(self.connection_ready)
         self.on_request_end.append(self.request_end)
 
+    def timer(self, context, name: str):
+        """Start a timer for a stat, reported per host when enabled."""
+        groups = [self.prefix + name]
+        host_prefix = context.host_prefix if self.per_host else None
+        if host_prefix:
+            groups.append(host_prefix + name)
+        return self.collector.timer(*groups).start()
+
     async def request_start(self, session, context, params):
         """Handle the start of a request."""
         context.method, context.url = params.method, params.url
+        context.host_prefix = (
+            f"{self.prefix}{params.url.host}:{params.url.port}:"
+            if self.per_host
+            else None
+        )
 
     async def connection_queued_start(self, session, context, params):
         """Handle the start of a queued connection."""
-        context.queue_timer = self.collector.timer(self.prefix + "queued").start()
+        context.queue_timer = self.timer(context, "queued")
 
     async def connection_queued_end(self, session, context, params):
         """Handle the end of a queued connection."""
@@ -39,7 +61,7 @@ class StatsTracer(aiohttp.TraceConfig):
 
     async def dns_resolvehost_start(self, session, context, params):
         """Handle the start of a DNS resolution."""
-        context.dns_timer = self.collector.timer(self.prefix + "dns_resolve").start()
+        context.dns_timer = self.timer(context, "dns_resolve")
 
     async def dns_resolvehost_end(self, session, context, params):
         """Handle the end of a DNS resolution."""
@@ -47,7 +69,7 @@ class StatsTracer(aiohttp.TraceConfig):
 
     async def socket_connect_start(self, session, context, params):
         """Handle the start of a socket connection."""
-        context.socket_timer = self.collector.timer(self.prefix + "connect").start()
+        context.socket_timer = self.timer(context, "connect")
 
     async def connection_ready(self, session, context, params):
         """Handle the end of connection acquisition."""
@@ -55,7 +77,7 @@ class StatsTracer(aiohttp.TraceConfig):
             context.socket_timer.stop()
         except AttributeError:
             pass
-        context.fetch_timer = self.collector.timer(self.prefix + context.method).start()
+        context.fetch_timer = self.timer(context, context.method)
 
     async def request_end(self, session, context, params):
         """Handle the end of request."""
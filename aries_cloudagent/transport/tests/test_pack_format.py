@@ -11,6 +11,7 @@ from ...wallet.base import BaseWallet
 from ...wallet.did_method import SOV, DIDMethods
 from ...wallet.error import WalletError
 from ...wallet.key_type import ED25519
+from ...utils.worker_pool import WORKER_PROCESS, WorkerPool
 from .. import pack_format as test_module
 from ..error import RecipientKeysError, WireFormatEncodeError, WireFormatParseError
 from ..pack_format import PackWireFormat
@@ -106,11 +107,8 @@ class TestPackWireFormat(AsyncTestCase):
         )
         session = InMemoryProfile.test_session(bind={BaseWallet: mock_wallet})
         with async_mock.patch.object(
-            test_module, "Forward", async_mock.MagicMock()
-        ) as mock_forward:
-            mock_forward.return_value = async_mock.MagicMock(
-                to_json=async_mock.MagicMock()
-            )
+            serializer, "forward_json", async_mock.MagicMock(return_value="{}")
+        ):
             with self.assertRaises(WireFormatEncodeError):
                 await serializer.pack(session, None, ["key"], ["key"], ["key"])
 
@@ -199,6 +197,52 @@ class TestPackWireFormat(AsyncTestCase):
         assert delivery.recipient_verkey == router_did.verkey
         assert delivery.sender_verkey is None
 
+    async def test_forward_json(self):
+        serializer = PackWireFormat()
+        packed = json.dumps({"protected": "abc", "ciphertext": "def"}).encode()
+
+        fwd = json.loads(serializer.forward_json("recip-key", packed))
+        assert fwd["@type"] == DIDCommPrefix.qualify_current(FORWARD)
+        assert fwd["to"] == "recip-key"
+        assert fwd["msg"] == json.loads(packed)
+
+    async def test_forward_worker_pool(self):
+        for pool in (WorkerPool(), WorkerPool(kind=WORKER_PROCESS, max_workers=1)):
+            self.session.profile.context.injector.bind_instance(WorkerPool, pool)
+            local_did = await self.wallet.create_local_did(
+                method=SOV, key_type=ED25519, seed=self.test_seed
+            )
+            router_did = await self.wallet.create_local_did(
+                method=SOV, key_type=ED25519, seed=self.test_routing_seed
+            )
+            serializer = PackWireFormat()
+            message_json = json.dumps(self.test_message)
+
+            packed_json = await serializer.encode_message(
+                self.session,
+                message_json,
+                (local_did.verkey,),
+                (local_did.verkey, router_did.verkey),
+                local_did.verkey,
+            )
+            message_dict, delivery = await serializer.parse_message(
+                self.session, packed_json
+            )
+            assert message_dict["@type"] == DIDCommPrefix.qualify_current(FORWARD)
+            assert message_dict["to"] == local_did.verkey
+            assert delivery.recipient_verkey == router_did.verkey
+
+            inner_dict, delivery = await serializer.parse_message(
+                self.session, json.dumps(message_dict["msg"])
+            )
+            assert inner_dict["to"] == local_did.verkey
+            message_dict, delivery = await serializer.parse_message(
+                self.session, json.dumps(inner_dict["msg"])
+            )
+            assert message_dict == self.test_message
+            assert delivery.sender_verkey == local_did.verkey
+            pool.shutdown()
+
     async def test_get_recipient_keys(self):
         recip_keys = ["kid1", "kid2", "kid3"]
         enc_message = {
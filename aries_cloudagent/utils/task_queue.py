@@ -3,10 +3,18 @@
 import asyncio
 import logging
 import time
-from typing import Callable, Coroutine, Tuple
+from collections import Counter, OrderedDict, deque
+from typing import Callable, Coroutine, Hashable, List, Sequence, Tuple
 
 LOGGER = logging.getLogger(__name__)
 
+PRIORITY_HIGH = "high"
+PRIORITY_NORMAL = "normal"
+PRIORITY_LOW = "low"
+
+# priority classes, highest first, with the share of turns each one receives
+DEFAULT_PRIORITIES = ((PRIORITY_HIGH, 4), (PRIORITY_NORMAL, 2), (PRIORITY_LOW, 1))
+
 
 def coro_ident(coro: Coroutine):
     """Extract an identifier for a coroutine."""
@@ -180,7 +188,7 @@ class TaskQueue:
     @property
     def current_size(self) -> int:
         """Accessor for the total number of tasks in the queue."""
-        return len(self.active_tasks) + len(self.pending_tasks)
+        return len(self.active_tasks) + self.current_pending
 
     def __bool__(self) -> bool:
         """
@@ -199,7 +207,7 @@ class TaskQueue:
         """Start the process to run queued tasks."""
         if self._drain_task and not self._drain_task.done():
             self._drain_evt.set()
-        elif self.pending_tasks:
+        elif self.current_pending:
             self._drain_task = self.loop.create_task(self._drain_loop())
             self._drain_task.add_done_callback(lambda task: self._drain_done(task))
         return self._drain_task
@@ -218,10 +226,10 @@ class TaskQueue:
         # waiting for the drain event, to avoid yielding to other queue methods
         while True:
             self._drain_evt.clear()
-            while self.pending_tasks and (
+            while self.current_pending and (
                 not self._max_active or len(self.active_tasks) < self._max_active
             ):
-                pending: PendingTask = self.pending_tasks.pop(0)
+                pending = self._pop_pending()
                 if pending.queued_time:
                     pending.unqueued_time = time.perf_counter()
                     timing = {
@@ -237,11 +245,15 @@ class TaskQueue:
                     pending.task = task
                 except ValueError:
                     LOGGER.warning("Pending task future already fulfilled")
-            if self.pending_tasks:
+            if self.current_pending:
                 await self._drain_evt.wait()
             else:
                 break
 
+    def _pop_pending(self) -> PendingTask:
+        """Remove the next task to run from the pending queue."""
+        return self.pending_tasks.pop(0)
+
     def add_pending(self, pending: PendingTask):
         """
         Add a task to the pending queue.
@@ -416,3 +428,221 @@ class TaskQueue:
     async def wait_for(self, timeout: float):
         """Wait for all queued tasks to complete with a timeout."""
         return await asyncio.wait_for(self.flush(), timeout)
+
+
+class TaskQueueFullError(Exception):
+    """The queue cannot accept more pending tasks for a tenant or connection."""
+
+
+class FairTaskQueue(TaskQueue):
+    """
+    A task queue serving its pending tasks by priority class and fair share.
+
+    Priority classes are served by weighted round robin, so lower classes still
+    make progress while higher ones are busy. Within a class the tenants take
+    turns, and within a tenant its connections take turns, so that no single
+    tenant or connection can hold up the others. Tasks beyond the pending
+    limits for a tenant or connection are refused with `TaskQueueFullError`.
+    """
+
+    def __init__(
+        self,
+        max_active: int = 0,
+        timed: bool = False,
+        trace_fn: Callable = None,
+        *,
+        priorities: Sequence[Tuple[str, int]] = DEFAULT_PRIORITIES,
+        default_priority: str = PRIORITY_NORMAL,
+        max_tenant_pending: int = 0,
+        max_connection_pending: int = 0,
+    ):
+        """
+        Initialize the task queue.
+
+        Args:
+            max_active: The maximum number of tasks to automatically run
+            timed: A flag indicating that timing should be collected for tasks
+            trace_fn: A callback for all completed tasks
+            priorities: The priority class names, highest first, and their weights
+            default_priority: The priority class for tasks not given one
+            max_tenant_pending: The maximum number of pending tasks per tenant
+            max_connection_pending: The maximum number of pending tasks per
+                connection of a tenant
+        """
+        self._weights = OrderedDict(priorities)
+        self._credits = dict(self._weights)
+        self._default_priority = (
+            default_priority
+            if default_priority in self._weights
+            else next(reversed(self._weights))
+        )
+        self._queues = {name: OrderedDict() for name in self._weights}
+        self._priority_pending = Counter()
+        self._tenant_pending = Counter()
+        self._connection_pending = Counter()
+        self.max_tenant_pending = max_tenant_pending
+        self.max_connection_pending = max_connection_pending
+        super().__init__(max_active, timed, trace_fn)
+
+    @property
+    def pending_tasks(self) -> List[PendingTask]:
+        """Accessor for the pending tasks, by priority class."""
+        return [
+            pending
+            for tenants in self._queues.values()
+            for connections in tenants.values()
+            for tasks in connections.values()
+            for pending in tasks
+        ]
+
+    @pending_tasks.setter
+    def pending_tasks(self, tasks: Sequence[PendingTask]):
+        """Replace the pending tasks, queueing them with the default priority."""
+        for tenants in self._queues.values():
+            tenants.clear()
+        self._priority_pending.clear()
+        self._tenant_pending.clear()
+        self._connection_pending.clear()
+        for pending in tasks:
+            self._enqueue(pending, self._default_priority, None, None)
+
+    @property
+    def current_pending(self) -> int:
+        """Accessor for the current number of pending tasks in the queue."""
+        return sum(self._priority_pending.values())
+
+    def priority_pending(self, priority: str) -> int:
+        """Get the number of pending tasks in a priority class."""
+        return self._priority_pending[priority]
+
+    def _enqueue(
+        self,
+        pending: PendingTask,
+        priority: str,
+        tenant: Hashable,
+        connection: Hashable,
+    ):
+        """Add a pending task to the queue of its tenant and connection."""
+        connections = self._queues[priority].setdefault(tenant, OrderedDict())
+        connections.setdefault(connection, deque()).append(pending)
+        self._priority_pending[priority] += 1
+        self._tenant_pending[tenant] += 1
+        self._connection_pending[(tenant, connection)] += 1
+
+    def _next_priority(self) -> str:
+        """Select the priority class to run the next pending task from."""
+        for name in self._weights:
+            if self._priority_pending[name] and self._credits[name] > 0:
+                return name
+        # every class with pending tasks has had its share, start a new round
+        self._credits.update(self._weights)
+        for name in self._weights:
+            if self._priority_pending[name]:
+                return name
+
+    def _pop_pending(self) -> PendingTask:
+        """Remove the next task to run from the pending queue."""
+        priority = self._next_priority()
+        tenants = self._queues[priority]
+        tenant, connections = next(iter(tenants.items()))
+        connection, tasks = next(iter(connections.items()))
+        pending = tasks.popleft()
+        if tasks:
+            connections.move_to_end(connection)
+        else:
+            del connections[connection]
+        if connections:
+            tenants.move_to_end(tenant)
+        else:
+            del tenants[tenant]
+        self._credits[priority] -= 1
+        self._priority_pending[priority] -= 1
+        self._tenant_pending[tenant] -= 1
+        if not self._tenant_pending[tenant]:
+            del self._tenant_pending[tenant]
+        self._connection_pending[(tenant, connection)] -= 1
+        if not self._connection_pending[(tenant, connection)]:
+            del self._connection_pending[(tenant, connection)]
+        return pending
+
+    def add_pending(
+        self,
+        pending: PendingTask,
+        *,
+        priority: str = None,
+        tenant: Hashable = None,
+        connection: Hashable = None,
+    ):
+        """
+        Add a task to the pending queue.
+
+        Args:
+            pending: The `PendingTask` to add to the task queue
+            priority: The priority class of the task
+            tenant: The tenant the task is run for
+            connection: The connection of the tenant the task is run for
+
+        Raises:
+            TaskQueueFullError: If the tenant or connection has too many pending
+                tasks, in which case the pending task is cancelled
+
+        """
+        if priority not in self._queues:
+            priority = self._default_priority
+        if (
+            self.max_connection_pending
+            and self._connection_pending[(tenant, connection)]
+            >= self.max_connection_pending
+        ):
+            pending.cancel()
+            raise TaskQueueFullError(
+                f"Too many pending tasks for connection {connection}"
+            )
+        if self.max_tenant_pending and (
+            self._tenant_pending[tenant] >= self.max_tenant_pending
+        ):
+            pending.cancel()
+            raise TaskQueueFullError(f"Too many pending tasks for tenant {tenant}")
+        if self.timed and not pending.queued_time:
+            pending.queued_time = time.perf_counter()
+        self._enqueue(pending, priority, tenant, connection)
+        self.drain()
+
+    def put(
+        self,
+        coro: Coroutine,
+        task_complete: Callable = None,
+        ident: str = None,
+        *,
+        priority: str = None,
+        tenant: Hashable = None,
+        connection: Hashable = None,
+    ) -> PendingTask:
+        """
+        Add a new task to the queue, delaying execution if busy.
+
+        Args:
+            coro: The coroutine to run
+            task_complete: A callback to run on completion
+            ident: A string identifier for the task
+            priority: The priority class of the task
+            tenant: The tenant the task is run for
+            connection: The connection of the tenant the task is run for
+
+        Returns: a future resolving to the asyncio task instance once queued
+
+        Raises:
+            TaskQueueFullError: If the task must wait and the tenant or connection
+                has too many pending tasks
+
+        """
+        pending = PendingTask(coro, task_complete, ident)
+        if self._cancelled:
+            pending.cancel()
+        elif self.ready:
+            pending.task = self.run(coro, task_complete, pending.ident)
+        else:
+            self.add_pending(
+                pending, priority=priority, tenant=tenant, connection=connection
+            )
+        return pending
@@ -2,7 +2,17 @@ import asyncio
 
 from asynctest import mock as async_mock, TestCase as AsyncTestCase
 
-from ..task_queue import CompletedTask, PendingTask, TaskQueue, task_exc_info
+from ..task_queue import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    CompletedTask,
+    FairTaskQueue,
+    PendingTask,
+    TaskQueue,
+    TaskQueueFullError,
+    task_exc_info,
+)
 
 
 async def retval(val, *, delay=0):
@@ -226,3 +236,88 @@ class TestTaskQueue(AsyncTestCase):
         assert len(completed) == 2
         assert "queued" not in completed[0][1]
         assert "queued" in completed[1][1]
+
+
+class TestFairTaskQueue(AsyncTestCase):
+    async def test_put_no_limit(self):
+        queue = FairTaskQueue()
+        pend = queue.put(retval(1), priority=PRIORITY_LOW, tenant="a")
+        assert not queue.pending_tasks
+        await queue.flush()
+        assert pend.task.result() == 1
+
+    async def test_fair_share(self):
+        queue = FairTaskQueue(1)
+        order = []
+
+        async def record(val):
+            order.append(val)
+
+        blocker = queue.put(retval(0, delay=0.01))
+        for i in range(3):
+            queue.put(record(f"a1-{i}"), tenant="a", connection="1")
+        queue.put(record("a2-0"), tenant="a", connection="2")
+        queue.put(record("b1-0"), tenant="b", connection="1")
+        assert queue.current_pending == 5
+        assert queue.priority_pending(PRIORITY_NORMAL) == 5
+        await queue.flush()
+        assert blocker.task.result() == 0
+        # tenants take turns, then the connections of each tenant
+        assert order == ["a1-0", "b1-0", "a2-0", "a1-1", "a1-2"]
+
+    async def test_priorities(self):
+        queue = FairTaskQueue(1, priorities=((PRIORITY_HIGH, 2), (PRIORITY_LOW, 1)))
+        order = []
+
+        async def record(val):
+            order.append(val)
+
+        queue.put(retval(0, delay=0.01))
+        for i in range(3):
+            queue.put(record(f"low-{i}"), priority=PRIORITY_LOW)
+        for i in range(5):
+            queue.put(record(f"high-{i}"), priority=PRIORITY_HIGH)
+        # without a normal class, tasks default to the lowest class
+        queue.put(record("normal-0"))
+        assert queue.priority_pending(PRIORITY_LOW) == 4
+        await queue.flush()
+        # the low priority class is served by its share, not starved
+        assert order == [
+            "high-0",
+            "high-1",
+            "low-0",
+            "high-2",
+            "high-3",
+            "low-1",
+            "high-4",
+            "low-2",
+            "normal-0",
+        ]
+
+    async def test_limits(self):
+        queue = FairTaskQueue(1, max_tenant_pending=3, max_connection_pending=2)
+        queue.put(retval(0, delay=0.01))
+        queue.put(retval(1), tenant="a", connection="1")
+        queue.put(retval(2), tenant="a", connection="1")
+        coro = retval(3)
+        with self.assertRaises(TaskQueueFullError):
+            queue.put(coro, tenant="a", connection="1")
+        # the refused coroutine is closed
+        assert coro.cr_frame is None
+        queue.put(retval(4), tenant="a", connection="2")
+        with self.assertRaises(TaskQueueFullError):
+            queue.put(retval(5), tenant="a", connection="3")
+        queue.put(retval(6), tenant="b", connection="1")
+        await queue.flush()
+        queue.put(retval(7), tenant="a", connection="1")
+        await queue.flush()
+
+    async def test_cancel_pending(self):
+        queue = FairTaskQueue(1)
+        queue.put(retval(0, delay=0.01))
+        pend = queue.put(retval(1), priority=PRIORITY_HIGH, tenant="a")
+        assert queue.pending_tasks == [pend]
+        queue.cancel_pending()
+        assert pend.cancelled
+        assert not queue.current_pending
+        await queue.flush()
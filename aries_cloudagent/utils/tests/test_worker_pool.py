@@ -0,0 +1,74 @@
+import asyncio
+import operator
+
+from asynctest import mock as async_mock, TestCase as AsyncTestCase
+
+from .. import worker_pool as test_module
+from ..worker_pool import WORKER_PROCESS, WorkerPool, run_batch
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+class TestWorkerPool(AsyncTestCase):
+    def test_run_batch(self):
+        results = run_batch([(operator.add, (1, 2)), (fail, ("bad",))])
+        assert results[0] == (True, 3)
+        assert results[1][0] is False
+        assert isinstance(results[1][1], ValueError)
+
+    def test_bad_kind(self):
+        with self.assertRaises(ValueError):
+            WorkerPool(kind="fiber")
+
+    async def test_run(self):
+        pool = WorkerPool(max_workers=2)
+        assert not pool.processes
+        assert await pool.run(operator.add, 1, 2) == 3
+        with self.assertRaises(ValueError):
+            await pool.run(fail, "bad")
+        pool.shutdown()
+
+    async def test_run_threads_unbatched(self):
+        pool = WorkerPool(max_workers=2, batch_size=3)
+        with async_mock.patch.object(
+            test_module, "run_batch", async_mock.MagicMock(wraps=run_batch)
+        ) as mock_run_batch:
+            results = await asyncio.gather(
+                *(pool.run(operator.mul, i, 2) for i in range(7))
+            )
+        assert results == [i * 2 for i in range(7)]
+        mock_run_batch.assert_not_called()
+        pool.shutdown()
+
+    async def test_run_processes_batched(self):
+        pool = WorkerPool(kind=WORKER_PROCESS, max_workers=1, batch_size=3)
+        with async_mock.patch.object(
+            pool.executor, "submit", wraps=pool.executor.submit
+        ) as mock_submit:
+            results = await asyncio.gather(
+                *(pool.run(operator.mul, i, 2) for i in range(7))
+            )
+        assert results == [i * 2 for i in range(7)]
+        assert [len(call[0][1]) for call in mock_submit.call_args_list] == [
+            3,
+            3,
+            1,
+        ]
+        pool.shutdown()
+
+    async def test_run_processes(self):
+        pool = WorkerPool(kind=WORKER_PROCESS, max_workers=1)
+        assert pool.processes
+        results = await asyncio.gather(
+            pool.run(operator.add, 1, 2), pool.run(operator.add, 3, 4)
+        )
+        assert results == [3, 7]
+        pool.shutdown()
+
+    async def test_executor_error(self):
+        pool = WorkerPool(kind=WORKER_PROCESS, max_workers=1)
+        pool.executor.shutdown()
+        with self.assertRaises(RuntimeError):
+            await pool.run(operator.add, 1, 2)
@@ -0,0 +1,143 @@
+"""Pool of workers for running CPU-bound calls off the event loop."""
+
+import asyncio
+import logging
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, List, Sequence, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+WORKER_THREAD = "thread"
+WORKER_PROCESS = "process"
+
+
+def run_batch(calls: Sequence[Tuple[Callable, tuple]]) -> List[Tuple[bool, Any]]:
+    """
+    Run a batch of calls within a worker.
+
+    Returns:
+        A list of (success, result or exception) tuples, one per call
+
+    """
+    results = []
+    for func, args in calls:
+        try:
+            results.append((True, func(*args)))
+        except Exception as err:
+            results.append((False, err))
+    return results
+
+
+class WorkerPool:
+    """
+    Run calls in a pool of threads or processes.
+
+    Calls to a process pool made before the event loop next runs are sent to a
+    worker as a single batch of at most `batch_size` calls, and require the
+    functions and arguments to be picklable. Calls to a thread pool are
+    submitted individually, so that they start without waiting for a batch.
+    """
+
+    def __init__(
+        self, kind: str = WORKER_THREAD, max_workers: int = None, batch_size: int = 16
+    ):
+        """
+        Initialize the worker pool.
+
+        Args:
+            kind: run calls in threads or in processes
+            max_workers: the number of workers, defaulting to the CPU count
+            batch_size: the maximum number of calls sent to a worker process at once
+
+        """
+        if kind not in (WORKER_THREAD, WORKER_PROCESS):
+            raise ValueError(f"Unknown worker kind: {kind}")
+        self.kind = kind
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.batch_size = max(batch_size, 1)
+        self._executor: Executor = None
+        self._pending: List[Tuple[Callable, tuple, asyncio.Future]] = []
+        self._flush_handle: asyncio.Handle = None
+
+    @property
+    def processes(self) -> bool:
+        """Accessor for whether calls cross to another process."""
+        return self.kind == WORKER_PROCESS
+
+    @property
+    def executor(self) -> Executor:
+        """Accessor for the executor, created on first use."""
+        if not self._executor:
+            if self.processes:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="worker-pool"
+                )
+        return self._executor
+
+    async def run(self, func: Callable, *args) -> Any:
+        """Run a call in a worker and return its result."""
+        loop = asyncio.get_event_loop()
+        if not self.processes:
+            return await loop.run_in_executor(self.executor, func, *args)
+        future = loop.create_future()
+        self._pending.append((func, args, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif not self._flush_handle:
+            self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self):
+        """Send the pending calls to the worker processes."""
+        if self._flush_handle:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, []
+        loop = asyncio.get_event_loop()
+        while pending:
+            batch = pending[: self.batch_size]
+            del pending[: self.batch_size]
+            calls = [(func, args) for (func, args, _) in batch]
+            futures = [future for (_, _, future) in batch]
+            try:
+                result = loop.run_in_executor(self.executor, run_batch, calls)
+            except Exception as err:
+                self._set_results(futures, [(False, err)] * len(futures))
+                continue
+            result.add_done_callback(
+                lambda result, futures=futures: self._batch_done(futures, result)
+            )
+
+    def _batch_done(self, futures: Sequence[asyncio.Future], result: asyncio.Future):
+        """Resolve the futures of a batch of calls."""
+        if result.cancelled():
+            for future in futures:
+                future.cancel()
+            return
+        err = result.exception()
+        if err:
+            self._set_results(futures, [(False, err)] * len(futures))
+        else:
+            self._set_results(futures, result.result())
+
+    @staticmethod
+    def _set_results(
+        futures: Sequence[asyncio.Future], results: Sequence[Tuple[bool, Any]]
+    ):
+        """Set the outcome of each call on its future."""
+        for future, (success, value) in zip(futures, results):
+            if future.done():
+                continue
+            if success:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def shutdown(self):
+        """Stop the workers once the calls already sent have completed."""
+        if self._executor:
+            self._executor.shutdown(wait=False)
+            self._executor = None
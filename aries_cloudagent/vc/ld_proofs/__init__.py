@@ -22,6 +22,7 @@ from .crypto import (
 from .document_loader import (
     DocumentLoader,
     DocumentLoaderMethod,
+    run_jsonld,
 )
 from .error import LinkedDataProofException
 from .validation_result import DocumentVerificationResult, ProofResult, PurposeResult
@@ -51,6 +52,7 @@ __all__ = [
     # Document Loaders
     "DocumentLoaderMethod",
     "DocumentLoader",
+    "run_jsonld",
     # Exceptions
     "LinkedDataProofException",
     # Validation results
@@ -2,42 +2,191 @@
 
 import asyncio
 import concurrent.futures
-
-from typing import Callable
-
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Mapping
+
+import pkg_resources
 from pydid.did_url import DIDUrl
-from pyld.documentloader import requests
 
 from ...cache.base import BaseCache
 from ...core.profile import Profile
 from ...resolver.did_resolver import DIDResolver
-
+from ...resolver.http_client import ResolverHTTPClient
+
+from .constants import (
+    CREDENTIALS_CONTEXT_V1_URL,
+    DID_V1_CONTEXT_URL,
+    SECURITY_CONTEXT_BBS_URL,
+    SECURITY_CONTEXT_V1_URL,
+    SECURITY_CONTEXT_V2_URL,
+    SECURITY_CONTEXT_V3_URL,
+)
 from .error import LinkedDataProofException
 
-import nest_asyncio
-
-nest_asyncio.apply()
+LOGGER = logging.getLogger(__name__)
+
+# Contexts shipped with the package, by url
+STATIC_CONTEXT_FILES = {
+    CREDENTIALS_CONTEXT_V1_URL: "credentials_v1.jsonld",
+    SECURITY_CONTEXT_V1_URL: "security_v1.jsonld",
+    SECURITY_CONTEXT_V2_URL: "security_v2.jsonld",
+    SECURITY_CONTEXT_V3_URL: "security_v3_unstable.jsonld",
+    SECURITY_CONTEXT_BBS_URL: "bbs_v1.jsonld",
+    DID_V1_CONTEXT_URL: "did_v1.jsonld",
+    "https://w3id.org/did/v1": "did_v1.jsonld",
+    "https://www.w3.org/2018/credentials/examples/v1": "examples_v1.jsonld",
+    "https://w3id.org/citizenship/v1": "citizenship_v1.jsonld",
+    "https://w3id.org/vaccination/v1": "vaccination_v1.jsonld",
+    "https://www.w3.org/ns/odrl.jsonld": "odrl.jsonld",
+    "http://schema.org/": "schema_org.jsonld",
+    "https://schema.org/": "schema_org.jsonld",
+}
+
+_JSONLD_EXECUTOR: concurrent.futures.ThreadPoolExecutor = None
+_JSONLD_THREAD = threading.local()
+
+
+@functools.lru_cache(maxsize=1)
+def static_contexts() -> Mapping[str, dict]:
+    """Load the contexts shipped with the package, once."""
+    documents = {}
+    for url, file_name in STATIC_CONTEXT_FILES.items():
+        with pkg_resources.resource_stream(__name__, f"resources/{file_name}") as f:
+            documents[url] = json.load(f)
+    return MappingProxyType(documents)
+
+
+def _remote_document(url: str, document: dict) -> dict:
+    """Wrap a loaded document in the remote document structure used by PyLD."""
+    return {
+        "contentType": "application/ld+json",
+        "contextUrl": None,
+        "documentUrl": url,
+        "document": document,
+    }
+
+
+async def run_jsonld(func: Callable, *args, **kwargs) -> Any:
+    """
+    Run JSON-LD processing off the event loop.
+
+    PyLD only supports synchronous document loaders, so expansion, framing and
+    canonicalization run in a dedicated thread. A `DocumentLoader` called from
+    that thread loads missing documents on the event loop in the meantime.
+    Calls are run one at a time, as PyLD shares its context cache globally.
+    """
+    global _JSONLD_EXECUTOR
+
+    if not _JSONLD_EXECUTOR:
+        _JSONLD_EXECUTOR = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="jsonld"
+        )
+    loop = asyncio.get_event_loop()
+
+    def _run():
+        _JSONLD_THREAD.loop = loop
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _JSONLD_THREAD.loop = None
+
+    return await loop.run_in_executor(_JSONLD_EXECUTOR, _run)
 
 
 class DocumentLoader:
-    """JSON-LD document loader."""
-
-    def __init__(self, profile: Profile, cache_ttl: int = 300) -> None:
+    """
+    JSON-LD document loader.
+
+    Standard contexts are served from the copies shipped with the package.
+    Other contexts are fetched asynchronously through the resolvers' pooled
+    HTTP client and kept in the cache, and in the context cache directory if
+    one is configured. DID documents are loaded using the DID resolver.
+    """
+
+    def __init__(
+        self, profile: Profile, cache_ttl: int = 86400, max_documents: int = 256
+    ) -> None:
         """Initialize new DocumentLoader instance.
 
         Args:
             profile (Profile): The profile
-            cache_ttl (int, optional): TTL for cached documents. Defaults to 300.
+            cache_ttl (int, optional): TTL for cached remote contexts.
+                Defaults to 86400.
+            max_documents (int, optional): The number of remote contexts kept in
+                process for synchronous loading. Defaults to 256.
 
         """
         self.profile = profile
         self.resolver = profile.inject(DIDResolver)
         self.cache = profile.inject_or(BaseCache)
-        self.requests_loader = requests.requests_document_loader()
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         self.cache_ttl = cache_ttl
+        self.cache_dir = profile.settings.get("jsonld.cache_dir")
+        self.max_documents = max_documents
+        self._http_client = profile.inject_or(ResolverHTTPClient)
+        self._documents = OrderedDict()
+        self._documents_lock = threading.Lock()
         self._event_loop = asyncio.get_event_loop()
 
+    @property
+    def http_client(self) -> ResolverHTTPClient:
+        """Accessor for the HTTP client fetching remote contexts."""
+        if not self._http_client:
+            self._http_client = ResolverHTTPClient()
+        return self._http_client
+
+    def _get_document(self, url: str) -> dict:
+        """Get a static or previously fetched context, if available."""
+        document = static_contexts().get(url)
+        if document is None:
+            with self._documents_lock:
+                document = self._documents.get(url)
+                if document is not None:
+                    self._documents.move_to_end(url)
+        return document
+
+    def _add_document(self, url: str, document: dict):
+        """Keep a fetched context for synchronous loading."""
+        with self._documents_lock:
+            self._documents[url] = document
+            self._documents.move_to_end(url)
+            while len(self._documents) > self.max_documents:
+                self._documents.popitem(last=False)
+
+    def _cache_path(self, url: str) -> str:
+        """Get the path of the cached copy of a context."""
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.jsonld")
+
+    def _read_cache_file(self, url: str) -> dict:
+        """Read a context from the context cache directory."""
+        try:
+            with open(self._cache_path(url)) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as err:
+            LOGGER.warning("Error reading cached JSON-LD context %s: %s", url, err)
+            return None
+
+    def _write_cache_file(self, url: str, document: dict):
+        """Write a context to the context cache directory."""
+        path = self._cache_path(url)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(document, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError as err:
+            LOGGER.warning("Error caching JSON-LD context %s: %s", url, err)
+
     async def _load_did_document(self, did: str, options: dict):
         # Resolver expects plain did without path, query, etc...
         # DIDUrl throws error if it contains no path, query etc...
@@ -46,19 +195,34 @@ class DocumentLoader:
 
         did_document = await self.resolver.resolve(self.profile, did)
 
-        document = {
-            "contentType": "application/ld+json",
-            "contextUrl": None,
-            "documentUrl": did,
-            "document": did_document,
-        }
-
-        return document
+        return _remote_document(did, did_document)
+
+    async def _load_http_document(self, url: str, options: dict):
+        loop = asyncio.get_event_loop()
+        if self.cache_dir:
+            document = await loop.run_in_executor(None, self._read_cache_file, url)
+            if document is not None:
+                return _remote_document(url, document)
+
+        headers = {"Accept": "application/ld+json, application/json"}
+        try:
+            async with self.http_client.get(url, headers=headers) as response:
+                if response.status != 200:
+                    raise LinkedDataProofException(
+                        f"Unexpected status {response.status} loading document {url}"
+                    )
+                document = await response.json(content_type=None)
+        except LinkedDataProofException:
+            raise
+        except Exception as err:
+            raise LinkedDataProofException(
+                f"Error loading document {url}: {err}"
+            ) from err
 
-    def _load_http_document(self, url: str, options: dict):
-        document = self.requests_loader(url, options)
+        if self.cache_dir:
+            await loop.run_in_executor(None, self._write_cache_file, url, document)
 
-        return document
+        return _remote_document(url, document)
 
     # Async document loader can use await for cache and did resolver
     async def _load_async(self, url: str, options: dict):
@@ -68,7 +232,7 @@ class DocumentLoader:
         if url.startswith("did:"):
             document = await self._load_did_document(url, options)
         elif url.startswith("http://") or url.startswith("https://"):
-            document = self._load_http_document(url, options)
+            document = await self._load_http_document(url, options)
         else:
             raise LinkedDataProofException(
                 "Unrecognized url format. Must start with "
@@ -80,20 +244,26 @@ class DocumentLoader:
     async def load_document(self, url: str, options: dict):
         """Load JSON-LD document.
 
-        Method signature conforms to PyLD document loader interface
-
-        Document loading is processed in separate thread to deal with
-        async to sync transformation.
+        Remote contexts are cached; DID documents are cached by the DID resolver.
         """
+        document = self._get_document(url)
+        if document is not None:
+            return _remote_document(url, document)
+
+        if url.startswith("did:"):
+            return await self._load_did_document(url, options)
+
         cache_key = f"json_ld_document_resolver::{url}"
 
         # Try to get from cache
         if self.cache:
             document = await self.cache.get(cache_key)
             if document:
+                self._add_document(url, document["document"])
                 return document
 
         document = await self._load_async(url, options)
+        self._add_document(url, document["document"])
 
         # Cache document, if cache is available
         if self.cache:
@@ -102,15 +272,34 @@ class DocumentLoader:
         return document
 
     def __call__(self, url: str, options: dict):
-        """Load JSON-LD Document."""
+        """Load JSON-LD Document.
 
-        loop = self._event_loop
-        coroutine = self.load_document(url, options)
-        document = loop.run_until_complete(coroutine)
+        Method signature conforms to PyLD document loader interface.
 
-        return document
+        Static and previously fetched contexts are returned directly. Other
+        documents are loaded on the event loop, which requires the JSON-LD
+        processing to be running in another thread, such as with `run_jsonld`.
+        """
+        document = self._get_document(url)
+        if document is not None:
+            return _remote_document(url, document)
+
+        loop = getattr(_JSONLD_THREAD, "loop", None) or self._event_loop
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+        if running_loop is loop:
+            raise LinkedDataProofException(
+                f"Document {url} cannot be loaded without blocking the event loop; "
+                "process the document with run_jsonld or load it beforehand"
+            )
+        coroutine = self.load_document(url, options)
+        if loop.is_running():
+            return asyncio.run_coroutine_threadsafe(coroutine, loop).result()
+        return loop.run_until_complete(coroutine)
 
 
 DocumentLoaderMethod = Callable[[str, dict], dict]
 
-__all__ = ["DocumentLoaderMethod", "DocumentLoader"]
+__all__ = ["DocumentLoaderMethod", "DocumentLoader", "run_jsonld"]
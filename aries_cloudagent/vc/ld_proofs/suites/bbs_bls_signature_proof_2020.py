@@ -27,7 +27,7 @@ from ....wallet.util import b64_to_bytes, bytes_to_b64
 from ..crypto import _KeyPair as KeyPair
 from ..error import LinkedDataProofException
 from ..validation_result import ProofResult
-from ..document_loader import DocumentLoaderMethod
+from ..document_loader import DocumentLoaderMethod, run_jsonld
 from ..purposes import _ProofPurpose as ProofPurpose
 
 from .bbs_bls_signature_2020 import BbsBlsSignature2020
@@ -94,11 +94,16 @@ class BbsBlsSignatureProof2020(BbsBlsSignature2020Base):
         derived_proof["type"] = self.signature_type
 
         # Get the input document and proof statements
-        document_statements = suite._create_verify_document_data(
-            document=document, document_loader=document_loader
+        document_statements = await run_jsonld(
+            suite._create_verify_document_data,
+            document=document,
+            document_loader=document_loader,
         )
-        proof_statements = suite._create_verify_proof_data(
-            proof=proof, document=document, document_loader=document_loader
+        proof_statements = await run_jsonld(
+            suite._create_verify_proof_data,
+            proof=proof,
+            document=document,
+            document_loader=document_loader,
         )
 
         # Transform any blank node identifiers for the input
@@ -111,20 +116,23 @@ class BbsBlsSignatureProof2020(BbsBlsSignature2020Base):
         )
 
         # Transform the resulting RDF statements back into JSON-LD
-        compact_input_proof_document = jsonld.from_rdf(
-            "\n".join(transformed_input_document_statements)
+        compact_input_proof_document = await run_jsonld(
+            jsonld.from_rdf, "\n".join(transformed_input_document_statements)
         )
 
         # Frame the result to create the reveal document result
-        reveal_document_result = jsonld.frame(
+        reveal_document_result = await run_jsonld(
+            jsonld.frame,
             compact_input_proof_document,
             reveal_document,
             {"documentLoader": document_loader},
         )
 
         # Canonicalize the resulting reveal document
-        reveal_document_statements = suite._create_verify_document_data(
-            document=reveal_document_result, document_loader=document_loader
+        reveal_document_statements = await run_jsonld(
+            suite._create_verify_document_data,
+            document=reveal_document_result,
+            document_loader=document_loader,
         )
 
         # Get the indices of the revealed statements from the transformed input document
@@ -169,8 +177,10 @@ class BbsBlsSignatureProof2020(BbsBlsSignature2020Base):
         all_input_statements = [*proof_statements, *document_statements]
 
         # Fetch the verification method
-        verification_method = self._get_verification_method(
-            proof=proof, document_loader=document_loader
+        verification_method = await run_jsonld(
+            self._get_verification_method,
+            proof=proof,
+            document_loader=document_loader,
         )
 
         # Create key pair from public key in verification method
@@ -236,11 +246,16 @@ class BbsBlsSignatureProof2020(BbsBlsSignature2020Base):
             proof["type"] = self.mapped_derived_proof_type
 
             # Get the proof and document statements
-            proof_statements = self._create_verify_proof_data(
-                proof=proof, document=document, document_loader=document_loader
+            proof_statements = await run_jsonld(
+                self._create_verify_proof_data,
+                proof=proof,
+                document=document,
+                document_loader=document_loader,
             )
-            document_statements = self._create_verify_document_data(
-                document=document, document_loader=document_loader
+            document_statements = await run_jsonld(
+                self._create_verify_document_data,
+                document=document,
+                document_loader=document_loader,
             )
 
             # Transform the blank node identifier placeholders for the document statements
@@ -258,8 +273,10 @@ class BbsBlsSignatureProof2020(BbsBlsSignature2020Base):
             statements_to_verify = [*proof_statements, *transformed_document_statements]
 
             # Fetch the verification method
-            verification_method = self._get_verification_method(
-                proof=proof, document_loader=document_loader
+            verification_method = await run_jsonld(
+                self._get_verification_method,
+                proof=proof,
+                document_loader=document_loader,
             )
 
             key_pair = self.key_pair.from_verification_method(verification_method)
@@ -287,7 +304,8 @@ class BbsBlsSignatureProof2020(BbsBlsSignature2020Base):
                     f"Invalid signature on document {document}"
                 )
 
-            purpose_result = purpose.validate(
+            purpose_result = await run_jsonld(
+                purpose.validate,
                 proof=proof,
                 document=document,
                 suite=self,
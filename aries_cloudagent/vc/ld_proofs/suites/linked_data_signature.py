@@ -7,7 +7,7 @@ from pytz import utc
 from typing import Union
 
 from ..constants import SECURITY_CONTEXT_URL
-from ..document_loader import DocumentLoaderMethod
+from ..document_loader import DocumentLoaderMethod, run_jsonld
 from ..error import LinkedDataProofException
 from ..purposes import _ProofPurpose as ProofPurpose
 from ..validation_result import ProofResult
@@ -109,8 +109,11 @@ class LinkedDataSignature(LinkedDataProof, metaclass=ABCMeta):
         proof = purpose.update(proof)
 
         # Create data to sign
-        verify_data = self._create_verify_data(
-            proof=proof, document=document, document_loader=document_loader
+        verify_data = await run_jsonld(
+            self._create_verify_data,
+            proof=proof,
+            document=document,
+            document_loader=document_loader,
         )
 
         # Sign data
@@ -129,13 +132,18 @@ class LinkedDataSignature(LinkedDataProof, metaclass=ABCMeta):
         """Verify proof against document and proof purpose."""
         try:
             # Create data to verify
-            verify_data = self._create_verify_data(
-                proof=proof, document=document, document_loader=document_loader
+            verify_data = await run_jsonld(
+                self._create_verify_data,
+                proof=proof,
+                document=document,
+                document_loader=document_loader,
             )
 
             # Fetch verification method
-            verification_method = self._get_verification_method(
-                proof=proof, document_loader=document_loader
+            verification_method = await run_jsonld(
+                self._get_verification_method,
+                proof=proof,
+                document_loader=document_loader,
             )
 
             # Verify signature on data
@@ -152,7 +160,8 @@ class LinkedDataSignature(LinkedDataProof, metaclass=ABCMeta):
                 )
 
             # Ensure proof was performed for a valid purpose
-            purpose_result = purpose.validate(
+            purpose_result = await run_jsonld(
+                purpose.validate,
                 proof=proof,
                 document=document,
                 suite=self,
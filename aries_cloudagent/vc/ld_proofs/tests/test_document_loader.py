@@ -0,0 +1,136 @@
+import json
+import os
+import tempfile
+
+from asynctest import mock as async_mock, TestCase as AsyncTestCase
+
+from ....cache.base import BaseCache
+from ....cache.in_memory import InMemoryCache
+from ....core.in_memory import InMemoryProfile
+from ....resolver.did_resolver import DIDResolver
+from ....resolver.http_client import ResolverHTTPClient
+from ..constants import CREDENTIALS_CONTEXT_V1_URL, SECURITY_CONTEXT_V2_URL
+from ..document_loader import DocumentLoader, run_jsonld, static_contexts
+from ..error import LinkedDataProofException
+
+CONTEXT_URL = "https://example.org/contexts/v1"
+CONTEXT = {"@context": {"name": "https://example.org/name"}}
+DID = "did:example:123"
+DID_DOC = {"@context": "https://www.w3.org/ns/did/v1", "id": DID}
+
+
+class MockResponse:
+    def __init__(self, status: int, body):
+        self.status = status
+        self.body = body
+
+    async def json(self, content_type=None):
+        return self.body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, err_type, err_value, err_exc):
+        pass
+
+
+class TestDocumentLoader(AsyncTestCase):
+    async def setUp(self):
+        self.resolver = async_mock.MagicMock(
+            resolve=async_mock.CoroutineMock(return_value=DID_DOC)
+        )
+        self.http_client = async_mock.MagicMock(
+            get=async_mock.MagicMock(return_value=MockResponse(200, CONTEXT))
+        )
+        self.profile = InMemoryProfile.test_profile(
+            bind={
+                DIDResolver: self.resolver,
+                BaseCache: InMemoryCache(),
+                ResolverHTTPClient: self.http_client,
+            }
+        )
+        self.loader = DocumentLoader(self.profile)
+
+    def test_static_contexts(self):
+        contexts = static_contexts()
+        assert contexts is static_contexts()
+        assert CREDENTIALS_CONTEXT_V1_URL in contexts
+        assert "@context" in contexts[SECURITY_CONTEXT_V2_URL]
+        with self.assertRaises(TypeError):
+            contexts[CONTEXT_URL] = CONTEXT
+
+    async def test_load_static(self):
+        document = self.loader(CREDENTIALS_CONTEXT_V1_URL, {})
+        assert document["documentUrl"] == CREDENTIALS_CONTEXT_V1_URL
+        assert document["document"] is static_contexts()[CREDENTIALS_CONTEXT_V1_URL]
+        document = await self.loader.load_document(SECURITY_CONTEXT_V2_URL, {})
+        assert document["document"] is static_contexts()[SECURITY_CONTEXT_V2_URL]
+        self.http_client.get.assert_not_called()
+
+    async def test_load_http(self):
+        document = await run_jsonld(self.loader, CONTEXT_URL, {})
+        assert document["document"] == CONTEXT
+        assert document["documentUrl"] == CONTEXT_URL
+
+        # served from process memory, even on the event loop
+        assert self.loader(CONTEXT_URL, {})["document"] == CONTEXT
+        self.http_client.get.assert_called_once()
+
+        loader = DocumentLoader(self.profile)
+        document = await loader.load_document(CONTEXT_URL, {})
+        assert document["document"] == CONTEXT
+        self.http_client.get.assert_called_once()
+
+    async def test_load_http_x_status(self):
+        self.http_client.get.return_value = MockResponse(404, None)
+        with self.assertRaises(LinkedDataProofException):
+            await self.loader.load_document(CONTEXT_URL, {})
+
+    async def test_load_http_x_error(self):
+        self.http_client.get.side_effect = OSError("no route")
+        with self.assertRaises(LinkedDataProofException):
+            await self.loader.load_document(CONTEXT_URL, {})
+
+    async def test_load_http_cache_dir(self):
+        with tempfile.TemporaryDirectory() as cache_dir:
+            self.profile.settings["jsonld.cache_dir"] = cache_dir
+            loader = DocumentLoader(self.profile)
+            await loader.load_document(CONTEXT_URL, {})
+            assert len(os.listdir(cache_dir)) == 1
+
+            profile = InMemoryProfile.test_profile(
+                settings={"jsonld.cache_dir": cache_dir},
+                bind={DIDResolver: self.resolver, ResolverHTTPClient: self.http_client},
+            )
+            document = await DocumentLoader(profile).load_document(CONTEXT_URL, {})
+            assert document["document"] == CONTEXT
+            self.http_client.get.assert_called_once()
+
+            with open(os.path.join(cache_dir, os.listdir(cache_dir)[0]), "w") as f:
+                f.write("{")
+            document = await DocumentLoader(profile).load_document(CONTEXT_URL, {})
+            assert document["document"] == CONTEXT
+            assert self.http_client.get.call_count == 2
+            with open(os.path.join(cache_dir, os.listdir(cache_dir)[0])) as f:
+                assert json.load(f) == CONTEXT
+
+    async def test_load_did(self):
+        document = await run_jsonld(self.loader, f"{DID}#key-1", {})
+        assert document["document"] == DID_DOC
+        assert document["documentUrl"] == DID
+        self.resolver.resolve.assert_called_once_with(self.profile, DID)
+
+    async def test_load_x_on_event_loop(self):
+        with self.assertRaises(LinkedDataProofException):
+            self.loader(DID, {})
+        self.resolver.resolve.assert_not_called()
+
+    async def test_load_x_unrecognized(self):
+        with self.assertRaises(LinkedDataProofException):
+            await self.loader.load_document("urn:example:123", {})
+
+    async def test_max_documents(self):
+        loader = DocumentLoader(self.profile, max_documents=1)
+        await loader.load_document(CONTEXT_URL, {})
+        await loader.load_document(f"{CONTEXT_URL}/other", {})
+        assert list(loader._documents) == [f"{CONTEXT_URL}/other"]
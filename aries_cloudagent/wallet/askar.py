@@ -23,6 +23,7 @@ from ..ledger.endpoint_type import EndpointType
 from ..ledger.error import LedgerConfigError
 from ..storage.askar import AskarStorage
 from ..storage.base import StorageRecord, StorageDuplicateError, StorageNotFoundError
+from ..utils.worker_pool import WorkerPool
 
 from .base import BaseWallet, KeyInfo, DIDInfo
 from .crypto import (
@@ -680,6 +681,10 @@ class AskarWallet(BaseWallet):
                 from_key = from_key_entry.key
             else:
                 from_key = None
+            pool = self._session.inject_or(WorkerPool)
+            if pool and not pool.processes:
+                # askar keys are native handles, so they only go to threads
+                return await pool.run(pack_message, to_verkeys, from_key, message)
             return await asyncio.get_event_loop().run_in_executor(
                 None, pack_message, to_verkeys, from_key, message
             )
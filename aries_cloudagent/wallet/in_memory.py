@@ -5,6 +5,7 @@ from typing import List, Sequence, Tuple, Union
 
 from .did_parameters_validation import DIDParametersValidation
 from ..core.in_memory import InMemoryProfile
+from ..utils.worker_pool import WorkerPool
 
 from .base import BaseWallet
 from .crypto import (
@@ -14,6 +15,7 @@ from .crypto import (
     verify_signed_message,
     encode_pack_message,
     decode_pack_message,
+    decode_pack_message_outer,
 )
 from .did_info import KeyInfo, DIDInfo
 from .did_posture import DIDPosture
@@ -351,6 +353,17 @@ class InMemoryWallet(BaseWallet):
 
         raise WalletError("Private key not found for verkey: {}".format(verkey))
 
+    def _get_recipient_secrets(self, verkeys: Sequence[str]) -> dict:
+        """Find the private keys held for any of a set of verkeys."""
+        keys_and_dids = list(self.profile.local_dids.values()) + list(
+            self.profile.keys.values()
+        )
+        return {
+            info["verkey"]: info["secret"]
+            for info in keys_and_dids
+            if info["verkey"] in verkeys
+        }
+
     async def get_public_did(self) -> DIDInfo:
         """
         Retrieve the public DID.
@@ -488,6 +501,9 @@ class InMemoryWallet(BaseWallet):
 
         keys_bin = [b58_to_bytes(key) for key in to_verkeys]
         secret = self._get_private_key(from_verkey) if from_verkey else None
+        pool = self.profile.inject_or(WorkerPool)
+        if pool:
+            return await pool.run(encode_pack_message, message, keys_bin, secret)
         result = await asyncio.get_event_loop().run_in_executor(
             None, encode_pack_message, message, keys_bin, secret
         )
@@ -510,14 +526,26 @@ class InMemoryWallet(BaseWallet):
         """
         if not enc_message:
             raise WalletError("Message not provided")
+        pool = self.profile.inject_or(WorkerPool)
         try:
-            (
-                message,
-                from_verkey,
-                to_verkey,
-            ) = await asyncio.get_event_loop().run_in_executor(
-                None, lambda: decode_pack_message(enc_message, self._get_private_key)
-            )
+            if pool and pool.processes:
+                # the key lookup cannot be sent to another process
+                (_, recips, _) = decode_pack_message_outer(enc_message)
+                find_key = self._get_recipient_secrets(recips).get
+            else:
+                find_key = self._get_private_key
+            if pool:
+                (message, from_verkey, to_verkey) = await pool.run(
+                    decode_pack_message, enc_message, find_key
+                )
+            else:
+                (
+                    message,
+                    from_verkey,
+                    to_verkey,
+                ) = await asyncio.get_event_loop().run_in_executor(
+                    None, lambda: decode_pack_message(enc_message, find_key)
+                )
         except ValueError as e:
             raise WalletError("Message could not be unpacked: {}".format(str(e)))
         return message, from_verkey, to_verkey
@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Benchmark tag queries against the in-memory storage index.
+
+Indexes records with distinct tag values, then runs selective tag queries
+through the index and by scanning every record, reporting the load time and
+the query time for each number of records.
+
+Usage: scripts/benchmark_in_memory_storage.py [--records N ...]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aries_cloudagent.storage.in_memory import (  # noqa: E402
+    InMemoryTagIndex,
+    tag_query_match,
+)
+from aries_cloudagent.storage.record import StorageRecord  # noqa: E402
+
+
+def make_records(count: int):
+    """Create records with a few shared tag values and one distinct value."""
+    colors = ("red", "green", "blue")
+    return [
+        StorageRecord(
+            type="TYPE",
+            value=str(index),
+            tags={
+                "color": colors[index % 3],
+                "size": str(index % 5),
+                "value": str(index),
+            },
+            id=f"TYPE-{index}",
+        )
+        for index in range(count)
+    ]
+
+
+def run(count: int):
+    """Time loading the index and querying it against a scan of the records."""
+    records = make_records(count)
+    start = time.perf_counter()
+    index = InMemoryTagIndex(records)
+    load_time = time.perf_counter() - start
+    by_id = {record.id: record for record in records}
+    queries = [
+        {"value": str(count // 2)},
+        {"color": "red", "value": {"$in": ["3", "6", "7"]}},
+        {"$or": [{"value": "1"}, {"size": "1", "value": "11"}]},
+    ]
+
+    start = time.perf_counter()
+    indexed = [
+        [by_id[record_id] for record_id in index.find("TYPE", query)]
+        for query in queries
+    ]
+    indexed_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    scanned = [
+        [
+            record
+            for record in records
+            if record.type == "TYPE" and tag_query_match(record.tags, query)
+        ]
+        for query in queries
+    ]
+    scan_time = time.perf_counter() - start
+
+    assert indexed == scanned
+    return load_time, indexed_time / len(queries), scan_time / len(queries)
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--records", type=int, nargs="+", default=[10000, 100000, 1000000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'records':>8} {'load ms':>9} {'indexed us':>11} {'scan us':>11}")
+    for count in args.records:
+        load_time, indexed_time, scan_time = run(count)
+        print(
+            f"{count:>8} {load_time * 1e3:>9.1f} "
+            f"{indexed_time * 1e6:>11.1f} {scan_time * 1e6:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
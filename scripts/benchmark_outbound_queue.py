@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Benchmark the outbound transport manager's queue.
+
+Delivers messages through the process loop to a stub transport, with backlogs
+of retries which are not yet due, reporting the scheduling time per message.
+Then enqueues webhooks with and without the outbound journal, reporting the
+time per message until all are delivered and the journal is synced.
+
+Usage: scripts/benchmark_outbound_queue.py [--messages N] [--backlog N ...]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aries_cloudagent.core.in_memory import InMemoryProfile  # noqa: E402
+from aries_cloudagent.transport.outbound.base import (  # noqa: E402
+    BaseOutboundTransport,
+)
+from aries_cloudagent.transport.outbound.manager import (  # noqa: E402
+    OutboundTransportManager,
+    QueuedOutboundMessage,
+)
+from aries_cloudagent.utils.tracing import get_timer  # noqa: E402
+
+
+class StubTransport(BaseOutboundTransport):
+    """Outbound transport accepting every message without sending it."""
+
+    schemes = ("http",)
+
+    async def start(self):
+        """Start the transport."""
+
+    async def stop(self):
+        """Stop the transport."""
+
+    async def handle_message(
+        self, profile, payload, endpoint, metadata=None, api_key=None
+    ):
+        """Accept a message."""
+
+
+async def process_loop(backlog: int, messages: int) -> float:
+    """Time the delivery of new messages alongside a backlog of retries."""
+    mgr = OutboundTransportManager(InMemoryProfile.test_profile())
+    retry_at = get_timer() + 3600
+    for _ in range(backlog):
+        queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+        queued.retry_at = retry_at
+        mgr._queue_retry(queued)
+        mgr.outbound_buffer.add(queued)
+
+    delivered = asyncio.Event()
+    done = []
+
+    def deliver(queued: QueuedOutboundMessage):
+        mgr._queue_done(queued)
+        mgr.process_queued()
+        done.append(queued)
+        if len(done) == messages:
+            delivered.set()
+
+    mgr.deliver_queued_message = deliver
+    start = get_timer()
+    for _ in range(messages):
+        queued = QueuedOutboundMessage(None, None, None, "transport_cls")
+        queued.endpoint = "http://localhost"
+        queued.state = QueuedOutboundMessage.STATE_PENDING
+        mgr.outbound_new.append(queued)
+        task = mgr.process_queued()
+        await asyncio.sleep(0)  # one loop wakeup per message
+    await delivered.wait()
+    elapsed = get_timer() - start
+    task.cancel()
+    return elapsed / messages
+
+
+async def enqueue(messages: int, journal_path: str = None) -> float:
+    """Time enqueueing and delivering webhooks, optionally with the journal."""
+    settings = {"transport.outbound_queue_path": journal_path} if journal_path else {}
+    mgr = OutboundTransportManager(InMemoryProfile.test_profile(settings))
+    mgr.register_class(StubTransport, "stub")
+    await mgr.start()
+    await mgr.task_queue
+    start = get_timer()
+    for idx in range(messages):
+        mgr.enqueue_webhook("topic", {"idx": idx}, "http://example")
+        if idx % 100 == 0:
+            await asyncio.sleep(0)
+    await mgr.flush()
+    if mgr.journal:
+        await mgr.journal.flush()
+    elapsed = get_timer() - start
+    await mgr.stop()
+    return elapsed / messages
+
+
+async def run(messages: int, backlogs: list):
+    """Run the benchmark."""
+    print(f"{messages} messages")
+    print(f"{'backlog':>8} {'us/message':>11}")
+    for backlog in backlogs:
+        elapsed = await process_loop(backlog, messages)
+        print(f"{backlog:>8} {elapsed * 1e6:>11.1f}")
+
+    print(f"{'journal':>8} {'us/message':>11}")
+    elapsed = await enqueue(messages)
+    print(f"{'off':>8} {elapsed * 1e6:>11.1f}")
+    with TemporaryDirectory() as temp_dir:
+        elapsed = await enqueue(messages, os.path.join(temp_dir, "outbound.log"))
+    print(f"{'on':>8} {elapsed * 1e6:>11.1f}")
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument(
+        "--backlog", type=int, nargs="+", default=[0, 2000, 20000, 200000]
+    )
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.messages, args.backlog))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+"""
+Benchmark packing and unpacking DIDComm v1 messages.
+
+Packs messages with the in-memory wallet for 1, 5 and 50 recipients and 0 to 3
+routing keys, then unpacks them, reporting messages per second per worker.
+
+Usage: scripts/benchmark_pack.py [--messages N] [--workers N] [--worker-type T]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aries_cloudagent.core.in_memory import InMemoryProfile  # noqa: E402
+from aries_cloudagent.transport.pack_format import PackWireFormat  # noqa: E402
+from aries_cloudagent.utils.worker_pool import WorkerPool  # noqa: E402
+from aries_cloudagent.wallet.base import BaseWallet  # noqa: E402
+from aries_cloudagent.wallet.did_method import SOV, DIDMethods  # noqa: E402
+from aries_cloudagent.wallet.key_type import ED25519  # noqa: E402
+
+RECIPIENTS = (1, 5, 50)
+ROUTING_KEYS = (0, 1, 2, 3)
+MESSAGE = {
+    "@type": "https://didcomm.org/basicmessage/1.0/message",
+    "@id": "c4f1f8d5-2a3b-4c5d-8e9f-0a1b2c3d4e5f",
+    "content": "x" * 512,
+}
+
+
+async def run(messages: int, pool: WorkerPool):
+    """Run the benchmark."""
+    session = InMemoryProfile.test_session()
+    session.profile.context.injector.bind_instance(DIDMethods, DIDMethods())
+    session.profile.context.injector.bind_instance(WorkerPool, pool)
+    wallet = session.inject(BaseWallet)
+    wire_format = PackWireFormat()
+
+    sender = await wallet.create_local_did(method=SOV, key_type=ED25519)
+    keys = [
+        (await wallet.create_local_did(method=SOV, key_type=ED25519)).verkey
+        for _ in range(max(max(RECIPIENTS), max(ROUTING_KEYS)))
+    ]
+    message_json = json.dumps(MESSAGE)
+
+    print(f"{pool.kind} pool, {pool.max_workers} workers, {messages} messages")
+    print(
+        f"{'recipients':>10} {'routing':>8} {'pack/s/core':>12} {'unpack/s/core':>14}"
+    )
+    for recipients in RECIPIENTS:
+        for routing in ROUTING_KEYS:
+            start = time.perf_counter()
+            packed = await asyncio.gather(
+                *(
+                    wire_format.encode_message(
+                        session,
+                        message_json,
+                        keys[:recipients],
+                        keys[:routing],
+                        sender.verkey,
+                    )
+                    for _ in range(messages)
+                )
+            )
+            pack_rate = messages / (time.perf_counter() - start) / pool.max_workers
+
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(wire_format.parse_message(session, message) for message in packed)
+            )
+            unpack_rate = messages / (time.perf_counter() - start) / pool.max_workers
+            print(
+                f"{recipients:>10} {routing:>8} {pack_rate:>12.1f} {unpack_rate:>14.1f}"
+            )
+
+    pool.shutdown()
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--worker-type", choices=("thread", "process"), default="thread"
+    )
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    pool = WorkerPool(
+        kind=args.worker_type, max_workers=args.workers, batch_size=args.batch_size
+    )
+    asyncio.get_event_loop().run_until_complete(run(args.messages, pool))
+
+
+if __name__ == "__main__":
+    main()
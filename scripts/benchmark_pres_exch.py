@@ -0,0 +1,195 @@
+#!/usr/bin/env python
+"""
+Benchmark evaluating DIF presentation definitions against held credentials.
+
+Evaluates presentation definitions with schema filters, field constraints and
+nested submission requirements against a set of generated credentials,
+reporting the time taken per definition.
+
+Usage: scripts/benchmark_pres_exch.py [--credentials N] [--rounds N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aries_cloudagent.core.in_memory import InMemoryProfile  # noqa: E402
+from aries_cloudagent.protocols.present_proof.dif.pres_exch import (  # noqa: E402
+    PresentationDefinition,
+)
+from aries_cloudagent.protocols.present_proof.dif.pres_exch_handler import (  # noqa: E402
+    DIFPresExchHandler,
+)
+from aries_cloudagent.resolver.did_resolver import DIDResolver  # noqa: E402
+from aries_cloudagent.storage.vc_holder.vc_record import VCRecord  # noqa: E402
+from aries_cloudagent.vc.ld_proofs.document_loader import DocumentLoader  # noqa: E402
+
+SCHEMAS = (
+    "https://example.org/examples/degree.json",
+    "https://example.org/examples/license.json",
+    "https://example.org/examples/membership.json",
+    "https://example.org/examples/employment.json",
+)
+
+DEGREE_DESCRIPTOR = {
+    "id": "degree_input",
+    "group": ["A"],
+    "schema": [{"uri": SCHEMAS[0]}],
+    "constraints": {
+        "fields": [
+            {"path": ["$.credentialSubject.degree.type"], "filter": {"const": "BSc"}},
+            {
+                "path": ["$.credentialSubject.graduated", "$.issuanceDate"],
+                "filter": {"type": "string", "format": "date", "minimum": "2015-01-01"},
+            },
+        ]
+    },
+}
+LICENSE_DESCRIPTOR = {
+    "id": "license_input",
+    "group": ["B"],
+    "schema": [{"uri": SCHEMAS[1]}],
+    "constraints": {
+        "fields": [
+            {
+                "path": ["$.credentialSubject.licenseClass"],
+                "filter": {"type": "string", "enum": ["A", "B"]},
+            },
+            {
+                "path": ["$.credentialSubject.points"],
+                "filter": {"type": "number", "maximum": 6},
+            },
+        ]
+    },
+}
+MEMBERSHIP_DESCRIPTOR = {
+    "id": "membership_input",
+    "group": ["B"],
+    "schema": [{"uri": SCHEMAS[2]}],
+    "constraints": {
+        "fields": [
+            {
+                "path": ["$.credentialSubject.club"],
+                "filter": {"type": "string", "pattern": "^Club [0-9]$"},
+            }
+        ]
+    },
+}
+
+DEFINITIONS = {
+    "single descriptor": {
+        "id": "f7c2f6e4-7d8e-4c5e-9a0e-1a3b5c7d9e01",
+        "input_descriptors": [DEGREE_DESCRIPTOR],
+    },
+    "nested requirements": {
+        "id": "f7c2f6e4-7d8e-4c5e-9a0e-1a3b5c7d9e02",
+        "submission_requirements": [
+            {"name": "Degree", "rule": "all", "from": "A"},
+            {"name": "License or membership", "rule": "pick", "count": 1, "from": "B"},
+            {
+                "name": "Any",
+                "rule": "pick",
+                "min": 1,
+                "from_nested": [
+                    {"name": "Degree", "rule": "all", "from": "A"},
+                    {"name": "Other", "rule": "pick", "count": 1, "from": "B"},
+                ],
+            },
+        ],
+        "input_descriptors": [
+            DEGREE_DESCRIPTOR,
+            LICENSE_DESCRIPTOR,
+            MEMBERSHIP_DESCRIPTOR,
+        ],
+    },
+}
+
+
+def make_credentials(count: int):
+    """Generate credential records with a mix of schemas and values."""
+    records = []
+    for index in range(count):
+        schema = SCHEMAS[index % len(SCHEMAS)]
+        subject = {
+            "id": f"did:example:{index}",
+            "degree": {"type": ("BSc", "MSc")[index % 2]},
+            "graduated": f"20{10 + index % 12}-06-01",
+            "licenseClass": "ABC"[index % 3],
+            "points": index % 10,
+            "club": f"Club {index % 12}",
+        }
+        records.append(
+            VCRecord(
+                contexts=["https://www.w3.org/2018/credentials/v1"],
+                expanded_types=[
+                    "https://www.w3.org/2018/credentials#VerifiableCredential"
+                ],
+                issuer_id="did:example:issuer",
+                subject_ids=[subject["id"]],
+                proof_types=["Ed25519Signature2018"],
+                schema_ids=[schema],
+                cred_value={
+                    "@context": ["https://www.w3.org/2018/credentials/v1"],
+                    "type": ["VerifiableCredential"],
+                    "issuer": "did:example:issuer",
+                    "issuanceDate": "2020-01-01T00:00:00Z",
+                    "credentialSubject": subject,
+                },
+                given_id=f"urn:uuid:{index}",
+                record_id=f"record-{index}",
+            )
+        )
+    return records
+
+
+async def evaluate(handler: DIFPresExchHandler, pd: PresentationDefinition, creds):
+    """Select the applicable credentials the way create_vp does, without signing."""
+    req = await handler.make_requirement(
+        srs=pd.submission_requirements, descriptors=pd.input_descriptors
+    )
+    descriptor_results = {}
+    results = []
+    for nested_req in req.nested_req or [req]:
+        results.append(
+            await handler.apply_requirements(
+                req=nested_req,
+                credentials=creds,
+                descriptor_results=descriptor_results,
+            )
+        )
+    return results
+
+
+async def run(count: int, rounds: int):
+    """Run the benchmark."""
+    profile = InMemoryProfile.test_profile(bind={DIDResolver: DIDResolver([])})
+    profile.context.injector.bind_instance(DocumentLoader, DocumentLoader(profile))
+    handler = DIFPresExchHandler(profile)
+    creds = make_credentials(count)
+
+    print(f"{count} credentials, {rounds} rounds")
+    for name, definition in DEFINITIONS.items():
+        pd = PresentationDefinition.deserialize(definition)
+        start = time.perf_counter()
+        for _ in range(rounds):
+            results = await evaluate(handler, pd, creds)
+        elapsed = (time.perf_counter() - start) / rounds
+        matched = sum(len(creds) for res in results for creds in res.values())
+        print(f"{name:>20}: {elapsed * 1000:9.1f} ms, {matched} matches")
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--credentials", type=int, default=10000)
+    parser.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.credentials, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+"""
+Benchmark finding the sub wallets of relayed messages.
+
+Stores tenants with one route each, then resolves the recipient wallets of
+messages with two recipients, with a hot set of tenants receiving most of the
+messages. Compares looking up each route and wallet record in storage with the
+multitenant manager's routing index and wallet record cache, reporting the time
+and storage sessions per message.
+
+Usage: scripts/benchmark_relay_lookup.py [--tenants N] [--messages N]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aries_cloudagent.core.in_memory import InMemoryProfile  # noqa: E402
+from aries_cloudagent.multitenant.manager import MultitenantManager  # noqa: E402
+from aries_cloudagent.protocols.routing.v1_0.manager import (  # noqa: E402
+    RoutingManager,
+)
+from aries_cloudagent.protocols.routing.v1_0.models.route_record import (  # noqa: E402
+    RouteRecord,
+)
+from aries_cloudagent.wallet.models.wallet_record import WalletRecord  # noqa: E402
+
+
+class RecipientKeys:
+    """Wire format treating a message body as its list of recipient keys."""
+
+    def get_recipient_keys(self, message_body):
+        """Get the recipient keys of a message."""
+        return message_body
+
+
+async def run(tenants: int, messages: int):
+    """Run the benchmark."""
+    profile = InMemoryProfile.test_profile({"multitenant.wallet_cache_ttl": 60})
+    async with profile.session() as session:
+        for idx in range(tenants):
+            wallet_record = WalletRecord(settings={})
+            await wallet_record.save(session)
+            await RouteRecord(
+                wallet_id=wallet_record.wallet_id, recipient_key=f"key{idx}"
+            ).save(session)
+    rand = random.Random(1)
+    hot = max(tenants // 10, 1)
+    bodies = [
+        [
+            f"key{rand.randrange(hot if rand.random() < 0.9 else tenants)}"
+            for _ in range(2)
+        ]
+        for _ in range(messages)
+    ]
+
+    print(f"{tenants} tenants, {messages} messages")
+    print(f"{'lookup':>8} {'us/message':>11} {'sessions/message':>17}")
+    with mock.patch.object(profile, "session", wraps=profile.session) as sessions:
+        start = time.perf_counter()
+        for body in bodies:
+            for key in body:
+                route = await RoutingManager(profile).get_recipient(key)
+                async with profile.session() as session:
+                    await WalletRecord.retrieve_by_id(session, route.wallet_id)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{'storage':>8} {elapsed / messages * 1e6:>11.1f} "
+            f"{sessions.call_count / messages:>17.2f}"
+        )
+
+        manager = MultitenantManager(profile)
+        await manager.load_routing_index()
+        sessions.reset_mock()
+        wire_format = RecipientKeys()
+        start = time.perf_counter()
+        for body in bodies:
+            await manager.get_wallets_by_message(body, wire_format)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{'indexed':>8} {elapsed / messages * 1e6:>11.1f} "
+            f"{sessions.call_count / messages:>17.2f}"
+        )
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=2000)
+    parser.add_argument("--messages", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(run(args.tenants, args.messages))
+
+
+if __name__ == "__main__":
+    main()
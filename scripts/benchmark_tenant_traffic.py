@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Benchmark resolving tenant profiles with the askar-profile multitenant manager.
+
+Opens an in-memory Askar store for the tenants and serves a mix of admin
+requests and inbound messages, with a hot set of tenants sending most of the
+traffic, reporting the time per request for each profile cache size.
+
+Usage: scripts/benchmark_tenant_traffic.py [--tenants N] [--cache-size N ...]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aries_askar import Store  # noqa: E402
+
+from aries_cloudagent.askar.profile import AskarProfile  # noqa: E402
+from aries_cloudagent.askar.store import AskarStoreConfig  # noqa: E402
+from aries_cloudagent.config.injection_context import InjectionContext  # noqa: E402
+from aries_cloudagent.core.in_memory import InMemoryProfile  # noqa: E402
+from aries_cloudagent.multitenant.askar_profile_manager import (  # noqa: E402
+    AskarProfileMultitenantManager,
+)
+from aries_cloudagent.wallet.models.wallet_record import WalletRecord  # noqa: E402
+
+
+async def run(tenants: int, requests: int, cache_sizes: list):
+    """Run the benchmark."""
+    config = AskarStoreConfig(
+        {
+            "name": ":memory:",
+            "key": Store.generate_raw_key(),
+            "key_derivation_method": AskarStoreConfig.KEY_DERIVATION_RAW,
+        }
+    )
+    opened = await config.open_store()
+    multitenant_profile = AskarProfile(opened, InjectionContext())
+
+    records = [
+        WalletRecord(wallet_id=f"tenant{idx}", settings={"wallet.id": f"t{idx}"})
+        for idx in range(tenants)
+    ]
+    rand = random.Random(1)
+    hot = max(tenants // 20, 1)
+    traffic = [
+        records[rand.randrange(hot)]
+        if rand.random() < 0.9
+        else records[rand.randrange(tenants)]
+        for _ in range(requests)
+    ]
+
+    print(f"{tenants} tenants, {requests} requests")
+    print(f"{'cache':>8} {'us/request':>11}")
+    for cache_size in cache_sizes:
+        profile = InMemoryProfile.test_profile({"multitenant.cache_size": cache_size})
+        manager = AskarProfileMultitenantManager(profile, multitenant_profile)
+        start = time.perf_counter()
+        for idx, wallet_record in enumerate(traffic):
+            if idx % 2:
+                # admin request
+                await manager.get_wallet_profile(profile.context, wallet_record)
+            else:
+                # inbound message
+                await manager.get_wallet_profile(
+                    profile.context, wallet_record, {"wallet.key": "key"}
+                )
+        elapsed = time.perf_counter() - start
+        print(f"{cache_size:>8} {elapsed / requests * 1e6:>11.1f}")
+
+    await opened.close()
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tenants", type=int, default=10000)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--cache-size", type=int, nargs="+", default=[1, 100, 1000])
+    args = parser.parse_args()
+    asyncio.get_event_loop().run_until_complete(
+        run(args.tenants, args.requests, args.cache_size)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+"""
+Benchmark picking up messages from the undelivered queue.
+
+Fills the in-memory and persistent undelivered queues with messages spread
+over many recipient keys, then drains the messages of some of the keys as
+reconnecting clients would, reporting the time per message.
+
+Usage: scripts/benchmark_undelivered_queue.py [--messages N] [--keys N]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+from tempfile import TemporaryDirectory
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from aries_cloudagent.transport.inbound.delivery_queue import (  # noqa: E402
+    DeliveryQueue,
+)
+from aries_cloudagent.transport.inbound.persistent_queue import (  # noqa: E402
+    PersistentDeliveryQueue,
+)
+from aries_cloudagent.transport.outbound.message import (  # noqa: E402
+    OutboundMessage,
+)
+
+
+def pickup(queue, messages: int, keys: int, clients: int, batch: int):
+    """Time adding messages to a queue and draining them for some clients."""
+    target_keys = [f"key{idx}" for idx in range(keys)]
+    msgs = [
+        OutboundMessage(
+            payload=None,
+            enc_payload=b"x" * 256,
+            reply_to_verkey=target_keys[idx % keys],
+        )
+        for idx in range(messages)
+    ]
+    start = time.perf_counter()
+    if isinstance(queue, PersistentDeliveryQueue):
+        queue.add_messages(msgs)
+    else:
+        for msg in msgs:
+            queue.add_message(msg)
+    added = time.perf_counter() - start
+
+    start = time.perf_counter()
+    drained = 0
+    for key in target_keys[:clients]:
+        for msg in queue.get_messages_for_key(key, batch):
+            queue.remove_message_for_key(key, msg)
+            drained += 1
+    return added / messages, (time.perf_counter() - start) / drained
+
+
+def main():
+    """Parse the arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=100000)
+    parser.add_argument("--keys", type=int, default=10000)
+    parser.add_argument("--clients", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.messages} messages, {args.keys} keys, {args.clients} clients")
+    print(f"{'queue':>10} {'add us/msg':>11} {'pickup us/msg':>14}")
+    added, picked = pickup(
+        DeliveryQueue(), args.messages, args.keys, args.clients, args.batch_size
+    )
+    print(f"{'memory':>10} {added * 1e6:>11.1f} {picked * 1e6:>14.1f}")
+    with TemporaryDirectory() as temp_dir:
+        queue = PersistentDeliveryQueue(os.path.join(temp_dir, "undelivered.db"))
+        added, picked = pickup(
+            queue, args.messages, args.keys, args.clients, args.batch_size
+        )
+        queue.close()
+    print(f"{'persistent':>10} {added * 1e6:>11.1f} {picked * 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -32,7 +32,12 @@ if __name__ == "__main__":
         url="https://github.com/hyperledger/aries-cloudagent-python",
         packages=find_packages(),
         include_package_data=True,
-        package_data={"aries_cloudagent": ["requirements.txt"]},
+        package_data={
+            "aries_cloudagent": [
+                "requirements.txt",
+                "vc/ld_proofs/resources/*.jsonld",
+            ]
+        },
         install_requires=parse_requirements("requirements.txt"),
         tests_require=parse_requirements("requirements.dev.txt"),
         extras_require={